@@ -5,11 +5,11 @@
 """
 
 import logging
-import yaml
 from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 from auto_executor import Task, executor
+from utils.registry_snapshot import registry_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +35,8 @@ class NamingRegistryManager:
             }
 
         try:
-            with open(self.registry_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                return data or {"naming_rules": []}
+            data = registry_snapshots.load(self.registry_path, mutable=True)
+            return data or {"naming_rules": []}
         except Exception as e:
             logger.error(f"加載命名規範註冊表失敗: {e}")
             return {"naming_rules": []}
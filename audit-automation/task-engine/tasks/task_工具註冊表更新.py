@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 from auto_executor import Task, executor
+from utils.registry_snapshot import registry_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +38,7 @@ class ToolRegistryUpdater:
             }
 
         try:
-            with open(self.registry_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return registry_snapshots.load(self.registry_path, mutable=True)
         except Exception as e:
             logger.error(f"加載工具註冊表失敗: {e}")
             return {"tools": []}
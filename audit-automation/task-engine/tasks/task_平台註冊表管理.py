@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from auto_executor import Task, executor
+from utils.registry_snapshot import registry_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +36,8 @@ class PlatformRegistryManager:
             }
 
         try:
-            with open(self.registry_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                return data or {"platforms": []}
+            data = registry_snapshots.load(self.registry_path, mutable=True)
+            return data or {"platforms": []}
         except Exception as e:
             logger.error(f"加載註冊表失敗: {e}")
             return {"platforms": []}
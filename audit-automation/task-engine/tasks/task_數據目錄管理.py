@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from auto_executor import Task, executor
+from utils.registry_snapshot import registry_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +40,8 @@ class DataCatalogManager:
             }
 
         try:
-            with open(self.catalog_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                return data or {"datasets": []}
+            data = registry_snapshots.load(self.catalog_path, mutable=True)
+            return data or {"datasets": []}
         except Exception as e:
             logger.error(f"加載數據目錄失敗: {e}")
             return {"datasets": []}
@@ -5,13 +5,12 @@
 """
 
 import logging
-import json
-import yaml
 from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 from auto_executor import Task, executor
 from event_bus import event_bus
+from utils.registry_snapshot import registry_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -32,23 +31,13 @@ class RegistrySynchronizer:
             logger.warning(f"⚠️  註冊表目錄不存在: {self.registries_dir}")
             return loaded
 
-        # 加載 JSON 註冊表
-        for json_file in self.registries_dir.glob("*.json"):
+        # 加載 JSON / YAML 註冊表（共享唯讀快照，未變更時不重新解析）
+        for registry_file in registry_snapshots.list_registry_files(self.registries_dir):
             try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    loaded[json_file.stem] = json.load(f)
-                logger.info(f"  ✓ {json_file.name}")
+                loaded[registry_file.stem] = registry_snapshots.load(registry_file)
+                logger.info(f"  ✓ {registry_file.name}")
             except Exception as e:
-                logger.error(f"  ✗ {json_file.name}: {e}")
-
-        # 加載 YAML 註冊表
-        for yaml_file in self.registries_dir.glob("*.yaml"):
-            try:
-                with open(yaml_file, "r", encoding="utf-8") as f:
-                    loaded[yaml_file.stem] = yaml.safe_load(f)
-                logger.info(f"  ✓ {yaml_file.name}")
-            except Exception as e:
-                logger.error(f"  ✗ {yaml_file.name}: {e}")
+                logger.error(f"  ✗ {registry_file.name}: {e}")
 
         self.registries = loaded
         return loaded
@@ -130,6 +119,7 @@ class RegistrySyncTask(Task):
 
         # 加載所有註冊表
         registries = self.synchronizer.load_all_registries()
+        registry_snapshots.save()
         logger.info(f"📂 已加載 {len(registries)} 個註冊表")
 
         # 驗證一致性
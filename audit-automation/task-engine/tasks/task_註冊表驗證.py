@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 from auto_executor import Task, executor
+from utils.registry_snapshot import registry_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,8 @@ class RegistryValidator:
             "required_metadata": ["updated", "version"],
             "valid_statuses": ["active", "inactive", "deprecated"],
         }
+        # 文件路徑 -> (版本, 驗證結果)；文件未變更時直接復用
+        self._results: Dict[str, tuple] = {}
 
     def validate_all(self) -> Dict[str, Any]:
         """驗證所有註冊表"""
@@ -36,13 +39,17 @@ class RegistryValidator:
             return results
 
         # 驗證所有註冊表文件
-        registry_files = list(self.registries_dir.glob("*.json")) + list(
-            self.registries_dir.glob("*.yaml")
-        )
+        registry_files = registry_snapshots.list_registry_files(self.registries_dir)
         results["total_registries"] = len(registry_files)
 
         for registry_file in registry_files:
-            validation = self._validate_single_registry(registry_file)
+            version = registry_snapshots.version(registry_file)
+            cached = self._results.get(str(registry_file))
+            if cached is not None and cached[0] == version:
+                validation = cached[1]
+            else:
+                validation = self._validate_single_registry(registry_file)
+                self._results[str(registry_file)] = (version, validation)
             results["details"].append(validation)
 
             if validation["passed"]:
@@ -62,13 +69,8 @@ class RegistryValidator:
         }
 
         try:
-            # 加載文件
-            if registry_file.suffix == ".json":
-                with open(registry_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            else:  # .yaml
-                with open(registry_file, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
+            # 加載文件（共享快照，未變更時不重新解析）
+            data = registry_snapshots.load(registry_file)
 
             if not isinstance(data, dict):
                 result["errors"].append("不是有效的字典格式")
@@ -157,6 +159,7 @@ class RegistryValidationTask(Task):
 
         # 執行驗證
         results = self.validator.validate_all()
+        registry_snapshots.save()
 
         # 顯示結果
         logger.info(f"📊 驗證結果:")
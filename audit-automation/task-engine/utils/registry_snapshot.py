@@ -0,0 +1,257 @@
+"""註冊表快照服務
+
+用途: 進程內共享的註冊表解析快取
+- 每個文件只解析一次，之後以 (mtime, size) 判斷是否需要重新解析
+- 有 libyaml 時使用 CSafeLoader
+- 解析結果以 JSON Lines 寫入磁碟，冷啟動時免重新解析
+- 對外提供唯讀視圖；需要修改的管理器取得獨立副本
+"""
+
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# 固定在任務引擎目錄下，不隨啟動時的工作目錄改變
+DEFAULT_CACHE_PATH = str(
+    Path(__file__).resolve().parent.parent / ".cache" / "registry-snapshots.jsonl"
+)
+
+# 磁碟快取格式版本，結構變更時遞增
+CACHE_FORMAT_VERSION = 2
+
+
+def _readonly(*_args, **_kwargs):
+    raise TypeError("註冊表快照為唯讀視圖，請使用 load(path, mutable=True) 取得副本")
+
+
+class FrozenDict(dict):
+    """唯讀字典（仍是 dict 子類，isinstance 檢查與 json.dump 不受影響）"""
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (thaw(self),))
+
+
+class FrozenList(list):
+    """唯讀列表"""
+
+    __setitem__ = __delitem__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (thaw(self),))
+
+
+def freeze(value: Any) -> Any:
+    """遞迴轉換為唯讀結構"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """遞迴轉換為可修改的普通 dict / list"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+class _Snapshot:
+    """單個文件的快照"""
+
+    __slots__ = ("version", "payload", "view", "error")
+
+    def __init__(
+        self,
+        version: Tuple[int, int],
+        payload: Optional[bytes],
+        error: Optional[Exception] = None,
+    ):
+        self.version = version
+        self.payload = payload
+        self.view: Any = None
+        self.error = error
+
+
+class RegistrySnapshotService:
+    """註冊表快照服務"""
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
+        """初始化服務
+
+        Args:
+            cache_path: 磁碟快取路徑；None 表示只使用記憶體
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._snapshots: Dict[str, _Snapshot] = {}
+        self._lock = threading.RLock()
+        self._disk_loaded = False
+        self._dirty = False
+        self.stats = {"parses": 0, "hits": 0, "disk_entries": 0}
+
+    def load(self, path: Union[str, Path], mutable: bool = False) -> Any:
+        """讀取註冊表
+
+        文件未變更時直接返回快照。解析錯誤會原樣拋出
+        （json.JSONDecodeError / yaml.YAMLError），與直接解析時一致。
+
+        Args:
+            path: 註冊表文件路徑（.json / .yaml / .yml）
+            mutable: True 時返回可修改的獨立副本
+
+        Returns:
+            唯讀視圖或獨立副本
+        """
+        snapshot = self._get_snapshot(Path(path))
+        if snapshot.error is not None:
+            raise snapshot.error
+        if mutable:
+            return pickle.loads(snapshot.payload)
+        with self._lock:
+            if snapshot.view is None:
+                snapshot.view = freeze(pickle.loads(snapshot.payload))
+            return snapshot.view
+
+    def version(self, path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+        """文件當前版本 (mtime_ns, size)，不存在時返回 None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def list_registry_files(
+        self, directory: Union[str, Path], patterns: Tuple[str, ...] = ("*.json", "*.yaml")
+    ) -> List[Path]:
+        """列出目錄下的註冊表文件（按模式順序）"""
+        directory = Path(directory)
+        files: List[Path] = []
+        for pattern in patterns:
+            files.extend(directory.glob(pattern))
+        return files
+
+    def save(self) -> bool:
+        """把有變更的快照寫回磁碟快取（原子替換）
+
+        第一行是格式標頭，之後每行一個文件。無法以 JSON 表示的內容
+        （例如 YAML 日期）不寫入，下次冷啟動時重新解析。
+        """
+        with self._lock:
+            if self.cache_path is None or not self._dirty:
+                return False
+            entries = [
+                (key, snap.version, snap.payload)
+                for key, snap in self._snapshots.items()
+                if snap.error is None
+            ]
+            self._dirty = False
+        try:
+            lines = [json.dumps({"format": CACHE_FORMAT_VERSION})]
+            for key, version, payload in entries:
+                try:
+                    lines.append(json.dumps(
+                        {"path": key, "version": version, "data": pickle.loads(payload)},
+                        ensure_ascii=False,
+                    ))
+                except (TypeError, ValueError):
+                    continue
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.cache_path.parent, prefix=".registry-snapshots-"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_path, self.cache_path)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️  寫入註冊表快取失敗: {e}")
+            return False
+
+    def clear(self):
+        """清除記憶體中的快照"""
+        with self._lock:
+            self._snapshots.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """獲取統計信息"""
+        with self._lock:
+            return {**self.stats, "snapshots": len(self._snapshots)}
+
+    def _get_snapshot(self, path: Path) -> _Snapshot:
+        key = str(path.resolve())
+        version = self.version(path)
+        if version is None:
+            raise FileNotFoundError(f"註冊表不存在: {path}")
+        with self._lock:
+            self._load_disk_cache()
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.version == version:
+                self.stats["hits"] += 1
+                return snapshot
+            try:
+                data = self._parse(path)
+                snapshot = _Snapshot(
+                    version, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+                )
+            except (json.JSONDecodeError, yaml.YAMLError, UnicodeDecodeError) as e:
+                snapshot = _Snapshot(version, None, error=e)
+            self.stats["parses"] += 1
+            self._snapshots[key] = snapshot
+            self._dirty = True
+            return snapshot
+
+    def _parse(self, path: Path) -> Any:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.suffix == ".json":
+                return json.load(f)
+            return yaml.load(f, Loader=YamlLoader)
+
+    def _load_disk_cache(self):
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("format") != CACHE_FORMAT_VERSION:
+                    return
+                for line in f:
+                    entry = json.loads(line)
+                    payload = pickle.dumps(entry["data"], protocol=pickle.HIGHEST_PROTOCOL)
+                    self._snapshots.setdefault(
+                        entry["path"], _Snapshot(tuple(entry["version"]), payload)
+                    )
+                    self.stats["disk_entries"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️  讀取註冊表快取失敗，將重新解析: {e}")
+
+
+# 進程內共享實例
+registry_snapshots = RegistrySnapshotService()
@@ -19,12 +19,21 @@ MNGA (Machine Native Governance Architecture) 強制執行器
 - 掃描所有文件的 GL 合規性
 - 驗證命名規範
 - 檢查證據鏈完整性
+
+執行方式：
+- 整個工作區只走訪一次，建立共享的文件清單供所有檢查篩選
+- 逐文件內容掃描分派到進程池
+- 逐文件結果按 (路徑, mtime, 大小, 規則集版本) 快取，未變更的文件下次跳過
 """
 
 import sys
 import os
 import re
 import json
+import hashlib
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Tuple, List, Dict, Any, Optional
 from dataclasses import dataclass, field, asdict
@@ -107,6 +116,138 @@ class EnforcementResult:
     execution_time_ms: int = 0
 
 
+# ============================================================================
+# 共享文件清單與逐文件掃描
+# ============================================================================
+
+# 掃描邏輯變更時遞增，使既有的逐文件快取失效
+SCANNER_VERSION = 1
+
+GL_ANNOTATION_PATTERN = re.compile(r"@GL-governed|@GL-layer|GL\d{2}")
+
+# 走訪時不進入的目錄（所有檢查本來就排除其內容）
+WALK_PRUNED_DIRS = {".git"}
+
+# 待掃描文件少於此數時不啟動進程池
+PARALLEL_SCAN_THRESHOLD = 256
+
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "mnga-enforce"
+)
+
+
+class FileInventory:
+    """工作區文件清單
+
+    一次 scandir 走訪，條目順序與 Path.rglob 相同（目錄前序、目錄內按
+    scandir 順序），因此各檢查從清單篩選得到的結果與各自 rglob 一致。
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.entries: List[Tuple[Path, bool]] = []
+        self._paths = set()
+        self._walk(root)
+
+    def _walk(self, directory: Path):
+        try:
+            with os.scandir(directory) as it:
+                scanned = list(it)
+        except OSError:
+            return
+
+        subdirs = []
+        for entry in scanned:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            path = directory / entry.name
+            self.entries.append((path, is_dir))
+            self._paths.add(path)
+            if is_dir and not entry.is_symlink() and entry.name not in WALK_PRUNED_DIRS:
+                subdirs.append(path)
+
+        for subdir in subdirs:
+            self._walk(subdir)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def contains(self, path: Path) -> bool:
+        return path in self._paths
+
+    def directories(self) -> List[Path]:
+        return [path for path, is_dir in self.entries if is_dir]
+
+    def with_suffix(self, suffix: str, under: Optional[Path] = None) -> List[Path]:
+        """等同 rglob(f"*{suffix}")，可限定在 under 子樹內"""
+        prefix = f"{under}{os.sep}" if under is not None else ""
+        return [
+            path
+            for path, _ in self.entries
+            if path.name.endswith(suffix) and str(path).startswith(prefix)
+        ]
+
+    def named(self, name: str) -> List[Path]:
+        """等同 rglob(name)"""
+        return [path for path, _ in self.entries if path.name == name]
+
+
+_SCAN_RULES = None
+
+
+def _init_scan_worker(
+    forbidden_patterns: List[Tuple[str, str]], placeholder_patterns: List[str]
+):
+    """編譯掃描規則（進程池 initializer，也用於進程內掃描）"""
+    global _SCAN_RULES
+    _SCAN_RULES = (
+        [(re.compile(pattern), description) for pattern, description in forbidden_patterns],
+        [re.compile(pattern, re.IGNORECASE) for pattern in placeholder_patterns],
+        re.compile("|".join(f"(?:{pattern})" for pattern, _ in forbidden_patterns)),
+    )
+
+
+def _scan_file(task: Tuple[str, str]) -> Any:
+    """掃描單個文件
+
+    Returns:
+        "gl": 是否有 GL 標註；"security": [[行號, 描述], ...]；讀取失敗為 None
+    """
+    kind, path = task
+    try:
+        content = Path(path).read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        return None
+
+    if kind == "gl":
+        return bool(GL_ANNOTATION_PATTERN.search(content))
+
+    forbidden, placeholders, prefilter = _SCAN_RULES
+    if not prefilter.search(content):
+        return []
+
+    hits = []
+    for regex, description in forbidden:
+        for match in regex.finditer(content):
+            # 檢查匹配文本及所在行是否為佔位符
+            line_start = content.rfind("\n", 0, match.start()) + 1
+            line_end = content.find("\n", match.end())
+            if line_end == -1:
+                line_end = len(content)
+            line_content = content[line_start:line_end]
+
+            if any(
+                placeholder.search(match.group()) or placeholder.search(line_content)
+                for placeholder in placeholders
+            ):
+                continue
+
+            hits.append([content.count("\n", 0, match.start()) + 1, description])
+    return hits
+
+
 # ============================================================================
 # MNGA 核心檢查器
 # ============================================================================
@@ -115,12 +256,32 @@ class EnforcementResult:
 class MNGAEnforcer:
     """Machine Native Governance Architecture 強制執行器"""
 
-    def __init__(self, workspace_path: Path = WORKSPACE_ROOT):
+    def __init__(
+        self,
+        workspace_path: Path = WORKSPACE_ROOT,
+        max_workers: Optional[int] = None,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+    ):
         self.workspace = workspace_path
         self.ecosystem = workspace_path / "ecosystem"
         self.violations: List[Violation] = []
         self.files_scanned = 0
 
+        # 執行設定
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if cache_path is None:
+            workspace_key = hashlib.sha256(
+                str(Path(workspace_path).resolve()).encode("utf-8")
+            ).hexdigest()[:16]
+            cache_path = DEFAULT_CACHE_DIR / f"{workspace_key}.json"
+        self.cache_path = Path(cache_path) if use_cache else None
+        self._inventory: Optional[FileInventory] = None
+        self._file_cache: Optional[Dict[str, Any]] = None
+        self._used_cache_entries: Dict[str, Any] = {}
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.inventory_time_ms = 0
+
         # GL 命名規範
         self.naming_patterns = {
             "kebab-case": re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$"),
@@ -166,10 +327,116 @@ class MNGAEnforcer:
             "GL90-99": "Meta-Specification",
         }
 
+    @property
+    def inventory(self) -> FileInventory:
+        """共享文件清單（首次使用時走訪一次）"""
+        if self._inventory is None:
+            start_time = time.perf_counter()
+            self._inventory = FileInventory(self.workspace)
+            self.inventory_time_ms = int((time.perf_counter() - start_time) * 1000)
+        return self._inventory
+
+    @property
+    def ruleset_version(self) -> str:
+        """規則集指紋，規則或掃描邏輯變更時快取失效"""
+        rules = [
+            SCANNER_VERSION,
+            GL_ANNOTATION_PATTERN.pattern,
+            self.forbidden_patterns,
+            self.placeholder_patterns,
+        ]
+        return hashlib.sha256(json.dumps(rules).encode("utf-8")).hexdigest()[:16]
+
+    def _load_file_cache(self) -> Dict[str, Any]:
+        if self._file_cache is not None:
+            return self._file_cache
+
+        self._file_cache = {}
+        if self.cache_path is not None and self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("ruleset") == self.ruleset_version:
+                    self._file_cache = cached.get("files", {})
+            except Exception:
+                pass
+        return self._file_cache
+
+    def save_file_cache(self) -> bool:
+        """寫回本次用到的逐文件結果（未出現的文件自然淘汰）"""
+        if self.cache_path is None or not self._used_cache_entries:
+            return False
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.cache_path.parent, prefix=".mnga-enforce-"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"ruleset": self.ruleset_version, "files": self._used_cache_entries},
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.cache_path)
+            return True
+        except Exception:
+            return False
+
+    def _scan_files(self, kind: str, paths: List[Path]) -> List[Any]:
+        """逐文件掃描（命中快取直接返回，其餘分派到進程池），結果與 paths 同序"""
+        cache = self._load_file_cache()
+        results: List[Any] = [None] * len(paths)
+        pending = []
+
+        for i, path in enumerate(paths):
+            key = f"{kind}:{path.relative_to(self.workspace)}"
+            try:
+                stat = path.stat()
+                version = [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                version = None
+
+            cached = cache.get(key)
+            if version is not None and cached is not None and cached[:2] == version:
+                results[i] = cached[2]
+                self._used_cache_entries[key] = cached
+                self.cache_stats["hits"] += 1
+            else:
+                pending.append((i, key, version, (kind, str(path))))
+                self.cache_stats["misses"] += 1
+
+        if not pending:
+            return results
+
+        tasks = [task for _, _, _, task in pending]
+        rules = (self.forbidden_patterns, self.placeholder_patterns)
+        if self.max_workers > 1 and len(tasks) >= PARALLEL_SCAN_THRESHOLD:
+            chunksize = max(1, len(tasks) // (self.max_workers * 8))
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_scan_worker,
+                initargs=rules,
+            ) as pool:
+                scanned = list(pool.map(_scan_file, tasks, chunksize=chunksize))
+        else:
+            _init_scan_worker(*rules)
+            scanned = [_scan_file(task) for task in tasks]
+
+        for (i, key, version, _), result in zip(pending, scanned):
+            results[i] = result
+            # 讀取失敗可能是暫時性的，不快取
+            if version is not None and result is not None:
+                self._used_cache_entries[key] = [*version, result]
+
+        return results
+
     def run_all_checks(self) -> List[EnforcementResult]:
         """執行所有 MNGA 檢查"""
         results = []
 
+        # 0. 建立共享文件清單
+        _ = self.inventory
+
         # 1. GL 合規性檢查
         results.append(self.check_gl_compliance())
 
@@ -202,6 +469,8 @@ class MNGAEnforcer:
         results.append(self.check_reasoning_system())
         results.append(self.check_validators_layer())
 
+        self.save_file_cache()
+
         return results
 
     def check_gl_compliance(self) -> EnforcementResult:
@@ -231,28 +500,26 @@ class MNGAEnforcer:
                     )
                 )
 
-        # 掃描 Python 文件的 GL 標註
-        python_files = list(self.ecosystem.rglob("*.py"))
-        for py_file in python_files:
-            files_scanned += 1
-            try:
-                content = py_file.read_text(encoding="utf-8", errors="ignore")
-                # 檢查是否有 GL 標註
-                if not re.search(r"@GL-governed|@GL-layer|GL\d{2}", content):
-                    # 只對核心文件要求 GL 標註
-                    if "enforcer" in py_file.name or "audit" in py_file.name:
-                        violations.append(
-                            Violation(
-                                rule_id="GL-COMPLIANCE-002",
-                                file_path=str(py_file.relative_to(self.workspace)),
-                                line_number=1,
-                                message="核心治理文件缺少 GL 標註",
-                                severity="MEDIUM",
-                                suggestion="添加 @GL-governed 和 @GL-layer 標註",
-                            )
-                        )
-            except Exception as e:
-                pass
+        # 掃描 Python 文件的 GL 標註（只對核心文件要求 GL 標註）
+        python_files = self.inventory.with_suffix(".py", under=self.ecosystem)
+        files_scanned = len(python_files)
+        core_files = [
+            py_file
+            for py_file in python_files
+            if "enforcer" in py_file.name or "audit" in py_file.name
+        ]
+        for py_file, annotated in zip(core_files, self._scan_files("gl", core_files)):
+            if annotated is False:
+                violations.append(
+                    Violation(
+                        rule_id="GL-COMPLIANCE-002",
+                        file_path=str(py_file.relative_to(self.workspace)),
+                        line_number=1,
+                        message="核心治理文件缺少 GL 標註",
+                        severity="MEDIUM",
+                        suggestion="添加 @GL-governed 和 @GL-layer 標註",
+                    )
+                )
 
         elapsed = (datetime.now() - start_time).total_seconds() * 1000
 
@@ -308,9 +575,7 @@ class MNGAEnforcer:
             return False
 
         # 1. 檢查目錄命名
-        for dir_path in self.workspace.rglob("*"):
-            if not dir_path.is_dir():
-                continue
+        for dir_path in self.inventory.directories():
             if should_exclude(dir_path):
                 continue
 
@@ -326,7 +591,7 @@ class MNGAEnforcer:
                 continue
 
             # Python 包目錄允許 snake_case
-            if (dir_path / "__init__.py").exists():
+            if self.inventory.contains(dir_path / "__init__.py"):
                 continue
 
             # 檢查下劃線（應使用連字符）
@@ -343,7 +608,7 @@ class MNGAEnforcer:
                 )
 
         # 2. 檢查 Python 文件命名（應使用 snake_case）
-        for file_path in self.workspace.rglob("*.py"):
+        for file_path in self.inventory.with_suffix(".py"):
             if should_exclude(file_path):
                 continue
 
@@ -370,7 +635,7 @@ class MNGAEnforcer:
 
         # 3. 檢查配置文件命名（應使用 kebab-case）
         for ext in [".yaml", ".yml", ".json"]:
-            for file_path in self.workspace.rglob(f"*{ext}"):
+            for file_path in self.inventory.with_suffix(ext):
                 if should_exclude(file_path):
                     continue
 
@@ -433,68 +698,35 @@ class MNGAEnforcer:
             ".sh",
         ]
 
-        for ext in text_extensions:
-            for file_path in self.workspace.rglob(f"*{ext}"):
-                # 排除特定目錄（包括敏感數據目錄）
-                if any(
-                    p in str(file_path)
-                    for p in [
-                        ".git",
-                        "node_modules",
-                        "__pycache__",
-                        "outputs",
-                        "summarized_conversations",
-                        "summarized-conversations",
-                    ]
-                ):
-                    continue
+        # 排除特定目錄（包括敏感數據目錄）
+        excluded = [
+            ".git",
+            "node_modules",
+            "__pycache__",
+            "outputs",
+            "summarized_conversations",
+            "summarized-conversations",
+        ]
+        text_files = [
+            file_path
+            for ext in text_extensions
+            for file_path in self.inventory.with_suffix(ext)
+            if not any(p in str(file_path) for p in excluded)
+        ]
+        files_scanned = len(text_files)
 
-                files_scanned += 1
-                try:
-                    content = file_path.read_text(encoding="utf-8", errors="ignore")
-
-                    for pattern, description in self.forbidden_patterns:
-                        matches = list(re.finditer(pattern, content))
-                        for match in matches:
-                            matched_text = match.group()
-
-                            # 檢查是否為佔位符
-                            is_placeholder = False
-                            for placeholder in self.placeholder_patterns:
-                                if re.search(placeholder, matched_text, re.IGNORECASE):
-                                    is_placeholder = True
-                                    break
-
-                            # 獲取匹配行的上下文
-                            line_start = content.rfind("\n", 0, match.start()) + 1
-                            line_end = content.find("\n", match.end())
-                            if line_end == -1:
-                                line_end = len(content)
-                            line_content = content[line_start:line_end]
-
-                            # 檢查行內容是否包含佔位符
-                            for placeholder in self.placeholder_patterns:
-                                if re.search(placeholder, line_content, re.IGNORECASE):
-                                    is_placeholder = True
-                                    break
-
-                            if not is_placeholder:
-                                # 計算行號
-                                line_num = content[: match.start()].count("\n") + 1
-                                violations.append(
-                                    Violation(
-                                        rule_id="GL-SECURITY-001",
-                                        file_path=str(
-                                            file_path.relative_to(self.workspace)
-                                        ),
-                                        line_number=line_num,
-                                        message=description,
-                                        severity="CRITICAL",
-                                        suggestion="移除敏感信息並添加到 .gitignore",
-                                    )
-                                )
-                except Exception:
-                    pass
+        for file_path, hits in zip(text_files, self._scan_files("security", text_files)):
+            for line_num, description in hits or []:
+                violations.append(
+                    Violation(
+                        rule_id="GL-SECURITY-001",
+                        file_path=str(file_path.relative_to(self.workspace)),
+                        line_number=line_num,
+                        message=description,
+                        severity="CRITICAL",
+                        suggestion="移除敏感信息並添加到 .gitignore",
+                    )
+                )
 
         elapsed = (datetime.now() - start_time).total_seconds() * 1000
 
@@ -514,7 +746,7 @@ class MNGAEnforcer:
         files_scanned = 0
 
         # 檢查 .governance 目錄
-        governance_dirs = list(self.workspace.rglob(".governance"))
+        governance_dirs = self.inventory.named(".governance")
 
         for gov_dir in governance_dirs:
             files_scanned += 1
@@ -536,7 +768,7 @@ class MNGAEnforcer:
         # 檢查審計日誌目錄
         audit_logs_dir = self.ecosystem / "logs" / "audit-logs"
         if audit_logs_dir.exists():
-            log_files = list(audit_logs_dir.rglob("*.json"))
+            log_files = self.inventory.with_suffix(".json", under=audit_logs_dir)
             files_scanned += len(log_files)
 
             if len(log_files) == 0:
@@ -1089,7 +1321,7 @@ class MNGAEnforcer:
                 )
                 continue
 
-            py_files = list(full_path.rglob("*.py"))
+            py_files = self.inventory.with_suffix(".py", under=full_path)
             files_checked += len(py_files)
             if not py_files:
                 violations.append(
@@ -1681,6 +1913,12 @@ def parse_args():
     parser.add_argument(
         "--strict", action="store_true", help="Strict mode - fail on any violation"
     )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes for file scanning (default: CPU count)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Rescan every file, ignoring the per-file cache"
+    )
 
     return parser.parse_args()
 
@@ -1750,11 +1988,15 @@ def main() -> int:
         print_info("Dry-run mode: ENABLED")
 
     # 創建強制執行器
-    enforcer = MNGAEnforcer(WORKSPACE_ROOT)
+    enforcer = MNGAEnforcer(
+        WORKSPACE_ROOT, max_workers=args.workers, use_cache=not args.no_cache
+    )
 
     # 執行所有檢查
     print_step(1, "執行 MNGA 治理檢查...")
+    run_start = time.perf_counter()
     results = enforcer.run_all_checks()
+    run_elapsed_ms = int((time.perf_counter() - run_start) * 1000)
 
     # 打印結果
     print_header("📊 檢查結果總結")
@@ -1791,6 +2033,19 @@ def main() -> int:
 
     print("=" * 70)
 
+    # 各檢查耗時（wall-clock）
+    print(f"\n{'檢查項目':<25} {'耗時 (ms)':>10}")
+    print("-" * 70)
+    print(f"{'File Inventory':<25} {enforcer.inventory_time_ms:>10}")
+    for result in results:
+        print(f"{result.check_name:<25} {result.execution_time_ms:>10}")
+    print(f"{'Total':<25} {run_elapsed_ms:>10}")
+    print_info(
+        f"文件清單 {len(enforcer.inventory)} 個條目，逐文件快取命中 "
+        f"{enforcer.cache_stats['hits']} / 重新掃描 {enforcer.cache_stats['misses']}"
+    )
+    print("=" * 70)
+
     # 總結
     if total_failed == 0:
         print_success(f"所有檢查通過 ({total_passed}/{len(results)})")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# 
+#  @GL-governed
+#  @GL-layer: search
+#  @GL-semantic: autocomplete_benchmark
+#  @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+# 
+#  GL Unified Architecture Governance Framework Activated
+# /
+"""
+Autocomplete Latency Benchmark
+GL-Layer: GL50-59 (Observability)
+Closure-Signal: metrics
+
+Measures per-keystroke suggestion latency of the in-process suggestion index
+and prefix result cache. No Elasticsearch cluster is needed.
+
+Usage: python benchmarks/autocomplete_benchmark.py [--documents N] [--queries N]
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.search.suggestion_index import SuggestionIndex, PrefixResultCache  # noqa: E402
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+def make_documents(count, rng):
+    vocabulary = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(5000)]
+    return [
+        {
+            'id': f'doc-{i}',
+            'title': ' '.join(rng.choices(vocabulary, k=rng.randint(2, 6))),
+            'tags': rng.sample(vocabulary, 2),
+            'type': 'article',
+            'popularity': rng.random() * 100
+        }
+        for i in range(count)
+    ], vocabulary
+def keystrokes(vocabulary, count, rng):
+    prefixes = []
+    while len(prefixes) < count:
+        word = rng.choice(vocabulary)
+        prefixes.extend(word[:n] for n in range(1, len(word) + 1))
+    return prefixes[:count]
+def measure(fn, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+def report(label, samples):
+    print(f"{label:<28} p50={percentile(samples, 50):8.1f}us  p99={percentile(samples, 99):8.1f}us  max={max(samples):9.1f}us")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=50000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    documents, vocabulary = make_documents(args.documents, rng)
+    index = SuggestionIndex(['title', 'tags'], ['id', 'title', 'type'])
+    start = time.perf_counter()
+    index.build(documents)
+    print(f"Built index over {len(index)} documents in {time.perf_counter() - start:.2f}s")
+    queries = keystrokes(vocabulary, args.queries, rng)
+    report('index lookup (uncached)', measure(lambda q: index.search(q, args.limit), queries))
+    cache = PrefixResultCache(4096)
+    def cached(query):
+        key = ('bench', 0, query)
+        if cache.get(key) is None:
+            cache.put(key, index.search(query, args.limit))
+    report('index + LRU (cold)', measure(cached, queries))
+    report('index + LRU (warm)', measure(cached, queries))
+    print(f"LRU hit rate: {cache.hits / max(1, cache.hits + cache.misses):.1%}")
+    updates = [dict(doc, popularity=rng.random() * 100) for doc in rng.sample(documents, min(1000, len(documents)))]
+    start = time.perf_counter()
+    index.upsert(updates)
+    print(f"Incremental upsert of {len(updates)} documents: {(time.perf_counter() - start) * 1e3:.1f}ms")
+if __name__ == '__main__':
+    main()
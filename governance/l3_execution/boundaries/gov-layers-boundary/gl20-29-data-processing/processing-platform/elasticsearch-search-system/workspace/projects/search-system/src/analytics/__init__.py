@@ -9,4 +9,5 @@
 """Analytics Services Package"""
 from .search_analytics import SearchAnalytics
 from .relevance_tuning import RelevanceTuner
-__all__ = ['SearchAnalytics', 'RelevanceTuner']
\ No newline at end of file
+from .ingestion_buffer import AnalyticsIngestionBuffer
+__all__ = ['SearchAnalytics', 'RelevanceTuner', 'AnalyticsIngestionBuffer']
\ No newline at end of file
@@ -0,0 +1,186 @@
+# 
+#  @GL-governed
+#  @GL-layer: search
+#  @GL-semantic: ingestion_buffer
+#  @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+# 
+#  GL Unified Architecture Governance Framework Activated
+# /
+"""
+Analytics Ingestion Buffer
+GL-Layer: GL50-59 (Observability)
+Closure-Signal: metrics
+"""
+# MNGA-002: Import organization needs review
+from typing import Dict, Any, List, Optional, Callable
+from collections import OrderedDict
+import bisect
+import logging
+import queue
+import random
+import threading
+import time
+from ..elasticsearch.client import EsClientManager
+logger = logging.getLogger(__name__)
+DEFAULT_LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+class AnalyticsIngestionBuffer:
+    """Bounded queue that batches analytics events into bulk writes on a background thread."""
+    def __init__(self, client: EsClientManager, config: Dict[str, Any],
+                 on_batch: Optional[Callable[[int, int], None]] = None):
+        self.client = client
+        self.config = config
+        self.analytics_index = config.get('analytics_index', 'search_analytics')
+        self.batch_size = config.get('batch_size', 500)
+        self.flush_interval = config.get('flush_interval_seconds', 1.0)
+        self.max_queue_size = config.get('max_queue_size', 10000)
+        self.sample_watermark = config.get('sample_watermark', 0.8)
+        self.overload_sample_rate = config.get('overload_sample_rate', 0.1)
+        self.bucket_seconds = config.get('bucket_seconds', 60)
+        self.max_buckets = config.get('max_buckets', 1440)
+        self.latency_buckets_ms = sorted(config.get('latency_buckets_ms', DEFAULT_LATENCY_BUCKETS_MS))
+        self.on_batch = on_batch
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue_size)
+        self._aggregates: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.metrics = {
+            'events_accepted': 0,
+            'events_sampled_out': 0,
+            'events_dropped': 0,
+            'events_written': 0,
+            'events_failed': 0,
+            'batches_written': 0
+        }
+    def start(self) -> None:
+        """Start the background writer if it is not already running."""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop_event.clear()
+            self._worker = threading.Thread(target=self._run, name='analytics-ingestion', daemon=True)
+            self._worker.start()
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Aggregate the event and enqueue it for bulk write; never blocks the caller."""
+        self._aggregate(event)
+        if self._worker is None or not self._worker.is_alive():
+            self.start()
+        if self._queue.qsize() >= self.max_queue_size * self.sample_watermark and random.random() >= self.overload_sample_rate:
+            self._increment('events_sampled_out')
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._increment('events_dropped')
+            return False
+        self._increment('events_accepted')
+        return True
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the writer after draining every queued event."""
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+        self._drain()
+    def flush(self) -> int:
+        """Synchronously write everything currently queued."""
+        return self._drain()
+    def pending(self) -> int:
+        return self._queue.qsize()
+    def get_bucket_stats(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Pre-aggregated counters per time bucket, oldest first."""
+        with self._lock:
+            buckets = [(start, dict(stats, latency_histogram=list(stats['latency_histogram'])))
+                       for start, stats in self._aggregates.items()
+                       if since is None or start + self.bucket_seconds > since]
+        results = []
+        for start, stats in buckets:
+            queries = stats['queries']
+            results.append({
+                'bucket_start': start,
+                'bucket_seconds': self.bucket_seconds,
+                'queries': queries,
+                'clicks': stats['clicks'],
+                'zero_result_queries': stats['zero_results'],
+                'zero_result_rate': stats['zero_results'] / queries if queries else 0.0,
+                'average_query_time_ms': stats['latency_total_ms'] / queries if queries else 0.0,
+                'latency_buckets_ms': list(self.latency_buckets_ms),
+                'latency_histogram': stats['latency_histogram']
+            })
+        return results
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = self.metrics.copy()
+        metrics['queue_depth'] = self._queue.qsize()
+        return metrics
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while not self._stop_event.is_set():
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                if batch:
+                    self._write_batch(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+        if batch:
+            self._write_batch(batch)
+    def _drain(self) -> int:
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                written += self._write_batch(batch)
+                batch = []
+        if batch:
+            written += self._write_batch(batch)
+        return written
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> int:
+        try:
+            result = self.client.bulk_index(self.analytics_index, batch)
+            success = result['success']
+            failed = len(batch) - success
+        except Exception as e:
+            logger.error(f"Failed to write analytics batch: {str(e)}")
+            success, failed = 0, len(batch)
+        with self._lock:
+            self.metrics['events_written'] += success
+            self.metrics['events_failed'] += failed
+            self.metrics['batches_written'] += 1
+        if self.on_batch:
+            self.on_batch(success, failed)
+        return success
+    def _aggregate(self, event: Dict[str, Any]) -> None:
+        bucket_start = int(time.time() // self.bucket_seconds * self.bucket_seconds)
+        with self._lock:
+            stats = self._aggregates.get(bucket_start)
+            if stats is None:
+                stats = {
+                    'queries': 0,
+                    'clicks': 0,
+                    'zero_results': 0,
+                    'latency_total_ms': 0,
+                    'latency_histogram': [0] * (len(self.latency_buckets_ms) + 1)
+                }
+                self._aggregates[bucket_start] = stats
+                while len(self._aggregates) > self.max_buckets:
+                    self._aggregates.popitem(last=False)
+            if event.get('event_type') == 'search_query':
+                latency = event.get('query_time_ms') or 0
+                stats['queries'] += 1
+                stats['latency_total_ms'] += latency
+                stats['latency_histogram'][bisect.bisect_left(self.latency_buckets_ms, latency)] += 1
+                if not event.get('results_count'):
+                    stats['zero_results'] += 1
+            elif event.get('event_type') == 'document_click':
+                stats['clicks'] += 1
+    def _increment(self, key: str) -> None:
+        with self._lock:
+            self.metrics[key] += 1
@@ -17,7 +17,9 @@ import logging
 from datetime import datetime, timedelta
 import hashlib
 import json
+import time
 from ..elasticsearch.client import EsClientManager
+from .ingestion_buffer import AnalyticsIngestionBuffer
 logger = logging.getLogger(__name__)
 class SearchAnalytics:
     def __init__(self, client: EsClientManager, config: Dict[str, Any]):
@@ -32,6 +34,12 @@ class SearchAnalytics:
             'start_time': None,
             'end_time': None
         }
+        ingestion_config = dict(config.get('ingestion', {}))
+        self.buffered = ingestion_config.get('enabled', True)
+        self.ingestion_buffer: Optional[AnalyticsIngestionBuffer] = None
+        if self.buffered:
+            ingestion_config.setdefault('analytics_index', self.analytics_index)
+            self.ingestion_buffer = AnalyticsIngestionBuffer(client, ingestion_config, on_batch=self._on_batch_written)
     def generate_evidence(self, operation: str, details: Dict[str, Any]) -> str:
         evidence = {
             'timestamp': datetime.utcnow().isoformat(),
@@ -65,6 +73,12 @@ class SearchAnalytics:
                 'index_name': event['index_name'],
                 'event_hash': event['hash']
             })
+            if self.ingestion_buffer is not None:
+                event['id'] = event_id
+                accepted = self.ingestion_buffer.submit(event)
+                self.metrics['queries_logged'] += 1
+                self.metrics['events_collected'] += int(accepted)
+                return True
             self.client.index_document(self.analytics_index, event_id, event)
             self.metrics['queries_logged'] += 1
             self.metrics['events_collected'] += 1
@@ -97,6 +111,10 @@ class SearchAnalytics:
                 'index_name': event['index_name'],
                 'event_hash': event['hash']
             })
+            if self.ingestion_buffer is not None:
+                event['id'] = event_id
+                self.metrics['events_collected'] += int(self.ingestion_buffer.submit(event))
+                return True
             self.client.index_document(self.analytics_index, event_id, event)
             self.metrics['events_collected'] += 1
             self.generate_evidence('click_event_logged', {
@@ -197,6 +215,23 @@ class SearchAnalytics:
         except Exception as e:
             logger.error(f"Failed to get zero-result queries: {str(e)}")
             return []
+    def get_aggregated_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
+        if self.ingestion_buffer is None:
+            return []
+        return self.ingestion_buffer.get_bucket_stats(since=time.time() - hours * 3600)
+    def flush(self) -> int:
+        if self.ingestion_buffer is None:
+            return 0
+        return self.ingestion_buffer.flush()
+    def close(self) -> None:
+        if self.ingestion_buffer is not None:
+            self.ingestion_buffer.close()
+    def _on_batch_written(self, success: int, failed: int) -> None:
+        self.generate_evidence('analytics_batch_written', {
+            'index': self.analytics_index,
+            'success': success,
+            'failed': failed
+        })
     def _compute_event_hash(self, query: str, params: Optional[Dict[str, Any]] = None) -> str:
         hash_input = {'query': query}
         if params:
@@ -213,6 +248,9 @@ class SearchAnalytics:
         hash_str = json.dumps(hash_input, sort_keys=True)
         return hashlib.sha256(hash_str.encode()).hexdigest()
     def get_metrics(self) -> Dict[str, Any]:
-        return self.metrics.copy()
+        metrics = self.metrics.copy()
+        if self.ingestion_buffer is not None:
+            metrics['ingestion'] = self.ingestion_buffer.get_metrics()
+        return metrics
     def get_evidence_chain(self) -> List[Dict[str, Any]]:
         return self.evidence_chain
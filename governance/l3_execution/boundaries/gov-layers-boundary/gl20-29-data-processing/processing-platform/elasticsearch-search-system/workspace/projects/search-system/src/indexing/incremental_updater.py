@@ -12,7 +12,7 @@ GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
 # MNGA-002: Import organization needs review
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable
 import logging
 from datetime import datetime
 import hashlib
@@ -26,6 +26,7 @@ class IncrementalUpdater:
         self.updater_id = config.get('id', 'incremental-updater')
         self.change_detection_field = config.get('change_detection_field', 'updated_at')
         self.enable_hashing = config.get('enable_hashing', True)
+        self.update_listeners: List[Callable[[str, List[Dict[str, Any]], List[str]], None]] = []
         self.evidence_chain = []
         self.metrics = {
             'documents_checked': 0,
@@ -47,6 +48,9 @@ class IncrementalUpdater:
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         return evidence_hash
+    def register_listener(self, listener: Callable[[str, List[Dict[str, Any]], List[str]], None]) -> None:
+        """Notify ``listener(index_name, changed_documents, deleted_ids)`` after each update."""
+        self.update_listeners.append(listener)
     def update_incremental(self, index_name: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
         self.metrics['start_time'] = datetime.utcnow()
         self.generate_evidence('incremental_update_start', {
@@ -60,6 +64,8 @@ class IncrementalUpdater:
                 'deleted': 0,
                 'unchanged': 0
             }
+            changed_documents = []
+            deleted_ids = []
             doc_lookup = self._fetch_existing_documents(index_name, documents)
             for document in documents:
                 doc_id = document.get('id')
@@ -71,17 +77,25 @@ class IncrementalUpdater:
                     self.client.index_document(index_name, doc_id, document)
                     results['created'] += 1
                     self.metrics['documents_created'] += 1
+                    changed_documents.append(document)
                 elif change_type == 'update':
                     self.client.index_document(index_name, doc_id, document)
                     results['updated'] += 1
                     self.metrics['documents_updated'] += 1
+                    changed_documents.append(document)
                 elif change_type == 'delete':
                     self.client.client.delete(index=index_name, id=doc_id)
                     results['deleted'] += 1
                     self.metrics['documents_deleted'] += 1
+                    deleted_ids.append(doc_id)
                 else:
                     results['unchanged'] += 1
                     self.metrics['unchanged_documents'] += 1
+            for listener in self.update_listeners:
+                try:
+                    listener(index_name, changed_documents, deleted_ids)
+                except Exception as e:
+                    logger.warning(f"Update listener failed: {str(e)}")
             self.generate_evidence('incremental_update_complete', {
                 'index': index_name,
                 'results': results
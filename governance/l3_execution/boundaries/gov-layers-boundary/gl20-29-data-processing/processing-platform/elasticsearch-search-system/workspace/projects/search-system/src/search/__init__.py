@@ -10,4 +10,5 @@
 from .full_text_search import FullTextSearch
 from .faceted_search import FacetedSearch
 from .autocomplete import Autocomplete
-__all__ = ['FullTextSearch', 'FacetedSearch', 'Autocomplete']
\ No newline at end of file
+from .suggestion_index import SuggestionIndex, PrefixResultCache
+__all__ = ['FullTextSearch', 'FacetedSearch', 'Autocomplete', 'SuggestionIndex', 'PrefixResultCache']
\ No newline at end of file
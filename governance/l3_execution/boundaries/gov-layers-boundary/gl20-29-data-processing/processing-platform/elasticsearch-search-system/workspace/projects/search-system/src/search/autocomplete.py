@@ -12,12 +12,13 @@ GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
 # MNGA-002: Import organization needs review
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable
 import logging
 from datetime import datetime
 import hashlib
 import json
 from ..elasticsearch.client import EsClientManager
+from .suggestion_index import SuggestionIndex, PrefixResultCache
 logger = logging.getLogger(__name__)
 class Autocomplete:
     def __init__(self, client: EsClientManager, config: Dict[str, Any]):
@@ -27,10 +28,19 @@ class Autocomplete:
         self.suggestion_fields = config.get('suggestion_fields', ['title', 'tags'])
         self.max_suggestions = config.get('max_suggestions', 10)
         self.source_fields = config.get('source_fields', ['id', 'title', 'type'])
+        self.min_query_length = config.get('min_query_length', 1)
+        self.popularity_field = config.get('popularity_field', 'popularity')
+        self.fallback_on_empty = config.get('fallback_on_empty', True)
+        self.local_indexes: Dict[str, SuggestionIndex] = {}
+        self._generations: Dict[str, int] = {}
+        self.result_cache = PrefixResultCache(config.get('result_cache_size', 1024))
         self.evidence_chain = []
         self.metrics = {
             'queries_performed': 0,
             'suggestions_returned': 0,
+            'cache_hits': 0,
+            'local_index_hits': 0,
+            'es_fallbacks': 0,
             'start_time': None,
             'end_time': None
         }
@@ -45,8 +55,49 @@ class Autocomplete:
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         return evidence_hash
+    def build_local_index(self, index_name: str, documents: Iterable[Dict[str, Any]]) -> int:
+        local_index = SuggestionIndex(self.suggestion_fields, self.source_fields, self.popularity_field)
+        count = local_index.build(documents)
+        self.local_indexes[index_name] = local_index
+        self._bump_generation(index_name)
+        self.generate_evidence('suggestion_index_built', {'index': index_name, 'documents': count})
+        return count
+    def apply_index_updates(self, index_name: str, documents: Iterable[Dict[str, Any]] = (),
+                            deleted_ids: Iterable[str] = ()) -> None:
+        # Cached results of the index go stale either way, local index or not
+        self._bump_generation(index_name)
+        local_index = self.local_indexes.get(index_name)
+        if local_index is None:
+            return
+        local_index.remove(deleted_ids)
+        local_index.upsert(documents)
+    def record_selection(self, index_name: str, doc_id: str) -> None:
+        local_index = self.local_indexes.get(index_name)
+        if local_index is not None:
+            local_index.record_selection(doc_id)
+            self._bump_generation(index_name)
     def suggest(self, index_name: str, query: str) -> List[Dict[str, Any]]:
         self.metrics['queries_performed'] += 1
+        if len(query.strip()) < self.min_query_length:
+            return []
+        cache_key = (index_name, self._generations.get(index_name, 0), ' '.join(query.lower().split()))
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            self.metrics['cache_hits'] += 1
+            self.metrics['suggestions_returned'] += len(cached)
+            return list(cached)
+        local_index = self.local_indexes.get(index_name)
+        if local_index is not None:
+            suggestions = local_index.search(query, self.max_suggestions)
+            if suggestions or not self.fallback_on_empty:
+                self.metrics['local_index_hits'] += 1
+                self.metrics['suggestions_returned'] += len(suggestions)
+                self.result_cache.put(cache_key, suggestions)
+                return list(suggestions)
+        # Elasticsearch results are not cached: nothing tracks when the cluster's documents change
+        self.metrics['es_fallbacks'] += 1
+        return self._suggest_from_elasticsearch(index_name, query)
+    def _suggest_from_elasticsearch(self, index_name: str, query: str) -> List[Dict[str, Any]]:
         query_body = {
             'query': {
                 'bool': {
@@ -90,7 +141,12 @@ class Autocomplete:
             logger.error(f"Autocomplete failed: {str(e)}")
             self.generate_evidence('autocomplete_failed', {'error': str(e)})
             raise
+    def _bump_generation(self, index_name: str) -> None:
+        self._generations[index_name] = self._generations.get(index_name, 0) + 1
     def get_metrics(self) -> Dict[str, Any]:
-        return self.metrics.copy()
+        metrics = self.metrics.copy()
+        metrics['result_cache_size'] = len(self.result_cache)
+        metrics['local_index_documents'] = {name: len(index) for name, index in self.local_indexes.items()}
+        return metrics
     def get_evidence_chain(self) -> List[Dict[str, Any]]:
         return self.evidence_chain
@@ -0,0 +1,212 @@
+# 
+#  @GL-governed
+#  @GL-layer: search
+#  @GL-semantic: suggestion_index
+#  @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+# 
+#  GL Unified Architecture Governance Framework Activated
+# /
+"""
+In-Process Suggestion Index
+GL-Layer: GL30-49 (Execution)
+Closure-Signal: artifact
+"""
+# MNGA-002: Import organization needs review
+from typing import Dict, Any, List, Optional, Iterable, Set, Tuple
+from collections import OrderedDict
+import bisect
+import heapq
+import threading
+class SuggestionIndex:
+    """Sorted-array prefix index over suggestion field values with popularity weights.
+
+    Every word-start of every suggestion field value is a key, so a prefix
+    matches mid-phrase words the way the edge n-gram ``title.suggest`` field does.
+    Prefixes spanning up to ``max_scan`` keys collect candidates from the key
+    range; wider ones walk the documents in weight order and stop after
+    ``limit`` matches. Both are exact.
+    """
+    def __init__(self, suggestion_fields: List[str], source_fields: List[str],
+                 popularity_field: Optional[str] = 'popularity', max_scan: int = 2000,
+                 short_prefix_length: int = 2):
+        self.suggestion_fields = suggestion_fields
+        self.source_fields = source_fields
+        self.popularity_field = popularity_field
+        self.max_scan = max_scan
+        self.short_prefix_length = short_prefix_length
+        self._short_prefix_results: Dict[Tuple[str, int], List[str]] = {}
+        self._keys: List[str] = []
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_keys: Dict[str, Set[str]] = {}
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._weights: Dict[str, float] = {}
+        # (weight, doc_id) ascending, kept in step with _weights; ranked reads it backwards
+        self._by_weight: List[Tuple[float, str]] = []
+        self._lock = threading.RLock()
+    def __len__(self) -> int:
+        return len(self._sources)
+    def build(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Replace the index contents with the given documents in one sort."""
+        with self._lock:
+            self._postings = {}
+            self._doc_keys = {}
+            self._sources = {}
+            self._weights = {}
+            self._short_prefix_results = {}
+            for document in documents:
+                self._add(document, insort=False)
+            self._keys = sorted(self._postings)
+            self._by_weight = sorted((weight, doc_id) for doc_id, weight in self._weights.items())
+            return len(self._sources)
+    def upsert(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Add or replace documents without rebuilding the whole index."""
+        count = 0
+        with self._lock:
+            for document in documents:
+                doc_id = document.get('id')
+                if not doc_id:
+                    continue
+                self._remove(str(doc_id))
+                self._add(document, insort=True)
+                count += 1
+        return count
+    def remove(self, doc_ids: Iterable[str]) -> int:
+        count = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                count += int(self._remove(str(doc_id)))
+        return count
+    def record_selection(self, doc_id: str, boost: float = 1.0) -> None:
+        """Raise a document's popularity weight, e.g. after a click."""
+        with self._lock:
+            if doc_id in self._weights:
+                self._unrank(doc_id)
+                self._weights[doc_id] += boost
+                bisect.insort(self._by_weight, (self._weights[doc_id], doc_id))
+                self._short_prefix_results = {}
+    def search(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """Return the ``limit`` heaviest documents with a word starting with ``prefix``."""
+        prefix = self._normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            # Short prefixes match most of the index; their rankings are kept until the next mutation.
+            memo_key = (prefix, limit)
+            ranked = self._short_prefix_results.get(memo_key) if len(prefix) <= self.short_prefix_length else None
+            if ranked is None:
+                ranked = self._rank(prefix, limit)
+                if len(prefix) <= self.short_prefix_length:
+                    self._short_prefix_results[memo_key] = ranked
+            return [dict(self._sources[doc_id]) for doc_id in ranked]
+    def _rank(self, prefix: str, limit: int) -> List[str]:
+        candidates: Set[str] = set()
+        position = bisect.bisect_left(self._keys, prefix)
+        end = min(len(self._keys), position + self.max_scan)
+        while position < end and self._keys[position].startswith(prefix):
+            candidates.update(self._postings[self._keys[position]])
+            position += 1
+        if position == end and end < len(self._keys) and self._keys[end].startswith(prefix):
+            return self._rank_by_weight(prefix, limit)
+        return heapq.nlargest(limit, candidates, key=lambda doc_id: (self._weights[doc_id], doc_id))
+    def _rank_by_weight(self, prefix: str, limit: int) -> List[str]:
+        """Walk documents heaviest first; a wide prefix matches most of them early."""
+        if limit <= 0:
+            return []
+        ranked = []
+        for _, doc_id in reversed(self._by_weight):
+            if any(key.startswith(prefix) for key in self._doc_keys[doc_id]):
+                ranked.append(doc_id)
+                if len(ranked) >= limit:
+                    break
+        return ranked
+    def _add(self, document: Dict[str, Any], insort: bool) -> None:
+        doc_id = document.get('id')
+        if not doc_id:
+            return
+        doc_id = str(doc_id)
+        keys: Set[str] = set()
+        for field in self.suggestion_fields:
+            for value in self._field_values(document.get(field)):
+                keys.update(self._word_starts(value))
+        if not keys:
+            return
+        self._short_prefix_results = {}
+        for key in keys:
+            postings = self._postings.get(key)
+            if postings is None:
+                postings = self._postings[key] = set()
+                if insort:
+                    bisect.insort(self._keys, key)
+            postings.add(doc_id)
+        self._doc_keys[doc_id] = keys
+        self._sources[doc_id] = {field: document[field] for field in self.source_fields if field in document}
+        weight = document.get(self.popularity_field) if self.popularity_field else None
+        self._weights[doc_id] = float(weight) if isinstance(weight, (int, float)) else 0.0
+        if insort:
+            bisect.insort(self._by_weight, (self._weights[doc_id], doc_id))
+    def _remove(self, doc_id: str) -> bool:
+        keys = self._doc_keys.pop(doc_id, None)
+        if keys is None:
+            return False
+        self._short_prefix_results = {}
+        self._unrank(doc_id)
+        for key in keys:
+            postings = self._postings[key]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[key]
+                position = bisect.bisect_left(self._keys, key)
+                if position < len(self._keys) and self._keys[position] == key:
+                    self._keys.pop(position)
+        self._sources.pop(doc_id, None)
+        self._weights.pop(doc_id, None)
+        return True
+    def _unrank(self, doc_id: str) -> None:
+        entry = (self._weights[doc_id], doc_id)
+        position = bisect.bisect_left(self._by_weight, entry)
+        if position < len(self._by_weight) and self._by_weight[position] == entry:
+            self._by_weight.pop(position)
+    @staticmethod
+    def _field_values(value: Any) -> List[str]:
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple, set)):
+            return [str(item) for item in value if item is not None]
+        return [str(value)]
+    @classmethod
+    def _word_starts(cls, value: str) -> List[str]:
+        words = cls._normalize(value).split(' ')
+        return [' '.join(words[i:]) for i in range(len(words)) if words[i]]
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(text.lower().split())
+class PrefixResultCache:
+    """Bounded LRU of recent prefix results keyed by (index, generation, prefix)."""
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    def get(self, key: Tuple[Any, ...]) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    def put(self, key: Tuple[Any, ...], value: List[Dict[str, Any]]) -> None:
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,48 @@
+# 
+#  @GL-governed
+#  @GL-layer: search
+#  @GL-semantic: test_autocomplete
+#  @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+# 
+#  GL Unified Architecture Governance Framework Activated
+# /
+"""
+Autocomplete Tests
+GL-Layer: GL50-59 (Observability)
+Closure-Signal: evidence
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.search.autocomplete import Autocomplete  # noqa: E402
+class RecordingClient:
+    """Answers every search with the current contents of ``documents``."""
+    def __init__(self):
+        self.documents = []
+        self.searches = 0
+    def search(self, index_name, query_body):
+        self.searches += 1
+        return {'hits': {'hits': [{'_source': dict(document)} for document in self.documents]}}
+def test_elasticsearch_results_are_not_cached():
+    client = RecordingClient()
+    autocomplete = Autocomplete(client, {})
+    client.documents = [{'id': '1', 'title': 'alpha'}]
+    assert autocomplete.suggest('docs', 'al') == [{'id': '1', 'title': 'alpha'}]
+    client.documents.append({'id': '2', 'title': 'alps'})
+    assert [hit['id'] for hit in autocomplete.suggest('docs', 'al')] == ['1', '2']
+    assert client.searches == 2
+def test_updates_invalidate_cache_without_local_index():
+    autocomplete = Autocomplete(RecordingClient(), {})
+    before = autocomplete._generations.get('docs', 0)
+    autocomplete.apply_index_updates('docs', [{'id': '3', 'title': 'alpine'}])
+    assert autocomplete._generations['docs'] == before + 1
+def test_local_index_results_are_cached_until_update():
+    client = RecordingClient()
+    autocomplete = Autocomplete(client, {})
+    autocomplete.build_local_index('docs', [{'id': '1', 'title': 'alpha', 'popularity': 1}])
+    assert [hit['id'] for hit in autocomplete.suggest('docs', 'al')] == ['1']
+    assert [hit['id'] for hit in autocomplete.suggest('docs', 'al')] == ['1']
+    assert autocomplete.metrics['cache_hits'] == 1
+    autocomplete.apply_index_updates('docs', [{'id': '2', 'title': 'alps', 'popularity': 5}])
+    assert [hit['id'] for hit in autocomplete.suggest('docs', 'al')] == ['2', '1']
+    assert client.searches == 0
@@ -0,0 +1,92 @@
+# 
+#  @GL-governed
+#  @GL-layer: search
+#  @GL-semantic: test_suggestion_index
+#  @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+# 
+#  GL Unified Architecture Governance Framework Activated
+# /
+"""
+Suggestion Index Tests
+GL-Layer: GL50-59 (Observability)
+Closure-Signal: evidence
+"""
+import random
+import string
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.search.suggestion_index import SuggestionIndex  # noqa: E402
+def make_documents(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            'id': f'doc-{i}',
+            'title': ' '.join(
+                ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(rng.randint(1, 4))
+            ),
+            'popularity': rng.randint(0, 50)
+        }
+        for i in range(count)
+    ]
+def expected_ids(documents, prefix, limit):
+    matching = [
+        document for document in documents
+        if any(word.startswith(prefix) for word in document['title'].split())
+    ]
+    matching.sort(key=lambda document: (document['popularity'], document['id']), reverse=True)
+    return [document['id'] for document in matching[:limit]]
+def test_wide_prefix_returns_heaviest_documents():
+    documents = make_documents(5000)
+    index = SuggestionIndex(['title'], ['id'], max_scan=2000)
+    index.build(documents)
+    assert len(index._keys) > 2000
+    for prefix in ('a', 'm', 'z', 'ab'):
+        ranked = [hit['id'] for hit in index.search(prefix, 10)]
+        assert ranked == expected_ids(documents, prefix, 10), prefix
+def test_heaviest_matches_beyond_scan_window():
+    # Weight grows with the key, so the heaviest matches sort after the first 2000 keys
+    documents = [{'id': f'doc-{i:05d}', 'title': f'alpha{i:05d}', 'popularity': i} for i in range(3000)]
+    index = SuggestionIndex(['title'], ['id'], max_scan=2000)
+    index.build(documents)
+    assert [hit['id'] for hit in index.search('al', 3)] == ['doc-02999', 'doc-02998', 'doc-02997']
+def test_wide_prefix_follows_weight_changes():
+    documents = make_documents(5000)
+    index = SuggestionIndex(['title'], ['id'], max_scan=2000)
+    index.build(documents)
+    target = expected_ids(documents, 'q', 50)[-1]
+    index.record_selection(target, boost=1000)
+    assert index.search('q', 1)[0]['id'] == target
+    index.upsert([{'id': 'doc-new', 'title': 'quokka', 'popularity': 5000}])
+    assert [hit['id'] for hit in index.search('q', 2)] == ['doc-new', target]
+    index.remove(['doc-new'])
+    assert index.search('q', 1)[0]['id'] == target
+def test_narrow_and_wide_scans_agree():
+    documents = make_documents(3000, seed=11)
+    wide = SuggestionIndex(['title'], ['id'], max_scan=5)
+    narrow = SuggestionIndex(['title'], ['id'], max_scan=10 ** 9)
+    wide.build(documents)
+    narrow.build(documents)
+    for prefix in ('b', 'ca', 'de', 'x', 'zz', 'nomatch'):
+        assert wide.search(prefix, 7) == narrow.search(prefix, 7), prefix
+def test_weight_order_is_maintained_incrementally():
+    documents = {document['id']: document for document in make_documents(2000, seed=3)}
+    index = SuggestionIndex(['title'], ['id'], max_scan=5)
+    index.build(documents.values())
+    rng = random.Random(5)
+    for step in range(300):
+        doc_id = f'doc-{rng.randrange(2000)}'
+        if step % 3 == 0:
+            documents[doc_id] = {'id': doc_id, 'title': 'moved entry', 'popularity': rng.randint(0, 80)}
+            index.upsert([documents[doc_id]])
+        elif step % 3 == 1 and doc_id in documents:
+            boost = rng.randint(1, 20)
+            documents[doc_id] = dict(documents[doc_id], popularity=documents[doc_id]['popularity'] + boost)
+            index.record_selection(doc_id, boost=boost)
+        else:
+            documents.pop(doc_id, None)
+            index.remove([doc_id])
+    assert index._by_weight == sorted((weight, doc_id) for doc_id, weight in index._weights.items())
+    for prefix in ('m', 'e', 'a'):
+        ranked = [hit['id'] for hit in index.search(prefix, 10)]
+        assert ranked == expected_ids(documents.values(), prefix, 10), prefix
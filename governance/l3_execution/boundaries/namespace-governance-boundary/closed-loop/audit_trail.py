@@ -8,17 +8,24 @@ Cryptographic Audit Trail
 - 事件鏈具備防篡改能力
 - 完整的 Provenance（來源追溯）
 - 支援合規查詢（by time, actor, event type）
+
+持久化為追加式 JSONL 分段：每個事件一行，fsync 批次進行；
+分段封存時記錄鏈頭 checkpoint，驗證只需重新計算新事件的 hash。
 """
 
 from __future__ import annotations
 
+import bisect
 import hashlib
+import heapq
 import json
+import os
+import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, IO, Iterable, List, Optional
 
 
 def _utc_now() -> str:
@@ -75,6 +82,49 @@ class AuditEvent:
         d["severity"] = self.severity.value
         return d
 
+    def hashable(self) -> Dict[str, Any]:
+        """參與 hash 計算的欄位"""
+        return {
+            "event_id": self.event_id,
+            "event_type": self.event_type.value,
+            "severity": self.severity.value,
+            "cycle_id": self.cycle_id,
+            "actor": self.actor,
+            "timestamp": self.timestamp,
+            "payload": self.payload,
+            "previous_hash": self.previous_hash,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "AuditEvent":
+        return cls(
+            event_id=d["event_id"],
+            event_type=AuditEventType(d["event_type"]),
+            severity=AuditSeverity(d["severity"]),
+            cycle_id=d["cycle_id"],
+            actor=d["actor"],
+            timestamp=d["timestamp"],
+            payload=d["payload"],
+            event_hash=d["event_hash"],
+            previous_hash=d["previous_hash"],
+        )
+
+
+_SEVERITY_ORDER = [AuditSeverity.DEBUG, AuditSeverity.INFO, AuditSeverity.WARNING,
+                   AuditSeverity.ERROR, AuditSeverity.CRITICAL]
+
+
+@dataclass
+class SegmentCheckpoint:
+    """已封存分段的鏈頭"""
+    segment: int
+    first_event_id: int
+    last_event_id: int
+    head_hash: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
 
 class AuditTrail:
     """
@@ -82,12 +132,50 @@ class AuditTrail:
 
     事件形成密碼學鏈：
       Event_0 -> Event_1 -> Event_2 -> ...
+
+    storage_path 指定時（副檔名忽略），事件追加寫入
+    <stem>.<segment>.jsonl，封存分段的鏈頭寫入 <stem>.checkpoints.json。
+    resume=True 時載入既有分段並續寫；否則開始新追蹤並刪除舊分段
+    （與 StateLockChain 相同）。
     """
 
-    def __init__(self, storage_path: Optional[Path] = None, actor: str = "system"):
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        actor: str = "system",
+        resume: bool = False,
+        segment_size: int = 100_000,
+        fsync_every: int = 256,
+        fsync_interval: float = 1.0,
+    ):
         self._events: List[AuditEvent] = []
-        self._storage_path = storage_path
+        self._storage_path = Path(storage_path) if storage_path is not None else None
         self._default_actor = actor
+        self._segment_size = segment_size
+        self._fsync_every = fsync_every
+        self._fsync_interval = fsync_interval
+
+        # 二級索引：值 -> 遞增的 event_id 列表
+        self._by_cycle: Dict[str, List[int]] = {}
+        self._by_type: Dict[AuditEventType, List[int]] = {}
+        self._by_actor: Dict[str, List[int]] = {}
+        self._by_severity: Dict[AuditSeverity, List[int]] = {}
+        self._timestamps: List[str] = []
+        self._timestamps_sorted = True
+
+        # 增量驗證：[0, _verified_upto) 已驗證
+        self._verified_upto = 0
+        self._checkpoints: List[SegmentCheckpoint] = []
+
+        self._segment_file: Optional[IO[str]] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        if self._storage_path is not None:
+            if resume:
+                self._load()
+            else:
+                self._discard_existing()
 
     @property
     def length(self) -> int:
@@ -107,43 +195,39 @@ class AuditTrail:
         Returns:
             不可變的 AuditEvent（已計算 hash）
         """
-        event_id = len(self._events)
-        previous_hash = self._events[-1].event_hash if self._events else ""
-        timestamp = _utc_now()
-
-        hashable = {
-            "event_id": event_id,
-            "event_type": event_type.value,
-            "severity": severity.value,
-            "cycle_id": cycle_id,
-            "actor": actor or self._default_actor,
-            "timestamp": timestamp,
-            "payload": payload,
-            "previous_hash": previous_hash,
-        }
-        event_hash = _sha3_256(_canonical(hashable))
-
         event = AuditEvent(
-            event_id=event_id,
+            event_id=len(self._events),
             event_type=event_type,
             severity=severity,
             cycle_id=cycle_id,
             actor=actor or self._default_actor,
-            timestamp=timestamp,
+            timestamp=_utc_now(),
             payload=payload,
-            event_hash=event_hash,
-            previous_hash=previous_hash,
+            previous_hash=self._events[-1].event_hash if self._events else "",
         )
+        event.event_hash = _sha3_256(_canonical(event.hashable()))
 
-        self._events.append(event)
-        self._persist()
+        self._append(event)
+        self._persist(event)
         return event
 
-    def verify_integrity(self) -> Dict[str, Any]:
-        """驗證審計鏈完整性"""
+    def verify_integrity(self, full: bool = False) -> Dict[str, Any]:
+        """
+        驗證審計鏈完整性
+
+        預設只重新計算上次驗證之後的事件，並比對各封存分段的鏈頭；
+        full=True 時從 genesis 重新計算全部事件。
+        """
         errors: List[str] = []
 
-        for i, event in enumerate(self._events):
+        for checkpoint in self._checkpoints:
+            last = checkpoint.last_event_id
+            if last >= len(self._events) or self._events[last].event_hash != checkpoint.head_hash:
+                errors.append(f"Segment {checkpoint.segment}: head hash mismatch")
+
+        start = 0 if full else self._verified_upto
+        for i in range(start, len(self._events)):
+            event = self._events[i]
             if event.event_id != i:
                 errors.append(f"Event {i}: event_id mismatch")
 
@@ -154,44 +238,200 @@ class AuditTrail:
                 if event.previous_hash != self._events[i - 1].event_hash:
                     errors.append(f"Event {i}: chain broken (previous_hash mismatch)")
 
-            hashable = {
-                "event_id": event.event_id,
-                "event_type": event.event_type.value,
-                "severity": event.severity.value,
-                "cycle_id": event.cycle_id,
-                "actor": event.actor,
-                "timestamp": event.timestamp,
-                "payload": event.payload,
-                "previous_hash": event.previous_hash,
-            }
-            recomputed = _sha3_256(_canonical(hashable))
+            recomputed = _sha3_256(_canonical(event.hashable()))
             if recomputed != event.event_hash:
                 errors.append(f"Event {i}: hash tampered")
 
+        if not errors:
+            self._verified_upto = len(self._events)
+
         return {
             "valid": len(errors) == 0,
             "errors": errors,
             "total_events": len(self._events),
+            "verified_events": len(self._events) - start,
         }
 
+    def cycle_ids(self) -> List[str]:
+        """已記錄的 cycle_id（依首次出現順序）"""
+        return list(self._by_cycle)
+
     def query_by_cycle(self, cycle_id: str) -> List[Dict[str, Any]]:
-        return [e.to_dict() for e in self._events if e.cycle_id == cycle_id]
+        return self._materialize(self._by_cycle.get(cycle_id, ()))
 
     def query_by_type(self, event_type: AuditEventType) -> List[Dict[str, Any]]:
-        return [e.to_dict() for e in self._events if e.event_type == event_type]
+        return self._materialize(self._by_type.get(event_type, ()))
+
+    def query_by_actor(self, actor: str) -> List[Dict[str, Any]]:
+        return self._materialize(self._by_actor.get(actor, ()))
 
     def query_by_severity(self, min_severity: AuditSeverity) -> List[Dict[str, Any]]:
-        severity_order = [AuditSeverity.DEBUG, AuditSeverity.INFO, AuditSeverity.WARNING,
-                          AuditSeverity.ERROR, AuditSeverity.CRITICAL]
-        min_idx = severity_order.index(min_severity)
-        return [e.to_dict() for e in self._events
-                if severity_order.index(e.severity) >= min_idx]
+        min_idx = _SEVERITY_ORDER.index(min_severity)
+        ids = heapq.merge(*(self._by_severity.get(s, ()) for s in _SEVERITY_ORDER[min_idx:]))
+        return self._materialize(ids)
+
+    def query_by_time_range(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """查詢 start <= timestamp < end 的事件（ISO 8601 UTC 字串）"""
+        if not self._timestamps_sorted:
+            return [e.to_dict() for e in self._events
+                    if (start is None or e.timestamp >= start) and (end is None or e.timestamp < end)]
+        lo = bisect.bisect_left(self._timestamps, start) if start is not None else 0
+        hi = bisect.bisect_left(self._timestamps, end) if end is not None else len(self._events)
+        return [e.to_dict() for e in self._events[lo:hi]]
 
     def export_all(self) -> List[Dict[str, Any]]:
         return [e.to_dict() for e in self._events]
 
-    def _persist(self) -> None:
-        if self._storage_path is not None:
-            self._storage_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._storage_path, "w", encoding="utf-8") as f:
-                json.dump(self.export_all(), f, indent=2, ensure_ascii=False)
+    def export_json(self, path: Path) -> None:
+        """導出為單一 JSON 陣列"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.export_all(), f, indent=2, ensure_ascii=False)
+
+    def sync(self) -> None:
+        """把已寫入但尚未 fsync 的事件落盤"""
+        if self._segment_file is not None and self._unsynced:
+            self._segment_file.flush()
+            os.fsync(self._segment_file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        self.sync()
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+
+    def __enter__(self) -> "AuditTrail":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------
+    # 內部：索引
+    # ------------------------------------------------------------
+
+    def _append(self, event: AuditEvent) -> None:
+        event_id = event.event_id
+        self._events.append(event)
+        self._by_cycle.setdefault(event.cycle_id, []).append(event_id)
+        self._by_type.setdefault(event.event_type, []).append(event_id)
+        self._by_actor.setdefault(event.actor, []).append(event_id)
+        self._by_severity.setdefault(event.severity, []).append(event_id)
+        if self._timestamps and event.timestamp < self._timestamps[-1]:
+            # 時鐘回撥時改用線性掃描，結果仍正確
+            self._timestamps_sorted = False
+        self._timestamps.append(event.timestamp)
+
+    def _materialize(self, event_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self._events[i].to_dict() for i in event_ids]
+
+    # ------------------------------------------------------------
+    # 內部：分段存儲
+    # ------------------------------------------------------------
+
+    def _segment_path(self, segment: int) -> Path:
+        base = self._storage_path.with_suffix("")
+        return base.parent / f"{base.name}.{segment:06d}.jsonl"
+
+    def _checkpoint_path(self) -> Path:
+        base = self._storage_path.with_suffix("")
+        return base.parent / f"{base.name}.checkpoints.json"
+
+    def _load(self) -> None:
+        """載入既有分段；封存分段由 checkpoint 擔保，只驗證未封存的部分"""
+        checkpoint_path = self._checkpoint_path()
+        if checkpoint_path.exists():
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                self._checkpoints = [SegmentCheckpoint(**c) for c in json.load(f)]
+            if self._checkpoints:
+                # 沿用既有分段大小，避免新事件寫入錯誤的分段
+                first = self._checkpoints[0]
+                self._segment_size = first.last_event_id - first.first_event_id + 1
+
+        segment = 0
+        while self._segment_path(segment).exists():
+            with open(self._segment_path(segment), "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        # 最後一行寫入中斷，丟棄並截斷
+                        break
+                    self._append(AuditEvent.from_dict(json.loads(line)))
+            segment += 1
+
+        if segment:
+            self._truncate_partial_line(self._segment_path(segment - 1))
+
+        verified = 0
+        for checkpoint in self._checkpoints:
+            last = checkpoint.last_event_id
+            if last < len(self._events) and self._events[last].event_hash == checkpoint.head_hash:
+                verified = last + 1
+            else:
+                break
+        self._verified_upto = verified
+
+    def _discard_existing(self) -> None:
+        """開始新追蹤：刪除舊分段與 checkpoint"""
+        segment = 0
+        while self._segment_path(segment).exists():
+            self._segment_path(segment).unlink()
+            segment += 1
+        self._checkpoint_path().unlink(missing_ok=True)
+
+    @staticmethod
+    def _truncate_partial_line(path: Path) -> None:
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                f.truncate(end)
+
+    def _persist(self, event: AuditEvent) -> None:
+        if self._storage_path is None:
+            return
+
+        segment, offset = divmod(event.event_id, self._segment_size)
+        if self._segment_file is None or offset == 0:
+            self._open_segment(segment)
+
+        self._segment_file.write(
+            json.dumps(event.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+        self._unsynced += 1
+
+        if offset == self._segment_size - 1:
+            self._seal_segment(segment)
+        elif (self._unsynced >= self._fsync_every
+              or time.monotonic() - self._last_sync >= self._fsync_interval):
+            self.sync()
+
+    def _open_segment(self, segment: int) -> None:
+        if self._segment_file is not None:
+            self.close()
+        path = self._segment_path(segment)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._segment_file = open(path, "a", encoding="utf-8")
+
+    def _seal_segment(self, segment: int) -> None:
+        """封存已滿的分段並記錄鏈頭"""
+        self.close()
+        last_event_id = (segment + 1) * self._segment_size - 1
+        self._checkpoints.append(SegmentCheckpoint(
+            segment=segment,
+            first_event_id=segment * self._segment_size,
+            last_event_id=last_event_id,
+            head_hash=self._events[last_event_id].event_hash,
+        ))
+
+        checkpoint_path = self._checkpoint_path()
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([c.to_dict() for c in self._checkpoints], f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+NG 閉環審計追蹤基準測試
+Audit Trail Append Benchmark
+
+量測分段 JSONL 後端的每筆記錄成本是否隨鏈長保持平穩，
+以及增量驗證與索引查詢的耗時。
+
+用法: python audit_trail_benchmark.py [--events 1000000] [--window 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_BASE = Path(__file__).resolve().parent
+
+
+def _load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_at = _load_module("audit_trail", _BASE / "audit_trail.py")
+AuditTrail = _at.AuditTrail
+AuditEventType = _at.AuditEventType
+AuditSeverity = _at.AuditSeverity
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--window", type=int, default=100_000)
+    parser.add_argument("--segment-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    event_types = list(AuditEventType)
+    with tempfile.TemporaryDirectory() as tmp:
+        audit = AuditTrail(storage_path=Path(tmp) / "audit_trail.jsonl",
+                           actor="benchmark", segment_size=args.segment_size)
+
+        print(f"{'events':>10}  {'us/record':>10}")
+        window_start = time.perf_counter()
+        for i in range(args.events):
+            audit.record(
+                event_types[i % len(event_types)],
+                f"CYC-{i // 1000:04d}",
+                {"index": i},
+                AuditSeverity.ERROR if i % 97 == 0 else AuditSeverity.INFO,
+                actor=f"worker-{i % 8}",
+            )
+            if (i + 1) % args.window == 0:
+                elapsed = time.perf_counter() - window_start
+                print(f"{i + 1:>10}  {elapsed / args.window * 1e6:>10.1f}")
+                window_start = time.perf_counter()
+
+        start = time.perf_counter()
+        result = audit.verify_integrity()
+        print(f"\nfull verification: {time.perf_counter() - start:.2f}s valid={result['valid']}")
+
+        for _ in range(1000):
+            audit.record(AuditEventType.CYCLE_COMPLETED, "CYC-tail", {})
+        start = time.perf_counter()
+        result = audit.verify_integrity()
+        print(f"incremental verification of {result['verified_events']} events: "
+              f"{(time.perf_counter() - start) * 1e3:.1f}ms")
+
+        start = time.perf_counter()
+        hits = len(audit.query_by_cycle("CYC-0500")) + len(audit.query_by_actor("worker-3"))
+        print(f"indexed queries ({hits} rows): {(time.perf_counter() - start) * 1e3:.1f}ms")
+        audit.close()
+
+
+if __name__ == "__main__":
+    main()
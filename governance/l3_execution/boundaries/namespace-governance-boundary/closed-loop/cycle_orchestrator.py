@@ -12,6 +12,7 @@ Cycle Orchestrator - Full Closed-Loop Lifecycle
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -42,6 +43,8 @@ class CycleConfig:
     error_limit: int = 10
     assumptions: List[str] = field(default_factory=list)
     storage_dir: Optional[str] = None
+    # 續接 storage_dir 中既有的狀態鏈與審計追蹤；max_cycles 計入已完成的迴圈
+    resume: bool = False
 
 
 @dataclass
@@ -75,17 +78,20 @@ class CycleOrchestrator:
         storage = Path(config.storage_dir) if config.storage_dir else None
 
         self._state_chain = StateLockChain(
-            storage_path=storage / "state_chain.json" if storage else None
+            storage_path=storage / "state_chain.json" if storage else None,
+            resume=config.resume,
         )
         self._gates = VerificationGateSystem()
         self._decision = DecisionEngine(error_limit=config.error_limit)
         self._cost = CostEvaluator()
         self._audit = AuditTrail(
-            storage_path=storage / "audit_trail.json" if storage else None,
+            storage_path=storage / "audit_trail.jsonl" if storage else None,
             actor="cycle_orchestrator",
+            resume=config.resume,
         )
 
-        self._current_cycle: int = 0
+        # 續接時從審計追蹤恢復迴圈編號，避免重複使用已記錄的 cycle_id
+        self._current_cycle: int = self._next_cycle_number() if config.resume else 0
         self._time_start: Optional[float] = None
         self._resource_consumed: float = 0.0
         self._terminated: bool = False
@@ -114,6 +120,23 @@ class CycleOrchestrator:
         Returns:
             完整的閉環執行報告
         """
+        try:
+            return self._run(
+                initial_parameters, external_constraints,
+                work_fn, metrics_fn, cost_fn, benefit_fn,
+            )
+        finally:
+            self.close()
+
+    def _run(
+        self,
+        initial_parameters: List[CycleParameters],
+        external_constraints: Dict[str, Any],
+        work_fn: Callable[[CycleContext], Dict[str, Any]],
+        metrics_fn: Callable[[int, Any], Dict[str, Any]],
+        cost_fn: Callable[[int, Any], CycleCost],
+        benefit_fn: Callable[[int, Any], CycleBenefit],
+    ) -> Dict[str, Any]:
         import time
 
         self._time_start = time.monotonic()
@@ -285,6 +308,7 @@ class CycleOrchestrator:
                 "audit_chain_valid": audit_integrity["valid"],
             },
         )
+        self._audit.sync()
 
         self._termination_report = {
             "status": "TERMINATED" if self._terminated else "MAX_CYCLES_REACHED",
@@ -306,6 +330,29 @@ class CycleOrchestrator:
 
         return self._termination_report
 
+    def close(self) -> None:
+        """落盤並關閉狀態鏈與審計追蹤（之後的記錄會重新開啟檔案）"""
+        self._state_chain.close()
+        self._audit.close()
+
+    def __enter__(self) -> "CycleOrchestrator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _next_cycle_number(self) -> int:
+        """已使用的最大 CYC-NNNN 編號 + 1"""
+        cycle_ids = self._audit.cycle_ids()
+        if self._state_chain.latest is not None:
+            cycle_ids.append(self._state_chain.latest.cycle_id)
+        used = [
+            int(match.group(1))
+            for match in (re.fullmatch(r"CYC-(\d+)", cycle_id) for cycle_id in cycle_ids)
+            if match
+        ]
+        return max(used) + 1 if used else 0
+
     @property
     def report(self) -> Optional[Dict[str, Any]]:
         return self._termination_report
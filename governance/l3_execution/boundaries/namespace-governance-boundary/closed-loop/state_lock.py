@@ -8,6 +8,9 @@ SHA3-512 不可變狀態鎖定：
 - 鎖定後不可修改、不可覆蓋
 - 後續迴圈必須參照此基準
 - 支援狀態鏈（每輪鎖定指向上一輪）
+
+持久化為追加式 JSONL：每個鎖定一行並 fsync；驗證通過的鏈頭記錄為
+checkpoint，之後只需重新計算新鎖定的 hash。
 """
 
 from __future__ import annotations
@@ -15,10 +18,11 @@ from __future__ import annotations
 import hashlib
 import json
 import copy
+import os
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, IO, List, Optional, Tuple
 
 
 def _utc_now() -> str:
@@ -59,6 +63,21 @@ class StateLock:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    def hashable(self) -> Dict[str, Any]:
+        return {
+            "cycle_id": self.cycle_id,
+            "sequence": self.sequence,
+            "timestamp": self.timestamp,
+            "parent_hash": self.parent_hash,
+            "parameters": self.parameters,
+            "assumptions": self.assumptions,
+            "external_constraints": self.external_constraints,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StateLock":
+        return cls(**data)
+
 
 class StateLockChain:
     """
@@ -67,11 +86,34 @@ class StateLockChain:
     每個迴圈的初始狀態形成不可變鏈：
       Lock_0 -> Lock_1 -> Lock_2 -> ...
     每個鎖定包含指向上一個的 parent_hash。
+
+    storage_path 指定時（副檔名忽略），鎖定追加寫入 <stem>.jsonl，
+    已驗證的鏈頭寫入 <stem>.checkpoint.json。resume=True 時載入既有的鏈
+    （無 .jsonl 時讀取舊版 JSON 陣列）；否則開始新鏈並覆蓋舊檔。
     """
 
-    def __init__(self, storage_path: Optional[Path] = None):
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        resume: bool = False,
+        fsync: bool = True,
+    ):
         self._chain: List[StateLock] = []
-        self._storage_path = storage_path
+        self._storage_path = Path(storage_path) if storage_path is not None else None
+        self._fsync = fsync
+
+        # cycle_id -> sequence
+        self._by_cycle_id: Dict[str, int] = {}
+        # 參數名 -> [(sequence, 參數 dict)]，依序列遞增
+        self._by_parameter: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+
+        # 增量驗證：[0, _verified_upto) 已驗證
+        self._verified_upto = 0
+
+        self._log_file: Optional[IO[str]] = None
+
+        if self._storage_path is not None and resume:
+            self._load()
 
     @property
     def length(self) -> int:
@@ -96,7 +138,7 @@ class StateLockChain:
         Raises:
             ValueError: 如果 cycle_id 已存在
         """
-        if any(lock.cycle_id == cycle_id for lock in self._chain):
+        if cycle_id in self._by_cycle_id:
             raise ValueError(f"Cycle '{cycle_id}' already locked")
 
         parent_hash = self._chain[-1].state_hash if self._chain else None
@@ -129,20 +171,29 @@ class StateLockChain:
             locked=True,
         )
 
-        self._chain.append(lock)
-        self._persist()
+        self._append(lock)
+        self._persist(lock)
         return lock
 
-    def verify_chain_integrity(self) -> Dict[str, Any]:
+    def get_lock(self, cycle_id: str) -> Optional[StateLock]:
+        sequence = self._by_cycle_id.get(cycle_id)
+        return self._chain[sequence] if sequence is not None else None
+
+    def verify_chain_integrity(self, full: bool = False) -> Dict[str, Any]:
         """
-        驗證整條鏈的完整性。
+        驗證鏈的完整性。
+
+        預設只驗證上次驗證通過（或 checkpoint 擔保）之後的鎖定；
+        full=True 時從第一個鎖定重新計算。
 
         Returns:
-            {"valid": bool, "errors": [...], "length": int}
+            {"valid": bool, "errors": [...], "length": int, "verified_locks": int}
         """
         errors: List[str] = []
 
-        for i, lock in enumerate(self._chain):
+        start = 0 if full else self._verified_upto
+        for i in range(start, len(self._chain)):
+            lock = self._chain[i]
             # 1. 驗證序列號
             if lock.sequence != i:
                 errors.append(f"Lock {i}: sequence mismatch (expected {i}, got {lock.sequence})")
@@ -157,23 +208,19 @@ class StateLockChain:
                     errors.append(f"Lock {i}: parent_hash mismatch")
 
             # 3. 重新計算 hash 驗證未被篡改
-            hashable_payload = {
-                "cycle_id": lock.cycle_id,
-                "sequence": lock.sequence,
-                "timestamp": lock.timestamp,
-                "parent_hash": lock.parent_hash,
-                "parameters": lock.parameters,
-                "assumptions": lock.assumptions,
-                "external_constraints": lock.external_constraints,
-            }
-            recomputed = _sha3_512(_canonical_json(hashable_payload))
+            recomputed = _sha3_512(_canonical_json(lock.hashable()))
             if recomputed != lock.state_hash:
                 errors.append(f"Lock {i}: hash tampered (recomputed != stored)")
 
+        if not errors and self._verified_upto != len(self._chain):
+            self._verified_upto = len(self._chain)
+            self._save_checkpoint()
+
         return {
             "valid": len(errors) == 0,
             "errors": errors,
             "length": len(self._chain),
+            "verified_locks": len(self._chain) - start,
         }
 
     def get_parameter_drift(self, param_name: str) -> List[Dict[str, Any]]:
@@ -186,26 +233,23 @@ class StateLockChain:
         drift: List[Dict[str, Any]] = []
         baseline_value: Optional[float] = None
 
-        for lock in self._chain:
-            for p in lock.parameters:
-                if p["name"] == param_name:
-                    value = p["value"]
-                    tolerance = p["tolerance"]
+        for sequence, p in self._by_parameter.get(param_name, ()):
+            value = p["value"]
+            tolerance = p["tolerance"]
 
-                    if baseline_value is None:
-                        baseline_value = value
+            if baseline_value is None:
+                baseline_value = value
 
-                    within = abs(value - baseline_value) <= tolerance
+            within = abs(value - baseline_value) <= tolerance
 
-                    drift.append({
-                        "cycle_id": lock.cycle_id,
-                        "value": value,
-                        "tolerance": tolerance,
-                        "baseline": baseline_value,
-                        "deviation": value - baseline_value,
-                        "within_tolerance": within,
-                    })
-                    break
+            drift.append({
+                "cycle_id": self._chain[sequence].cycle_id,
+                "value": value,
+                "tolerance": tolerance,
+                "baseline": baseline_value,
+                "deviation": value - baseline_value,
+                "within_tolerance": within,
+            })
 
         return drift
 
@@ -213,8 +257,119 @@ class StateLockChain:
         """導出完整鏈（用於審計）"""
         return [lock.to_dict() for lock in self._chain]
 
-    def _persist(self) -> None:
-        if self._storage_path is not None:
-            self._storage_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._storage_path, "w", encoding="utf-8") as f:
-                json.dump(self.export_chain(), f, indent=2, ensure_ascii=False)
+    def sync(self) -> None:
+        """把已寫入的鎖定落盤"""
+        if self._log_file is not None:
+            self._log_file.flush()
+            os.fsync(self._log_file.fileno())
+
+    def close(self) -> None:
+        if self._log_file is not None:
+            self.sync()
+            self._log_file.close()
+            self._log_file = None
+
+    def __enter__(self) -> "StateLockChain":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------
+    # 內部：索引
+    # ------------------------------------------------------------
+
+    def _append(self, lock: StateLock) -> None:
+        sequence = len(self._chain)
+        self._chain.append(lock)
+        self._by_cycle_id.setdefault(lock.cycle_id, sequence)
+        seen = set()
+        for p in lock.parameters:
+            # 同名參數只取第一個
+            if p["name"] not in seen:
+                seen.add(p["name"])
+                self._by_parameter.setdefault(p["name"], []).append((sequence, p))
+
+    # ------------------------------------------------------------
+    # 內部：追加式存儲
+    # ------------------------------------------------------------
+
+    def _log_path(self) -> Path:
+        return self._storage_path.with_suffix(".jsonl")
+
+    def _checkpoint_path(self) -> Path:
+        base = self._storage_path.with_suffix("")
+        return base.parent / f"{base.name}.checkpoint.json"
+
+    def _load(self) -> None:
+        """載入既有的鏈；checkpoint 之前的鎖定在鏈頭相符時視為已驗證"""
+        log_path = self._log_path()
+        if log_path.exists():
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        # 最後一行寫入中斷，丟棄並截斷
+                        break
+                    self._append(StateLock.from_dict(json.loads(line)))
+            self._truncate_partial_line(log_path)
+        elif self._storage_path.suffix == ".json" and self._storage_path.exists():
+            # 舊版格式：整條鏈為單一 JSON 陣列，轉存為 JSONL
+            with open(self._storage_path, "r", encoding="utf-8") as f:
+                for data in json.load(f):
+                    self._append(StateLock.from_dict(data))
+            for lock in self._chain:
+                self._persist(lock)
+
+        checkpoint_path = self._checkpoint_path()
+        if checkpoint_path.exists():
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            length = checkpoint["length"]
+            if 0 < length <= len(self._chain) and self._chain[length - 1].state_hash == checkpoint["head_hash"]:
+                self._verified_upto = length
+
+    @staticmethod
+    def _truncate_partial_line(path: Path) -> None:
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                f.truncate(end)
+
+    def _persist(self, lock: StateLock) -> None:
+        if self._storage_path is None:
+            return
+
+        if self._log_file is None:
+            log_path = self._log_path()
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            # 新鏈覆蓋舊檔；載入的鏈從其結尾續寫
+            mode = "a" if lock.sequence > 0 else "w"
+            self._log_file = open(log_path, mode, encoding="utf-8")
+            if mode == "w":
+                self._checkpoint_path().unlink(missing_ok=True)
+
+        self._log_file.write(
+            json.dumps(lock.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+        if self._fsync:
+            self.sync()
+        else:
+            self._log_file.flush()
+
+    def _save_checkpoint(self) -> None:
+        """記錄已驗證的鏈頭"""
+        if self._storage_path is None or not self._chain:
+            return
+
+        checkpoint_path = self._checkpoint_path()
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "length": self._verified_upto,
+                "head_hash": self._chain[self._verified_upto - 1].state_hash,
+            }, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
@@ -124,6 +124,65 @@ def test_parameter_drift_tracking():
     print("  [PASS] Parameter drift tracking detects in/out of tolerance")
 
 
+def test_state_chain_persistence():
+    """狀態鏈追加式持久化、續載與增量驗證"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "state_chain.json"
+        with StateLockChain(storage_path=path) as chain:
+            for i in range(4):
+                params = [CycleParameters(name="accuracy", value=0.90 + i * 0.01, tolerance=0.05)]
+                chain.lock_initial_state(f"CYC-{i}", params, ["A"], {})
+            first = chain.verify_chain_integrity()
+            assert first["valid"] and first["verified_locks"] == 4
+            chain.lock_initial_state("CYC-4", [CycleParameters(name="latency", value=40.0, tolerance=5.0)], ["A"], {})
+            assert chain.verify_chain_integrity()["verified_locks"] == 1
+
+        assert sorted(p.name for p in Path(tmp).iterdir()) == [
+            "state_chain.checkpoint.json", "state_chain.jsonl",
+        ]
+
+        with StateLockChain(storage_path=path, resume=True) as resumed:
+            assert resumed.length == 5
+            assert resumed.get_lock("CYC-2").sequence == 2
+            # checkpoint 擔保之前的鎖定，只需驗證新鎖定
+            lock = resumed.lock_initial_state("CYC-5", [CycleParameters(name="accuracy", value=1.2, tolerance=0.05)], ["A"], {})
+            assert lock.parent_hash == resumed.get_lock("CYC-4").state_hash
+            result = resumed.verify_chain_integrity()
+            assert result["valid"] and result["verified_locks"] == 1
+            drift = resumed.get_parameter_drift("accuracy")
+            assert [d["cycle_id"] for d in drift] == ["CYC-0", "CYC-1", "CYC-2", "CYC-3", "CYC-5"]
+            assert not drift[-1]["within_tolerance"]
+            try:
+                resumed.lock_initial_state("CYC-1", [], [], {})
+                assert False, "Duplicate cycle id should be rejected"
+            except ValueError:
+                pass
+
+            resumed._chain[1].parameters[0]["value"] = 0.5
+            tampered = resumed.verify_chain_integrity(full=True)
+            assert not tampered["valid"]
+            assert tampered["errors"] == ["Lock 1: hash tampered (recomputed != stored)"]
+
+        # 檔案內被改寫的鎖定同樣由完整驗證發現
+        log_path = Path(tmp) / "state_chain.jsonl"
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert '"value":0.92' in lines[2]
+        lines[2] = lines[2].replace('"value":0.92', '"value":0.5')
+        log_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        with StateLockChain(storage_path=path, resume=True) as reloaded:
+            assert not reloaded.verify_chain_integrity(full=True)["valid"]
+
+        # 未指定 resume 時開始新鏈
+        with StateLockChain(storage_path=path) as fresh:
+            fresh.lock_initial_state("CYC-0", [], [], {})
+        assert len((Path(tmp) / "state_chain.jsonl").read_text(encoding="utf-8").splitlines()) == 1
+        assert not (Path(tmp) / "state_chain.checkpoint.json").exists()
+
+    print("  [PASS] State chain appends to JSONL and resumes with checkpointed verification")
+
+
 # ============================================================
 # Test 2: Verification Gates
 # ============================================================
@@ -291,6 +350,89 @@ def test_audit_query():
     print("  [PASS] Audit queries by cycle and severity work")
 
 
+def test_audit_segment_persistence():
+    """審計分段持久化、重新載入與增量驗證"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "audit_trail.jsonl"
+        with AuditTrail(storage_path=path, segment_size=4, fsync_every=2) as audit:
+            for i in range(10):
+                audit.record(AuditEventType.COST_RECORDED, f"CYC-{i % 3}", {"i": i},
+                             actor="worker-a" if i % 2 else "worker-b")
+            first = audit.verify_integrity()
+            assert first["valid"] and first["verified_events"] == 10
+            audit.record(AuditEventType.CYCLE_COMPLETED, "CYC-9", {})
+            assert audit.verify_integrity()["verified_events"] == 1
+
+        assert sorted(p.name for p in Path(tmp).iterdir()) == [
+            "audit_trail.000000.jsonl", "audit_trail.000001.jsonl",
+            "audit_trail.000002.jsonl", "audit_trail.checkpoints.json",
+        ]
+
+        reloaded = AuditTrail(storage_path=path, segment_size=4, resume=True)
+        assert reloaded.length == 11
+        # 兩個封存分段由 checkpoint 擔保，只需重新計算未封存的 3 個事件
+        result = reloaded.verify_integrity()
+        assert result["valid"] and result["verified_events"] == 3
+        assert len(reloaded.query_by_actor("worker-a")) == 5
+        assert len(reloaded.query_by_cycle("CYC-1")) == 3
+
+        reloaded._events[2].payload["i"] = 99
+        assert not reloaded.verify_integrity(full=True)["valid"]
+        reloaded.close()
+
+    print("  [PASS] Audit segments reload with checkpointed incremental verification")
+
+
+def test_audit_resume_default():
+    """審計追蹤與狀態鏈預設重新開始，resume=True 時續接"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audit_path = Path(tmp) / "audit_trail.jsonl"
+        chain_path = Path(tmp) / "state_chain.json"
+        params = [CycleParameters(name="accuracy", value=0.95, tolerance=0.05)]
+        with AuditTrail(storage_path=audit_path, segment_size=2) as audit, \
+                StateLockChain(storage_path=chain_path) as chain:
+            for i in range(3):
+                audit.record(AuditEventType.CYCLE_STARTED, f"CYC-{i:04d}", {})
+                chain.lock_initial_state(f"CYC-{i:04d}", params, [], {})
+
+        with AuditTrail(storage_path=audit_path, resume=True) as audit, \
+                StateLockChain(storage_path=chain_path, resume=True) as chain:
+            assert audit.cycle_ids() == ["CYC-0000", "CYC-0001", "CYC-0002"]
+            assert chain.length == 3
+
+        with AuditTrail(storage_path=audit_path) as audit, \
+                StateLockChain(storage_path=chain_path) as chain:
+            assert audit.length == 0 and chain.length == 0
+            audit.record(AuditEventType.CYCLE_STARTED, "CYC-0000", {})
+            chain.lock_initial_state("CYC-0000", params, [], {})
+
+        with AuditTrail(storage_path=audit_path, resume=True) as audit, \
+                StateLockChain(storage_path=chain_path, resume=True) as chain:
+            assert audit.length == 1 and audit.verify_integrity(full=True)["valid"]
+            assert chain.length == 1 and chain.verify_chain_integrity(full=True)["valid"]
+
+    print("  [PASS] Audit trail and state chain share the fresh-start default")
+
+
+def test_audit_time_range_query():
+    """審計時間範圍查詢"""
+    audit = AuditTrail()
+    for i in range(5):
+        audit.record(AuditEventType.CYCLE_STARTED, f"CYC-{i}", {})
+    events = audit.export_all()
+    start, end = events[2]["timestamp"], events[4]["timestamp"]
+    expected = [e["event_id"] for e in events if start <= e["timestamp"] < end]
+    assert [e["event_id"] for e in audit.query_by_time_range(start, end)] == expected
+    assert 2 in [e["event_id"] for e in audit.query_by_time_range(start)]
+    assert audit.query_by_time_range(end="0000") == []
+    assert len(audit.query_by_time_range()) == 5
+    print("  [PASS] Audit time range query uses timestamp order")
+
+
 # ============================================================
 # Test 6: Full Integration - Closed-Loop Cycle
 # ============================================================
@@ -362,6 +504,7 @@ def run_all_tests():
         ("1.1 State Lock Reproducibility", test_state_lock_reproducibility),
         ("1.2 State Chain Integrity", test_state_chain_integrity),
         ("1.3 Parameter Drift Tracking", test_parameter_drift_tracking),
+        ("1.4 State Chain Persistence", test_state_chain_persistence),
         ("2.1 Verification Gates Pass", test_verification_gates_pass),
         ("2.2 Layer 0 Non-bypassable", test_verification_layer0_cannot_bypass),
         ("2.3 Upper Layers Log-and-Continue", test_verification_upper_layers_log_and_continue),
@@ -372,6 +515,9 @@ def run_all_tests():
         ("4.1 Cost Evaluator ROI", test_cost_evaluator_roi),
         ("5.1 Audit Trail Integrity", test_audit_trail_integrity),
         ("5.2 Audit Queries", test_audit_query),
+        ("5.3 Audit Segment Persistence", test_audit_segment_persistence),
+        ("5.4 Audit Time Range Query", test_audit_time_range_query),
+        ("5.5 Audit Resume Default", test_audit_resume_default),
         ("6.1 Full Closed-Loop Integration", test_full_closed_loop),
     ]
 
@@ -18,14 +18,21 @@ import json
 import logging
 import importlib.util
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 NG_ROOT = SCRIPT_DIR.parent
 
+# Import dependency scheduler
+scheduler_spec = importlib.util.spec_from_file_location(
+    "ng_dependency_scheduler", SCRIPT_DIR / "ng-dependency-scheduler.py"
+)
+ng_dependency_scheduler = importlib.util.module_from_spec(scheduler_spec)
+scheduler_spec.loader.exec_module(ng_dependency_scheduler)
+DependencyScheduler = ng_dependency_scheduler.DependencyScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,26 +52,35 @@ class BatchTask:
 class NgBatchExecutor:
     """NG 批次執行器"""
 
-    def __init__(self, batch_id: str = "batch-1", max_workers: int = 4):
+    def __init__(
+        self,
+        batch_id: str = "batch-1",
+        max_workers: Optional[int] = None,
+        log_every: int = 1000,
+    ):
         """
         初始化批次執行器
 
         Args:
             batch_id: 批次 ID (batch-1 到 batch-5)
-            max_workers: 最大並行工作線程數
+            max_workers: 最大並行工作線程數，預設依 CPU 數自適應
+            log_every: 每完成多少個任務輸出一次進度
         """
         self.batch_id = batch_id
-        self.max_workers = max_workers
+        self.scheduler = DependencyScheduler(
+            max_workers=max_workers, log_every=log_every, logger=logger
+        )
+        self.max_workers = self.scheduler.max_workers
         self.tasks: List[BatchTask] = []
         self.execution_start = None
         self.execution_end = None
 
-        logger.info(f"🎯 批次執行器已初始化: {batch_id} (workers={max_workers})")
+        logger.info(f"🎯 批次執行器已初始化: {batch_id} (workers≤{self.max_workers})")
 
     def add_task(self, task: BatchTask):
         """添加批次任務"""
         self.tasks.append(task)
-        logger.info(f"📝 添加任務: {task.task_type} → {task.target}")
+        logger.debug(f"📝 添加任務: {task.task_type} → {task.target}")
 
     def add_tasks_from_config(self, config_path: str):
         """從配置文件添加任務"""
@@ -136,9 +152,14 @@ class NgBatchExecutor:
         return results
 
     def execute_parallel(self) -> Dict[str, Any]:
-        """並行執行所有任務"""
+        """
+        並行執行所有任務
+
+        觸及相同、祖先/後代命名空間或 params["depends_on"] 的任務按添加順序執行，
+        其餘任務並行；結果按添加順序返回。
+        """
         logger.info(
-            f"🚀 開始並行執行: {len(self.tasks)} 個任務 (workers={self.max_workers})"
+            f"🚀 開始並行執行: {len(self.tasks)} 個任務 (workers≤{self.max_workers})"
         )
 
         self.execution_start = datetime.now()
@@ -152,32 +173,18 @@ class NgBatchExecutor:
             "tasks": [],
         }
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 提交所有任務
-            future_to_task = {
-                executor.submit(self._execute_single_task, task): task
-                for task in self.tasks
-            }
-
-            # 收集結果
-            for future in as_completed(future_to_task):
-                result = future.result()
-                results["tasks"].append(result)
-
-                if result["status"] == "completed":
-                    results["completed"] += 1
-                elif result["status"] == "failed":
-                    results["failed"] += 1
-
-                # 顯示進度
-                progress = (
-                    (results["completed"] + results["failed"])
-                    / results["total_tasks"]
-                    * 100
-                )
-                logger.info(
-                    f"📊 進度: {progress:.1f}% ({results['completed'] + results['failed']}/{results['total_tasks']})"
-                )
+        results["tasks"] = self.scheduler.run(
+            self.tasks,
+            execute=self._execute_single_task,
+            keys_of=lambda task: [task.target, *task.params.get("depends_on", [])],
+            kind_of=lambda task: task.task_type,
+            label="任務",
+        )
+        for result in results["tasks"]:
+            if result["status"] == "completed":
+                results["completed"] += 1
+            elif result["status"] == "failed":
+                results["failed"] += 1
 
         self.execution_end = datetime.now()
         duration = (self.execution_end - self.execution_start).total_seconds()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+NG 依賴感知調度器
+NG Dependency-Aware Scheduler
+
+NG Code: NG00003
+Purpose: NgExecutor 與 NgBatchExecutor 共用的並行調度
+
+- 依命名空間關係建立依賴圖：相同命名空間、祖先/後代命名空間
+  按提交順序執行，其餘操作可並行
+- 自適應工作者：耗時極短的操作類型直接在調度線程執行，
+  其餘交給按需擴張的線程池
+- 批量日誌：逐項訊息降為 DEBUG，進度每 log_every 項彙總一次
+"""
+
+import heapq
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+
+def namespace_ancestors(namespace_id: str) -> List[str]:
+    """命名空間的所有祖先前綴（a.b.c → a, a.b）"""
+    parts = namespace_id.split(".")
+    return [".".join(parts[:i]) for i in range(1, len(parts))]
+
+
+def build_dependency_graph(
+    keys: Sequence[Iterable[str]], barriers: Optional[Sequence[bool]] = None
+) -> List[Set[int]]:
+    """
+    建立依賴圖
+
+    項目 i 依賴於所有在它之前、且與它觸及相同命名空間或
+    祖先/後代命名空間的項目。只記錄必要的邊（同一命名空間上的
+    操作串成鏈），圖的大小與項目數成線性。
+
+    Args:
+        keys: 每個項目觸及的命名空間
+        barriers: 為 True 的項目與前後所有項目串行
+
+    Returns:
+        每個項目的前驅集合
+    """
+    last_exact: Dict[str, int] = {}
+    # 祖先前綴 → 自該前綴上次被直接觸及以來，觸及其後代的項目
+    under_prefix: Dict[str, List[int]] = {}
+    predecessors: List[Set[int]] = []
+    since_barrier: List[int] = []
+    last_barrier: Optional[int] = None
+
+    for index, item_keys in enumerate(keys):
+        preds: Set[int] = set()
+
+        if barriers is not None and barriers[index]:
+            preds.update(since_barrier)
+            if last_barrier is not None:
+                preds.add(last_barrier)
+            predecessors.append(preds)
+            last_barrier = index
+            since_barrier = []
+            continue
+
+        if last_barrier is not None:
+            preds.add(last_barrier)
+
+        item_keys = set(item_keys)
+        for key in item_keys:
+            if key in last_exact:
+                preds.add(last_exact[key])
+            preds.update(under_prefix.get(key, ()))
+            for ancestor in namespace_ancestors(key):
+                if ancestor in last_exact:
+                    preds.add(last_exact[ancestor])
+
+        for key in item_keys:
+            last_exact[key] = index
+            under_prefix[key] = []
+            for ancestor in namespace_ancestors(key):
+                under_prefix.setdefault(ancestor, []).append(index)
+
+        preds.discard(index)
+        predecessors.append(preds)
+        since_barrier.append(index)
+
+    return predecessors
+
+
+class DependencyScheduler:
+    """依賴感知的並行調度器"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        inline_threshold_ms: float = 0.5,
+        log_every: int = 1000,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        初始化調度器
+
+        Args:
+            max_workers: 線程池上限，預設 min(32, CPU 數 + 4)
+            inline_threshold_ms: 平均耗時低於此值的操作類型在調度線程內執行
+            log_every: 每完成多少項輸出一次進度
+            logger: 進度日誌使用的 logger
+        """
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.inline_threshold_ms = inline_threshold_ms
+        self.log_every = max(1, log_every)
+        self.logger = logger or logging.getLogger(__name__)
+
+        # 各操作類型的平均耗時（指數移動平均，毫秒）
+        self._avg_ms: Dict[str, float] = {}
+        self.stats = {
+            "items": 0,
+            "inline": 0,
+            "threaded": 0,
+            "max_parallel": 0,
+            "edges": 0,
+        }
+
+    def run(
+        self,
+        items: Sequence[Any],
+        execute: Callable[[Any], Any],
+        keys_of: Callable[[Any], Iterable[str]],
+        kind_of: Callable[[Any], str] = lambda item: "default",
+        is_barrier: Optional[Callable[[Any], bool]] = None,
+        on_complete: Optional[Callable[[Any, Any], None]] = None,
+        label: str = "操作",
+    ) -> List[Any]:
+        """
+        按依賴圖執行所有項目
+
+        就緒項目按原始順序（索引）出隊；on_complete 在調度線程內
+        依完成順序調用，不需要加鎖。
+
+        Returns:
+            與 items 對應順序的執行結果
+        """
+        total = len(items)
+        if total == 0:
+            return []
+
+        barriers = [is_barrier(item) for item in items] if is_barrier else None
+        predecessors = build_dependency_graph(
+            [keys_of(item) for item in items], barriers
+        )
+        dependents: List[List[int]] = [[] for _ in range(total)]
+        remaining = [len(preds) for preds in predecessors]
+        for index, preds in enumerate(predecessors):
+            self.stats["edges"] += len(preds)
+            for pred in preds:
+                dependents[pred].append(index)
+
+        ready = [index for index in range(total) if remaining[index] == 0]
+        heapq.heapify(ready)
+        results: List[Any] = [None] * total
+        inflight: Dict[Future, int] = {}
+        completed = 0
+        started_at = time.perf_counter()
+        pool: Optional[ThreadPoolExecutor] = None
+
+        def finish(index: int, result: Any, elapsed_ms: float):
+            nonlocal completed
+            results[index] = result
+            kind = kind_of(items[index])
+            previous = self._avg_ms.get(kind)
+            self._avg_ms[kind] = (
+                elapsed_ms if previous is None else previous * 0.8 + elapsed_ms * 0.2
+            )
+            for dependent in dependents[index]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+            completed += 1
+            if on_complete is not None:
+                on_complete(items[index], result)
+            if completed % self.log_every == 0 or completed == total:
+                elapsed = time.perf_counter() - started_at
+                self.logger.info(
+                    f"📊 進度: {completed / total * 100:.1f}% ({completed}/{total} "
+                    f"{label}, {completed / elapsed if elapsed else 0:.0f}/s)"
+                )
+
+        def timed(item: Any):
+            start = time.perf_counter()
+            result = execute(item)
+            return result, (time.perf_counter() - start) * 1000
+
+        try:
+            while ready or inflight:
+                while ready:
+                    index = ready[0]
+                    kind = kind_of(items[index])
+                    average = self._avg_ms.get(kind)
+                    # 首次出現的類型先在本線程測量耗時
+                    if average is None or average < self.inline_threshold_ms:
+                        heapq.heappop(ready)
+                        result, elapsed_ms = timed(items[index])
+                        self.stats["inline"] += 1
+                        finish(index, result, elapsed_ms)
+                        continue
+                    if len(inflight) >= self.max_workers:
+                        break
+                    heapq.heappop(ready)
+                    if pool is None:
+                        pool = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="ng-scheduler",
+                        )
+                    inflight[pool.submit(timed, items[index])] = index
+                    self.stats["threaded"] += 1
+                    self.stats["max_parallel"] = max(
+                        self.stats["max_parallel"], len(inflight)
+                    )
+
+                if not inflight:
+                    continue
+
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = inflight.pop(future)
+                    result, elapsed_ms = future.result()
+                    finish(index, result, elapsed_ms)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        self.stats["items"] += total
+        return results
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+NG 執行引擎基準測試
+NG Executor Benchmark
+
+在臨時目錄生成合成註冊表（預設 12000 個命名空間，含父子層級），
+比較舊版串行執行（逐項 INFO 日誌 + 全量閉環掃描）與依賴圖並行執行的吞吐量。
+
+用法: python core/ng-executor-benchmark.py [--namespaces N] [--archive-ratio R]
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+spec = importlib.util.spec_from_file_location("ng_executor", SCRIPT_DIR / "ng-executor.py")
+ng_executor_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ng_executor_module)
+
+NgExecutor = ng_executor_module.NgExecutor
+NgOperation = ng_executor_module.NgOperation
+OperationType = ng_executor_module.OperationType
+ExecutionPriority = ng_executor_module.ExecutionPriority
+NgNamespaceRegistry = ng_executor_module.NgNamespaceRegistry
+NamespaceSpec = ng_executor_module.NamespaceSpec
+Era = ng_executor_module.Era
+
+logger = ng_executor_module.logger
+
+
+def build_registry(path: Path, count: int) -> "NgNamespaceRegistry":
+    """生成合成註冊表：每 50 個組件共用一個領域父命名空間"""
+    registry = NgNamespaceRegistry(str(path), durable=False, compact_every=10**9)
+    specs = []
+    domains = max(1, count // 50)
+    for d in range(domains):
+        specs.append(
+            NamespaceSpec(
+                namespace_id=f"pkg.era1.domain{d}",
+                namespace_type="package",
+                era=Era.ERA_1,
+                domain=f"domain{d}",
+                component="root",
+                owner="bench",
+                description="",
+            )
+        )
+    for i in range(count - domains):
+        d = i % domains
+        specs.append(
+            NamespaceSpec(
+                namespace_id=f"pkg.era1.domain{d}.component{i}",
+                namespace_type="package",
+                era=Era.ERA_1,
+                domain=f"domain{d}",
+                component=f"component{i}",
+                owner="bench",
+                description="",
+            )
+        )
+    registry.register_many(specs, verbose=False)
+    return registry
+
+
+def build_operations(registry, archive_ratio: float):
+    """每個命名空間一個驗證與審計操作，部分命名空間歸檔"""
+    operations = []
+    namespace_ids = [record.spec.namespace_id for record in registry.namespaces.values()]
+    archive_every = int(1 / archive_ratio) if archive_ratio > 0 else 0
+    for i, namespace_id in enumerate(namespace_ids):
+        operations.append(
+            NgOperation(
+                operation_id=f"validate-{uuid.uuid4()}",
+                operation_type=OperationType.VALIDATE,
+                priority=ExecutionPriority.HIGH,
+                target_namespaces=[namespace_id],
+                parameters={},
+            )
+        )
+        operations.append(
+            NgOperation(
+                operation_id=f"audit-{uuid.uuid4()}",
+                operation_type=OperationType.AUDIT,
+                priority=ExecutionPriority.MANDATORY,
+                target_namespaces=[namespace_id],
+                parameters={},
+            )
+        )
+        if archive_every and i % archive_every == 0:
+            operations.append(
+                NgOperation(
+                    operation_id=f"archive-{uuid.uuid4()}",
+                    operation_type=OperationType.ARCHIVE,
+                    priority=ExecutionPriority.MANDATORY,
+                    target_namespaces=[namespace_id],
+                    parameters={},
+                )
+            )
+    return operations
+
+
+def legacy_execute_all(executor, operations):
+    """改版前的 execute_all：逐項執行、逐項 INFO 日誌、全量閉環掃描"""
+    for operation in sorted(operations, key=lambda x: x.priority.value):
+        logger.info(
+            f"▶️  執行: {operation.operation_type.value} "
+            f"[優先級={operation.priority.value}] [ZERO_TOLERANCE_MODE]"
+        )
+        result = executor.execute_operation(operation)
+        if result.status == "success":
+            logger.info(
+                f"✅ 完成: {operation.operation_type.value} [ZERO_TOLERANCE_PASS]"
+            )
+    executor.check_closure(full=True)
+
+
+def run(label, namespaces, archive_ratio, fn):
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = build_registry(Path(tmp) / "namespaces.json", namespaces)
+        executor = NgExecutor(registry=registry)
+        operations = build_operations(registry, archive_ratio)
+        start = time.perf_counter()
+        fn(executor, operations)
+        elapsed = time.perf_counter() - start
+        registry.close()
+    print(
+        f"{label:<28} {len(operations):>7} ops  {elapsed:7.2f}s  "
+        f"{len(operations) / elapsed:9,.0f} ops/s  {executor.scheduler.stats}"
+    )
+    return executor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--namespaces", type=int, default=12000)
+    parser.add_argument("--archive-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    # 日誌寫入 devnull：保留格式化成本而不污染輸出
+    handler = logging.StreamHandler(open(os.devnull, "w", encoding="utf-8"))
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)-8s | %(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
+    run("legacy serial", args.namespaces, args.archive_ratio, legacy_execute_all)
+
+    def dependency_graph(executor, operations):
+        for operation in operations:
+            executor.submit_operation(operation)
+        executor.execute_all()
+
+    executor = run("dependency graph", args.namespaces, args.archive_ratio, dependency_graph)
+
+    start = time.perf_counter()
+    executor.check_closure()
+    incremental_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    executor.check_closure(full=True)
+    full_ms = (time.perf_counter() - start) * 1000
+    print(f"check_closure: incremental {incremental_ms:.2f}ms, full {full_ms:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,21 +19,29 @@ import sys
 import json
 import yaml
 import logging
+import threading
+import importlib.util
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Set
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
 # Add parent directories to path
 SCRIPT_DIR = Path(__file__).resolve().parent
 NG_ROOT = SCRIPT_DIR.parent
 
+# Import dependency scheduler
+scheduler_spec = importlib.util.spec_from_file_location(
+    "ng_dependency_scheduler", SCRIPT_DIR / "ng-dependency-scheduler.py"
+)
+ng_dependency_scheduler = importlib.util.module_from_spec(scheduler_spec)
+scheduler_spec.loader.exec_module(ng_dependency_scheduler)
+DependencyScheduler = ng_dependency_scheduler.DependencyScheduler
+
 # Import registry module
 registry_path = NG_ROOT / "registry" / "namespace-registry.py"
 if registry_path.exists():
-    import importlib.util
-
     spec = importlib.util.spec_from_file_location("namespace_registry", registry_path)
     namespace_registry_module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(namespace_registry_module)
@@ -135,6 +143,8 @@ class NgOperation:
     parameters: Dict[str, Any]
     batch_id: Optional[str] = None
     era_scope: Optional[Era] = None
+    # 額外依賴的命名空間：本操作排在觸及這些命名空間的先前操作之後
+    depends_on: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict:
         """轉換為字典"""
@@ -146,6 +156,7 @@ class NgOperation:
             "parameters": self.parameters,
             "batch_id": self.batch_id,
             "era_scope": self.era_scope.value if self.era_scope else None,
+            "depends_on": self.depends_on,
         }
 
 
@@ -171,12 +182,31 @@ class NgExecutor:
     """
     NG 命名空間治理執行引擎
 
-    最高權重執行器，負責統一執行所有 NG 治理操作
+    最高權重執行器，負責統一執行所有 NG 治理操作。
+    execute_all 依命名空間關係（相同、祖先/後代、spec.metadata["depends_on"]
+    與 NgOperation.depends_on）建立依賴圖，互不相關的操作並行執行。
     """
 
-    def __init__(self, registry_path: str = "registry/namespaces.json"):
-        """初始化執行引擎"""
-        self.registry = NgNamespaceRegistry(registry_path)
+    # 讀取全局統計或遞歸執行的操作類型，與前後操作串行
+    BARRIER_OPERATIONS = {OperationType.MONITOR, OperationType.OPTIMIZE, OperationType.CLOSURE}
+
+    def __init__(
+        self,
+        registry_path: str = "registry/namespaces.json",
+        max_workers: Optional[int] = None,
+        log_every: int = 1000,
+        registry: Optional[NgNamespaceRegistry] = None,
+    ):
+        """
+        初始化執行引擎
+
+        Args:
+            registry_path: 註冊表路徑
+            max_workers: 並行工作線程上限，預設依 CPU 數自適應
+            log_every: 每完成多少個操作輸出一次進度
+            registry: 直接使用已載入的註冊表
+        """
+        self.registry = registry or NgNamespaceRegistry(registry_path)
         self.operations_queue: List[NgOperation] = []
         self.execution_history: List[ExecutionResult] = []
         self.closure_state = {
@@ -184,6 +214,16 @@ class NgExecutor:
             "closure_complete": False,
             "pending_operations": [],
         }
+        self.scheduler = DependencyScheduler(
+            max_workers=max_workers, log_every=log_every, logger=logger
+        )
+        # 註冊表寫入與全表遍歷需互斥
+        self._registry_lock = threading.RLock()
+
+        # 增量閉環: 記錄 ID → 待處理操作；_closure_dirty 為需重新檢查的記錄
+        self._closure_pending: Dict[str, List[NgOperation]] = {}
+        self._closure_known: Set[str] = set()
+        self._closure_dirty: Set[str] = set()
 
         # 操作處理器註冊表
         self.operation_handlers: Dict[OperationType, Callable] = {
@@ -202,7 +242,7 @@ class NgExecutor:
     def submit_operation(self, operation: NgOperation) -> str:
         """提交操作到執行隊列"""
         self.operations_queue.append(operation)
-        logger.info(
+        logger.debug(
             f"📝 提交操作: {operation.operation_type.value} "
             f"[優先級={operation.priority.value}, ID={operation.operation_id}]"
         )
@@ -218,18 +258,25 @@ class NgExecutor:
         Returns:
             執行結果列表
         """
-        logger.info(f"🎯 開始執行 {len(self.operations_queue)} 個操作...")
-
-        # 按優先級排序
-        sorted_ops = sorted(self.operations_queue, key=lambda x: x.priority.value)
-
-        results = []
-        for operation in sorted_ops:
-            result = self.execute_operation(operation)
-            results.append(result)
+        # 取出當前隊列；閉環操作遞歸提交的新操作進入新隊列
+        pending, self.operations_queue = self.operations_queue, []
+        logger.info(f"🎯 開始執行 {len(pending)} 個操作...")
+
+        # 按優先級排序（穩定排序，同優先級保持提交順序）
+        sorted_ops = sorted(pending, key=lambda x: x.priority.value)
+
+        results = self.scheduler.run(
+            sorted_ops,
+            execute=self.execute_operation,
+            keys_of=self._operation_keys,
+            kind_of=lambda op: op.operation_type.value,
+            is_barrier=lambda op: op.operation_type in self.BARRIER_OPERATIONS,
+            on_complete=self._mark_closure_dirty,
+        )
 
-        # 清空隊列
-        self.operations_queue.clear()
+        failed = sum(1 for r in results if r.status != "success")
+        if failed:
+            logger.warning(f"⚠️  {failed}/{len(results)} 個操作失敗")
 
         # 自動閉環檢查
         if auto_closure:
@@ -243,6 +290,26 @@ class NgExecutor:
         logger.info(f"✅ 執行完成: {len(results)} 個操作")
         return results
 
+    def _operation_keys(self, operation: NgOperation) -> List[str]:
+        """操作觸及的命名空間（含宣告的依賴），記錄 ID 轉為規範 namespace_id"""
+        keys = list(operation.depends_on)
+        for namespace_id in operation.target_namespaces:
+            record = self.registry.get_namespace(namespace_id)
+            if record is None:
+                keys.append(namespace_id)
+                continue
+            keys.append(record.spec.namespace_id)
+            if record.spec.metadata:
+                keys.extend(record.spec.metadata.get("depends_on", ()))
+        return keys
+
+    def _mark_closure_dirty(self, operation: NgOperation, result: ExecutionResult):
+        """操作完成後標記目標命名空間需重新檢查閉環"""
+        for namespace_id in operation.target_namespaces:
+            record = self.registry.get_namespace(namespace_id)
+            if record is not None:
+                self._closure_dirty.add(record.id)
+
     def execute_operation(self, operation: NgOperation) -> ExecutionResult:
         """
         執行單個操作（零容忍模式）
@@ -260,7 +327,7 @@ class NgExecutor:
         # 零容忍：檢查執行時間
         timeout_ms = 100  # 100ms 超時限制
 
-        logger.info(
+        logger.debug(
             f"▶️  執行: {operation.operation_type.value} "
             f"[優先級={operation.priority.value}] [ZERO_TOLERANCE_MODE]"
         )
@@ -316,7 +383,7 @@ class NgExecutor:
                 }
             )
 
-            logger.info(
+            logger.debug(
                 f"✅ 完成: {operation.operation_type.value} [ZERO_TOLERANCE_PASS]"
             )
 
@@ -406,7 +473,8 @@ class NgExecutor:
                     description=params.get("description", ""),
                 )
 
-                ns_id = self.registry.register_namespace(spec)
+                with self._registry_lock:
+                    ns_id = self.registry.register_namespace(spec)
                 results["registered"].append(ns_id)
 
             except Exception as e:
@@ -470,7 +538,8 @@ class NgExecutor:
         results = {"monitored": [], "metrics": {}, "alerts": []}
 
         # 收集統計
-        stats = self.registry.get_statistics()
+        with self._registry_lock:
+            stats = self.registry.get_statistics()
         results["metrics"] = stats
 
         # 檢查健康狀況
@@ -625,7 +694,8 @@ class NgExecutor:
         results = {"optimized": [], "recommendations": []}
 
         # 分析命名空間使用模式
-        stats = self.registry.get_statistics()
+        with self._registry_lock:
+            stats = self.registry.get_statistics()
 
         # 生成優化建議
         if stats["total"] > 1000:
@@ -656,9 +726,10 @@ class NgExecutor:
 
         for namespace_id in operation.target_namespaces:
             try:
-                success = self.registry.update_namespace_status(
-                    namespace_id, NamespaceStatus.ARCHIVED, actor="ng-executor"
-                )
+                with self._registry_lock:
+                    success = self.registry.update_namespace_status(
+                        namespace_id, NamespaceStatus.ARCHIVED, actor="ng-executor"
+                    )
 
                 if success:
                     results["archived"].append(namespace_id)
@@ -693,57 +764,93 @@ class NgExecutor:
 
         return closure_check
 
-    def check_closure(self) -> Dict[str, Any]:
+    def check_closure(self, full: bool = False) -> Dict[str, Any]:
         """
         檢查治理閉環完整性
 
+        增量模式只重新檢查新註冊的記錄與本執行器操作過的記錄；
+        註冊表在執行器之外被修改狀態時，使用 full=True 全量重建。
+
+        Args:
+            full: 是否重新掃描所有命名空間
+
         Returns:
             閉環狀態和待處理操作
         """
+        with self._registry_lock:
+            if full:
+                self._closure_pending.clear()
+                self._closure_known.clear()
+                self._closure_dirty.clear()
+            namespaces = self.registry.namespaces
+            # 新記錄（包含執行器之外註冊的）
+            new_ids = namespaces.keys() - self._closure_known
+            removed_ids = self._closure_known - namespaces.keys()
+            self._closure_known.update(new_ids)
+            self._closure_known.difference_update(removed_ids)
+            for record_id in removed_ids:
+                self._closure_pending.pop(record_id, None)
+            for record_id in new_ids | self._closure_dirty:
+                record = namespaces.get(record_id)
+                if record is None:
+                    continue
+                pending = self._closure_operations(record)
+                if pending:
+                    self._closure_pending[record_id] = pending
+                else:
+                    self._closure_pending.pop(record_id, None)
+            self._closure_dirty.clear()
+
+        pending_operations = [
+            op for ops in self._closure_pending.values() for op in ops
+        ]
         closure_state = {
             "timestamp": datetime.now().isoformat(),
-            "closure_complete": True,
-            "pending_operations": [],
-            "closure_metrics": {},
+            "closure_complete": not pending_operations,
+            "pending_operations": pending_operations,
+            "closure_metrics": {
+                "namespaces": len(self._closure_known),
+                "pending_namespaces": len(self._closure_pending),
+            },
         }
 
-        # 檢查所有命名空間的生命週期狀態
-        all_namespaces = self.registry.list_namespaces()
-
-        for record in all_namespaces:
-            # 檢查是否需要驗證
-            if record.status == NamespaceStatus.REGISTERED:
-                # 應該進行初始驗證
-                closure_state["closure_complete"] = False
-                closure_state["pending_operations"].append(
-                    NgOperation(
-                        operation_id=f"validate-{record.id}",
-                        operation_type=OperationType.VALIDATE,
-                        priority=ExecutionPriority.HIGH,
-                        target_namespaces=[record.id],
-                        parameters={},
-                    )
-                )
-
-            # 檢查是否需要審計
-            if not record.audit_trail or len(record.audit_trail) < 1:
-                closure_state["closure_complete"] = False
-                closure_state["pending_operations"].append(
-                    NgOperation(
-                        operation_id=f"audit-{record.id}",
-                        operation_type=OperationType.AUDIT,
-                        priority=ExecutionPriority.MEDIUM,
-                        target_namespaces=[record.id],
-                        parameters={},
-                    )
-                )
-
         # 更新閉環狀態
         self.closure_state = closure_state
         self.closure_state["last_closure_check"] = datetime.now().isoformat()
 
         return closure_state
 
+    def _closure_operations(self, record: NamespaceRecord) -> List[NgOperation]:
+        """單一命名空間尚未完成的閉環操作"""
+        operations = []
+
+        # 檢查是否需要驗證
+        if record.status == NamespaceStatus.REGISTERED:
+            # 應該進行初始驗證
+            operations.append(
+                NgOperation(
+                    operation_id=f"validate-{record.id}",
+                    operation_type=OperationType.VALIDATE,
+                    priority=ExecutionPriority.HIGH,
+                    target_namespaces=[record.id],
+                    parameters={},
+                )
+            )
+
+        # 檢查是否需要審計
+        if not record.audit_trail or len(record.audit_trail) < 1:
+            operations.append(
+                NgOperation(
+                    operation_id=f"audit-{record.id}",
+                    operation_type=OperationType.AUDIT,
+                    priority=ExecutionPriority.MANDATORY,
+                    target_namespaces=[record.id],
+                    parameters={},
+                )
+            )
+
+        return operations
+
     def execute_batch(self, batch_id: str, era: Era = None) -> Dict[str, Any]:
         """
         執行批次操作
@@ -1067,7 +1174,7 @@ if __name__ == "__main__":
     monitor_op = NgOperation(
         operation_id=str(uuid.uuid4()),
         operation_type=OperationType.MONITOR,
-        priority=ExecutionPriority.MEDIUM,
+        priority=ExecutionPriority.MANDATORY,
         target_namespaces=["pkg.era1.test.demo"],
         parameters={},
     )
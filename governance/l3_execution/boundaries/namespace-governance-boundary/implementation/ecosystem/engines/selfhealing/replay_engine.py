@@ -13,11 +13,20 @@ import os
 import shutil
 import tempfile
 import subprocess
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from pickle import PicklingError
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+# A file whose mtime is this close to when it was hashed may be rewritten
+# within the same timestamp tick, so its cached digest is not trusted
+RACY_WINDOW_NS = 2_000_000_000
+
 
 @dataclass
 class ReplayResult:
@@ -47,6 +56,102 @@ class VerificationResult:
     verified_at: str
 
 
+class SnapshotCache:
+    """
+    Content-addressed cache of parsed JSON evidence files
+
+    A file is identified by (path, size, mtime_ns) -> sha256 of its bytes,
+    and each distinct content is parsed once, so decisions that reference
+    the same snapshot files share one parsed object. Parsed objects are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        # path -> (size, mtime_ns, recorded_ns, digest)
+        self._digests: Dict[str, Tuple[int, int, int, str]] = {}
+        # digest -> parsed JSON, least recently used first
+        self._parsed: "OrderedDict[str, Any]" = OrderedDict()
+        self.reads = 0
+        self.parses = 0
+
+    def digest(self, path: str) -> Optional[str]:
+        """
+        Content digest of a file, re-read only if its stat changed
+
+        Returns:
+            Hex sha256 or None if the file does not exist
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        entry = self._digests.get(path)
+        if (
+            entry is not None
+            and entry[0] == stat.st_size
+            and entry[1] == stat.st_mtime_ns
+            and entry[1] < entry[2] - RACY_WINDOW_NS
+        ):
+            return entry[3]
+        return self._read(path, stat)
+
+    def load(self, path: str) -> Any:
+        """
+        Parsed JSON content of a file
+
+        Returns:
+            Parsed content or None if the file does not exist
+        """
+        digest = self.digest(path)
+        if digest is None:
+            return None
+        if digest in self._parsed:
+            self._parsed.move_to_end(digest)
+            return self._parsed[digest]
+        # Parsed content was evicted; read it again
+        digest = self._read(path, os.stat(path))
+        return self._parsed[digest]
+
+    def _read(self, path: str, stat: os.stat_result) -> str:
+        recorded_ns = time.time_ns()
+        with open(path, "rb") as f:
+            data = f.read()
+        self.reads += 1
+
+        digest = hashlib.sha256(data).hexdigest()
+        self._digests[path] = (stat.st_size, stat.st_mtime_ns, recorded_ns, digest)
+        if digest not in self._parsed:
+            self._parsed[digest] = json.loads(data)
+            self.parses += 1
+            while len(self._parsed) > self.max_entries:
+                self._parsed.popitem(last=False)
+        return digest
+
+
+# Engine of a batch replay worker process, set by _init_replay_worker
+_worker_engine: Optional["ReplayEngine"] = None
+
+
+def _init_replay_worker(engine_class: type, workspace_root: str):
+    """Create the worker-local engine (and its snapshot cache) once"""
+    global _worker_engine
+    _worker_engine = engine_class(workspace_root=workspace_root)
+
+
+def _replay_chunk(decision_ids: List[str]) -> List[Tuple[str, Any, Any]]:
+    """Replay a contiguous chunk of decisions in a worker process"""
+    results = []
+    for decision_id in decision_ids:
+        try:
+            key, result = _worker_engine._replay(decision_id)
+            results.append((decision_id, key, result))
+        except Exception as e:
+            results.append((decision_id, None, str(e)))
+    return results
+
+
 class ReplayEngine:
     """
     Self-Healing Decision Replay Engine
@@ -67,6 +172,13 @@ class ReplayEngine:
         self.traces_root = os.path.join(self.evidence_root, "selfhealing", "traces")
         self.tests_root = os.path.join(self.evidence_root, "tests", "selfhealing")
 
+        # Parsed decisions, snapshots and traces, keyed by content hash
+        self.snapshot_cache = SnapshotCache()
+
+        # decision_id -> (input digests, ReplayResult); reused by
+        # verify_replay and the replayability tests
+        self._replay_memo: Dict[str, Tuple[Tuple, ReplayResult]] = {}
+
         # Ensure directories exist
         self._ensure_directories()
 
@@ -97,12 +209,7 @@ class ReplayEngine:
             Decision artifact or None if not found
         """
         decision_path = os.path.join(self.decisions_root, f"{decision_id}.json")
-
-        if not os.path.exists(decision_path):
-            return None
-
-        with open(decision_path, "r") as f:
-            return json.load(f)
+        return self.snapshot_cache.load(decision_path)
 
     def load_input_snapshot(self, snapshot_refs: Dict[str, str]) -> Dict[str, Any]:
         """
@@ -118,12 +225,7 @@ class ReplayEngine:
 
         for snapshot_type, file_path in snapshot_refs.items():
             full_path = os.path.join(self.evidence_root, "selfhealing", file_path)
-
-            if os.path.exists(full_path):
-                with open(full_path, "r") as f:
-                    snapshots[snapshot_type] = json.load(f)
-            else:
-                snapshots[snapshot_type] = None
+            snapshots[snapshot_type] = self.snapshot_cache.load(full_path)
 
         return snapshots
 
@@ -152,13 +254,40 @@ class ReplayEngine:
         Returns:
             ReplayResult with output_action, execution_trace, metrics
         """
-        start_time = datetime.now(timezone.utc)
+        return self._replay(decision_id)[1]
+
+    def _replay(self, decision_id: str) -> Tuple[Tuple, ReplayResult]:
+        """
+        Replay a decision, memoized on the content of its inputs
 
+        Returns:
+            (memo key, ReplayResult)
+        """
         # Load decision
-        decision = self.load_decision(decision_id)
-        if decision is None:
+        decision_path = os.path.join(self.decisions_root, f"{decision_id}.json")
+        decision_digest = self.snapshot_cache.digest(decision_path)
+        if decision_digest is None:
             raise ValueError(f"Decision {decision_id} not found")
 
+        # The result is reused while the decision and its snapshots are unchanged
+        snapshot_refs = self.snapshot_cache.load(decision_path)["input_snapshot"]
+        key = (decision_digest,) + tuple(
+            (
+                snapshot_type,
+                self.snapshot_cache.digest(
+                    os.path.join(self.evidence_root, "selfhealing", file_path)
+                ),
+            )
+            for snapshot_type, file_path in sorted(snapshot_refs.items())
+        )
+        memo = self._replay_memo.get(decision_id)
+        if memo is not None and memo[0] == key:
+            return memo
+
+        start_time = datetime.now(timezone.utc)
+
+        decision = self.load_decision(decision_id)
+
         # Load input snapshot
         inputs = self.load_input_snapshot(decision["input_snapshot"])
 
@@ -178,7 +307,7 @@ class ReplayEngine:
             }
         )
 
-        return ReplayResult(
+        result = ReplayResult(
             decision_id=decision_id,
             output_action=replayed_action,
             action_parameters=replayed_parameters,
@@ -189,34 +318,55 @@ class ReplayEngine:
             engine_hash=decision["engine_hash"],
             canonical_hash=canonical_hash,
         )
+        self._replay_memo[decision_id] = (key, result)
+        return key, result
 
-    def replay_batch(self, decision_ids: List[str]) -> Dict[str, Any]:
+    def replay_batch(
+        self, decision_ids: List[str], workers: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        Replay multiple decisions in sequence
+        Replay multiple decisions, in sequence or in worker processes
 
         Args:
             decision_ids: List of decision UUIDs to replay
+            workers: Worker processes (None or 1 replays in-process). Each
+                worker keeps its own snapshot cache; decisions are sent in
+                contiguous chunks so neighbouring decisions share it.
 
         Returns:
             BatchReplayResult with individual results and aggregate metrics
         """
+        started = time.perf_counter()
+        outcomes = None
+        if workers and workers > 1 and len(decision_ids) > 1:
+            outcomes = self._replay_parallel(decision_ids, workers)
+        if outcomes is None:
+            outcomes = []
+            for decision_id in decision_ids:
+                try:
+                    outcomes.append((decision_id,) + self._replay(decision_id))
+                except Exception as e:
+                    outcomes.append((decision_id, None, str(e)))
+
         results = []
         total_duration_ms = 0.0
         successful = 0
         failed = 0
 
-        for decision_id in decision_ids:
-            try:
-                result = self.replay_decision(decision_id)
+        for decision_id, key, result in outcomes:
+            if key is not None:
+                self._replay_memo[decision_id] = (key, result)
                 results.append(result)
                 total_duration_ms += result.duration_ms
                 successful += 1
-            except Exception as e:
+            else:
                 results.append(
-                    {"decision_id": decision_id, "error": str(e), "success": False}
+                    {"decision_id": decision_id, "error": result, "success": False}
                 )
                 failed += 1
 
+        wall_time_ms = (time.perf_counter() - started) * 1000
+
         return {
             "total_decisions": len(decision_ids),
             "successful": successful,
@@ -225,9 +375,44 @@ class ReplayEngine:
             "average_duration_ms": (
                 total_duration_ms / len(decision_ids) if decision_ids else 0
             ),
+            "wall_time_ms": wall_time_ms,
+            "decisions_per_second": (
+                len(decision_ids) / (wall_time_ms / 1000) if wall_time_ms else 0.0
+            ),
             "results": results,
         }
 
+    def _replay_parallel(
+        self, decision_ids: List[str], workers: int
+    ) -> Optional[List[Tuple[str, Any, Any]]]:
+        """
+        Replay decisions in a process pool
+
+        Returns:
+            (decision_id, memo key or None, ReplayResult or error) in input
+            order, or None if a process pool cannot be used here
+        """
+        chunk_count = workers * 4
+        chunk_size = max(1, (len(decision_ids) + chunk_count - 1) // chunk_count)
+        chunks = [
+            decision_ids[i : i + chunk_size]
+            for i in range(0, len(decision_ids), chunk_size)
+        ]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_replay_worker,
+                initargs=(type(self), self.workspace_root),
+            ) as pool:
+                return [
+                    outcome
+                    for chunk in pool.map(_replay_chunk, chunks)
+                    for outcome in chunk
+                ]
+        except (BrokenProcessPool, PicklingError, OSError):
+            # e.g. the engine was loaded from a path that workers cannot import
+            return None
+
     def verify_replay(self, decision_id: str) -> VerificationResult:
         """
         Verify that replay matches original decision
@@ -240,13 +425,11 @@ class ReplayEngine:
         """
         start_time = datetime.now(timezone.utc)
 
+        # Replay decision (memoized)
+        replay_result = self.replay_decision(decision_id)
+
         # Load original decision
         original_decision = self.load_decision(decision_id)
-        if original_decision is None:
-            raise ValueError(f"Decision {decision_id} not found")
-
-        # Replay decision
-        replay_result = self.replay_decision(decision_id)
 
         # Verify output match
         output_match = (
@@ -335,12 +518,8 @@ class ReplayEngine:
             Execution trace or empty list if not found
         """
         full_path = os.path.join(self.evidence_root, "selfhealing", trace_path)
-
-        if os.path.exists(full_path):
-            with open(full_path, "r") as f:
-                return json.load(f)
-
-        return []
+        trace = self.snapshot_cache.load(full_path)
+        return trace if trace is not None else []
 
     def generate_test_result(self, decision_id: str) -> Dict[str, Any]:
         """
@@ -494,6 +673,9 @@ if __name__ == "__main__":
     parser.add_argument(
         "--batch", type=str, nargs="+", help="Multiple decision IDs to replay"
     )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes for --batch"
+    )
     parser.add_argument(
         "--workspace", type=str, default="/workspace", help="Workspace root"
     )
@@ -526,12 +708,13 @@ if __name__ == "__main__":
         print(f"   Duration: {result['summary']['total_duration_ms']}ms")
 
     elif args.batch:
-        result = engine.replay_batch(args.batch)
+        result = engine.replay_batch(args.batch, workers=args.workers)
         print(f"✅ Batch replay completed")
         print(f"   Total: {result['total_decisions']}")
         print(f"   Successful: {result['successful']}")
         print(f"   Failed: {result['failed']}")
         print(f"   Duration: {result['total_duration_ms']}ms")
+        print(f"   Throughput: {result['decisions_per_second']:.1f} decisions/sec")
 
     else:
         parser.print_help()
@@ -27,19 +27,35 @@ This module is part of the GL governance framework.
 Please add specific module documentation here.
 """
 # MNGA-002: Import organization needs review
+import base64
+import codecs
 import hashlib
 import hmac
 import json
+import os
 import platform
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Set
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
 import logging
 
 
+UTF8_BOM = b"\xef\xbb\xbf"
+
+# 每次讀取的塊大小；取3的倍數，使分塊base64可直接拼接
+DEFAULT_CHUNK_SIZE = 3 * 256 * 1024
+
+# mtime 距離記錄時間過近的條目不可信（同一時間刻內可能再次修改）
+RACY_WINDOW_NS = 2_000_000_000
+
+REGISTRY_VERSION = 1
+
+
 class HashAlgorithm(Enum):
     """哈希算法"""
 
@@ -122,6 +138,138 @@ class HashValidation:
     reproducibility_score: float = 0.0  # 0-100
 
 
+def _scan_stream(
+    stream: BinaryIO,
+    normalize: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    capture_content: bool = False,
+) -> Dict[str, Any]:
+    """
+    單次分塊掃描：標準化、SHA-256/SHA3-256與缺陷檢測共用同一次讀取
+
+    記憶體上限約為一個塊（加上未結束行的行尾空白）；
+    capture_content 時另保留原始內容的base64。
+
+    Args:
+        stream: 二進位輸入流
+        normalize: 是否標準化（同 _normalize_content）
+        chunk_size: 每次讀取的字節數
+        capture_content: 是否輸出原始內容的base64
+
+    Returns:
+        {sha256, sha3_256, size, raw_size, defects[, content_base64]}
+    """
+    chunk_size = max(3, chunk_size - chunk_size % 3)
+    sha256 = hashlib.sha256()
+    sha3_256 = hashlib.sha3_256()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    encoded: List[bytes] = []
+
+    size = 0
+    raw_size = 0
+    pending = b""  # 未結束行的行尾空白，行結束時丟棄
+    encoding_error: Optional[str] = None
+    has_null = False
+    lf_count = 0
+    crlf_count = 0
+    previous_cr = False
+    bom = False
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+
+        offset = raw_size
+        raw_size += len(chunk)
+
+        # ---- 缺陷檢測（原始字節）
+        if offset == 0:
+            bom = chunk.startswith(UTF8_BOM)
+        if encoding_error is None:
+            buffered = len(decoder.getstate()[0])
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError as e:
+                encoding_error = _encoding_error(e, offset - buffered)
+        has_null = has_null or b"\x00" in chunk
+        lf_count += chunk.count(b"\n")
+        crlf_count += chunk.count(b"\r\n")
+        if previous_cr and chunk.startswith(b"\n"):
+            crlf_count += 1
+        previous_cr = chunk.endswith(b"\r")
+        if capture_content:
+            encoded.append(base64.b64encode(chunk))
+
+        # ---- 標準化並哈希
+        if normalize:
+            if offset == 0 and bom:
+                chunk = chunk[len(UTF8_BOM) :]
+            lines = (pending + chunk if pending else chunk).split(b"\n")
+            tail = lines.pop()
+            kept = tail.rstrip()
+            pending = tail[len(kept) :]
+            if lines:
+                body = b"\n".join([line.rstrip() for line in lines])
+                pieces = (body, b"\n", kept)
+            else:
+                pieces = (kept,)
+        else:
+            pieces = (chunk,)
+        for piece in pieces:
+            sha256.update(piece)
+            sha3_256.update(piece)
+            size += len(piece)
+
+    if encoding_error is None:
+        buffered = len(decoder.getstate()[0])
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            encoding_error = _encoding_error(e, raw_size - buffered)
+
+    defects = []
+    if encoding_error:
+        defects.append(
+            {"type": "encoding_issue", "severity": "high", "message": encoding_error}
+        )
+    if has_null:
+        defects.append(
+            {"type": "null_bytes", "severity": "medium", "message": "包含NULL字節"}
+        )
+    if crlf_count and lf_count > crlf_count:
+        defects.append(
+            {
+                "type": "mixed_line_endings",
+                "severity": "medium",
+                "message": "混合使用CRLF和LF",
+            }
+        )
+    if bom:
+        defects.append(
+            {"type": "bom_present", "severity": "low", "message": "包含UTF-8 BOM"}
+        )
+
+    result = {
+        "sha256": sha256.hexdigest(),
+        "sha3_256": sha3_256.hexdigest(),
+        "size": size,
+        "raw_size": raw_size,
+        "defects": defects,
+    }
+    if capture_content:
+        result["content_base64"] = b"".join(encoded).decode("ascii")
+    return result
+
+
+def _encoding_error(error: UnicodeDecodeError, offset: int) -> str:
+    """以文件內的絕對位置描述編碼錯誤"""
+    return (
+        f"編碼錯誤: '{error.encoding}' codec can't decode position "
+        f"{offset + error.start}: {error.reason}"
+    )
+
+
 class SHAIntegritySystem:
     """SHA完整性系統"""
 
@@ -138,6 +286,16 @@ class SHAIntegritySystem:
         # 平台上下文緩存
         self._platform_context = self._detect_platform_context()
 
+        # 持久化掃描註冊表: {絕對路徑: 掃描結果 + (大小, mtime)}
+        # 路徑、大小、mtime 均未變的文件直接取用，不再讀取與哈希
+        # 單文件調用只標記變更；由 save_registry()/close() 或批次操作統一寫盤
+        self.registry_path = self.config.get("registry_path")
+        self.chunk_size = self.config.get("chunk_size", DEFAULT_CHUNK_SIZE)
+        self._scan_registry: Dict[str, Dict] = {}
+        self._scan_registry_dirty = False
+        if self.registry_path:
+            self._load_scan_registry()
+
         # 標準化配置
         self.max_depth = 3  # 最大依賴深度
         self.enable_blockchain = False  # 區塊鏈錨定
@@ -182,7 +340,7 @@ class SHAIntegritySystem:
     # ═══════════════════════════════════════════════════════════════════
 
     def compute_stable_hash(
-        self, file_path: Path, normalize: bool = True
+        self, file_path: Path, normalize: bool = True, use_registry: bool = False
     ) -> HashRecord:
         """
         計算穩定的SHA值（跨平台一致）
@@ -192,43 +350,81 @@ class SHAIntegritySystem:
         Args:
             file_path: 文件路徑
             normalize: 是否標準化
+            use_registry: 是否信任註冊表（大小、mtime 可被偽造，驗證時必須為 False）
 
         Returns:
             哈希記錄
         """
-        # 讀取文件
-        with open(file_path, "rb") as f:
-            content = f.read()
-
-        # 標準化處理
-        if normalize:
-            content = self._normalize_content(content)
-
-        # 計算多種哈希（防碰撞）
-        sha256 = hashlib.sha256(content).hexdigest()
-        sha3_256 = hashlib.sha3_256(content).hexdigest()
+        # 分塊串流：標準化與多種哈希（防碰撞）一次完成
+        scan, _ = self._scan_file(file_path, normalize, use_registry=use_registry)
 
-        # 創建記錄
-        record = HashRecord(
-            sha256=sha256,
-            sha3_256=sha3_256,
-            file_path=str(file_path),
-            file_size=len(content),
-            context=self._platform_context,
-            created_by=f"{self._platform_context.platform}-{self._platform_context.architecture}",
-        )
-
-        # 註冊
+        # 創建並註冊記錄
+        record = self._record_from_scan(file_path, scan)
         self._register_hash(record)
 
         self.logger.debug(
             f"Stable hash computed: {file_path.name}\n"
-            f"  SHA256: {sha256[:16]}...\n"
-            f"  Size: {len(content)} bytes"
+            f"  SHA256: {record.sha256[:16]}...\n"
+            f"  Size: {record.file_size} bytes"
         )
 
         return record
 
+    def _scan_file(
+        self,
+        file_path: Path,
+        normalize: bool = True,
+        capture_content: bool = False,
+        use_registry: bool = False,
+    ) -> Tuple[Dict, bool]:
+        """
+        掃描文件（use_registry 時優先取用持久化註冊表；結果總會寫回註冊表）
+
+        Returns:
+            (掃描結果, 是否來自註冊表)
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        entry = self._scan_registry.get(key)
+        if (
+            use_registry
+            and entry is not None
+            and not capture_content
+            and entry["normalize"] == normalize
+            and entry["file_size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["mtime_ns"] < entry["recorded_ns"] - RACY_WINDOW_NS
+        ):
+            return entry, True
+
+        recorded_ns = time.time_ns()
+        with open(file_path, "rb") as f:
+            scan = _scan_stream(f, normalize, self.chunk_size, capture_content)
+
+        # 讀取期間被修改的文件不入表
+        if scan["raw_size"] == stat.st_size:
+            entry = {k: v for k, v in scan.items() if k != "content_base64"}
+            entry.update(
+                normalize=normalize,
+                file_size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                recorded_ns=recorded_ns,
+            )
+            self._scan_registry[key] = entry
+            self._scan_registry_dirty = True
+        return scan, False
+
+    def _record_from_scan(self, file_path: Path, scan: Dict) -> HashRecord:
+        """由掃描結果創建哈希記錄"""
+        return HashRecord(
+            sha256=scan["sha256"],
+            sha3_256=scan["sha3_256"],
+            file_path=str(file_path),
+            file_size=scan["size"],
+            context=self._platform_context,
+            created_by=f"{self._platform_context.platform}-{self._platform_context.architecture}",
+        )
+
     def _normalize_content(self, content: bytes) -> bytes:
         """
         標準化內容（確保跨平台一致）
@@ -236,21 +432,16 @@ class SHAIntegritySystem:
         處理：
         - 移除BOM
         - 統一換行符為LF
-        - UTF-8編碼驗證
+        - 移除行尾空白
+
+        與 _scan_stream 的串流標準化結果一致。
         """
         # 移除BOM
-        if content.startswith(b"\xef\xbb\xbf"):
-            content = content[3:]
+        if content.startswith(UTF8_BOM):
+            content = content[len(UTF8_BOM) :]
 
-        # 統一換行符（CRLF → LF）
-        content = content.replace(b"\r\n", b"\n")
-
-        # 移除行尾空白
-        lines = content.split(b"\n")
-        lines = [line.rstrip() for line in lines]
-        content = b"\n".join(lines)
-
-        return content
+        # 移除行尾空白；CRLF 的 \r 屬於行尾空白，因此同時統一為LF
+        return b"\n".join([line.rstrip() for line in content.split(b"\n")])
 
     # ═══════════════════════════════════════════════════════════════════
     # 問題4-6: 循環依賴、語意不對齊、層級過多
@@ -375,12 +566,10 @@ class SHAIntegritySystem:
         Returns:
             快照數據
         """
-        # 計算哈希
-        hash_record = self.compute_stable_hash(file_path)
-
-        # 讀取完整內容
-        with open(file_path, "rb") as f:
-            content = f.read()
+        # 計算哈希並同時取得內容（單次讀取）
+        scan, _ = self._scan_file(file_path, capture_content=True)
+        hash_record = self._record_from_scan(file_path, scan)
+        self._register_hash(hash_record)
 
         # 獲取Git信息（如果可用）
         git_info = self._get_git_info(file_path)
@@ -388,7 +577,7 @@ class SHAIntegritySystem:
         # 創建快照
         snapshot = {
             "hash_record": asdict(hash_record),
-            "content_base64": self._encode_content(content),
+            "content_base64": scan["content_base64"],
             "git_info": git_info,
             "created_at": datetime.utcnow().isoformat(),
             "reproducibility_level": "full",  # full, partial, none
@@ -528,53 +717,13 @@ class SHAIntegritySystem:
         Returns:
             缺陷列表
         """
-        defects = []
-
-        # 讀取文件
+        # 檢測（與哈希同一次掃描）：非標準字符、NULL字節、混合換行符、BOM
         try:
-            with open(file_path, "rb") as f:
-                content = f.read()
+            scan, _ = self._scan_file(file_path, use_registry=True)
         except Exception as e:
-            defects.append(
-                {"type": "read_error", "severity": "critical", "message": str(e)}
-            )
-            return defects
+            return [{"type": "read_error", "severity": "critical", "message": str(e)}]
 
-        # 檢測1: 非標準字符
-        try:
-            content.decode("utf-8")
-        except UnicodeDecodeError as e:
-            defects.append(
-                {
-                    "type": "encoding_issue",
-                    "severity": "high",
-                    "message": f"編碼錯誤: {e}",
-                }
-            )
-
-        # 檢測2: 異常字節序列
-        if b"\x00" in content:
-            defects.append(
-                {"type": "null_bytes", "severity": "medium", "message": "包含NULL字節"}
-            )
-
-        # 檢測3: 混合換行符
-        if b"\r\n" in content and b"\n" in content.replace(b"\r\n", b""):
-            defects.append(
-                {
-                    "type": "mixed_line_endings",
-                    "severity": "medium",
-                    "message": "混合使用CRLF和LF",
-                }
-            )
-
-        # 檢測4: BOM標記
-        if content.startswith(b"\xef\xbb\xbf"):
-            defects.append(
-                {"type": "bom_present", "severity": "low", "message": "包含UTF-8 BOM"}
-            )
-
-        return defects
+        return [dict(defect) for defect in scan["defects"]]
 
     # ═══════════════════════════════════════════════════════════════════
     # 核心功能：註冊、驗證、追蹤
@@ -653,6 +802,84 @@ class SHAIntegritySystem:
 
         return manifest
 
+    def generate_directory_manifest(
+        self,
+        directory: Path,
+        pattern: str = "**/*",
+        normalize: bool = True,
+        max_workers: Optional[int] = None,
+        exclude_dirs: Iterable[str] = (".git",),
+    ) -> Dict:
+        """
+        並行生成目錄的SHA清單（Merkle Root）
+
+        未變更的文件取自持久化註冊表，其餘文件以線程池分塊串流哈希
+        （hashlib 與文件讀取會釋放GIL）。文件按相對路徑排序，
+        Merkle Root 與掃描順序無關。
+
+        Args:
+            directory: 目錄路徑
+            pattern: glob 模式
+            normalize: 是否標準化
+            max_workers: 線程數
+            exclude_dirs: 排除的目錄名
+
+        Returns:
+            清單數據
+        """
+        directory = Path(directory)
+        excluded = set(exclude_dirs)
+        files = sorted(
+            path
+            for path in directory.glob(pattern)
+            if path.is_file()
+            and not excluded.intersection(path.relative_to(directory).parts)
+        )
+
+        def scan(path: Path) -> Optional[Tuple[Dict, bool]]:
+            try:
+                return self._scan_file(path, normalize, use_registry=True)
+            except OSError as e:
+                self.logger.warning(f"無法讀取: {path}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(scan, files))
+
+        manifest = {
+            "generated_at": datetime.utcnow().isoformat(),
+            "platform": self._platform_context.platform,
+            "architecture": self._platform_context.architecture,
+            "root": str(directory),
+            "total_files": 0,
+            "cached_files": 0,
+            "files": {},
+        }
+
+        for path, result in zip(files, results):
+            if result is None:
+                continue
+            scan_result, cached = result
+            record = self._record_from_scan(path, scan_result)
+            self._register_hash(record)
+            manifest["cached_files"] += cached
+            manifest["files"][path.relative_to(directory).as_posix()] = {
+                "sha256": record.sha256,
+                "sha3_256": record.sha3_256,
+                "size": record.file_size,
+                "version": record.version,
+                "semantic_label": record.semantic_label,
+                "depth": record.dependency_depth,
+                "defects": [defect["type"] for defect in scan_result["defects"]],
+            }
+        manifest["total_files"] = len(manifest["files"])
+
+        file_hashes = [r["sha256"] for r in manifest["files"].values()]
+        manifest["merkle_root"] = self._calculate_merkle_root(file_hashes)
+
+        self.save_registry()
+        return manifest
+
     def _calculate_merkle_root(self, hashes: List[str]) -> str:
         """計算Merkle樹根"""
         if not hashes:
@@ -679,6 +906,45 @@ class SHAIntegritySystem:
     # 輔助功能
     # ═══════════════════════════════════════════════════════════════════
 
+    def _load_scan_registry(self):
+        """載入持久化掃描註冊表"""
+        try:
+            with open(self.registry_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == REGISTRY_VERSION:
+            self._scan_registry = data.get("files", {})
+
+    def save_registry(self):
+        """持久化掃描註冊表（原子寫入；無變更時略過）
+
+        單文件操作不會自動寫盤，逐一哈希 N 個文件後調用一次即可
+        """
+        if not self.registry_path or not self._scan_registry_dirty:
+            return
+        registry_path = Path(self.registry_path)
+        registry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = registry_path.with_name(registry_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": REGISTRY_VERSION, "files": self._scan_registry},
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, registry_path)
+        self._scan_registry_dirty = False
+
+    def close(self):
+        """寫出未保存的掃描註冊表"""
+        self.save_registry()
+
+    def __enter__(self) -> "SHAIntegritySystem":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _get_git_info(self, file_path: Path) -> Optional[Dict]:
         """獲取Git信息"""
         try:
@@ -5,6 +5,8 @@ SHA Integrity System Tests
 測試SHA完整性系統 - 13個核心痛點驗證
 """
 
+import hashlib
+import os
 import sys
 import tempfile
 from pathlib import Path
@@ -200,6 +202,109 @@ def test_manifest_generation():
     print("✅ Manifest Generation tests passed")
 
 
+def test_streaming_hash():
+    """測試分塊串流哈希與一次性標準化結果一致"""
+    print("\n=== Test Streaming Hash ===")
+
+    # 極小的塊，讓BOM、CRLF、行尾空白與多字節字符跨越塊邊界
+    system = SHAIntegritySystem({"chunk_size": 4})
+
+    content = b"\xef\xbb\xbfline 1  \r\n\xe4\xb8\xad\xe6\x96\x87\t\nline 3\r\nno newline   "
+    with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+        f.write(content)
+        test_file = Path(f.name)
+
+    try:
+        normalized = system._normalize_content(content)
+        assert normalized == "line 1\n中文\nline 3\nno newline".encode("utf-8")
+
+        hash_rec = system.compute_stable_hash(test_file)
+        assert hash_rec.sha256 == hashlib.sha256(normalized).hexdigest()
+        assert hash_rec.sha3_256 == hashlib.sha3_256(normalized).hexdigest()
+        assert hash_rec.file_size == len(normalized)
+        print("✓ 串流標準化與雙哈希一致")
+
+        defects = {d["type"] for d in system.scan_hidden_defects(test_file)}
+        assert defects == {"bom_present", "mixed_line_endings"}, f"缺陷不符: {defects}"
+        print("✓ 同一次掃描完成缺陷檢測")
+
+    finally:
+        test_file.unlink()
+
+    print("✅ Streaming Hash tests passed")
+
+
+def test_persistent_registry():
+    """測試持久化註冊表（路徑、大小、mtime 未變則跳過哈希）"""
+    print("\n=== Test Persistent Registry ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry_path = Path(tmp) / "registry.json"
+        test_file = Path(tmp) / "data.txt"
+        test_file.write_bytes(b"original")
+        # 避開 mtime 與記錄時間過近的不可信窗口
+        os.utime(test_file, (1_700_000_000, 1_700_000_000))
+
+        with SHAIntegritySystem({"registry_path": str(registry_path)}) as first:
+            original = first.compute_stable_hash(test_file)
+            # 單文件哈希只標記變更，不逐次重寫註冊表
+            assert not registry_path.exists(), "註冊表不應逐文件寫盤"
+        assert registry_path.exists(), "註冊表應於關閉時持久化"
+
+        # 同大小、同mtime的改寫不會被重新讀取（證明跳過了哈希）
+        test_file.write_bytes(b"modified")
+        os.utime(test_file, (1_700_000_000, 1_700_000_000))
+        second = SHAIntegritySystem({"registry_path": str(registry_path)})
+        cached = second.compute_stable_hash(test_file, use_registry=True)
+        assert cached.sha256 == original.sha256
+        print("✓ 未變更的文件取自註冊表")
+
+        # 驗證路徑不信任註冊表：同大小、回設 mtime 的篡改仍被發現
+        assert not second.verify_integrity(test_file, original.sha256)
+        assert second.compute_stable_hash(test_file).sha256 != original.sha256
+        print("✓ verify_integrity 重新哈希，偵測到篡改")
+
+        os.utime(test_file, (1_700_000_100, 1_700_000_100))
+        changed = second.compute_stable_hash(test_file, use_registry=True)
+        assert changed.sha256 == hashlib.sha256(b"modified").hexdigest()
+        print("✓ mtime 變更後重新計算")
+
+    print("✅ Persistent Registry tests passed")
+
+
+def test_directory_manifest():
+    """測試目錄級並行清單（Merkle Root）"""
+    print("\n=== Test Directory Manifest ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        (root / "sub").mkdir(parents=True)
+        (root / ".git").mkdir()
+        (root / ".git" / "HEAD").write_text("ref")
+        for name in ("b.txt", "a.txt", "sub/c.txt"):
+            (root / name).write_text(f"content of {name}\r\n")
+            os.utime(root / name, (1_700_000_000, 1_700_000_000))
+
+        config = {"registry_path": str(Path(tmp) / "registry.json")}
+        system = SHAIntegritySystem(config)
+        manifest = system.generate_directory_manifest(root, max_workers=2)
+
+        assert list(manifest["files"]) == ["a.txt", "b.txt", "sub/c.txt"]
+        expected_root = system._calculate_merkle_root(
+            [entry["sha256"] for entry in manifest["files"].values()]
+        )
+        assert manifest["merkle_root"] == expected_root
+        assert manifest["files"]["a.txt"]["sha256"] == system.compute_stable_hash(root / "a.txt").sha256
+        print(f"✓ 清單已生成: {manifest['total_files']} 個文件")
+
+        rerun = SHAIntegritySystem(config).generate_directory_manifest(root)
+        assert rerun["cached_files"] == 3, "第二次應全部取自註冊表"
+        assert rerun["merkle_root"] == manifest["merkle_root"]
+        print("✓ 重跑取自註冊表，Merkle Root 不變")
+
+    print("✅ Directory Manifest tests passed")
+
+
 def main():
     """運行所有測試"""
     print("\n" + "=" * 60)
@@ -213,6 +318,9 @@ def main():
         test_reproducible_snapshots()
         test_cross_platform_consistency()
         test_manifest_generation()
+        test_streaming_hash()
+        test_persistent_registry()
+        test_directory_manifest()
 
         print("\n" + "=" * 60)
         print("✅ ALL SHA INTEGRITY TESTS PASSED")
@@ -1,12 +1,23 @@
 """
 Code Knowledge Graph
 Builds and queries a multi-layer graph representing code structure
+
+L1 and L2 are built from the Python AST. Files are parsed in a process pool
+and each file's parse result is cached by content hash, so a rebuild only
+reparses files that changed. Symbols are keyed by fully qualified name
+(module.Class.method); callers/callees/concepts are kept in adjacency
+indexes so query_context never scans a whole layer.
 """
 
 import os
+import ast
 import json
+import time
 import hashlib
-from typing import List, Dict, Any, Optional, Set
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timezone
 from collections import defaultdict
 
@@ -17,6 +28,187 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from utils.simple_yaml import safe_load
 
+# Bump when the per-file parse result format changes
+CACHE_VERSION = 1
+
+EXCLUDE_DIRS = {
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    "dist",
+    "build",
+    ".tox",
+    ".pytest_cache",
+}
+
+
+# Nodes that never contain calls or definitions; not descended into
+_LEAF_NODES = (
+    ast.Constant,
+    ast.Name,
+    ast.expr_context,
+    ast.operator,
+    ast.cmpop,
+    ast.unaryop,
+    ast.boolop,
+    ast.alias,
+)
+
+
+class _FileVisitor:
+    """
+    Collects definitions, calls and imports of one module
+    Names are module-relative ("Class.method"); "" is the module itself
+
+    Walks _fields directly instead of ast.NodeVisitor's per-node dispatch,
+    which costs about as much as parsing on large files.
+    """
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.scope: List[str] = []
+        self.kinds: List[str] = []
+        self.symbols: List[Dict[str, Any]] = []
+        self.calls: List[List[str]] = []
+        self.imports: List[List[Any]] = []
+        self._seen_calls: Set[Tuple[str, str]] = set()
+
+    def visit(self, node: ast.AST):
+        """Visit the children of node"""
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST) and not isinstance(item, _LEAF_NODES):
+                        self._dispatch(item)
+            elif isinstance(value, ast.AST) and not isinstance(value, _LEAF_NODES):
+                self._dispatch(value)
+
+    def _dispatch(self, node: ast.AST):
+        handler = _HANDLERS.get(type(node))
+        if handler is None:
+            self.visit(node)
+        else:
+            handler(self, node)
+
+    def _define(self, node: ast.AST, kind: str):
+        name = ".".join(self.scope + [node.name])
+        source = "\n".join(self.lines[node.lineno - 1 : node.end_lineno])
+        symbol = {
+            "name": name,
+            "type": kind,
+            "line": node.lineno,
+            "end_line": node.end_lineno,
+            "checksum": hashlib.md5(source.encode()).hexdigest()[:16],
+        }
+        if isinstance(node, ast.ClassDef):
+            symbol["bases"] = [b for b in map(_dotted_name, node.bases) if b]
+        self.symbols.append(symbol)
+
+    def _visit_header(self, node: ast.AST):
+        # Decorators, defaults and bases are evaluated in the enclosing scope
+        children = list(node.decorator_list)
+        if isinstance(node, ast.ClassDef):
+            children += node.bases + [k.value for k in node.keywords]
+        else:
+            children += node.args.defaults + node.args.kw_defaults
+        for child in children:
+            if child is not None and not isinstance(child, _LEAF_NODES):
+                self._dispatch(child)
+
+    def _visit_scope(self, node: ast.AST, kind: str):
+        self._visit_header(node)
+        self._define(node, kind)
+        self.scope.append(node.name)
+        self.kinds.append(kind)
+        for child in node.body:
+            self._dispatch(child)
+        self.scope.pop()
+        self.kinds.pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._visit_scope(node, "class")
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        kind = "method" if self.kinds and self.kinds[-1] == "class" else "function"
+        self._visit_scope(node, kind)
+
+    def visit_Call(self, node: ast.Call):
+        callee = _dotted_name(node.func)
+        if callee:
+            key = (".".join(self.scope), callee)
+            if key not in self._seen_calls:
+                self._seen_calls.add(key)
+                self.calls.append(list(key))
+        self.visit(node)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                self.imports.append([alias.asname, alias.name, 0])
+            else:
+                head = alias.name.split(".")[0]
+                self.imports.append([head, head, 0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            if alias.name == "*":
+                continue
+            target = f"{node.module}.{alias.name}" if node.module else alias.name
+            self.imports.append([alias.asname or alias.name, target, node.level])
+
+
+_HANDLERS = {
+    ast.ClassDef: _FileVisitor.visit_ClassDef,
+    ast.FunctionDef: _FileVisitor.visit_FunctionDef,
+    ast.AsyncFunctionDef: _FileVisitor.visit_FunctionDef,
+    ast.Call: _FileVisitor.visit_Call,
+    ast.Import: _FileVisitor.visit_Import,
+    ast.ImportFrom: _FileVisitor.visit_ImportFrom,
+}
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Return "a.b.c" for Name/Attribute chains, None for anything else"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common leading dotted path of two qualified names"""
+    return len(os.path.commonprefix([a.split("."), b.split(".")]))
+
+
+def _parse_file(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse one Python file (runs in worker processes)
+
+    Returns:
+        (sha256 of the content, parse result)
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        tree = ast.parse(data, filename=file_path)
+    except (SyntaxError, ValueError) as e:
+        return digest, {"error": f"{type(e).__name__}: {e}"}
+    visitor = _FileVisitor(data.decode("utf-8", errors="replace").split("\n"))
+    visitor.visit(tree)
+    return digest, {
+        "symbols": visitor.symbols,
+        "calls": visitor.calls,
+        "imports": visitor.imports,
+    }
+
 
 class KnowledgeGraph:
     """
@@ -26,10 +218,29 @@ class KnowledgeGraph:
     L3: Semantic graph - high-level concepts
     """
 
-    def __init__(self, codebase_path: str, graph_db_uri: Optional[str] = None):
-        """Initialize knowledge graph"""
+    def __init__(
+        self,
+        codebase_path: str,
+        graph_db_uri: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        parallel_min_files: int = 64,
+    ):
+        """
+        Initialize knowledge graph
+
+        Args:
+            codebase_path: Path to the codebase root
+            graph_db_uri: Graph database URI (unused by the in-memory store)
+            cache_path: JSON file persisting per-file parse results between runs
+            max_workers: Parser processes (defaults to the CPU count)
+            parallel_min_files: Below this many files to parse, parse in-process
+        """
         self.codebase_path = codebase_path
         self.graph_db_uri = graph_db_uri
+        self.cache_path = cache_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_min_files = parallel_min_files
 
         # Graph storage (in-memory for prototype, would use Neo4j in production)
         self.layers = {
@@ -38,94 +249,206 @@ class KnowledgeGraph:
             "L3_semantic_graph": defaultdict(set),
         }
 
-    def build_graph(self, codebase_path: str):
+        # Adjacency indexes (L2_call_graph is the forward index)
+        self._callers: Dict[str, List[str]] = defaultdict(list)
+        self._by_name: Dict[str, List[str]] = defaultdict(list)
+        self._concepts: Dict[str, Set[str]] = defaultdict(set)
+
+        # relative path -> {sha256, size, mtime_ns, result}
+        self._file_cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_root: Optional[str] = None
+        self._cache_loaded = False
+        self.build_stats: Dict[str, Any] = {}
+
+    def build_graph(self, codebase_path: str) -> Dict[str, Any]:
         """
         Build the multi-layer knowledge graph
 
         Args:
             codebase_path: Path to the codebase root
+
+        Returns:
+            Build statistics (files parsed / reused from cache, timings)
         """
         print(f"Building knowledge graph from {codebase_path}...")
+        started = time.perf_counter()
 
         # L1: Symbol graph - parse code files
-        self._build_symbol_graph(codebase_path)
+        modules = self._build_symbol_graph(codebase_path)
 
         # L2: Call graph - analyze function calls
-        self._build_call_graph(codebase_path)
+        self._build_call_graph(modules)
 
         # L3: Semantic graph - infer high-level concepts
         self._build_semantic_graph()
 
+        self.build_stats["seconds"] = round(time.perf_counter() - started, 3)
+
         print("Knowledge graph built successfully")
         print(f"  L1 (Symbol): {len(self.layers['L1_symbol_graph'])} symbols")
         print(f"  L2 (Call): {len(self.layers['L2_call_graph'])} call relationships")
         print(f"  L3 (Semantic): {len(self.layers['L3_semantic_graph'])} concepts")
-
-    def _build_symbol_graph(self, codebase_path: str):
+        print(
+            f"  Files: {self.build_stats['parsed']} parsed, "
+            f"{self.build_stats['cached']} cached "
+            f"in {self.build_stats['seconds']}s"
+        )
+        return self.build_stats
+
+    def _build_symbol_graph(self, codebase_path: str) -> List[Tuple[str, Dict]]:
         """
         Build L1 symbol graph
-        Extracts function, class, and variable definitions
-        """
-        # Mock implementation - would use tree-sitter or ast in production
-        python_files = self._find_files(codebase_path, "*.py")
+        Extracts module, class, function and method definitions
 
-        for file_path in python_files:
+        Returns:
+            (module name, parse result) for every parsed file
+        """
+        root = os.path.abspath(codebase_path)
+        self._load_cache(root)
+
+        cached = 0
+        dirty = False
+        stale: List[Tuple[str, str]] = []
+        current: Dict[str, Dict[str, Any]] = {}
+        for file_path in self._find_files(root, "*.py"):
+            rel_path = os.path.relpath(file_path, root)
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Simple regex-based extraction (mock)
-                self._extract_symbols(file_path, content)
-
-            except Exception as e:
-                print(f"Warning: Could not parse {file_path}: {e}")
-
-    def _extract_symbols(self, file_path: str, content: str):
-        """Extract symbols from file content (mock implementation)"""
-        # Mock: Detect common Python patterns
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines, 1):
-            # Function definitions
-            if line.strip().startswith("def "):
-                func_name = line.split("(")[0].replace("def ", "").strip()
-                self.layers["L1_symbol_graph"][func_name] = {
-                    "type": "function",
-                    "file": file_path,
-                    "line": i,
-                    "checksum": hashlib.md5(line.encode()).hexdigest()[:16],
-                }
-
-            # Class definitions
-            elif line.strip().startswith("class "):
-                class_name = (
-                    line.split("(")[0].replace("class ", "").strip().rstrip(":")
-                )
-                self.layers["L1_symbol_graph"][class_name] = {
-                    "type": "class",
-                    "file": file_path,
-                    "line": i,
-                    "checksum": hashlib.md5(line.encode()).hexdigest()[:16],
-                }
-
-    def _build_call_graph(self, codebase_path: str):
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            entry = self._file_cache.get(rel_path)
+            if entry and (entry["size"], entry["mtime_ns"]) == (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                current[rel_path] = entry
+                cached += 1
+                continue
+            if entry:
+                with open(file_path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+                if digest == entry["sha256"]:
+                    entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    current[rel_path] = entry
+                    cached += 1
+                    dirty = True
+                    continue
+            current[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            stale.append((rel_path, file_path))
+
+        for (rel_path, file_path), (digest, result) in zip(
+            stale, self._parse_files([file_path for _, file_path in stale])
+        ):
+            current[rel_path].update(sha256=digest, result=result)
+            if "error" in result:
+                print(f"Warning: Could not parse {file_path}: {result['error']}")
+
+        if dirty or stale or len(current) != len(self._file_cache):
+            self._file_cache = current
+            self._save_cache()
+        self._file_cache = current
+        self.build_stats = {"files": len(current), "parsed": len(stale), "cached": cached}
+
+        symbols = self.layers["L1_symbol_graph"] = defaultdict(dict)
+        self._by_name = defaultdict(list)
+        modules = []
+        for rel_path in sorted(current):
+            result = current[rel_path]["result"]
+            if "error" in result:
+                continue
+            module = self._module_name(root, rel_path)
+            file_path = os.path.join(root, rel_path)
+            symbols[module] = {"type": "module", "file": file_path, "line": 1}
+            self._by_name[module.rsplit(".", 1)[-1]].append(module)
+            for symbol in result["symbols"]:
+                qualified = f"{module}.{symbol['name']}"
+                if qualified not in symbols:
+                    self._by_name[symbol["name"].rsplit(".", 1)[-1]].append(qualified)
+                # A redefinition in the same scope wins, as at runtime
+                symbols[qualified] = dict(symbol, file=file_path, module=module)
+            modules.append((module, rel_path.endswith("__init__.py"), result))
+        return modules
+
+    def _parse_files(self, paths: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Parse files in a process pool, in-process when the batch is small"""
+        if self.max_workers > 1 and len(paths) >= self.parallel_min_files:
+            chunksize = max(1, len(paths) // (self.max_workers * 8))
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                    return list(pool.map(_parse_file, paths, chunksize=chunksize))
+            except (BrokenProcessPool, PicklingError, OSError) as e:
+                # e.g. spawn start method with a module that is not importable
+                print(f"Warning: parser pool unavailable ({e}), parsing in-process")
+        return [_parse_file(path) for path in paths]
+
+    def _build_call_graph(self, modules: List[Tuple[str, bool, Dict]]):
         """
         Build L2 call graph
-        Analyzes function call relationships
+        Resolves each call against local scopes and imports to a qualified name
         """
-        # Mock implementation - would analyze AST in production
-
-        # Add mock call relationships
-        mock_calls = [
-            ("process_task", "execute_task"),
-            ("execute_task", "asyncio.create_task"),
-            ("main", "process_task"),
-            ("execute_task", "task_queue.put"),
-        ]
-
-        for caller, callee in mock_calls:
-            if caller in self.layers["L1_symbol_graph"]:
-                self.layers["L2_call_graph"][caller].append(callee)
+        calls = self.layers["L2_call_graph"] = defaultdict(list)
+        self._callers = defaultdict(list)
+        # import target -> symbols whose qualified name ends with it
+        self._suffix_matches: Dict[str, List[str]] = {}
+
+        for module, is_package, result in modules:
+            imports = {}
+            for alias, target, level in result["imports"]:
+                if level:
+                    package = module.split(".")
+                    package = package[: len(package) - level + (1 if is_package else 0)]
+                    target = ".".join(package + [target])
+                imports[alias] = target
+            for caller, callee in result["calls"]:
+                caller = f"{module}.{caller}" if caller else module
+                resolved = self._resolve_call(caller, module, callee, imports)
+                if resolved not in calls[caller]:
+                    calls[caller].append(resolved)
+                    self._callers[resolved].append(caller)
+
+    def _resolve_call(
+        self, caller: str, module: str, callee: str, imports: Dict[str, str]
+    ) -> str:
+        """Map a dotted call expression to a qualified symbol when possible"""
+        symbols = self.layers["L1_symbol_graph"]
+        head, _, rest = callee.partition(".")
+
+        if head in ("self", "cls") and rest:
+            scope = caller
+            while scope in symbols and symbols[scope]["type"] != "class":
+                scope = scope.rpartition(".")[0]
+            candidate = f"{scope}.{rest}"
+            if candidate in symbols:
+                return candidate
+
+        # Enclosing function scopes, then module globals
+        scope = caller
+        while scope != module and scope in symbols:
+            if symbols[scope]["type"] != "class" or scope == caller:
+                candidate = f"{scope}.{callee}"
+                if candidate in symbols:
+                    return candidate
+            scope = scope.rpartition(".")[0]
+        if f"{module}.{callee}" in symbols:
+            return f"{module}.{callee}"
+
+        if head in imports:
+            target = imports[head] + (f".{rest}" if rest else "")
+            if target in symbols:
+                return target
+            # Import paths are relative to a source root, not the codebase
+            candidates = self._suffix_matches.get(target)
+            if candidates is None:
+                candidates = self._suffix_matches[target] = [
+                    name
+                    for name in self._by_name.get(target.rsplit(".", 1)[-1], ())
+                    if name.endswith(f".{target}")
+                ]
+            if candidates:
+                return max(candidates, key=lambda c: _common_prefix(c, module))
+            return target
+
+        return callee
 
     def _build_semantic_graph(self):
         """
@@ -139,17 +462,30 @@ class KnowledgeGraph:
             "worker_runtime": ["gov-execution-runtime", "worker", "executor"],
         }
 
-        for concept, symbols in concepts.items():
-            for symbol in symbols:
-                if symbol in self.layers["L1_symbol_graph"]:
-                    self.layers["L3_semantic_graph"][concept].add(symbol)
+        semantic = self.layers["L3_semantic_graph"] = defaultdict(set)
+        self._concepts = defaultdict(set)
+        for concept, names in concepts.items():
+            for name in names:
+                for symbol in self._lookup(name):
+                    semantic[concept].add(symbol)
+                    self._concepts[symbol].add(concept)
+
+    def _lookup(self, symbol: str) -> List[str]:
+        """Qualified names matching a qualified or short symbol name"""
+        if symbol in self.layers["L1_symbol_graph"]:
+            return [symbol]
+        return [
+            name
+            for name in self._by_name.get(symbol.rsplit(".", 1)[-1], ())
+            if name == symbol or name.endswith(f".{symbol}")
+        ]
 
     def query_context(self, symbol: str, depth: int = 3) -> Dict:
         """
         Query context for a symbol
 
         Args:
-            symbol: Symbol name
+            symbol: Qualified symbol name, or a short name / dotted suffix
             depth: Depth of context to retrieve
 
         Returns:
@@ -157,6 +493,8 @@ class KnowledgeGraph:
         """
         context = {
             "symbol": symbol,
+            "qualified_name": None,
+            "candidates": [],
             "definition": None,
             "callers": [],
             "callees": [],
@@ -165,38 +503,40 @@ class KnowledgeGraph:
             "descendants": [],
         }
 
+        symbols = self.layers["L1_symbol_graph"]
+        matches = self._lookup(symbol)
+        if not matches:
+            return context
+        if len(matches) > 1:
+            context["candidates"] = matches
+        # Ambiguous short names resolve to the first match; see "candidates"
+        symbol = matches[0]
+        context["qualified_name"] = symbol
+
         # Get symbol definition (L1)
-        if symbol in self.layers["L1_symbol_graph"]:
-            context["definition"] = self.layers["L1_symbol_graph"][symbol]
+        context["definition"] = symbols[symbol]
 
         # Get callers (who calls this function) (L2)
-        for caller, callees in self.layers["L2_call_graph"].items():
-            if symbol in callees:
-                if caller in self.layers["L1_symbol_graph"]:
-                    context["callers"].append(
-                        {
-                            "symbol": caller,
-                            "location": self.layers["L1_symbol_graph"][caller],
-                        }
-                    )
+        for caller in self._callers.get(symbol, ()):
+            context["callers"].append({"symbol": caller, "location": symbols[caller]})
 
         # Get callees (what this function calls) (L2)
-        if symbol in self.layers["L2_call_graph"]:
-            for callee in self.layers["L2_call_graph"][symbol]:
-                if callee in self.layers["L1_symbol_graph"]:
-                    context["callees"].append(
-                        {
-                            "symbol": callee,
-                            "location": self.layers["L1_symbol_graph"][callee],
-                        }
-                    )
+        for callee in self.layers["L2_call_graph"].get(symbol, ()):
+            if callee in symbols:
+                context["callees"].append(
+                    {"symbol": callee, "location": symbols[callee]}
+                )
 
         # Get related concepts (L3)
-        for concept, symbols in self.layers["L3_semantic_graph"].items():
-            if symbol in symbols:
-                context["related_concepts"].append(
-                    {"concept": concept, "related_symbols": list(symbols - {symbol})}
-                )
+        for concept in sorted(self._concepts.get(symbol, ())):
+            context["related_concepts"].append(
+                {
+                    "concept": concept,
+                    "related_symbols": list(
+                        self.layers["L3_semantic_graph"][concept] - {symbol}
+                    ),
+                }
+            )
 
         # Get ancestors (call chain upstream)
         context["ancestors"] = self._get_ancestors(symbol, depth)
@@ -207,45 +547,35 @@ class KnowledgeGraph:
         return context
 
     def _get_ancestors(self, symbol: str, depth: int) -> List[Dict]:
-        """Get ancestor symbols in call chain"""
-        ancestors = []
-        visited = set()
-        current_level = [symbol]
-
-        for _ in range(depth):
-            next_level = []
-            for s in current_level:
-                for caller, callees in self.layers["L2_call_graph"].items():
-                    if s in callees and caller not in visited:
-                        ancestors.append(
-                            {"symbol": caller, "level": len(ancestors) + 1}
-                        )
-                        visited.add(caller)
-                        next_level.append(caller)
-            current_level = next_level
-
-        return ancestors[:depth]
+        """Get ancestor symbols in call chain, up to depth levels"""
+        return self._traverse(symbol, depth, self._callers)
 
     def _get_descendants(self, symbol: str, depth: int) -> List[Dict]:
-        """Get descendant symbols in call chain"""
-        descendants = []
-        visited = set()
+        """Get descendant symbols in call chain, up to depth levels"""
+        return self._traverse(symbol, depth, self.layers["L2_call_graph"])
+
+    @staticmethod
+    def _traverse(
+        symbol: str, depth: int, edges: Dict[str, List[str]]
+    ) -> List[Dict]:
+        """Breadth-first walk of an adjacency index; level is the hop count"""
+        found = []
+        visited = {symbol}
         current_level = [symbol]
 
-        for _ in range(depth):
+        for level in range(1, depth + 1):
             next_level = []
             for s in current_level:
-                if s in self.layers["L2_call_graph"]:
-                    for callee in self.layers["L2_call_graph"][s]:
-                        if callee not in visited:
-                            descendants.append(
-                                {"symbol": callee, "level": len(descendants) + 1}
-                            )
-                            visited.add(callee)
-                            next_level.append(callee)
+                for neighbour in edges.get(s, ()):
+                    if neighbour not in visited:
+                        visited.add(neighbour)
+                        found.append({"symbol": neighbour, "level": level})
+                        next_level.append(neighbour)
+            if not next_level:
+                break
             current_level = next_level
 
-        return descendants[:depth]
+        return found
 
     def find_related_symbols(
         self, symbol: str, relation_type: str = "all"
@@ -262,7 +592,7 @@ class KnowledgeGraph:
         """
         related = []
 
-        context = self.query_context(symbol)
+        context = self.query_context(symbol, depth=0)
 
         if relation_type in ["callers", "all"]:
             for caller in context["callers"]:
@@ -299,6 +629,48 @@ class KnowledgeGraph:
 
         return related
 
+    @staticmethod
+    def _module_name(root: str, rel_path: str) -> str:
+        """Dotted module name of a file relative to the codebase root"""
+        parts = rel_path[: -len(".py")].split(os.sep)
+        if parts[-1] == "__init__":
+            parts.pop()
+        return ".".join(parts) or os.path.basename(root)
+
+    def _load_cache(self, root: str):
+        """Load persisted parse results once; drop them if the root changed"""
+        if not self._cache_loaded and self.cache_path:
+            self._cache_loaded = True
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self._cache_root = data.get("root")
+                    self._file_cache = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+        if self._cache_root != root:
+            self._file_cache = {}
+            self._cache_root = root
+
+    def _save_cache(self):
+        """Persist parse results atomically"""
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "root": self._cache_root,
+                    "files": self._file_cache,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.cache_path)
+
     def export_graph(self, output_path: str, format: str = "json"):
         """
         Export knowledge graph to file
@@ -335,6 +707,7 @@ class KnowledgeGraph:
         """Find files matching pattern"""
         files = []
         for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
             for filename in filenames:
                 if filename.endswith(pattern.replace("*", "")):
                     files.append(os.path.join(dirpath, filename))
@@ -343,7 +716,10 @@ class KnowledgeGraph:
 
 if __name__ == "__main__":
     # Test knowledge graph
-    graph = KnowledgeGraph(codebase_path="/workspace/machine-native-ops")
+    graph = KnowledgeGraph(
+        codebase_path="/workspace/machine-native-ops",
+        cache_path="/workspace/ecosystem/indexes/internal/knowledge_graph.cache.json",
+    )
 
     # Build graph
     graph.build_graph("/workspace/machine-native-ops")
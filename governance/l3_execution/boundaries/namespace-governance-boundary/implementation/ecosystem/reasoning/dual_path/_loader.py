@@ -1,5 +1,6 @@
 """Utility loader to reuse dual-path implementations with import-safe modules."""
 
+import sys
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 from types import ModuleType
@@ -25,5 +26,12 @@ def load_impl(relative_path: str, module_name: str) -> ModuleType:
     if spec is None or spec.loader is None:
         raise ImportError(f"Unable to locate spec for {target}")
     module = module_from_spec(spec)
-    spec.loader.exec_module(module)
+    # Registered so functions defined in the module can be pickled by
+    # reference (e.g. submitted to a process pool)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
     return module
@@ -5,14 +5,21 @@ NG Namespace Registry
 
 NG Code: NG00103
 Purpose: 管理所有命名空間的註冊、查詢、更新、歸檔
+
+存儲結構:
+- namespaces.json: 快照（與既有 JSON 佈局相同）
+- namespaces.journal.jsonl: 追加式變更日誌，加載時在快照之上重放，
+  累積到 compact_every 筆後壓縮回快照
 """
 
 import json
+import os
+import tempfile
 import yaml
 import uuid
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Set
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -93,82 +100,256 @@ class NamespaceRecord:
 class NgNamespaceRegistry:
     """NG 命名空間註冊系統"""
 
-    def __init__(self, registry_path: str = "registry/namespaces.json"):
-        """初始化註冊系統"""
+    def __init__(
+        self,
+        registry_path: str = "registry/namespaces.json",
+        journal_path: Optional[str] = None,
+        compact_every: int = 1000,
+        durable: bool = True,
+    ):
+        """初始化註冊系統
+
+        Args:
+            registry_path: 快照路徑（JSON 佈局）
+            journal_path: 變更日誌路徑，預設為快照旁的 .journal.jsonl
+            compact_every: 日誌累積多少筆變更後壓縮為快照
+            durable: 每次寫日誌後是否 fsync
+        """
         self.registry_path = Path(registry_path)
+        self.journal_path = (
+            Path(journal_path)
+            if journal_path
+            else self.registry_path.with_suffix(".journal.jsonl")
+        )
+        self.compact_every = compact_every
+        self.durable = durable
         self.namespaces: Dict[str, NamespaceRecord] = {}
         self.ng_code_counter = {}
+
+        # 索引: 規範 namespace_id → 記錄 ID；祖先前綴 → 其下已註冊的 namespace_id
+        self._by_namespace: Dict[str, str] = {}
+        self._descendants: Dict[str, Set[str]] = {}
+
+        # 日誌序號: 快照已包含 _snapshot_seq 之前的全部變更
+        self._journal_seq = 0
+        self._snapshot_seq = 0
+        self._pending_entries = 0
+
         self._load_registry()
 
     def _load_registry(self):
-        """加載註冊表"""
-        if not self.registry_path.exists():
+        """加載快照並重放變更日誌"""
+        if self.registry_path.exists():
+            try:
+                with open(self.registry_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+                for ns_id, ns_data in data.get("namespaces", {}).items():
+                    self._index_record(self._record_from_dict(ns_data), ns_id)
+
+                self._snapshot_seq = data.get("metadata", {}).get("journal_seq", 0)
+                self._journal_seq = self._snapshot_seq
+
+            except Exception as e:
+                print(f"⚠️  加載註冊表失敗: {e}")
+
+        replayed = self._replay_journal()
+
+        if self.namespaces or replayed:
+            print(
+                f"✅ 已加載 {len(self.namespaces)} 個命名空間"
+                + (f"（重放 {replayed} 筆變更）" if replayed else "")
+            )
+
+    def _replay_journal(self) -> int:
+        """重放快照之後的日誌條目"""
+        if not self.journal_path.exists():
+            return 0
+
+        replayed = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 末行寫入中斷時會出現半行，之後不會再有有效條目
+                    print(f"⚠️  日誌第 {line_no} 行不完整，已忽略")
+                    break
+
+                seq = entry.get("seq", 0)
+                if seq <= self._snapshot_seq:
+                    continue
+
+                self._apply_entry(entry)
+                self._journal_seq = seq
+                self._pending_entries += 1
+                replayed += 1
+
+        return replayed
+
+    def _apply_entry(self, entry: Dict[str, Any]):
+        """把一筆日誌條目套用到記憶體狀態"""
+        if entry["op"] == "register":
+            self._index_record(self._record_from_dict(entry["record"]))
+        elif entry["op"] == "status":
+            record = self.namespaces.get(entry["id"])
+            if record is None:
+                return
+            record.status = NamespaceStatus(entry["status"])
+            record.updated_at = entry["updated_at"]
+            if record.audit_trail is None:
+                record.audit_trail = []
+            record.audit_trail.append(entry["audit"])
+
+    def _record_from_dict(self, ns_data: Dict[str, Any]) -> NamespaceRecord:
+        """由 JSON 佈局重構記錄"""
+        spec_data = ns_data["spec"]
+        spec = NamespaceSpec(
+            namespace_id=spec_data["namespace_id"],
+            namespace_type=spec_data["namespace_type"],
+            era=Era(spec_data["era"]),
+            domain=spec_data["domain"],
+            component=spec_data["component"],
+            owner=spec_data["owner"],
+            description=spec_data["description"],
+            version=spec_data.get("version", "1.0.0"),
+            tags=spec_data.get("tags"),
+            metadata=spec_data.get("metadata"),
+        )
+
+        return NamespaceRecord(
+            id=ns_data["id"],
+            ng_code=ns_data["ng_code"],
+            spec=spec,
+            status=NamespaceStatus(ns_data["status"]),
+            created_at=ns_data["created_at"],
+            updated_at=ns_data["updated_at"],
+            approved_by=ns_data.get("approved_by"),
+            audit_trail=ns_data.get("audit_trail", []),
+        )
+
+    def _index_record(self, record: NamespaceRecord, ns_id: Optional[str] = None):
+        """存入記錄並更新索引與 NG 編碼計數"""
+        ns_id = ns_id or record.id
+        self.namespaces[ns_id] = record
+
+        namespace_id = record.spec.namespace_id
+        self._by_namespace[namespace_id] = ns_id
+        for prefix in self._ancestors(namespace_id):
+            self._descendants.setdefault(prefix, set()).add(namespace_id)
+
+        # 讓重新加載後分配的 NG 編碼延續既有序列
+        key = self._ng_code_key(record.spec)
+        sequence = record.ng_code[5:]
+        if sequence.isdigit():
+            self.ng_code_counter[key] = max(
+                self.ng_code_counter.get(key, 0), int(sequence)
+            )
+
+    @staticmethod
+    def _ancestors(namespace_id: str) -> List[str]:
+        """命名空間的所有祖先前綴（a.b.c → a, a.b）"""
+        parts = namespace_id.split(".")
+        return [".".join(parts[:i]) for i in range(1, len(parts))]
+
+    def _append_journal(self, entries: List[Dict[str, Any]]):
+        """批量追加日誌條目（一次寫入、一次 fsync）"""
+        if not entries:
             return
 
-        try:
-            with open(self.registry_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            for ns_id, ns_data in data.get("namespaces", {}).items():
-                # 重構記錄
-                spec_data = ns_data["spec"]
-                spec = NamespaceSpec(
-                    namespace_id=spec_data["namespace_id"],
-                    namespace_type=spec_data["namespace_type"],
-                    era=Era(spec_data["era"]),
-                    domain=spec_data["domain"],
-                    component=spec_data["component"],
-                    owner=spec_data["owner"],
-                    description=spec_data["description"],
-                    version=spec_data.get("version", "1.0.0"),
-                    tags=spec_data.get("tags"),
-                    metadata=spec_data.get("metadata"),
-                )
+        for entry in entries:
+            self._journal_seq += 1
+            entry["seq"] = self._journal_seq
 
-                record = NamespaceRecord(
-                    id=ns_data["id"],
-                    ng_code=ns_data["ng_code"],
-                    spec=spec,
-                    status=NamespaceStatus(ns_data["status"]),
-                    created_at=ns_data["created_at"],
-                    updated_at=ns_data["updated_at"],
-                    approved_by=ns_data.get("approved_by"),
-                    audit_trail=ns_data.get("audit_trail", []),
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(
+                "".join(
+                    json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries
                 )
+            )
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+
+        self._pending_entries += len(entries)
+        if self._pending_entries >= self.compact_every:
+            self.compact()
+
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """當前狀態的 JSON 佈局"""
+        return {
+            "metadata": {
+                "version": "3.0.0",
+                "updated_at": datetime.now().isoformat(),
+                "namespace_count": len(self.namespaces),
+                "journal_seq": self._journal_seq,
+            },
+            "namespaces": {
+                ns_id: record.to_dict() for ns_id, record in self.namespaces.items()
+            },
+        }
 
-                self.namespaces[ns_id] = record
+    def export_json(self, path: Optional[str] = None, indent: Optional[int] = 2) -> Path:
+        """導出為 JSON 佈局（原子替換）
 
-            print(f"✅ 已加載 {len(self.namespaces)} 個命名空間")
+        Args:
+            path: 導出路徑，預設為快照路徑
+            indent: JSON 縮排
 
-        except Exception as e:
-            print(f"⚠️  加載註冊表失敗: {e}")
+        Returns:
+            導出文件路徑
+        """
+        target = Path(path) if path else self.registry_path
+        target.parent.mkdir(parents=True, exist_ok=True)
 
-    def _save_registry(self):
-        """保存註冊表"""
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
         try:
-            self.registry_path.parent.mkdir(parents=True, exist_ok=True)
-
-            data = {
-                "metadata": {
-                    "version": "3.0.0",
-                    "updated_at": datetime.now().isoformat(),
-                    "namespace_count": len(self.namespaces),
-                },
-                "namespaces": {
-                    ns_id: record.to_dict() for ns_id, record in self.namespaces.items()
-                },
-            }
-
-            with open(self.registry_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            print(f"✅ 註冊表已保存: {self.registry_path}")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._snapshot_data(), f, indent=indent, ensure_ascii=False)
+                f.flush()
+                if self.durable:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return target
+
+    def compact(self) -> bool:
+        """把日誌壓縮為快照並清空日誌
+
+        先寫快照再截斷日誌；兩步之間中斷時，快照中的 journal_seq
+        會讓重放跳過已包含的條目。
+        """
+        try:
+            self.export_json()
+            self._snapshot_seq = self._journal_seq
+            self._pending_entries = 0
+            if self.journal_path.exists():
+                self.journal_path.unlink()
             return True
 
         except Exception as e:
-            print(f"❌ 保存註冊表失敗: {e}")
+            print(f"❌ 壓縮註冊表失敗: {e}")
             return False
 
+    def _save_registry(self):
+        """保存註冊表（立即壓縮為快照）"""
+        if self.compact():
+            print(f"✅ 註冊表已保存: {self.registry_path}")
+            return True
+        return False
+
+    def close(self):
+        """壓縮尚未寫入快照的變更"""
+        if self._pending_entries:
+            self.compact()
+
     def register_namespace(self, spec: NamespaceSpec) -> str:
         """註冊命名空間
 
@@ -178,40 +359,84 @@ class NgNamespaceRegistry:
         Returns:
             命名空間 ID
         """
-        # 1. 驗證唯一性
-        if self.check_conflict(spec.namespace_id):
-            raise ValueError(f"命名空間衝突: {spec.namespace_id}")
+        namespace_id = self.register_many([spec], verbose=False)[0]
+        record = self.namespaces[namespace_id]
 
-        # 2. 生成 ID 和 NG 編碼
-        namespace_id = self._generate_namespace_id(spec)
-        ng_code = self._assign_ng_code(spec)
+        print(f"✅ 註冊命名空間: {spec.namespace_id} [{record.ng_code}]")
 
-        # 3. 創建記錄
-        record = NamespaceRecord(
-            id=namespace_id,
-            ng_code=ng_code,
-            spec=spec,
-            status=NamespaceStatus.REGISTERED,
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat(),
-            audit_trail=[
-                {
-                    "action": "registered",
-                    "timestamp": datetime.now().isoformat(),
-                    "ng_code": ng_code,
-                }
-            ],
-        )
+        return namespace_id
 
-        # 4. 存儲
-        self.namespaces[namespace_id] = record
+    def register_many(
+        self,
+        specs: Iterable[NamespaceSpec],
+        hierarchical: bool = False,
+        verbose: bool = True,
+    ) -> List[str]:
+        """批量註冊命名空間
 
-        # 5. 保存
-        self._save_registry()
+        先驗證整批（與既有註冊及批內彼此），任一衝突則整批不寫入；
+        通過後一次追加日誌。
 
-        print(f"✅ 註冊命名空間: {spec.namespace_id} [{ng_code}]")
+        Args:
+            specs: 命名空間規範
+            hierarchical: 是否同時拒絕祖先 / 後代衝突
+            verbose: 是否輸出摘要
 
-        return namespace_id
+        Returns:
+            命名空間 ID 列表（與輸入順序一致）
+        """
+        specs = list(specs)
+
+        # 1. 驗證唯一性
+        seen: Set[str] = set()
+        for spec in specs:
+            if spec.namespace_id in seen or self.check_conflict(
+                spec.namespace_id, hierarchical=hierarchical
+            ):
+                raise ValueError(f"命名空間衝突: {spec.namespace_id}")
+            seen.add(spec.namespace_id)
+
+        if hierarchical:
+            for spec in specs:
+                if any(prefix in seen for prefix in self._ancestors(spec.namespace_id)):
+                    raise ValueError(f"命名空間衝突: {spec.namespace_id}")
+
+        # 2. 生成 ID、NG 編碼並創建記錄
+        entries = []
+        namespace_ids = []
+        for spec in specs:
+            namespace_id = self._generate_namespace_id(spec)
+            ng_code = self._assign_ng_code(spec)
+            now = datetime.now().isoformat()
+
+            record = NamespaceRecord(
+                id=namespace_id,
+                ng_code=ng_code,
+                spec=spec,
+                status=NamespaceStatus.REGISTERED,
+                created_at=now,
+                updated_at=now,
+                audit_trail=[
+                    {
+                        "action": "registered",
+                        "timestamp": now,
+                        "ng_code": ng_code,
+                    }
+                ],
+            )
+
+            # 3. 存儲並建立索引
+            self._index_record(record)
+            entries.append({"op": "register", "record": record.to_dict()})
+            namespace_ids.append(namespace_id)
+
+        # 4. 持久化
+        self._append_journal(entries)
+
+        if verbose:
+            print(f"✅ 批量註冊 {len(namespace_ids)} 個命名空間")
+
+        return namespace_ids
 
     def _generate_namespace_id(self, spec: NamespaceSpec) -> str:
         """生成命名空間 ID"""
@@ -223,8 +448,8 @@ class NgNamespaceRegistry:
 
         return f"{namespace_str}-{unique_id}"
 
-    def _assign_ng_code(self, spec: NamespaceSpec) -> str:
-        """分配 NG 編碼"""
+    def _ng_code_key(self, spec: NamespaceSpec) -> str:
+        """NG 編碼序列鍵（Era 層級 + 領域）"""
         # 根據 Era 確定層級
         era_mapping = {Era.ERA_1: 100, Era.ERA_2: 300, Era.ERA_3: 600, Era.CROSS: 900}
 
@@ -241,8 +466,14 @@ class NgNamespaceRegistry:
 
         domain_code = domain_map.get(spec.domain, 0)
 
+        return f"{base_level}_{domain_code}"
+
+    def _assign_ng_code(self, spec: NamespaceSpec) -> str:
+        """分配 NG 編碼"""
+        key = self._ng_code_key(spec)
+        base_level, domain_code = (int(part) for part in key.split("_"))
+
         # 序列號（遞增）
-        key = f"{base_level}_{domain_code}"
         if key not in self.ng_code_counter:
             self.ng_code_counter[key] = 0
 
@@ -254,19 +485,38 @@ class NgNamespaceRegistry:
 
         return ng_code
 
-    def check_conflict(self, namespace_id: str) -> bool:
-        """檢查命名空間衝突"""
-        return any(
-            record.spec.namespace_id == namespace_id
-            for record in self.namespaces.values()
-        )
+    def check_conflict(self, namespace_id: str, hierarchical: bool = False) -> bool:
+        """檢查命名空間衝突
+
+        Args:
+            namespace_id: 規範命名空間 ID
+            hierarchical: 是否把已註冊的祖先 / 後代也視為衝突
+        """
+        if namespace_id in self._by_namespace:
+            return True
+        if not hierarchical:
+            return False
+        conflicts = self.find_conflicts(namespace_id)
+        return bool(conflicts["ancestors"] or conflicts["descendants"])
+
+    def find_conflicts(self, namespace_id: str) -> Dict[str, Any]:
+        """列出與 namespace_id 完全相同、為其祖先或後代的已註冊命名空間"""
+        return {
+            "exact": namespace_id in self._by_namespace,
+            "ancestors": [
+                prefix
+                for prefix in self._ancestors(namespace_id)
+                if prefix in self._by_namespace
+            ],
+            "descendants": sorted(self._descendants.get(namespace_id, ())),
+        }
 
     def get_namespace(self, namespace_id: str) -> Optional[NamespaceRecord]:
         """取得命名空間"""
-        for record in self.namespaces.values():
-            if record.spec.namespace_id == namespace_id or record.id == namespace_id:
-                return record
-        return None
+        ns_id = self._by_namespace.get(namespace_id)
+        if ns_id is not None:
+            return self.namespaces[ns_id]
+        return self.namespaces.get(namespace_id)
 
     def list_namespaces(
         self, era: Era = None, status: NamespaceStatus = None, domain: str = None
@@ -307,10 +557,22 @@ class NgNamespaceRegistry:
         # 更新狀態
         record.status = new_status
         record.updated_at = datetime.now().isoformat()
+        if record.audit_trail is None:
+            record.audit_trail = []
         record.audit_trail.append(audit_entry)
 
         # 保存
-        self._save_registry()
+        self._append_journal(
+            [
+                {
+                    "op": "status",
+                    "id": record.id,
+                    "status": new_status.value,
+                    "updated_at": record.updated_at,
+                    "audit": audit_entry,
+                }
+            ]
+        )
 
         print(f"✅ 更新命名空間狀態: {namespace_id} → {new_status.value}")
 
@@ -373,3 +635,6 @@ if __name__ == "__main__":
 
     except Exception as e:
         print(f"❌ 測試失敗: {e}")
+
+    finally:
+        registry.close()
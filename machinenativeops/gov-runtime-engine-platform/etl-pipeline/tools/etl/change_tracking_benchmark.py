@@ -0,0 +1,92 @@
+#
+# @GL-governed
+# @GL-layer: gov-platform.gov-platform.governance
+# @GL-semantic: change_tracking_benchmark
+# @GL-audit-trail: ../../engine/gov-platform.gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+"""
+Change Tracking Benchmark
+GL-Layer: GL90-99 (Meta - Validation)
+Closure-Signal: metrics
+Diffs two generations of a synthetic dataset (1% updates, 0.5% deletes,
+0.5% creates) with the in-memory track_changes() and with the
+fingerprint-store track_changes_stream(). Each run is a separate process so
+peak RSS is measured independently. The in-memory diff holds both states,
+so keep --legacy-records within available memory.
+Usage: python tools/etl/change_tracking_benchmark.py [--records N] [--legacy-records N]
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+PROJECT_ROOT = Path(__file__).resolve().parents[2] / 'workspace' / 'projects' / 'etl-pipeline'
+sys.path.insert(0, str(PROJECT_ROOT))
+def generation(records: int, version: int) -> Iterator[Dict[str, Any]]:
+    """Version 0 is the baseline; version 1 applies the changes."""
+    for i in range(records):
+        if version and i % 200 == 7:
+            continue
+        record = {'id': i, 'name': f'user-{i}', 'score': i % 1000, 'region': ('eu', 'us', 'ap')[i % 3]}
+        if version and i % 100 == 3:
+            record['score'] += 1
+        yield record
+    if version:
+        for i in range(records, records + records // 200):
+            yield {'id': i, 'name': f'user-{i}', 'score': 0, 'region': 'eu'}
+def peak_rss_mb() -> float:
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+def run_legacy(records: int) -> Dict[str, Any]:
+    from src.sync.change_tracking import ChangeTracker
+    tracker = ChangeTracker({})
+    previous = list(generation(records, 0))
+    current = list(generation(records, 1))
+    start = time.perf_counter()
+    changes = tracker.track_changes(current, previous)
+    elapsed = time.perf_counter() - start
+    return {'changes': len(changes), 'seconds': elapsed, 'evidence': len(tracker.evidence_chain)}
+def run_stream(records: int, store: str) -> Dict[str, Any]:
+    from src.sync.change_tracking import ChangeTracker
+    tracker = ChangeTracker({'fingerprint_store': store})
+    for _ in tracker.track_changes_stream(generation(records, 0)):
+        pass
+    evidence_before = len(tracker.evidence_chain)
+    start = time.perf_counter()
+    changes = sum(len(batch) for batch in tracker.track_changes_stream(generation(records, 1)))
+    elapsed = time.perf_counter() - start
+    return {'changes': changes, 'seconds': elapsed, 'evidence': len(tracker.evidence_chain) - evidence_before}
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=5_000_000)
+    parser.add_argument('--legacy-records', type=int, default=500_000)
+    parser.add_argument('--run', choices=['legacy', 'stream'], help=argparse.SUPPRESS)
+    parser.add_argument('--store', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if args.run:
+        report = run_legacy(args.records) if args.run == 'legacy' else run_stream(args.records, args.store)
+        report.update({'mode': args.run, 'records': args.records, 'peak_rss_mb': peak_rss_mb()})
+        print(json.dumps(report))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [('legacy', args.legacy_records), ('stream', args.legacy_records), ('stream', args.records)]
+        for index, (mode, records) in enumerate(runs):
+            completed = subprocess.run(
+                [sys.executable, __file__, '--run', mode, '--records', str(records),
+                 '--store', os.path.join(tmp, f'fingerprints-{index}.db')],
+                capture_output=True, text=True, check=True
+            )
+            report = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(
+                f"{report['mode']:<7} {report['records']:>9} records  diff {report['seconds']:7.2f}s  "
+                f"{report['records'] / report['seconds']:>9,.0f} rec/s  changes {report['changes']:>7}  "
+                f"evidence {report['evidence']:>7}  peak RSS {report['peak_rss_mb']:8.1f} MiB"
+            )
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#
+# @GL-governed
+# @GL-layer: gov-platform.gov-platform.governance
+# @GL-semantic: etl_streaming_benchmark
+# @GL-audit-trail: ../../engine/gov-platform.gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+"""
+ETL Streaming Benchmark
+GL-Layer: GL90-99 (Meta - Validation)
+Closure-Signal: metrics
+Compares ETLPipeline batch mode (whole dataset in memory) with streaming mode
+on a generated Apache access log. Each mode runs in its own process so peak
+RSS is measured independently.
+Usage: python tools/etl/etl_streaming_benchmark.py [--lines N] [--batch-size N]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+PROJECT_ROOT = Path(__file__).resolve().parents[2] / 'workspace' / 'projects' / 'etl-pipeline'
+sys.path.insert(0, str(PROJECT_ROOT))
+def generate_log(path: Path, lines: int):
+    """Write a synthetic Apache combined log."""
+    rng = random.Random(42)
+    methods = ['GET', 'POST', 'PUT', 'DELETE']
+    paths = [f'/api/v1/resource/{i}' for i in range(500)]
+    agents = ['Mozilla/5.0', 'curl/8.0', 'python-requests/2.31']
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(lines):
+            f.write(
+                f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)} - - '
+                f'[10/Oct/2024:13:{i // 60 % 60:02d}:{i % 60:02d} +0000] '
+                f'"{rng.choice(methods)} {rng.choice(paths)}?req={i} HTTP/1.1" '
+                f'{rng.choice((200, 200, 200, 301, 404, 500))} {rng.randrange(100, 50000)} '
+                f'"-" "{rng.choice(agents)}"\n'
+            )
+def run_mode(mode: str, log_file: str, batch_size: int, output: str) -> Dict[str, Any]:
+    from src.extractors.log_extractors import ApacheLogExtractor
+    from src.transformers.data_transformer import DataCleaner, BusinessRuleApplier
+    from src.loaders.base_loader import BaseLoader
+    from src.pipeline.etl_pipeline import ETLPipeline
+    class JsonLinesLoader(BaseLoader):
+        """Appends records to a local JSON-lines file."""
+        def connect(self) -> bool:
+            self._handle = open(self.config['path'], 'w', encoding='utf-8')
+            return True
+        def load(self, data: List[Dict[str, Any]], table_name: Optional[str] = None) -> bool:
+            self._handle.writelines(json.dumps(record) + '\n' for record in data)
+            self.metrics['records_loaded'] += len(data)
+            return True
+        def disconnect(self) -> bool:
+            handle = getattr(self, '_handle', None)
+            if handle is not None:
+                handle.close()
+                self._handle = None
+            return True
+    pipeline = ETLPipeline({
+        'name': 'streaming-benchmark',
+        'execution_mode': mode,
+        'streaming': {'batch_size': batch_size}
+    })
+    pipeline.add_extractor(ApacheLogExtractor({
+        'name': 'apache-log', 'log_file': log_file, 'max_lines': float('inf')
+    }))
+    pipeline.add_transformer(DataCleaner({'name': 'cleaner', 'remove_duplicates': True}))
+    pipeline.add_transformer(BusinessRuleApplier({
+        'name': 'rules',
+        'rules': [{'actions': [{'type': 'transform_field', 'field': 'method', 'transformation': 'lowercase'}]}]
+    }))
+    pipeline.add_loader(JsonLinesLoader({'name': 'jsonl', 'path': output}))
+    start = time.perf_counter()
+    results = pipeline.execute()
+    elapsed = time.perf_counter() - start
+    records = results['total_records_processed']
+    return {
+        'mode': mode,
+        'records': records,
+        'seconds': round(elapsed, 2),
+        'records_per_second': round(records / elapsed),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'batches': len(results.get('batch_metrics', [])) or 1
+    }
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=2_000_000)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--log-file', help='Use an existing log file instead of generating one')
+    parser.add_argument('--run', choices=['batch', 'streaming'], help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if args.run:
+        print(json.dumps(run_mode(args.run, args.log_file, args.batch_size, args.output)))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = args.log_file
+        if not log_file:
+            log_file = os.path.join(tmp, 'access.log')
+            generate_log(Path(log_file), args.lines)
+        print(f"log file: {log_file} ({os.path.getsize(log_file) / 1024 / 1024:.0f} MiB)")
+        for mode in ('batch', 'streaming'):
+            completed = subprocess.run(
+                [sys.executable, __file__, '--run', mode, '--log-file', log_file,
+                 '--batch-size', str(args.batch_size), '--output', os.path.join(tmp, f'{mode}.jsonl')],
+                capture_output=True, text=True, check=True
+            )
+            report = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(
+                f"{report['mode']:<10} {report['records']:>9} records  {report['seconds']:7.2f}s  "
+                f"{report['records_per_second']:>8}/s  peak RSS {report['peak_rss_mb']:8.1f} MiB  "
+                f"batches {report['batches']}"
+            )
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#
+# @GL-governed
+# @GL-layer: gov-platform.gov-platform.governance
+# @GL-semantic: log_extraction_benchmark
+# @GL-audit-trail: ../../engine/gov-platform.gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+"""
+Log Extraction Benchmark
+GL-Layer: GL90-99 (Meta - Validation)
+Closure-Signal: metrics
+Measures lines/sec of ApacheLogExtractor on a generated multi-GB access log:
+the previous line-by-line reader with strptime timestamps, the serial
+reader, the parallel byte-range reader, and an incremental run that only
+reads lines appended after an offset checkpoint. Each run is a separate
+process so peak RSS is measured independently.
+Usage: python tools/etl/log_extraction_benchmark.py [--size-gb 2] [--workers N] [--append-lines N]
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+PROJECT_ROOT = Path(__file__).resolve().parents[2] / 'workspace' / 'projects' / 'etl-pipeline'
+sys.path.insert(0, str(PROJECT_ROOT))
+METHODS = ('GET', 'GET', 'GET', 'POST', 'PUT', 'DELETE')
+STATUSES = (200, 200, 200, 301, 404, 500)
+AGENTS = ('Mozilla/5.0 (X11; Linux x86_64)', 'curl/8.0', 'python-requests/2.31')
+def log_line(i: int) -> str:
+    return (
+        f'10.{i % 251}.{i % 241}.{i % 239} - - '
+        f'[{1 + i // 86400 % 28:02d}/Oct/2024:{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d} +0000] '
+        f'"{METHODS[i % 6]} /api/v1/resource/{i % 500}?req={i} HTTP/1.1" {STATUSES[i % 7 % 6]} {100 + i % 49900} '
+        f'"-" "{AGENTS[i % 3]}"\n'
+    )
+def generate_log(path: str, size_bytes: int, first_line: int = 0) -> int:
+    """Append lines to `path` until it reaches size_bytes; returns the next line number."""
+    i = first_line
+    with open(path, 'a', encoding='utf-8') as f:
+        written = f.tell()
+        while written < size_bytes:
+            block = ''.join(log_line(n) for n in range(i, i + 10000))
+            f.write(block)
+            written += len(block)
+            i += 10000
+    return i
+def legacy_lines(log_file: str) -> int:
+    """The reader as it was before: text-mode line loop, regex, strptime per line."""
+    from src.extractors.log_extractors import ApacheLogExtractor
+    pattern = ApacheLogExtractor({'log_file': log_file}).pattern
+    records = 0
+    with open(log_file, 'rt', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            match = pattern.match(line.strip())
+            if match:
+                record = match.groupdict()
+                try:
+                    record['timestamp'] = datetime.strptime(record['timestamp'], '%d/%b/%Y:%H:%M:%S %z').isoformat()
+                except Exception:
+                    pass
+                record['status'] = int(record['status'])
+                record['size'] = int(record.get('size', 0))
+                records += 1
+    return records
+def run_mode(mode: str, log_file: str, workers: int, checkpoint: str) -> Dict[str, Any]:
+    from src.extractors.log_extractors import ApacheLogExtractor
+    start = time.perf_counter()
+    if mode == 'legacy':
+        records = lines = legacy_lines(log_file)
+    else:
+        extractor = ApacheLogExtractor({
+            'name': 'apache-log', 'log_file': log_file, 'max_lines': None,
+            'parallel_workers': workers if mode == 'parallel' else 1,
+            'offset_checkpoint': checkpoint if mode == 'incremental' else None
+        })
+        records = sum(1 for _ in extractor.iter_records())
+        extractor.commit_checkpoint()
+        lines = extractor._lines_read
+    elapsed = time.perf_counter() - start
+    return {
+        'mode': mode,
+        'records': records,
+        'lines': lines,
+        'seconds': round(elapsed, 2),
+        'lines_per_second': round(lines / elapsed) if elapsed else 0,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-gb', type=float, default=2.0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--append-lines', type=int, default=100_000)
+    parser.add_argument('--log-file', help='Use an existing log file instead of generating one')
+    parser.add_argument('--run', choices=['legacy', 'serial', 'parallel', 'incremental'], help=argparse.SUPPRESS)
+    parser.add_argument('--checkpoint', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if args.run:
+        print(json.dumps(run_mode(args.run, args.log_file, args.workers, args.checkpoint)))
+        return
+    def run(mode: str, log_file: str, checkpoint: str) -> Dict[str, Any]:
+        completed = subprocess.run(
+            [sys.executable, __file__, '--run', mode, '--log-file', log_file,
+             '--workers', str(args.workers), '--checkpoint', checkpoint],
+            capture_output=True, text=True, check=True
+        )
+        report = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(
+            f"{report['mode']:<12} {report['lines']:>11,} lines  {report['seconds']:8.2f}s  "
+            f"{report['lines_per_second']:>10,} lines/s  peak RSS {report['peak_rss_mb']:7.1f} MiB"
+        )
+        return report
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = args.log_file
+        next_line = 0
+        if not log_file:
+            log_file = os.path.join(tmp, 'access.log')
+            start = time.perf_counter()
+            next_line = generate_log(log_file, int(args.size_gb * 1024 ** 3))
+            print(f"generated {next_line:,} lines in {time.perf_counter() - start:.1f}s")
+        print(f"log file: {log_file} ({os.path.getsize(log_file) / 1024 ** 3:.2f} GiB), workers: {args.workers}")
+        checkpoint = os.path.join(tmp, 'access.offset.json')
+        for mode in ('legacy', 'serial', 'parallel'):
+            run(mode, log_file, checkpoint)
+        if args.log_file:
+            return
+        run('incremental', log_file, checkpoint)
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.writelines(log_line(i) for i in range(next_line, next_line + args.append_lines))
+        report = run('incremental', log_file, checkpoint)
+        assert report['lines'] == args.append_lines, report
+if __name__ == '__main__':
+    main()
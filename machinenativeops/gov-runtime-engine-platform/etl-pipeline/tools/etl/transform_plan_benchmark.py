@@ -0,0 +1,100 @@
+#
+# @GL-governed
+# @GL-layer: gov-platform.gov-platform.governance
+# @GL-semantic: transform_plan_benchmark
+# @GL-audit-trail: ../../engine/gov-platform.gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+"""
+Transform Plan Benchmark
+GL-Layer: GL90-99 (Meta - Validation)
+Closure-Signal: metrics
+Measures records/sec of DataValidator, DataCleaner, SchemaNormalizer and
+BusinessRuleApplier on one batch of synthetic records (5% invalid, 1%
+duplicates). Every stage gets a fresh copy of the batch; only the stage
+call itself is timed.
+Usage: python tools/etl/transform_plan_benchmark.py [--records 1000000] [--repeat 3]
+"""
+import argparse
+import copy
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+PROJECT_ROOT = Path(__file__).resolve().parents[2] / 'workspace' / 'projects' / 'etl-pipeline'
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.transformers.data_transformer import BusinessRuleApplier, DataCleaner, SchemaNormalizer  # noqa: E402
+from src.transformers.data_validator import DataValidator  # noqa: E402
+def generate(records: int) -> List[Dict[str, Any]]:
+    data = []
+    for i in range(records):
+        j = i - 7 if i % 100 == 7 else i
+        record = {
+            'id': j,
+            'email': f' user{j}@example.com ',
+            'name': f'User {j}',
+            'age': str(18 + j % 60),
+            'score': j % 1000 / 10,
+            'country': ('us', 'de', 'jp', 'br')[j % 4],
+            'active': 'true' if j % 3 else 'false',
+            'signup': f'2024-{1 + j % 12:02d}-{1 + j % 28:02d} 12:00:00',
+            'note': None if j % 5 else ''
+        }
+        if i % 20 == 3:
+            record['email'] = None
+            record['score'] = 'n/a'
+        data.append(record)
+    return data
+VALIDATOR = {
+    'validation_rules': {
+        'required_fields': ['id', 'email', 'name'],
+        'field_rules': {
+            'id': {'type': 'integer'},
+            'email': {'type': 'string'},
+            'name': {'type': 'string'},
+            'score': {'type': 'float'},
+            'country': {'type': 'string'}
+        }
+    }
+}
+NORMALIZER = {
+    'target_schema': {
+        'user_id': {'required': True}, 'email': {'required': True}, 'name': {},
+        'age': {}, 'score': {}, 'is_active': {}, 'signup_at': {}, 'tier': {}
+    },
+    'rename_fields': {'user_id': 'id', 'is_active': 'active', 'signup_at': 'signup'},
+    'type_conversions': {'user_id': 'string', 'age': 'integer', 'score': 'float', 'is_active': 'boolean'},
+    'default_values': {'tier': 'free'}
+}
+RULES = {
+    'rules': [
+        {'name': 'normalize-country', 'actions': [{'type': 'transform_field', 'field': 'country', 'transformation': 'uppercase'}]},
+        {'name': 'eu', 'condition': {'field': 'country', 'operator': 'in', 'value': ['DE', 'FR']},
+         'actions': [{'type': 'set_field', 'field': 'region', 'value': 'eu'}]},
+        {'name': 'active', 'condition': {'field': 'active', 'operator': 'equals', 'value': 'true'},
+         'actions': [{'type': 'set_field', 'field': 'segment', 'value': 'engaged'}]},
+        {'name': 'drop-note', 'actions': [{'type': 'remove_field', 'field': 'note'}]}
+    ]
+}
+def measure(name: str, data: List[Dict[str, Any]], repeat: int, run: Callable[[List[Dict[str, Any]]], Any]):
+    best = None
+    for _ in range(repeat):
+        batch = copy.deepcopy(data)
+        start = time.perf_counter()
+        run(batch)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<20} {len(data):>9,} records  {best:7.2f}s  {len(data) / best:>11,.0f} records/s")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    data = generate(args.records)
+    measure('DataValidator', data, args.repeat, lambda batch: DataValidator(VALIDATOR)._validate_records(batch))
+    measure('DataCleaner', data, args.repeat, DataCleaner({'remove_duplicates': True}).transform)
+    measure('SchemaNormalizer', data, args.repeat, SchemaNormalizer(NORMALIZER).transform)
+    measure('BusinessRuleApplier', data, args.repeat, BusinessRuleApplier(RULES).transform)
+if __name__ == '__main__':
+    main()
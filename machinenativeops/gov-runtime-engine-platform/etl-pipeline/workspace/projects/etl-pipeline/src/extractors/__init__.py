@@ -12,7 +12,7 @@ Closure-Signal: artifact
 from .base_extractor import BaseExtractor
 from .database_extractors import PostgresExtractor, MySQLExtractor, MongoExtractor
 from .api_extractors import RestAPIExtractor, GraphQLExtractor
-from .log_extractors import ApacheLogExtractor, NginxLogExtractor, ApplicationLogExtractor
+from .log_extractors import LogFileExtractor, ApacheLogExtractor, NginxLogExtractor, ApplicationLogExtractor
 __all__ = [
     'BaseExtractor',
     'PostgresExtractor',
@@ -20,6 +20,7 @@ __all__ = [
     'MongoExtractor',
     'RestAPIExtractor',
     'GraphQLExtractor',
+    'LogFileExtractor',
     'ApacheLogExtractor',
     'NginxLogExtractor',
     'ApplicationLogExtractor'
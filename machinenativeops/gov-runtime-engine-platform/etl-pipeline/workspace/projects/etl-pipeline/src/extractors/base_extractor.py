@@ -10,9 +10,10 @@ GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 import logging
 from datetime import datetime
+from itertools import islice
 import hashlib
 import json
 logger = logging.getLogger(__name__)
@@ -57,6 +58,51 @@ class BaseExtractor(ABC):
             List of extracted records
         """
         pass
+    def iter_records(self, query: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate extracted records.
+        Defaults to iterating extract(); sources that can read incrementally
+        override this so streaming never materializes the full result.
+        Args:
+            query: Optional query or filter criteria
+        Returns:
+            Iterator of records
+        """
+        return iter(self.extract(query))
+    def extract_batches(self, query: Optional[str] = None, batch_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Extract data as bounded batches.
+        Args:
+            query: Optional query or filter criteria
+            batch_size: Maximum records per batch
+        Returns:
+            Iterator of record batches
+        """
+        records = self.iter_records(query)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            yield batch
+    def checkpoint_position(self) -> Optional[Any]:
+        """
+        Snapshot the source position after the last record handed out.
+        Sources without resumable positions return None.
+        Returns:
+            Opaque position to pass to commit_checkpoint()
+        """
+        return None
+    def commit_checkpoint(self, position: Optional[Any] = None):
+        """
+        Persist a consumed position once its records are safely loaded.
+        Called by the pipeline after every loader accepted a batch, never
+        by the extractor itself, so records that were read but not loaded
+        are read again on the next run.
+        Args:
+            position: Snapshot from checkpoint_position(), defaults to the
+                position after the last record handed out
+        """
+        pass
     @abstractmethod
     def disconnect(self) -> bool:
         """
@@ -81,7 +127,7 @@ class BaseExtractor(ABC):
             'operation': operation,
             'details': details
         }
-        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True).encode()).hexdigest()
+        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True, default=str).encode()).hexdigest()
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         logger.info(f"Evidence generated: {evidence_hash}")
@@ -159,4 +205,43 @@ class BaseExtractor(ABC):
             # Disconnect
             self.disconnect()
             self.metrics['end_time'] = datetime.utcnow()
-            self.generate_evidence('extraction_end', self.get_metrics())
\ No newline at end of file
+            self.generate_evidence('extraction_end', self.get_metrics())
+    def execute_batches(self, query: Optional[str] = None, batch_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute extraction workflow in streaming mode.
+        Same connect/validate/disconnect lifecycle as execute(), but yields
+        validated batches of at most batch_size records. Evidence is generated
+        per stream, not per batch.
+        Args:
+            query: Optional query or filter criteria
+            batch_size: Maximum records per batch
+        Returns:
+            Iterator of validated record batches
+        """
+        self.metrics['start_time'] = datetime.utcnow()
+        self.metrics['records_extracted'] = 0
+        self.metrics['batches_extracted'] = 0
+        self.generate_evidence('extraction_start', {'query': query, 'batch_size': batch_size})
+        try:
+            if not self.connect():
+                raise Exception("Connection failed")
+            self.generate_evidence('connection_success', {})
+            for batch in self.extract_batches(query, batch_size):
+                if not self.validate_data(batch):
+                    raise Exception("Data validation failed")
+                self.metrics['records_extracted'] += len(batch)
+                self.metrics['batches_extracted'] += 1
+                yield batch
+            self.generate_evidence('extraction_complete', {
+                'record_count': self.metrics['records_extracted'],
+                'batch_count': self.metrics['batches_extracted']
+            })
+        except Exception as e:
+            self.metrics['errors'] += 1
+            logger.error(f"Extraction failed: {str(e)}")
+            self.generate_evidence('extraction_error', {'error': str(e)})
+            raise
+        finally:
+            self.disconnect()
+            self.metrics['end_time'] = datetime.utcnow()
+            self.generate_evidence('extraction_end', self.get_metrics())
@@ -10,30 +10,148 @@ GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
 import re
+import os
 import gzip
-from typing import Dict, Any, List, Optional
+import json
+import hashlib
+from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from .base_extractor import BaseExtractor
 logger = logging.getLogger(__name__)
-class ApacheLogExtractor(BaseExtractor):
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+# Bytes of the file head fingerprinted in the offset checkpoint
+_HEAD_BYTES = 4096
+@lru_cache(maxsize=1024)
+def _clf_date(date_str: str) -> Optional[str]:
+    """'10/Oct/2024' -> '2024-10-10', or None if it is not a valid date."""
+    try:
+        return date(int(date_str[7:11]), _MONTHS[date_str[3:6]], int(date_str[0:2])).isoformat()
+    except (KeyError, ValueError):
+        return None
+@lru_cache(maxsize=1024)
+def _iso_date(date_str: str) -> Optional[str]:
+    """Validate a 'YYYY-MM-DD' date."""
+    try:
+        return date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10])).isoformat()
+    except ValueError:
+        return None
+@lru_cache(maxsize=256)
+def _utc_offset(offset_str: str) -> Optional[str]:
+    """'+0530' -> '+05:30' as datetime.isoformat() renders it."""
+    if len(offset_str) != 5 or offset_str[0] not in '+-' or not offset_str[1:].isdigit():
+        return None
+    hours, minutes = int(offset_str[1:3]), int(offset_str[3:5])
+    if hours > 23 or minutes > 59:
+        return None
+    if hours == minutes == 0:
+        return '+00:00'
+    return f"{offset_str[0]}{offset_str[1:3]}:{offset_str[3:5]}"
+def _valid_time(time_str: str) -> bool:
+    """Check an 'HH:MM:SS' string without building a datetime."""
+    return (
+        len(time_str) == 8 and time_str[2] == ':' and time_str[5] == ':'
+        and time_str[0:2].isdigit() and time_str[3:5].isdigit() and time_str[6:8].isdigit()
+        and time_str[0:2] < '24' and time_str[3:5] < '60' and time_str[6:8] < '60'
+    )
+def parse_clf_timestamp(timestamp_str: str) -> str:
     """
-    Apache access log extractor.
+    Convert a common-log-format timestamp ('10/Oct/2024:13:55:36 +0000') to ISO 8601.
+    Well-formed timestamps are assembled from cached date and offset parts;
+    anything else goes through strptime, and unparseable values are returned
+    unchanged.
+    Args:
+        timestamp_str: Timestamp as written in the access log
+    Returns:
+        ISO 8601 timestamp string
+    """
+    if len(timestamp_str) == 26 and timestamp_str[11] == ':' and timestamp_str[20] == ' ':
+        day = _clf_date(timestamp_str[0:11])
+        offset = _utc_offset(timestamp_str[21:26])
+        if day is not None and offset is not None and _valid_time(timestamp_str[12:20]):
+            return f"{day}T{timestamp_str[12:20]}{offset}"
+    try:
+        return datetime.strptime(timestamp_str, '%d/%b/%Y:%H:%M:%S %z').isoformat()
+    except Exception:
+        return timestamp_str
+def parse_iso_timestamp(timestamp_str: str) -> str:
+    """
+    Convert a 'YYYY-MM-DD HH:MM:SS' timestamp to ISO 8601.
+    Args:
+        timestamp_str: Timestamp as written in the application log
+    Returns:
+        ISO 8601 timestamp string
+    """
+    if len(timestamp_str) == 19 and timestamp_str[10] == ' ' and timestamp_str[4] == '-' and timestamp_str[7] == '-':
+        if _iso_date(timestamp_str[0:10]) is not None and _valid_time(timestamp_str[11:19]):
+            return f"{timestamp_str[0:10]}T{timestamp_str[11:19]}"
+    try:
+        return datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S').isoformat()
+    except Exception:
+        return timestamp_str
+# Parser instance of a parallel-extraction worker process
+_range_extractor = None
+def _init_range_worker(extractor_cls: type, config: Dict[str, Any]):
+    global _range_extractor
+    _range_extractor = extractor_cls(config)
+def _parse_range(path: str, start: int, end: int) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Parse the complete lines in [start, end) of a log file in a worker process."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        lines = f.read(end - start).decode('utf-8', errors='ignore').split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+    parse_line = _range_extractor.parse_line
+    records = []
+    for line in lines:
+        record = parse_line(line.strip())
+        if record is not None:
+            records.append(record)
+    return records, len(lines), end
+class LogFileExtractor(BaseExtractor):
+    """
+    Base class for line-oriented log file extractors.
+    With `offset_checkpoint` configured, the byte offset, inode and head
+    fingerprint of the last loaded line are persisted, so each run reads
+    only data appended since the previous one. The position is saved by
+    commit_checkpoint(), which the pipeline calls once a batch is loaded;
+    reading alone never advances it. A rotated file is detected by
+    its inode and its unread tail is drained before the new file; a truncated
+    or rewritten file is read again from the start. Large uncompressed
+    ranges are parsed in parallel byte-range chunks split on line
+    boundaries when `max_lines` is unlimited.
     """
+    log_label = 'log'
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.log_file = config.get('log_file', '')
-        self.log_format = config.get('log_format', 'combined')
-        self.max_lines = config.get('max_lines', 10000)
-        self.log_patterns = {
-            'common': re.compile(
-                r'(?P<ip>\d+\.\d+\.\d+\.\d+) - - \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^\s]+) (?P<protocol>[^"]+)" (?P<status>\d+) (?P<size>\d+)'
-            ),
-            'combined': re.compile(
-                r'(?P<ip>\d+\.\d+\.\d+\.\d+) - - \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^\s]+) (?P<protocol>[^"]+)" (?P<status>\d+) (?P<size>\d+) "(?P<referer>[^"]*)" "(?P<user_agent>[^"]*)"'
-            )
-        }
+        max_lines = config.get('max_lines', 10000)
+        self.max_lines = float('inf') if max_lines is None else max_lines
+        checkpoint = config.get('offset_checkpoint')
+        self.offset_checkpoint = Path(checkpoint) if checkpoint else None
+        self.parallel_workers = int(config.get('parallel_workers', os.cpu_count() or 1))
+        self.parallel_min_bytes = int(config.get('parallel_min_bytes', 64 * 1024 * 1024))
+        self.parallel_chunk_bytes = int(config.get('parallel_chunk_bytes', 16 * 1024 * 1024))
+        self._position: Optional[Dict[str, Any]] = None
+        self._lines_read = 0
+    @abstractmethod
+    def parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse one stripped log line.
+        Args:
+            line: Log line without surrounding whitespace
+        Returns:
+            Parsed record, or None to skip the line
+        """
+        pass
     def connect(self) -> bool:
         """Verify log file exists and is readable."""
         try:
@@ -50,49 +168,234 @@ class ApacheLogExtractor(BaseExtractor):
             logger.error(f"Log file connection failed: {str(e)}")
             return False
     def extract(self, query: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Extract data from Apache log file."""
-        pattern = self.log_patterns.get(self.log_format, self.log_patterns['combined'])
+        """Extract data from the log file."""
+        records = list(self.iter_records(query))
+        logger.info(f"Extracted {len(records)} records from {self.log_label} log")
+        return records
+    def iter_records(self, query: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream parsed records from the log file.
+        The offset checkpoint is not saved here: the position of the records
+        handed out is available from checkpoint_position() and persisted by
+        commit_checkpoint() once they are loaded.
+        """
+        self._position = None
+        self._lines_read = 0
         try:
-            records = []
-            line_count = 0
-            open_func = gzip.open if self.log_file.endswith('.gz') else open
-            with open_func(self.log_file, 'rt', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    if line_count >= self.max_lines:
-                        break
-                    match = pattern.match(line.strip())
-                    if match:
-                        record = match.groupdict()
-                        record['timestamp'] = self._parse_timestamp(record['timestamp'])
-                        record['status'] = int(record['status'])
-                        record['size'] = int(record.get('size', 0))
-                        records.append(record)
-                    line_count += 1
-            logger.info(f"Extracted {len(records)} records from Apache log")
-            return records
+            stat = os.stat(self.log_file)
+            checkpoint = self._load_checkpoint()
+            start = 0
+            if checkpoint is not None:
+                if (checkpoint['inode'], checkpoint['device']) != (stat.st_ino, stat.st_dev):
+                    rotated = self._find_rotated(checkpoint)
+                    if rotated is None:
+                        logger.warning(f"{self.log_file} was rotated and the previous file is gone, reading from the start")
+                    else:
+                        logger.info(f"{self.log_file} was rotated, draining {rotated} from offset {checkpoint['offset']}")
+                        yield from self._read_segment(rotated, checkpoint['offset'])
+                        if self._lines_read >= self.max_lines:
+                            return
+                elif self._is_rewritten(checkpoint, stat):
+                    logger.info(f"{self.log_file} was truncated or rewritten, reading from the start")
+                else:
+                    start = checkpoint['offset']
+            yield from self._read_segment(self.log_file, start)
         except Exception as e:
-            logger.error(f"Apache log extraction failed: {str(e)}")
+            logger.error(f"{self.log_label.capitalize()} log extraction failed: {str(e)}")
             raise
+    def checkpoint_position(self) -> Optional[Dict[str, Any]]:
+        """Copy of the file position just past the last record handed out."""
+        return dict(self._position) if self._position is not None else None
+    def commit_checkpoint(self, position: Optional[Dict[str, Any]] = None):
+        """Persist a loaded position, by default the end of the last read."""
+        self._save_checkpoint(position if position is not None else self._position)
     def disconnect(self) -> bool:
         """No disconnection needed for file-based extraction."""
-        logger.info("Disconnected from Apache log file")
+        logger.info(f"Disconnected from {self.log_label} log file")
         return True
+    def _read_segment(self, path: str, start: int) -> Iterator[Dict[str, Any]]:
+        """Read one physical file from `start`, tracking the consumed offset."""
+        stat = os.stat(path)
+        head_length = min(stat.st_size, _HEAD_BYTES)
+        self._position = {
+            'path': str(Path(path).resolve()),
+            'inode': stat.st_ino,
+            'device': stat.st_dev,
+            'offset': start,
+            'size': stat.st_size,
+            'head_length': head_length,
+            'head_sha256': self._head_digest(path, head_length)
+        }
+        compressed = path.endswith('.gz')
+        if (not compressed and self.parallel_workers > 1 and self.max_lines == float('inf')
+                and stat.st_size - start >= self.parallel_min_bytes):
+            yield from self._read_parallel(path, start, stat.st_size)
+        else:
+            yield from self._read_serial(path, start, compressed)
+    def _read_serial(self, path: str, start: int, compressed: bool) -> Iterator[Dict[str, Any]]:
+        open_func = gzip.open if compressed else open
+        # A trailing line without newline may still be being written; leave it for the next run
+        complete_lines_only = self.offset_checkpoint is not None
+        with open_func(path, 'rb') as f:
+            if start:
+                f.seek(start)
+            offset = start
+            for raw in f:
+                if self._lines_read >= self.max_lines:
+                    break
+                if complete_lines_only and not raw.endswith(b'\n'):
+                    break
+                offset += len(raw)
+                self._lines_read += 1
+                self._position['offset'] = offset
+                record = self.parse_line(raw.decode('utf-8', errors='ignore').strip())
+                if record is not None:
+                    yield record
+    def _read_parallel(self, path: str, start: int, size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Parse [start, size) in line-aligned chunks on a process pool.
+        Chunks are yielded in file order with at most two per worker in
+        flight. The tracked offset advances once a chunk is fully handed
+        out, so a position taken mid-chunk re-reads that chunk on the next run.
+        """
+        end = size if self.offset_checkpoint is None else self._last_line_end(path, start, size)
+        ranges = self._split_ranges(path, start, end)
+        logger.info(f"Parsing {end - start} bytes of {path} in {len(ranges)} chunks on {self.parallel_workers} workers")
+        pool = ProcessPoolExecutor(
+            max_workers=self.parallel_workers,
+            initializer=_init_range_worker,
+            initargs=(type(self), self.config)
+        )
+        pending: deque = deque()
+        try:
+            for range_start, range_end in ranges:
+                pending.append(pool.submit(_parse_range, path, range_start, range_end))
+                if len(pending) >= self.parallel_workers * 2:
+                    yield from self._drain_chunk(pending.popleft())
+            while pending:
+                yield from self._drain_chunk(pending.popleft())
+        finally:
+            pool.shutdown(cancel_futures=True)
+    def _drain_chunk(self, future: Future) -> Iterator[Dict[str, Any]]:
+        records, lines, end = future.result()
+        self._lines_read += lines
+        yield from records
+        self._position['offset'] = end
+    def _split_ranges(self, path: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Split [start, end) into chunks that each end just after a newline."""
+        ranges = []
+        with open(path, 'rb') as f:
+            while start < end:
+                boundary = start + self.parallel_chunk_bytes
+                if boundary >= end:
+                    boundary = end
+                else:
+                    f.seek(boundary)
+                    f.readline()
+                    boundary = min(f.tell(), end)
+                ranges.append((start, boundary))
+                start = boundary
+        return ranges
+    def _last_line_end(self, path: str, start: int, size: int) -> int:
+        """Offset just past the last newline in [start, size)."""
+        block = 64 * 1024
+        with open(path, 'rb') as f:
+            position = size
+            while position > start:
+                read_from = max(start, position - block)
+                f.seek(read_from)
+                index = f.read(position - read_from).rfind(b'\n')
+                if index != -1:
+                    return read_from + index + 1
+                position = read_from
+        return start
+    def _head_digest(self, path: str, length: int) -> str:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read(length)).hexdigest()
+    def _is_rewritten(self, checkpoint: Dict[str, Any], stat: os.stat_result) -> bool:
+        """A log only grows: a smaller file or a different head means it was truncated."""
+        if stat.st_size < checkpoint['size']:
+            return True
+        if not self.log_file.endswith('.gz') and stat.st_size < checkpoint['offset']:
+            return True
+        return self._head_digest(self.log_file, checkpoint['head_length']) != checkpoint['head_sha256']
+    def _find_rotated(self, checkpoint: Dict[str, Any]) -> Optional[str]:
+        """Locate the checkpointed file after rotation renamed it (access.log.1, access.log-20240101)."""
+        current = Path(self.log_file)
+        for candidate in sorted(current.parent.glob(current.name + '*')):
+            if candidate.name == current.name:
+                continue
+            try:
+                stat = candidate.stat()
+            except OSError:
+                continue
+            if (stat.st_ino, stat.st_dev) == (checkpoint['inode'], checkpoint['device']):
+                return str(candidate)
+        return None
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if self.offset_checkpoint is None or not self.offset_checkpoint.exists():
+            return None
+        try:
+            checkpoint = json.loads(self.offset_checkpoint.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable offset checkpoint {self.offset_checkpoint}: {str(e)}")
+            return None
+        if checkpoint.get('log_file') != str(Path(self.log_file).resolve()):
+            logger.info("Offset checkpoint belongs to a different log file, reading from the start")
+            return None
+        return checkpoint
+    def _save_checkpoint(self, position: Optional[Dict[str, Any]]):
+        """Persist a position atomically."""
+        if self.offset_checkpoint is None or position is None:
+            return
+        checkpoint = dict(position)
+        checkpoint['log_file'] = str(Path(self.log_file).resolve())
+        checkpoint['updated_at'] = datetime.utcnow().isoformat()
+        self.offset_checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.offset_checkpoint.with_suffix(self.offset_checkpoint.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.offset_checkpoint)
+class ApacheLogExtractor(LogFileExtractor):
+    """
+    Apache access log extractor.
+    """
+    log_label = 'Apache'
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.log_format = config.get('log_format', 'combined')
+        self.log_patterns = {
+            'common': re.compile(
+                r'(?P<ip>\d+\.\d+\.\d+\.\d+) - - \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^\s]+) (?P<protocol>[^"]+)" (?P<status>\d+) (?P<size>\d+)'
+            ),
+            'combined': re.compile(
+                r'(?P<ip>\d+\.\d+\.\d+\.\d+) - - \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^\s]+) (?P<protocol>[^"]+)" (?P<status>\d+) (?P<size>\d+) "(?P<referer>[^"]*)" "(?P<user_agent>[^"]*)"'
+            )
+        }
+        self.pattern = self.log_patterns.get(self.log_format, self.log_patterns['combined'])
+    def parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Parse one Apache access log line."""
+        match = self.pattern.match(line)
+        if not match:
+            return None
+        record = match.groupdict()
+        record['timestamp'] = self._parse_timestamp(record['timestamp'])
+        record['status'] = int(record['status'])
+        record['size'] = int(record.get('size', 0))
+        return record
     def _parse_timestamp(self, timestamp_str: str) -> str:
         """Parse Apache log timestamp."""
-        try:
-            dt = datetime.strptime(timestamp_str, '%d/%b/%Y:%H:%M:%S %z')
-            return dt.isoformat()
-        except Exception:
-            return timestamp_str
-class NginxLogExtractor(BaseExtractor):
+        return parse_clf_timestamp(timestamp_str)
+class NginxLogExtractor(LogFileExtractor):
     """
     Nginx access log extractor.
     """
+    log_label = 'Nginx'
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.log_file = config.get('log_file', '')
         self.log_format = config.get('log_format', 'combined')
-        self.max_lines = config.get('max_lines', 10000)
         self.log_patterns = {
             'combined': re.compile(
                 r'(?P<ip>\d+\.\d+\.\d+\.\d+) - (?P<user>[^\s]+) \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^\s]+) (?P<protocol>[^"]+)" (?P<status>\d+) (?P<size>\d+) "(?P<referer>[^"]*)" "(?P<user_agent>[^"]*)"'
@@ -101,111 +404,42 @@ class NginxLogExtractor(BaseExtractor):
                 r'(?P<ip>\d+\.\d+\.\d+\.\d+) - - \[(?P<timestamp>[^\]]+)\] "(?P<method>\w+) (?P<path>[^\s]+) (?P<protocol>[^"]+)" (?P<status>\d+) (?P<size>\d+)'
             )
         }
-    def connect(self) -> bool:
-        """Verify log file exists and is readable."""
-        try:
-            log_path = Path(self.log_file)
-            if not log_path.exists():
-                logger.error(f"Log file not found: {self.log_file}")
-                return False
-            logger.info(f"Connected to log file: {self.log_file}")
-            return True
-        except Exception as e:
-            logger.error(f"Log file connection failed: {str(e)}")
-            return False
-    def extract(self, query: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Extract data from Nginx log file."""
-        pattern = self.log_patterns.get(self.log_format, self.log_patterns['combined'])
-        try:
-            records = []
-            line_count = 0
-            open_func = gzip.open if self.log_file.endswith('.gz') else open
-            with open_func(self.log_file, 'rt', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    if line_count >= self.max_lines:
-                        break
-                    match = pattern.match(line.strip())
-                    if match:
-                        record = match.groupdict()
-                        record['timestamp'] = self._parse_timestamp(record['timestamp'])
-                        record['status'] = int(record['status'])
-                        record['size'] = int(record.get('size', 0))
-                        records.append(record)
-                    line_count += 1
-            logger.info(f"Extracted {len(records)} records from Nginx log")
-            return records
-        except Exception as e:
-            logger.error(f"Nginx log extraction failed: {str(e)}")
-            raise
-    def disconnect(self) -> bool:
-        """No disconnection needed for file-based extraction."""
-        logger.info("Disconnected from Nginx log file")
-        return True
+        self.pattern = self.log_patterns.get(self.log_format, self.log_patterns['combined'])
+    def parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Parse one Nginx access log line."""
+        match = self.pattern.match(line)
+        if not match:
+            return None
+        record = match.groupdict()
+        record['timestamp'] = self._parse_timestamp(record['timestamp'])
+        record['status'] = int(record['status'])
+        record['size'] = int(record.get('size', 0))
+        return record
     def _parse_timestamp(self, timestamp_str: str) -> str:
         """Parse Nginx log timestamp."""
-        try:
-            dt = datetime.strptime(timestamp_str, '%d/%b/%Y:%H:%M:%S %z')
-            return dt.isoformat()
-        except Exception:
-            return timestamp_str
-class ApplicationLogExtractor(BaseExtractor):
+        return parse_clf_timestamp(timestamp_str)
+class ApplicationLogExtractor(LogFileExtractor):
     """
     Generic application log extractor.
     """
+    log_label = 'application'
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.log_file = config.get('log_file', '')
         self.log_pattern = config.get('log_pattern', r'(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(?P<level>\w+)\] (?P<message>.*)')
-        self.max_lines = config.get('max_lines', 10000)
         self.compiled_pattern = re.compile(self.log_pattern)
-    def connect(self) -> bool:
-        """Verify log file exists and is readable."""
-        try:
-            log_path = Path(self.log_file)
-            if not log_path.exists():
-                logger.error(f"Log file not found: {self.log_file}")
-                return False
-            logger.info(f"Connected to log file: {self.log_file}")
-            return True
-        except Exception as e:
-            logger.error(f"Log file connection failed: {str(e)}")
-            return False
-    def extract(self, query: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Extract data from application log file."""
-        try:
-            records = []
-            line_count = 0
-            open_func = gzip.open if self.log_file.endswith('.gz') else open
-            with open_func(self.log_file, 'rt', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    if line_count >= self.max_lines:
-                        break
-                    match = self.compiled_pattern.match(line.strip())
-                    if match:
-                        record = match.groupdict()
-                        record['timestamp'] = self._parse_timestamp(record['timestamp'])
-                        records.append(record)
-                    else:
-                        records.append({
-                            'raw_line': line.strip(),
-                            'timestamp': datetime.utcnow().isoformat(),
-                            'level': 'UNKNOWN',
-                            'message': line.strip()
-                        })
-                    line_count += 1
-            logger.info(f"Extracted {len(records)} records from application log")
-            return records
-        except Exception as e:
-            logger.error(f"Application log extraction failed: {str(e)}")
-            raise
-    def disconnect(self) -> bool:
-        """No disconnection needed for file-based extraction."""
-        logger.info("Disconnected from application log file")
-        return True
+    def parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Parse one application log line; unmatched lines are kept as raw records."""
+        match = self.compiled_pattern.match(line)
+        if match:
+            record = match.groupdict()
+            record['timestamp'] = self._parse_timestamp(record['timestamp'])
+            return record
+        return {
+            'raw_line': line,
+            'timestamp': datetime.utcnow().isoformat(),
+            'level': 'UNKNOWN',
+            'message': line
+        }
     def _parse_timestamp(self, timestamp_str: str) -> str:
         """Parse application log timestamp."""
-        try:
-            dt = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-            return dt.isoformat()
-        except Exception:
-            return timestamp_str
\ No newline at end of file
+        return parse_iso_timestamp(timestamp_str)
@@ -50,7 +50,7 @@ class MonitoringService:
             'operation': operation,
             'details': details
         }
-        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True).encode()).hexdigest()
+        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True, default=str).encode()).hexdigest()
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         logger.info(f"Evidence generated: {evidence_hash}")
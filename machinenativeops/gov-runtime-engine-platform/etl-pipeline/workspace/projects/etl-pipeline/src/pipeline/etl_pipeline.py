@@ -11,14 +11,21 @@ Closure-Signal: artifact, manifest
 """
 from typing import Dict, Any, List, Optional
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
 import json
 import hashlib
 from ..extractors.base_extractor import BaseExtractor
 from ..transformers.data_transformer import BaseTransformer
 from ..loaders.base_loader import BaseLoader
-from ..monitoring.monitoring_service import MonitoringService
+from ..monitoring.monitoring_service import MonitoringService, AlertSeverity
 logger = logging.getLogger(__name__)
+# Marks the end of a stage's output in streaming mode
+_END_OF_STREAM = object()
+class _StageFailure(Exception):
+    """Raised in the loading thread when an upstream stage has failed."""
 class ETLPipeline:
     """
     Complete ETL pipeline orchestration.
@@ -45,6 +52,11 @@ class ETLPipeline:
             'end_time': None,
             'status': 'idle'
         }
+        streaming = config.get('streaming', {})
+        self.execution_mode = config.get('execution_mode', 'batch')
+        self.batch_size = streaming.get('batch_size', 10000)
+        # Batches buffered between two stages; peak memory is about (2 * depth + 3) batches
+        self.queue_depth = streaming.get('queue_depth', 2)
     def add_extractor(self, extractor: BaseExtractor):
         """Add extractor to pipeline."""
         self.extractors.append(extractor)
@@ -65,6 +77,8 @@ class ETLPipeline:
         Returns:
             Pipeline execution results
         """
+        if self.execution_mode == 'streaming':
+            return self.execute_streaming(query)
         self.pipeline_metrics['start_time'] = datetime.utcnow()
         self.pipeline_metrics['status'] = 'running'
         self._generate_evidence('pipeline_start', {'extractors': len(self.extractors)})
@@ -98,7 +112,7 @@ class ETLPipeline:
                     logger.error(f"Extractor {extractor.extractor_name} failed: {str(e)}")
                     self.pipeline_metrics['total_errors'] += 1
                     self.monitoring.alert(
-                        severity='CRITICAL',
+                        severity=AlertSeverity.CRITICAL,
                         message=f"Extractor failed: {extractor.extractor_name}",
                         details={'error': str(e)}
                     )
@@ -119,7 +133,7 @@ class ETLPipeline:
                     logger.error(f"Transformer {transformer.transformer_name} failed: {str(e)}")
                     self.pipeline_metrics['total_errors'] += 1
                     self.monitoring.alert(
-                        severity='CRITICAL',
+                        severity=AlertSeverity.CRITICAL,
                         message=f"Transformer failed: {transformer.transformer_name}",
                         details={'error': str(e)}
                     )
@@ -141,11 +155,14 @@ class ETLPipeline:
                     logger.error(f"Loader {loader.loader_name} failed: {str(e)}")
                     self.pipeline_metrics['total_errors'] += 1
                     self.monitoring.alert(
-                        severity='CRITICAL',
+                        severity=AlertSeverity.CRITICAL,
                         message=f"Loader failed: {loader.loader_name}",
                         details={'error': str(e)}
                     )
                     raise
+            # Source positions are only persisted once every loader succeeded
+            for extractor in self.extractors:
+                extractor.commit_checkpoint()
             results['total_records_processed'] = len(data)
             results['total_errors'] = self.pipeline_metrics['total_errors']
             results['success'] = True
@@ -164,6 +181,227 @@ class ETLPipeline:
             duration = (self.pipeline_metrics['end_time'] - self.pipeline_metrics['start_time']).total_seconds()
             results['duration_seconds'] = duration
             self.monitoring.collect_pipeline_metrics(self.pipeline_name, self.pipeline_metrics)
+    def execute_streaming(self, query: Optional[str] = None, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Execute ETL pipeline in streaming mode.
+        Extraction, transformation and loading run in separate threads connected
+        by bounded queues, so different batches are in different stages at the
+        same time and at most a few batches are held in memory.
+        Args:
+            query: Optional query for extractors
+            batch_size: Records per batch, defaults to streaming.batch_size
+        Returns:
+            Pipeline execution results, including per-batch stage metrics
+        """
+        batch_size = batch_size or self.batch_size
+        self.pipeline_metrics['start_time'] = datetime.utcnow()
+        self.pipeline_metrics['status'] = 'running'
+        self._generate_evidence('pipeline_start', {
+            'extractors': len(self.extractors),
+            'mode': 'streaming',
+            'batch_size': batch_size
+        })
+        results = {
+            'pipeline_name': self.pipeline_name,
+            'pipeline_id': self.pipeline_id,
+            'execution_mode': 'streaming',
+            'batch_size': batch_size,
+            'extraction_results': [],
+            'transformation_results': [],
+            'loading_results': [],
+            'batch_metrics': [],
+            'total_records_processed': 0,
+            'total_errors': 0,
+            'duration_seconds': 0,
+            'success': False
+        }
+        extracted = queue.Queue(maxsize=self.queue_depth)
+        transformed = queue.Queue(maxsize=self.queue_depth)
+        stop = threading.Event()
+        failures = []
+        def fail(stage: str, component: str, error: Exception):
+            logger.error(f"{stage} {component} failed: {str(error)}")
+            failures.append(error)
+            self.pipeline_metrics['total_errors'] += 1
+            self.monitoring.alert(
+                severity=AlertSeverity.CRITICAL,
+                message=f"{stage} failed: {component}",
+                details={'error': str(error)}
+            )
+            stop.set()
+        def put(target: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        def get(source: queue.Queue) -> Any:
+            while True:
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        raise _StageFailure()
+        def extract_stage():
+            index = 0
+            try:
+                for extractor in self.extractors:
+                    batches = extractor.execute_batches(query, batch_size)
+                    try:
+                        while True:
+                            started = time.perf_counter()
+                            try:
+                                batch = next(batches)
+                            except StopIteration:
+                                break
+                            except Exception as e:
+                                fail('Extractor', extractor.extractor_name, e)
+                                return
+                            position = extractor.checkpoint_position()
+                            stats = {
+                                'batch': index,
+                                'extractor': extractor.extractor_name,
+                                'records_extracted': len(batch),
+                                'extract_ms': round((time.perf_counter() - started) * 1000, 3)
+                            }
+                            index += 1
+                            if not put(extracted, (stats, batch, (extractor, position))):
+                                return
+                    finally:
+                        batches.close()
+            finally:
+                put(extracted, _END_OF_STREAM)
+        def transform_stage():
+            try:
+                for transformer in self.transformers:
+                    transformer.begin_stream()
+                while True:
+                    item = get(extracted)
+                    if item is _END_OF_STREAM:
+                        break
+                    stats, batch, source = item
+                    started = time.perf_counter()
+                    for transformer in self.transformers:
+                        try:
+                            batch = transformer.execute_batch(batch)
+                        except Exception as e:
+                            fail('Transformer', transformer.transformer_name, e)
+                            return
+                    stats['records_transformed'] = len(batch)
+                    stats['transform_ms'] = round((time.perf_counter() - started) * 1000, 3)
+                    if not put(transformed, (stats, batch, source)):
+                        return
+            except _StageFailure:
+                return
+            finally:
+                for transformer in self.transformers:
+                    transformer.end_stream()
+                put(transformed, _END_OF_STREAM)
+        workers = [
+            threading.Thread(target=extract_stage, name=f"{self.pipeline_name}-extract", daemon=True),
+            threading.Thread(target=transform_stage, name=f"{self.pipeline_name}-transform", daemon=True)
+        ]
+        loaded = {id(loader): 0 for loader in self.loaders}
+        opened = []
+        total_records = 0
+        try:
+            default_table = self.config.get('target_table')
+            for loader in self.loaders:
+                try:
+                    loader.begin_stream(getattr(loader, 'target_table', None) or default_table)
+                    opened.append(loader)
+                except Exception as e:
+                    fail('Loader', loader.loader_name, e)
+                    raise
+            for worker in workers:
+                worker.start()
+            while True:
+                item = get(transformed)
+                if item is _END_OF_STREAM:
+                    break
+                stats, batch, (extractor, position) = item
+                started = time.perf_counter()
+                for loader in self.loaders:
+                    table_name = getattr(loader, 'target_table', None) or default_table
+                    try:
+                        loaded[id(loader)] += loader.load_batch(batch, table_name)
+                    except Exception as e:
+                        fail('Loader', loader.loader_name, e)
+                        raise
+                # Batches arrive in extraction order, so the source position
+                # can advance past this batch once every loader has it
+                extractor.commit_checkpoint(position)
+                stats['records_loaded'] = len(batch)
+                stats['load_ms'] = round((time.perf_counter() - started) * 1000, 3)
+                results['batch_metrics'].append(stats)
+                total_records += len(batch)
+                logger.debug(f"Batch {stats['batch']} completed: {stats}")
+            if failures:
+                raise failures[0]
+            for extractor in self.extractors:
+                # Covers lines after the last loaded record that parsed to nothing
+                extractor.commit_checkpoint()
+            for extractor in self.extractors:
+                results['extraction_results'].append({
+                    'extractor': extractor.extractor_name,
+                    'records_extracted': extractor.metrics['records_extracted'],
+                    'metrics': extractor.get_metrics()
+                })
+                self.monitoring.collect_pipeline_metrics(
+                    f"{self.pipeline_name}.{extractor.extractor_name}",
+                    extractor.get_metrics()
+                )
+            for transformer in self.transformers:
+                results['transformation_results'].append({
+                    'transformer': transformer.transformer_name,
+                    'records_transformed': transformer.metrics['records_transformed'],
+                    'metrics': transformer.get_metrics()
+                })
+                self.monitoring.collect_pipeline_metrics(
+                    f"{self.pipeline_name}.{transformer.transformer_name}",
+                    transformer.get_metrics()
+                )
+            results['total_records_processed'] = total_records
+            results['success'] = True
+            self.pipeline_metrics['total_records_processed'] = total_records
+            self.pipeline_metrics['status'] = 'completed'
+            return results
+        except Exception as e:
+            if isinstance(e, _StageFailure) and failures:
+                e = failures[0]
+            logger.error(f"Pipeline execution failed: {str(e)}")
+            self.pipeline_metrics['status'] = 'failed'
+            self.pipeline_metrics['total_errors'] += 1
+            self._generate_evidence('pipeline_error', {'error': str(e)})
+            raise e
+        finally:
+            stop.set()
+            for worker in workers:
+                if worker.is_alive():
+                    worker.join()
+            for loader in opened:
+                loader.end_stream(loaded[id(loader)])
+                if results['success']:
+                    results['loading_results'].append({
+                        'loader': loader.loader_name,
+                        'records_loaded': loader.metrics['records_loaded'],
+                        'metrics': loader.get_metrics()
+                    })
+                    self.monitoring.collect_pipeline_metrics(
+                        f"{self.pipeline_name}.{loader.loader_name}",
+                        loader.get_metrics()
+                    )
+            self.pipeline_metrics['end_time'] = datetime.utcnow()
+            duration = (self.pipeline_metrics['end_time'] - self.pipeline_metrics['start_time']).total_seconds()
+            results['duration_seconds'] = duration
+            results['total_errors'] = self.pipeline_metrics['total_errors']
+            if results['success']:
+                self._generate_evidence('pipeline_complete', {
+                    key: value for key, value in results.items() if key != 'batch_metrics'
+                })
+            self.monitoring.collect_pipeline_metrics(self.pipeline_name, self.pipeline_metrics)
     def _generate_evidence(self, operation: str, details: Dict[str, Any]) -> str:
         """Generate evidence entry."""
         evidence = {
@@ -173,7 +411,7 @@ class ETLPipeline:
             'operation': operation,
             'details': details
         }
-        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True).encode()).hexdigest()
+        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True, default=str).encode()).hexdigest()
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         logger.info(f"Evidence generated: {evidence_hash}")
@@ -10,10 +10,12 @@ GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact
 """
 from .base_sync import BaseSyncService, SyncMode, ConflictResolution
-from .change_tracking import ChangeTracker
+from .change_tracking import ChangeTracker, FingerprintStore, merkle_root
 __all__ = [
     'BaseSyncService',
     'SyncMode',
     'ConflictResolution',
-    'ChangeTracker'
+    'ChangeTracker',
+    'FingerprintStore',
+    'merkle_root'
 ]
\ No newline at end of file
@@ -10,9 +10,14 @@ GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
+import heapq
 import logging
+import os
+import random
+import threading
 from datetime import datetime
+from pathlib import Path
 import hashlib
 import json
 import time
@@ -30,6 +35,8 @@ class ConflictResolution(Enum):
     SOURCE_WINS = "source-wins"
     TARGET_WINS = "target-wins"
     MANUAL_REVIEW = "manual-review"
+class _ChunkFailed(Exception):
+    """A chunk exhausted its retries, or the sync was stopped."""
 class BaseSyncService(ABC):
     """
     Abstract base class for synchronization services.
@@ -51,6 +58,14 @@ class BaseSyncService(ABC):
         self.enable_incremental = config.get('enable_incremental', True)
         self.retry_attempts = config.get('retry_attempts', 5)
         self.retry_backoff = config.get('retry_backoff', 'exponential')
+        self.retry_base_delay = config.get('retry_base_delay', 1.0)
+        self.retry_max_delay = config.get('retry_max_delay', 30.0)
+        self.apply_chunk_size = config.get('apply_chunk_size', 1000)
+        checkpoint_path = config.get('checkpoint_path')
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        # Set by stop() to interrupt retry backoff waits
+        self._stop_event = threading.Event()
+        self._random = random.Random()
         self.evidence_chain = []
         self.conflict_log = []
         self.sync_status = {
@@ -89,6 +104,19 @@ class BaseSyncService(ABC):
             bool: True if successful
         """
         pass
+    def apply_chunk(self, changes: List[Dict[str, Any]], chunk_index: int) -> bool:
+        """
+        Apply one chunk of changes.
+        A chunk may be applied again after a crash between apply and checkpoint,
+        so implementations should be idempotent (e.g. upserts keyed by id).
+        Defaults to apply_changes().
+        Args:
+            changes: Changes in the chunk
+            chunk_index: Position of the chunk in this sync
+        Returns:
+            bool: True if successful
+        """
+        return self.apply_changes(changes)
     @abstractmethod
     def detect_conflicts(self, source_changes: List[Dict[str, Any]], 
                         target_state: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -127,7 +155,7 @@ class BaseSyncService(ABC):
             'operation': operation,
             'details': details
         }
-        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True).encode()).hexdigest()
+        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True, default=str).encode()).hexdigest()
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         logger.info(f"Evidence generated: {evidence_hash}")
@@ -163,8 +191,11 @@ class BaseSyncService(ABC):
                 'records_processed': 0,
                 'records_synced': 0,
                 'records_failed': 0,
+                'records_resumed': 0,
                 'conflicts_detected': 0,
                 'conflicts_resolved': 0,
+                'chunks_applied': 0,
+                'apply_retries': 0,
                 'duration_seconds': 0,
                 'success': False
             }
@@ -182,7 +213,7 @@ class BaseSyncService(ABC):
                 results['conflicts_resolved'] = len(conflicts)
             else:
                 resolved_changes = source_changes
-            success = self._apply_with_retry(resolved_changes)
+            success = self._apply_with_retry(resolved_changes, results)
             if success:
                 results['records_synced'] = len(resolved_changes)
                 self.sync_status['records_synced'] = len(resolved_changes)
@@ -210,44 +241,156 @@ class BaseSyncService(ABC):
         Returns:
             Changes with conflicts resolved
         """
+        conflict_index = {}
+        for conflict in conflicts:
+            conflict_index.setdefault(conflict['id'], conflict)
         resolved = []
-        conflict_ids = {c['id'] for c in conflicts}
         for change in changes:
-            if change['id'] in conflict_ids:
-                conflict = next(c for c in conflicts if c['id'] == change['id'])
+            conflict = conflict_index.get(change['id'])
+            if conflict is not None:
                 resolved_change = self.resolve_conflict(conflict)
                 resolved.append(resolved_change)
                 self.log_conflict(conflict, resolved_change)
             else:
                 resolved.append(change)
         return resolved
-    def _apply_with_retry(self, changes: List[Dict[str, Any]]) -> bool:
+    def stop(self):
+        """Interrupt a running sync's retry backoff; the sync fails and keeps its checkpoint."""
+        self._stop_event.set()
+    def _retry_delay(self, attempt: int) -> float:
+        """Backoff before retry number attempt + 1, with jitter so workers do not retry in lockstep."""
+        if self.retry_backoff == 'exponential':
+            # Full jitter: uniform over [0, capped exponential]
+            return self._random.uniform(0, min(self.retry_base_delay * 2 ** attempt, self.retry_max_delay))
+        return self._random.uniform(0.5, 1.0) * 5
+    def _change_set_key(self, changes: List[Dict[str, Any]]) -> str:
+        """Identify a change set so a checkpoint is only resumed for the same changes."""
+        ids = json.dumps([change.get('id') for change in changes], default=str)
+        return hashlib.sha256(f"{self.apply_chunk_size}:{ids}".encode()).hexdigest()
+    def _load_checkpoint(self, change_set_key: str) -> Dict[str, Any]:
+        """Return the persisted checkpoint for this change set, or a fresh one."""
+        fresh = {'change_set': change_set_key, 'high_water_mark': 0, 'committed_above': []}
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return fresh
+        try:
+            checkpoint = json.loads(self.checkpoint_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {str(e)}")
+            return fresh
+        if checkpoint.get('change_set') != change_set_key:
+            logger.info("Checkpoint belongs to a different change set, starting from the beginning")
+            return fresh
+        return checkpoint
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Persist the checkpoint atomically."""
+        if self.checkpoint_path is None:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+    def _clear_checkpoint(self):
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+    def _apply_with_retry(self, changes: List[Dict[str, Any]], results: Optional[Dict[str, Any]] = None) -> bool:
         """
-        Apply changes with retry logic.
+        Apply changes in checkpointed chunks with per-chunk retry.
+        Chunks are applied in order. Committed chunks advance a persisted
+        high-water mark, so a failed sync resumes after the last committed
+        chunk. A failed chunk is retried after a jittered backoff while later
+        chunks that touch none of its ids keep being applied; the thread only
+        waits when every remaining chunk is blocked on a retry.
         Args:
             changes: Changes to apply
+            results: Optional results dict receiving chunk statistics
         Returns:
             bool: True if successful
         """
-        for attempt in range(self.retry_attempts):
+        results = results if results is not None else {}
+        chunk_size = max(1, self.apply_chunk_size)
+        chunks = [changes[i:i + chunk_size] for i in range(0, len(changes), chunk_size)]
+        checkpoint = self._load_checkpoint(self._change_set_key(changes))
+        committed = set(checkpoint['committed_above'])
+        committed.update(range(checkpoint['high_water_mark']))
+        resumed = sum(len(chunks[i]) for i in committed if i < len(chunks))
+        if committed:
+            results['records_resumed'] = resumed
+            self.generate_evidence('sync_resumed', {
+                'high_water_mark': checkpoint['high_water_mark'],
+                'chunks_committed': len(committed)
+            })
+        self._stop_event.clear()
+        attempts: Dict[int, int] = {}
+        # (ready_at, chunk_index) of chunks waiting for a retry
+        retry_queue: List[Any] = []
+        blocked_ids: Set[Any] = set()
+        next_chunk = 0
+        def commit(index: int):
+            committed.add(index)
+            hwm = checkpoint['high_water_mark']
+            while hwm in committed:
+                hwm += 1
+            checkpoint['high_water_mark'] = hwm
+            checkpoint['committed_above'] = sorted(i for i in committed if i > hwm)
+            self._save_checkpoint(checkpoint)
+            results['chunks_applied'] = results.get('chunks_applied', 0) + 1
+        def attempt(index: int) -> bool:
             try:
-                success = self.apply_changes(changes)
-                if success:
+                if self.apply_chunk(chunks[index], index):
+                    commit(index)
                     return True
+                error = 'apply returned False'
             except Exception as e:
-                logger.warning(f"Apply attempt {attempt + 1} failed: {str(e)}")
-                if attempt < self.retry_attempts - 1:
-                    if self.retry_backoff == 'exponential':
-                        wait_time = min(2 ** attempt, 30)
-                    else:
-                        wait_time = 5
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error("All retry attempts failed")
-                    self.sync_status['records_failed'] = len(changes)
-                    return False
-        return False
+                error = str(e)
+            tries = attempts.get(index, 0) + 1
+            attempts[index] = tries
+            logger.warning(f"Apply chunk {index} attempt {tries} failed: {error}")
+            if tries >= self.retry_attempts:
+                logger.error(f"All retry attempts failed for chunk {index}")
+                raise _ChunkFailed(index)
+            delay = self._retry_delay(tries - 1)
+            results['apply_retries'] = results.get('apply_retries', 0) + 1
+            logger.info(f"Retrying chunk {index} in {delay:.2f} seconds...")
+            heapq.heappush(retry_queue, (time.monotonic() + delay, index))
+            blocked_ids.update(change.get('id') for change in chunks[index])
+            return False
+        try:
+            while next_chunk < len(chunks) or retry_queue:
+                now = time.monotonic()
+                if retry_queue and retry_queue[0][0] <= now:
+                    _, index = heapq.heappop(retry_queue)
+                    blocked_ids.difference_update(change.get('id') for change in chunks[index])
+                    attempt(index)
+                    # Chunks still waiting keep their ids blocked
+                    for _, waiting in retry_queue:
+                        blocked_ids.update(change.get('id') for change in chunks[waiting])
+                    continue
+                if next_chunk < len(chunks):
+                    if next_chunk in committed:
+                        next_chunk += 1
+                        continue
+                    if not blocked_ids or blocked_ids.isdisjoint(change.get('id') for change in chunks[next_chunk]):
+                        index = next_chunk
+                        next_chunk += 1
+                        attempt(index)
+                        continue
+                if self._stop_event.wait(max(0.0, retry_queue[0][0] - now)):
+                    raise _ChunkFailed(retry_queue[0][1])
+        except _ChunkFailed:
+            failed = len(changes) - sum(len(chunks[i]) for i in committed if i < len(chunks))
+            self.sync_status['records_failed'] = failed
+            results['records_failed'] = failed
+            self.generate_evidence('sync_checkpointed', {
+                'high_water_mark': checkpoint['high_water_mark'],
+                'chunks_committed': len(committed),
+                'chunks_total': len(chunks)
+            })
+            return False
+        self._clear_checkpoint()
+        return True
     def get_sync_status(self) -> Dict[str, Any]:
         """
         Get current sync status.
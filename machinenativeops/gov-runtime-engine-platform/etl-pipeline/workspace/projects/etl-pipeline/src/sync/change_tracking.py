@@ -9,12 +9,108 @@ Change Tracking and CDC Implementation
 GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import logging
+import sqlite3
 from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
 import hashlib
 import json
 logger = logging.getLogger(__name__)
+# SQLite bound-parameter limit is 999 on older builds
+_SQL_BATCH = 900
+def merkle_root(leaves: List[bytes]) -> str:
+    """
+    Compute a SHA-256 Merkle root over leaf digests.
+    Odd nodes are paired with themselves; an empty tree hashes b''.
+    Args:
+        leaves: Leaf digests in order
+    Returns:
+        Hex root digest
+    """
+    if not leaves:
+        return hashlib.sha256(b'').hexdigest()
+    level = leaves
+    while len(level) > 1:
+        if len(level) % 2:
+            level = level + [level[-1]]
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+class FingerprintStore:
+    """
+    On-disk record_id → fingerprint table backed by SQLite.
+    Holds the previous state of a tracked source as 32-byte digests, so a
+    diff only hashes the current stream. Each diff is a run: records seen
+    in the run are stamped with its run number, and whatever keeps an older
+    stamp afterwards was deleted at the source. The digest a record had
+    before the run is kept as its base, so a record seen twice in one run
+    is still diffed against the previous state.
+    """
+    def __init__(self, path: str, cache_kib: int = 16384):
+        """
+        Open (or create) a fingerprint store.
+        Args:
+            path: SQLite database file, or ':memory:'
+            cache_kib: SQLite page cache budget in KiB
+        """
+        self.path = path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(f'PRAGMA cache_size=-{int(cache_kib)}')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS fingerprints ('
+            'record_key TEXT PRIMARY KEY, digest BLOB NOT NULL, run INTEGER NOT NULL, base BLOB'
+            ') WITHOUT ROWID'
+        )
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self.conn.commit()
+    def begin_run(self) -> int:
+        """Start a diff run and return its number."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'run'").fetchone()
+        run = (row[0] if row else 0) + 1
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('run', ?)", (run,))
+        return run
+    def lookup(self, keys: List[str]) -> Dict[str, Tuple[bytes, int, Optional[bytes]]]:
+        """Return (digest, run, base) for the given record keys."""
+        found = {}
+        for i in range(0, len(keys), _SQL_BATCH):
+            chunk = keys[i:i + _SQL_BATCH]
+            placeholders = ','.join('?' * len(chunk))
+            for key, digest, run, base in self.conn.execute(
+                f'SELECT record_key, digest, run, base FROM fingerprints WHERE record_key IN ({placeholders})', chunk
+            ):
+                found[key] = (digest, run, base)
+        return found
+    def stamp(self, rows: List[Tuple[str, bytes, int]]):
+        """Upsert (record_key, digest, run) rows, keeping the pre-run digest as base."""
+        self.conn.executemany(
+            'INSERT INTO fingerprints (record_key, digest, run) VALUES (?, ?, ?) '
+            'ON CONFLICT(record_key) DO UPDATE SET '
+            'base = CASE WHEN run = excluded.run THEN base ELSE digest END, '
+            'digest = excluded.digest, run = excluded.run',
+            rows
+        )
+    def take_unseen(self, run: int, chunk_size: int) -> Iterator[List[Tuple[str, bytes]]]:
+        """Yield, in chunks, records not stamped by the given run, then remove them."""
+        cursor = self.conn.execute('SELECT record_key, digest FROM fingerprints WHERE run < ?', (run,))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+        self.conn.execute('DELETE FROM fingerprints WHERE run < ?', (run,))
+    def commit(self):
+        self.conn.commit()
+    def rollback(self):
+        self.conn.rollback()
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+    def close(self):
+        self.conn.close()
 class ChangeTracker:
     """
     Tracks changes in data for incremental synchronization.
@@ -29,6 +125,11 @@ class ChangeTracker:
         self.change_type_field = config.get('change_type_field', '_change_type')
         self.evidence_chain = []
         self.tracking_enabled = config.get('tracking_enabled', True)
+        self.chunk_size = config.get('diff_chunk_size', 10000)
+        store_path = config.get('fingerprint_store')
+        self.fingerprint_store = FingerprintStore(
+            store_path, config.get('fingerprint_cache_kib', 16384)
+        ) if store_path else None
     @staticmethod
     def _current_timestamp() -> str:
         """Generate current timestamp for change tracking."""
@@ -42,11 +143,28 @@ class ChangeTracker:
             'operation': operation,
             'details': details
         }
-        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True).encode()).hexdigest()
+        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True, default=str).encode()).hexdigest()
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         logger.info(f"Evidence generated: {evidence_hash}")
         return evidence_hash
+    def _batch_evidence(self, batch_index: int, changes: List[Dict[str, Any]], leaves: List[bytes]) -> Optional[str]:
+        """One Merkle-rooted evidence entry covering every change of a batch."""
+        if not changes:
+            return None
+        counts = {}
+        for change in changes:
+            change_type = change[self.change_type_field]
+            counts[change_type] = counts.get(change_type, 0) + 1
+        return self.generate_evidence('changes_detected', {
+            'batch': batch_index,
+            'change_count': len(changes),
+            'counts': counts,
+            'merkle_root': merkle_root(leaves)
+        })
+    @staticmethod
+    def _leaf(change_type: str, record_key: str, digest: bytes) -> bytes:
+        return hashlib.sha256(change_type.encode() + b'\x00' + record_key.encode() + b'\x00' + digest).digest()
     def track_changes(self, current_state: List[Dict[str, Any]], 
                      previous_state: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -61,6 +179,7 @@ class ChangeTracker:
             self.generate_evidence('tracking_disabled', {})
             return []
         changes = []
+        leaves = []
         current_dict = {
             r[self.record_id_field]: r
             for r in current_state
@@ -89,44 +208,137 @@ class ChangeTracker:
             if current is None:
                 change[self.change_type_field] = 'delete'
                 change['previous_state'] = previous
-                changes.append(change)
-                self.generate_evidence('change_detected', {
-                    'type': 'delete',
-                    'id': record_id
-                })
+                digest = self._fingerprint(previous)
             elif previous is None:
                 change[self.change_type_field] = 'create'
                 change['current_state'] = current
-                changes.append(change)
-                self.generate_evidence('change_detected', {
-                    'type': 'create',
-                    'id': record_id
-                })
+                digest = self._fingerprint(current)
             else:
                 if self.enable_hashing:
-                    current_hash = self._compute_hash(current)
-                    previous_hash = self._compute_hash(previous)
-                    if current_hash != previous_hash:
-                        change[self.change_type_field] = 'update'
-                        change['previous_state'] = previous
-                        change['current_state'] = current
-                        changes.append(change)
-                        self.generate_evidence('change_detected', {
-                            'type': 'update',
-                            'id': record_id
-                        })
+                    digest = self._fingerprint(current)
+                    if digest == self._fingerprint(previous):
+                        continue
                 else:
-                    if current != previous:
-                        change[self.change_type_field] = 'update'
-                        change['previous_state'] = previous
-                        change['current_state'] = current
-                        changes.append(change)
-                        self.generate_evidence('change_detected', {
-                            'type': 'update',
-                            'id': record_id
-                        })
+                    if current == previous:
+                        continue
+                    digest = self._fingerprint(current)
+                change[self.change_type_field] = 'update'
+                change['previous_state'] = previous
+                change['current_state'] = current
+            changes.append(change)
+            leaves.append(self._leaf(change[self.change_type_field], self._record_key(record_id), digest))
+        self._batch_evidence(0, changes, leaves)
         logger.info(f"Tracked {len(changes)} changes")
         return changes
+    def track_changes_stream(self, current_records: Iterable[Dict[str, Any]],
+                             chunk_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Diff a stream of current records against the fingerprint store.
+        Only the current stream is hashed; previous state comes from the
+        store. Changes are yielded per chunk, with one Merkle-rooted evidence
+        entry per chunk. Deletes are emitted after the stream is exhausted and
+        carry 'previous_hash' instead of 'previous_state'. The store is
+        committed only when the whole stream has been diffed.
+        As in track_changes, the last copy of a repeated record id wins. A
+        repeat in a later chunk is diffed against the state before the run,
+        not against its earlier copy: an identical repeat is skipped, and a
+        differing one is emitted again with the same change type so that
+        applying changes in order leaves the last copy.
+        Args:
+            current_records: Iterable of current records
+            chunk_size: Records per chunk, defaults to diff_chunk_size
+        Returns:
+            Iterator of change lists, one per chunk
+        """
+        if self.fingerprint_store is None:
+            raise ValueError("track_changes_stream requires 'fingerprint_store' in config")
+        if not self.tracking_enabled:
+            self.generate_evidence('tracking_disabled', {})
+            return
+        chunk_size = chunk_size or self.chunk_size
+        store = self.fingerprint_store
+        run = store.begin_run()
+        totals = {'create': 0, 'update': 0, 'delete': 0, 'unchanged': 0, 'repeated': 0, 'missing_id': 0}
+        batch_index = 0
+        records = iter(current_records)
+        try:
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                digests = {}
+                for record in chunk:
+                    if self.record_id_field not in record:
+                        totals['missing_id'] += 1
+                        continue
+                    # Later duplicates of an id win, as in track_changes
+                    digests[self._record_key(record[self.record_id_field])] = (record, self._fingerprint(record))
+                stored = store.lookup(list(digests))
+                changes, leaves, rows = [], [], []
+                for key, (record, digest) in digests.items():
+                    previous, stamped_run, base = stored.get(key, (None, None, None))
+                    repeated = stamped_run == run
+                    if repeated:
+                        # Seen earlier in this run: skip an identical copy, and
+                        # diff a differing one against the pre-run state
+                        totals['repeated'] += 1
+                        if previous == digest:
+                            continue
+                        previous = base
+                    rows.append((key, digest, run))
+                    if previous == digest and not repeated:
+                        totals['unchanged'] += 1
+                        continue
+                    change = {
+                        'id': record[self.record_id_field],
+                        self.timestamp_field: self._current_timestamp(),
+                        'current_state': record
+                    }
+                    if previous is None:
+                        change[self.change_type_field] = 'create'
+                    else:
+                        change[self.change_type_field] = 'update'
+                        change['previous_hash'] = previous.hex()
+                    if not repeated:
+                        totals[change[self.change_type_field]] += 1
+                    changes.append(change)
+                    leaves.append(self._leaf(change[self.change_type_field], key, digest))
+                store.stamp(rows)
+                self._batch_evidence(batch_index, changes, leaves)
+                batch_index += 1
+                if changes:
+                    yield changes
+            for rows in store.take_unseen(run, chunk_size):
+                changes, leaves = [], []
+                for key, digest in rows:
+                    changes.append({
+                        'id': json.loads(key),
+                        self.timestamp_field: self._current_timestamp(),
+                        self.change_type_field: 'delete',
+                        'previous_hash': digest.hex()
+                    })
+                    leaves.append(self._leaf('delete', key, digest))
+                totals['delete'] += len(changes)
+                self._batch_evidence(batch_index, changes, leaves)
+                batch_index += 1
+                yield changes
+            store.commit()
+        except BaseException:
+            store.rollback()
+            raise
+        if totals['missing_id']:
+            self.generate_evidence('missing_record_ids', {'current_missing': totals['missing_id']})
+        self.generate_evidence('stream_diff_complete', {'run': run, 'batches': batch_index, 'totals': totals})
+        logger.info(f"Tracked {totals['create'] + totals['update'] + totals['delete']} changes in {batch_index} batches")
+    @staticmethod
+    def _record_key(record_id: Any) -> str:
+        """Store key that keeps 1 and '1' distinct."""
+        return json.dumps(record_id, sort_keys=True, default=str)
+    def _fingerprint(self, record: Dict[str, Any]) -> bytes:
+        """SHA-256 digest of a record, ignoring the timestamp field."""
+        record_copy = record.copy()
+        record_copy.pop(self.timestamp_field, None)
+        return hashlib.sha256(json.dumps(record_copy, sort_keys=True, default=str).encode()).digest()
     def _compute_hash(self, record: Dict[str, Any]) -> str:
         """
         Compute hash of record for change detection.
@@ -135,10 +347,7 @@ class ChangeTracker:
         Returns:
             Hash string
         """
-        record_copy = record.copy()
-        record_copy.pop(self.timestamp_field, None)
-        hash_input = json.dumps(record_copy, sort_keys=True)
-        return hashlib.sha256(hash_input.encode()).hexdigest()
+        return self._fingerprint(record).hex()
     def filter_changes_since(self, changes: List[Dict[str, Any]], 
                            since: datetime) -> List[Dict[str, Any]]:
         """
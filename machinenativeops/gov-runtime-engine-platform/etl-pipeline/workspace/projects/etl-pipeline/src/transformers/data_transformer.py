@@ -9,13 +9,42 @@ Data Transformer Module
 GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
-from typing import Dict, Any, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
+import operator
 from datetime import datetime
 from abc import ABC, abstractmethod
 import hashlib
 import json
 logger = logging.getLogger(__name__)
+# Same output as json.dumps(..., sort_keys=True, default=str) without building an encoder per record
+_HASH_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+def _to_boolean(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ['true', '1', 'yes']
+    return bool(value)
+_TYPE_CONVERTERS = {
+    'string': str,
+    'integer': int,
+    'float': float,
+    'boolean': _to_boolean
+}
+_CONDITION_OPERATORS = {
+    'equals': operator.eq,
+    'not_equals': operator.ne,
+    'greater_than': operator.gt,
+    'less_than': operator.lt,
+    'in': lambda record_value, value: record_value in value,
+    'not_in': lambda record_value, value: record_value not in value
+}
+_TRANSFORMATIONS = {
+    'uppercase': lambda value: str(value).upper(),
+    'lowercase': lambda value: str(value).lower(),
+    'trim': lambda value: str(value).strip()
+}
+def _overrides(instance: Any, base: type, method: str) -> bool:
+    """True if a subclass replaced `method`, so compiled plans must call it instead."""
+    return getattr(type(instance), method) is not getattr(base, method)
 class BaseTransformer(ABC):
     """
     Abstract base class for data transformers.
@@ -51,7 +80,7 @@ class BaseTransformer(ABC):
             'operation': operation,
             'details': details
         }
-        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True).encode()).hexdigest()
+        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True, default=str).encode()).hexdigest()
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         logger.info(f"Evidence generated: {evidence_hash}")
@@ -84,6 +113,26 @@ class BaseTransformer(ABC):
         finally:
             self.metrics['end_time'] = datetime.utcnow()
             self.generate_evidence('transformation_end', self.get_metrics())
+    def begin_stream(self):
+        """Start a streaming run; metrics accumulate across execute_batch() calls."""
+        self.metrics['start_time'] = datetime.utcnow()
+        self.metrics['records_transformed'] = 0
+        self.generate_evidence('transformation_start', {'mode': 'streaming'})
+    def execute_batch(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Transform one batch of a streaming run."""
+        try:
+            transformed_data = self.transform(data)
+            self.metrics['records_transformed'] += len(transformed_data)
+            return transformed_data
+        except Exception as e:
+            self.metrics['errors'] += 1
+            logger.error(f"Transformation failed: {str(e)}")
+            self.generate_evidence('transformation_error', {'error': str(e)})
+            raise
+    def end_stream(self):
+        """Finish a streaming run."""
+        self.metrics['end_time'] = datetime.utcnow()
+        self.generate_evidence('transformation_end', self.get_metrics())
 class DataCleaner(BaseTransformer):
     """
     Data cleaning transformer.
@@ -94,42 +143,74 @@ class DataCleaner(BaseTransformer):
         self.remove_nulls = config.get('remove_nulls', True)
         self.remove_duplicates = config.get('remove_duplicates', True)
         self.trim_strings = config.get('trim_strings', True)
+        # Duplicate hashes shared by all batches of a streaming run
+        self._stream_hashes = None
+    def begin_stream(self):
+        super().begin_stream()
+        self._stream_hashes = set() if self.remove_duplicates else None
+    def end_stream(self):
+        self._stream_hashes = None
+        super().end_stream()
     def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Clean data according to rules."""
         cleaned_data = []
-        seen_hashes = set() if self.remove_duplicates else None
+        if self._stream_hashes is not None:
+            seen_hashes = self._stream_hashes
+        else:
+            seen_hashes = set() if self.remove_duplicates else None
+        clean_record = self._compile_cleaning_plan()
+        encode = _HASH_ENCODER.encode
+        sha256 = hashlib.sha256
+        filtered = 0
         for record in data:
             try:
-                cleaned_record = {}
-                for key, value in record.items():
-                    if value is None:
-                        if self.remove_nulls:
-                            continue
-                        else:
-                            cleaned_record[key] = None
-                            continue
-                    if isinstance(value, str):
-                        if self.trim_strings:
-                            value = value.strip()
-                        if not value:
-                            if self.remove_nulls:
-                                continue
-                    cleaned_record[key] = value
+                cleaned_record = clean_record(record)
                 if not cleaned_record:
-                    self.metrics['records_filtered'] += 1
+                    filtered += 1
                     continue
                 if seen_hashes is not None:
-                    record_hash = hashlib.sha256(json.dumps(cleaned_record, sort_keys=True).encode()).hexdigest()
+                    record_hash = sha256(encode(cleaned_record).encode()).digest()
                     if record_hash in seen_hashes:
-                        self.metrics['records_filtered'] += 1
+                        filtered += 1
                         continue
                     seen_hashes.add(record_hash)
                 cleaned_data.append(cleaned_record)
             except Exception as e:
                 logger.error(f"Error cleaning record: {str(e)}")
                 self.metrics['errors'] += 1
+        self.metrics['records_filtered'] += filtered
         logger.info(f"Cleaned {len(cleaned_data)} records, filtered {self.metrics['records_filtered']}")
         return cleaned_data
+    def _compile_cleaning_plan(self) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Select a record cleaner specialized for the remove_nulls/trim_strings flags.
+        Returns:
+            Function returning the cleaned copy of one record
+        """
+        if self.remove_nulls and self.trim_strings:
+            def clean_record(record: Dict[str, Any]) -> Dict[str, Any]:
+                cleaned_record = {}
+                for key, value in record.items():
+                    if value is None:
+                        continue
+                    if isinstance(value, str):
+                        value = value.strip()
+                        if not value:
+                            continue
+                    cleaned_record[key] = value
+                return cleaned_record
+            return clean_record
+        if self.remove_nulls:
+            return lambda record: {
+                key: value for key, value in record.items()
+                if value is not None and not (isinstance(value, str) and not value)
+            }
+        if self.trim_strings:
+            return lambda record: {
+                key: value.strip() if isinstance(value, str) else value
+                for key, value in record.items()
+            }
+        return lambda record: dict(record.items())
 class SchemaNormalizer(BaseTransformer):
     """
     Schema normalization transformer.
@@ -143,26 +224,25 @@ class SchemaNormalizer(BaseTransformer):
     def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Normalize schema according to target schema."""
         normalized_data = []
+        plan = self._compile_normalization_plan()
         for record in data:
             try:
+                get = record.get
                 normalized_record = {}
                 record_valid = True
-                for field_name, field_config in self.target_schema.items():
-                    source_field = self.rename_fields.get(field_name, field_name)
-                    value = record.get(source_field)
+                for field_name, source_field, default_value, required, convert in plan:
+                    value = get(source_field)
                     if value is None:
-                        value = self.default_values.get(field_name)
+                        value = default_value
                     if value is None:
-                        if field_config.get('required', False):
+                        if required:
                             self.metrics['records_filtered'] += 1
                             record_valid = False
                             break
-                        else:
-                            normalized_record[field_name] = None
-                            continue
-                    type_conversion = self.type_conversions.get(field_name)
-                    if type_conversion:
-                        value = self._convert_type(value, type_conversion)
+                        normalized_record[field_name] = None
+                        continue
+                    if convert is not None:
+                        value = convert(value)
                     normalized_record[field_name] = value
                 if record_valid:
                     normalized_data.append(normalized_record)
@@ -171,6 +251,35 @@ class SchemaNormalizer(BaseTransformer):
                 self.metrics['errors'] += 1
         logger.info(f"Normalized {len(normalized_data)} records")
         return normalized_data
+    def _compile_normalization_plan(self) -> Tuple[Tuple[str, Any, Any, Any, Optional[Callable[[Any], Any]]], ...]:
+        """
+        Resolve target_schema, rename_fields, default_values and type_conversions once per batch.
+        Returns:
+            (field_name, source_field, default_value, required, converter) per target field
+        """
+        plan = []
+        for field_name, field_config in self.target_schema.items():
+            type_conversion = self.type_conversions.get(field_name)
+            plan.append((
+                field_name,
+                self.rename_fields.get(field_name, field_name),
+                self.default_values.get(field_name),
+                field_config.get('required', False),
+                self._compile_converter(type_conversion) if type_conversion else None
+            ))
+        return tuple(plan)
+    def _compile_converter(self, target_type: Any) -> Callable[[Any], Any]:
+        """Build a converter with _convert_type's semantics for one target type."""
+        convert = _TYPE_CONVERTERS.get(target_type) if isinstance(target_type, str) else None
+        if convert is None or _overrides(self, SchemaNormalizer, '_convert_type'):
+            return lambda value: self._convert_type(value, target_type)
+        def converter(value: Any) -> Any:
+            try:
+                return convert(value)
+            except Exception as e:
+                logger.error(f"Type conversion failed: {str(e)}")
+                return value
+        return converter
     def _convert_type(self, value: Any, target_type: str) -> Any:
         """Convert value to target type."""
         try:
@@ -181,9 +290,7 @@ class SchemaNormalizer(BaseTransformer):
             elif target_type == 'float':
                 return float(value)
             elif target_type == 'boolean':
-                if isinstance(value, str):
-                    return value.lower() in ['true', '1', 'yes']
-                return bool(value)
+                return _to_boolean(value)
             elif target_type == 'datetime':
                 if isinstance(value, str):
                     normalized_value = value.replace('Z', '+00:00')
@@ -217,24 +324,73 @@ class BusinessRuleApplier(BaseTransformer):
     def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Apply business rules to data."""
         transformed_data = []
+        plan = self._compile_rule_plan()
         for record in data:
             try:
                 record_copy = record.copy()
-                for rule in self.rules:
-                    rule.get('name', 'unknown')
-                    rule.get('type', 'transform')
-                    condition = rule.get('condition')
-                    actions = rule.get('actions', [])
-                    if condition and not self._evaluate_condition(record_copy, condition):
+                for condition, actions in plan:
+                    if condition is not None and not condition(record_copy):
                         continue
                     for action in actions:
-                        self._apply_action(record_copy, action)
+                        action(record_copy)
                 transformed_data.append(record_copy)
             except Exception as e:
                 logger.error(f"Error applying business rules: {str(e)}")
                 self.metrics['errors'] += 1
         logger.info(f"Applied business rules to {len(transformed_data)} records")
         return transformed_data
+    def _compile_rule_plan(self) -> Tuple[Tuple[Optional[Callable[[Dict[str, Any]], Any]], Tuple[Callable[[Dict[str, Any]], None], ...]], ...]:
+        """
+        Compile rules into (condition, actions) closures once per batch.
+        Conditions that always pass compile to None and no-op actions are
+        dropped. Rules the compiler does not model, and subclasses that
+        override the evaluation hooks, go through the interpreting methods.
+        Returns:
+            (condition, actions) per rule, in rule order
+        """
+        plan = []
+        for rule in self.rules:
+            condition = rule.get('condition')
+            actions = (self._compile_action(action) for action in rule.get('actions', []))
+            plan.append((
+                self._compile_condition(condition) if condition else None,
+                tuple(action for action in actions if action is not None)
+            ))
+        return tuple(plan)
+    def _compile_condition(self, condition: Any) -> Optional[Callable[[Dict[str, Any]], Any]]:
+        if not isinstance(condition, dict) or _overrides(self, BusinessRuleApplier, '_evaluate_condition'):
+            return lambda record: self._evaluate_condition(record, condition)
+        operator_name = condition.get('operator')
+        compare = _CONDITION_OPERATORS.get(operator_name) if isinstance(operator_name, str) else None
+        if compare is None:
+            return None
+        field = condition.get('field')
+        value = condition.get('value')
+        return lambda record: compare(record.get(field), value)
+    def _compile_action(self, action: Any) -> Optional[Callable[[Dict[str, Any]], None]]:
+        if not isinstance(action, dict) or _overrides(self, BusinessRuleApplier, '_apply_action'):
+            return lambda record: self._apply_action(record, action)
+        action_type = action.get('type')
+        field = action.get('field')
+        if action_type == 'set_field':
+            value = action.get('value')
+            def set_field(record: Dict[str, Any]):
+                record[field] = value
+            return set_field
+        elif action_type == 'remove_field':
+            return lambda record: record.pop(field, None)
+        elif action_type == 'transform_field':
+            transformation = action.get('transformation')
+            transform = _TRANSFORMATIONS.get(transformation) if isinstance(transformation, str) else None
+            if _overrides(self, BusinessRuleApplier, '_apply_transformation'):
+                transform = lambda value: self._apply_transformation(value, transformation)  # noqa: E731
+            elif transform is None:
+                # Unknown transformations keep the value, but still set the field
+                transform = lambda value: value  # noqa: E731
+            def transform_field(record: Dict[str, Any]):
+                record[field] = transform(record.get(field))
+            return transform_field
+        return None
     def _evaluate_condition(self, record: Dict[str, Any], condition: Dict[str, Any]) -> bool:
         """Evaluate condition against record."""
         field = condition.get('field')
@@ -9,12 +9,19 @@ Data Validator Module
 GL-Layer: GL30-49 (Execution)
 Closure-Signal: artifact, manifest
 """
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 import logging
 from datetime import datetime, timezone
 import hashlib
 import json
 logger = logging.getLogger(__name__)
+_TYPE_MAP = {
+    'string': str,
+    'integer': int,
+    'float': float,
+    'boolean': bool
+}
+_EMPTY_VALUES = (None, '')
 class DataValidator:
     """
     Comprehensive data validation module with evidence generation.
@@ -48,7 +55,7 @@ class DataValidator:
             'operation': operation,
             'details': details
         }
-        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True).encode()).hexdigest()
+        evidence_hash = hashlib.sha256(json.dumps(evidence, sort_keys=True, default=str).encode()).hexdigest()
         evidence['hash'] = evidence_hash
         self.evidence_chain.append(evidence)
         logger.info(f"Evidence generated: {evidence_hash}")
@@ -95,38 +102,55 @@ class DataValidator:
             'passed': True,
             'errors': []
         }
-        required_fields = self.validation_rules.get('required_fields', [])
-        field_rules = self.validation_rules.get('field_rules', {})
-        for record in data:
+        check_record = self._compile_validation_plan()
+        errors = results['errors']
+        checked = 0
+        valid = 0
+        try:
+            for record in data:
+                record_errors = check_record(record)
+                checked += 1
+                if record_errors:
+                    errors.append(record_errors)
+                else:
+                    valid += 1
+        finally:
+            self.metrics['valid_records'] += valid
+            self.metrics['invalid_records'] += checked - valid
+        if results['errors']:
+            results['passed'] = False
+        return results
+    def _compile_validation_plan(self) -> Callable[[Dict[str, Any]], List[str]]:
+        """
+        Compile validation_rules into a per-record checker.
+        Required fields and (field, type) pairs are resolved once per batch,
+        so checking a record does no rule lookups; errors are reported in
+        the same order and wording as the rules are declared.
+        Returns:
+            Function returning the error messages of one record
+        """
+        required_fields = tuple(self.validation_rules.get('required_fields', []))
+        type_checks = []
+        for field, rule in self.validation_rules.get('field_rules', {}).items():
+            expected_type = rule.get('type')
+            if isinstance(expected_type, str):
+                expected_type = _TYPE_MAP.get(expected_type)
+            if expected_type:
+                type_checks.append((field, expected_type))
+        type_checks = tuple(type_checks)
+        def check_record(record: Dict[str, Any]) -> List[str]:
             record_errors = []
+            get = record.get
             for field in required_fields:
-                if record.get(field) in (None, ''):
+                if get(field) in _EMPTY_VALUES:
                     record_errors.append(f"Missing required field: {field}")
-            for field, rule in field_rules.items():
-                if field not in record:
-                    continue
-                value = record.get(field)
-                if value is None:
-                    continue
-                expected_type = rule.get('type')
-                if isinstance(expected_type, str):
-                    type_map = {
-                        'string': str,
-                        'integer': int,
-                        'float': float,
-                        'boolean': bool
-                    }
-                    expected_type = type_map.get(expected_type)
-                if expected_type and not isinstance(value, expected_type):
+            for field, expected_type in type_checks:
+                # Absent and None values are not type-checked
+                value = get(field)
+                if value is not None and not isinstance(value, expected_type):
                     record_errors.append(f"Invalid type for {field}: {type(value).__name__}")
-            if record_errors:
-                self.metrics['invalid_records'] += 1
-                results['errors'].append(record_errors)
-            else:
-                self.metrics['valid_records'] += 1
-        if results['errors']:
-            results['passed'] = False
-        return results
+            return record_errors
+        return check_record
     def _calculate_quality_scores(self) -> Dict[str, float]:
         """Calculate quality scores based on metrics and thresholds."""
         total_records = self.metrics['total_records'] or 1
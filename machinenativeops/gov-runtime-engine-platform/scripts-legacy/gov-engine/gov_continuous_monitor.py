@@ -11,16 +11,18 @@ MachineNativeOps GL Architecture Implementation
 This module provides continuous monitoring capabilities for GL gov-platform.gov-platform.governance,
 enabling real-time health checks, anomaly detection, and automated alerts.
 """
+import heapq
 import json
 import logging
 import time
 import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, Iterator, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import deque
+from collections import OrderedDict, deque
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -79,6 +81,139 @@ class MonitoringReport:
     metrics: List[HealthMetric]
     active_alerts: List[Alert]
     recommendations: List[str]
+class AlertStore:
+    """
+    Alert storage indexed by alert id, with active alerts bucketed by severity.
+    Resolved alerts are kept for `resolved_retention` seconds. Beyond
+    `max_alerts`, the oldest resolved alerts are evicted first, then the
+    oldest active ones.
+    """
+    def __init__(self, max_alerts: int = 10000, resolved_retention: float = 86400):
+        self.max_alerts = max_alerts
+        self.resolved_retention = resolved_retention
+        self._lock = threading.RLock()
+        # Insertion order is creation order
+        self._alerts: Dict[str, Alert] = {}
+        self._active: Dict[str, Alert] = {}
+        self._active_by_severity: Dict[AlertSeverity, Dict[str, Alert]] = {
+            severity: {} for severity in AlertSeverity
+        }
+        # alert_id -> monotonic resolve time, oldest first
+        self._resolved: "OrderedDict[str, float]" = OrderedDict()
+    def add(self, alert: Alert) -> Alert:
+        """Store an alert; a colliding alert_id gets a numeric suffix."""
+        with self._lock:
+            if alert.alert_id in self._alerts:
+                base_id = alert.alert_id
+                suffix = 1
+                while f"{base_id}_{suffix}" in self._alerts:
+                    suffix += 1
+                alert.alert_id = f"{base_id}_{suffix}"
+            self._alerts[alert.alert_id] = alert
+            if alert.resolved:
+                self._resolved[alert.alert_id] = time.monotonic()
+            else:
+                self._active[alert.alert_id] = alert
+                self._active_by_severity[alert.severity][alert.alert_id] = alert
+            self._enforce_retention()
+            return alert
+    def get(self, alert_id: str) -> Optional[Alert]:
+        with self._lock:
+            return self._alerts.get(alert_id)
+    def active(self, severity: Optional[AlertSeverity] = None) -> List[Alert]:
+        """Unresolved alerts in creation order, optionally of one severity."""
+        with self._lock:
+            bucket = self._active_by_severity[severity] if severity else self._active
+            return list(bucket.values())
+    def acknowledge(self, alert_id: str) -> bool:
+        with self._lock:
+            alert = self._alerts.get(alert_id)
+            if alert is None:
+                return False
+            alert.acknowledged = True
+            return True
+    def resolve(self, alert_id: str) -> bool:
+        with self._lock:
+            alert = self._alerts.get(alert_id)
+            if alert is None:
+                return False
+            alert.resolved = True
+            if self._active.pop(alert_id, None) is not None:
+                self._active_by_severity[alert.severity].pop(alert_id, None)
+                self._resolved[alert_id] = time.monotonic()
+            self._enforce_retention()
+            return True
+    def counts(self) -> Dict[str, int]:
+        """Active alert count per severity."""
+        with self._lock:
+            return {severity.value: len(bucket) for severity, bucket in self._active_by_severity.items()}
+    def __len__(self) -> int:
+        return len(self._alerts)
+    def __iter__(self) -> Iterator[Alert]:
+        with self._lock:
+            return iter(list(self._alerts.values()))
+    def _enforce_retention(self) -> None:
+        expired_before = time.monotonic() - self.resolved_retention
+        while self._resolved:
+            alert_id, resolved_at = next(iter(self._resolved.items()))
+            if resolved_at > expired_before and len(self._alerts) <= self.max_alerts:
+                break
+            self._resolved.popitem(last=False)
+            self._alerts.pop(alert_id, None)
+        while len(self._alerts) > self.max_alerts:
+            alert_id, alert = next(iter(self._active.items()))
+            logger.warning(f"Alert store full, evicting unresolved alert: {alert_id}")
+            del self._active[alert_id]
+            self._active_by_severity[alert.severity].pop(alert_id, None)
+            self._alerts.pop(alert_id, None)
+class MetricTrend:
+    """
+    Sliding-window linear regression over the last `window` values of a metric.
+    Sums are updated in O(1) per value and recomputed exactly once per
+    window to keep floating-point drift bounded.
+    """
+    def __init__(self, window: int = 10):
+        self.window = window
+        self.values: deque = deque()
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+        self._updates = 0
+    def add(self, value: float) -> None:
+        if len(self.values) == self.window:
+            # Drop x=0 and shift the remaining points one position left
+            oldest = self.values.popleft()
+            self._sum_y -= oldest
+            self._sum_xy -= self._sum_y
+        self._sum_xy += len(self.values) * value
+        self._sum_y += value
+        self.values.append(value)
+        self._updates += 1
+        if self._updates >= self.window:
+            self._updates = 0
+            self._sum_y = sum(self.values)
+            self._sum_xy = sum(x * y for x, y in enumerate(self.values))
+    @property
+    def mean(self) -> float:
+        return self._sum_y / len(self.values) if self.values else 0.0
+    @property
+    def slope(self) -> float:
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return (n * self._sum_xy - sum_x * self._sum_y) / (n * sum_xx - sum_x * sum_x)
+    @property
+    def direction(self) -> str:
+        """Same thresholds as GLContinuousMonitor.calculate_trend."""
+        if len(self.values) < 2:
+            return "stable"
+        slope = self.slope
+        if slope > 0.1:
+            return "increasing"
+        elif slope < -0.1:
+            return "decreasing"
+        return "stable"
 class GLContinuousMonitor:
     """
     Continuous monitoring system for GL gov-platform.gov-platform.governance health.
@@ -88,14 +223,31 @@ class GLContinuousMonitor:
     - Anomaly detection
     - Automated alerts
     - Trend analysis
+    Checks run at their own `interval` on a pool of `max_workers` threads.
+    A run that exceeds its `timeout` is reported as failed; since threads
+    cannot be interrupted, the check is not started again until the stuck
+    run returns.
     """
-    def __init__(self):
+    # Longest the scheduler sleeps, bounding how late it notices stop or new checks
+    SCHEDULER_TICK = 1.0
+    def __init__(self,
+                 max_workers: int = 4,
+                 max_alerts: int = 10000,
+                 resolved_alert_retention: float = 86400,
+                 trend_window: int = 10):
         self.health_checks: Dict[str, HealthCheck] = {}
         self.metrics_history: Dict[str, deque] = {}
-        self.alerts: List[Alert] = []
+        self.metric_trends: Dict[str, MetricTrend] = {}
+        self.trend_window = trend_window
+        self.alerts = AlertStore(max_alerts=max_alerts, resolved_retention=resolved_alert_retention)
+        self.max_workers = max_workers
         self.running = False
         self._stop_event = threading.Event()
         self._monitor_thread = None
+        # Checks registered since the scheduler last looked
+        self._new_checks: deque = deque()
+        # Monotonic start time of each running scheduled check, set by the worker
+        self._check_started: Dict[str, float] = {}
     def register_health_check(self, 
                              name: str,
                              check_func: Callable,
@@ -109,6 +261,7 @@ class GLContinuousMonitor:
             timeout=timeout
         )
         self.health_checks[name] = health_check
+        self._new_checks.append(name)
         logger.info(f"Registered health check: {name}")
     def execute_health_check(self, name: str) -> HealthCheck:
         """Execute a specific health check."""
@@ -118,30 +271,42 @@ class GLContinuousMonitor:
         if not check.enabled:
             logger.info(f"Health check disabled, skipping: {name}")
             return check
+        result, error, execution_time = self._run_check_func(name, check)
+        self._record_check_result(name, check, result, error, execution_time)
+        return check
+    def _run_check_func(self, name: str, check: HealthCheck) -> Tuple[Any, Optional[Exception], float]:
+        """Run a check function, returning (result, error, execution_time)."""
         start_time = time.time()
         check.last_check = datetime.now()
         try:
             logger.info(f"Executing health check: {name}")
-            result = check.check_func()
-            execution_time = time.time() - start_time
+            return check.check_func(), None, time.time() - start_time
+        except Exception as e:
+            return None, e, time.time() - start_time
+    def _record_check_result(self,
+                             name: str,
+                             check: HealthCheck,
+                             result: Any,
+                             error: Optional[Exception],
+                             execution_time: float) -> None:
+        """Update check status and raise alerts for one completed run."""
+        if error is None:
             check.last_result = result
             check.status = HealthStatus.HEALTHY
             # Analyze result for alerts
             self._analyze_health_result(name, result)
             logger.info(f"Health check passed: {name} ({execution_time:.2f}s)")
-        except Exception as e:
-            execution_time = time.time() - start_time
-            check.last_result = str(e)
+        else:
+            check.last_result = str(error)
             check.status = HealthStatus.CRITICAL
             # Create critical alert
             self._create_alert(
                 severity=AlertSeverity.CRITICAL,
                 title=f"Health Check Failed: {name}",
-                description=f"Health check {name} failed: {str(e)}",
+                description=f"Health check {name} failed: {str(error)}",
                 source=name
             )
-            logger.error(f"Health check failed: {name} - {str(e)}")
-        return check
+            logger.error(f"Health check failed: {name} - {str(error)}")
     def _analyze_health_result(self, name: str, result: Any) -> None:
         """Analyze health check result for potential issues."""
         if isinstance(result, dict):
@@ -174,7 +339,7 @@ class GLContinuousMonitor:
             description=description,
             source=source
         )
-        self.alerts.append(alert)
+        self.alerts.add(alert)
         logger.warning(f"Alert created: {title}")
     def record_metric(self, 
                      name: str,
@@ -194,6 +359,9 @@ class GLContinuousMonitor:
         if name not in self.metrics_history:
             self.metrics_history[name] = deque(maxlen=1000)
         self.metrics_history[name].append(metric)
+        if name not in self.metric_trends:
+            self.metric_trends[name] = MetricTrend(self.trend_window)
+        self.metric_trends[name].add(value)
         # Check thresholds
         if threshold_critical and value >= threshold_critical:
             self._create_alert(
@@ -240,27 +408,24 @@ class GLContinuousMonitor:
             return "decreasing"
         else:
             return "stable"
+    def get_trend(self, name: str) -> str:
+        """Trend direction over the last `trend_window` values, maintained incrementally."""
+        trend = self.metric_trends.get(name)
+        return trend.direction if trend else "stable"
     def get_active_alerts(self, severity: Optional[AlertSeverity] = None) -> List[Alert]:
         """Get active alerts, optionally filtered by severity."""
-        alerts = [a for a in self.alerts if not a.resolved]
-        if severity:
-            alerts = [a for a in alerts if a.severity == severity]
-        return alerts
+        return self.alerts.active(severity)
     def acknowledge_alert(self, alert_id: str) -> bool:
         """Acknowledge an alert."""
-        for alert in self.alerts:
-            if alert.alert_id == alert_id:
-                alert.acknowledged = True
-                logger.info(f"Alert acknowledged: {alert_id}")
-                return True
+        if self.alerts.acknowledge(alert_id):
+            logger.info(f"Alert acknowledged: {alert_id}")
+            return True
         return False
     def resolve_alert(self, alert_id: str) -> bool:
         """Resolve an alert."""
-        for alert in self.alerts:
-            if alert.alert_id == alert_id:
-                alert.resolved = True
-                logger.info(f"Alert resolved: {alert_id}")
-                return True
+        if self.alerts.resolve(alert_id):
+            logger.info(f"Alert resolved: {alert_id}")
+            return True
         return False
     def generate_report(self) -> MonitoringReport:
         """Generate comprehensive monitoring report."""
@@ -327,16 +492,100 @@ class GLContinuousMonitor:
         self._monitor_thread.start()
         logger.info("Continuous monitoring started")
     def _monitoring_loop(self) -> None:
-        """Main monitoring loop."""
-        while not self._stop_event.is_set():
-            for name, check in self.health_checks.items():
-                if check.enabled:
+        """
+        Main monitoring loop.
+        Due checks are popped from a heap of (next_run, seq, name) and
+        submitted to the worker pool; results are recorded on this thread
+        as runs complete, and runs past their timeout are failed.
+        """
+        schedule: List[Tuple[float, int, str]] = []
+        scheduled = set()
+        seq = 0
+        running: Dict[Future, Tuple[str, HealthCheck]] = {}
+        # Timed-out runs still occupying a worker; their results are discarded
+        abandoned: Dict[Future, str] = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='gl-health-check')
+        self._new_checks.extend(list(self.health_checks))
+        try:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+                while self._new_checks:
+                    name = self._new_checks.popleft()
+                    if name not in scheduled:
+                        scheduled.add(name)
+                        heapq.heappush(schedule, (now, seq, name))
+                        seq += 1
+                busy = {name for name, _ in running.values()} | set(abandoned.values())
+                rescheduled = []
+                while schedule and schedule[0][0] <= now:
+                    due, _, name = heapq.heappop(schedule)
+                    check = self.health_checks.get(name)
+                    if check is None:
+                        scheduled.discard(name)
+                        continue
+                    if check.enabled and name in busy:
+                        logger.warning(f"Health check still running, skipping this run: {name}")
+                    elif check.enabled:
+                        busy.add(name)
+                        running[pool.submit(self._run_scheduled_check, name, check)] = (name, check)
+                    # Fixed cadence, without bursts of catch-up runs after a stall
+                    interval = check.interval if check.interval > 0 else self.SCHEDULER_TICK
+                    rescheduled.append((max(due + interval, now), name))
+                for next_run, name in rescheduled:
+                    heapq.heappush(schedule, (next_run, seq, name))
+                    seq += 1
+                self._expire_timed_out_checks(running, abandoned, now)
+                next_wakeup = now + self.SCHEDULER_TICK
+                if schedule:
+                    next_wakeup = min(next_wakeup, schedule[0][0])
+                for name, check in running.values():
+                    started = self._check_started.get(name)
+                    if started is not None:
+                        next_wakeup = min(next_wakeup, started + check.timeout)
+                pending = list(running) + list(abandoned)
+                delay = max(0.0, next_wakeup - time.monotonic())
+                if pending:
+                    done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+                else:
+                    self._stop_event.wait(delay)
+                    done = ()
+                for future in done:
+                    if future in abandoned:
+                        logger.info(f"Timed-out health check finished late: {abandoned.pop(future)}")
+                        continue
+                    name, check = running.pop(future)
+                    self._check_started.pop(name, None)
                     try:
-                        self.execute_health_check(name)
+                        result, error, execution_time = future.result()
+                        self._record_check_result(name, check, result, error, execution_time)
                     except Exception as e:
                         logger.error(f"Error executing health check {name}: {str(e)}")
-            # Sleep for a short interval
-            time.sleep(10)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    def _run_scheduled_check(self, name: str, check: HealthCheck) -> Tuple[Any, Optional[Exception], float]:
+        self._check_started[name] = time.monotonic()
+        return self._run_check_func(name, check)
+    def _expire_timed_out_checks(self,
+                                 running: Dict[Future, Tuple[str, HealthCheck]],
+                                 abandoned: Dict[Future, str],
+                                 now: float) -> None:
+        """Fail runs that exceeded their timeout and stop waiting for them."""
+        for future, (name, check) in list(running.items()):
+            started = self._check_started.get(name)
+            if started is None or now - started < check.timeout or future.done():
+                continue
+            del running[future]
+            self._check_started.pop(name, None)
+            abandoned[future] = name
+            check.last_result = f"Timed out after {check.timeout}s"
+            check.status = HealthStatus.CRITICAL
+            self._create_alert(
+                severity=AlertSeverity.CRITICAL,
+                title=f"Health Check Timed Out: {name}",
+                description=f"Health check {name} did not complete within {check.timeout}s",
+                source=name
+            )
+            logger.error(f"Health check timed out: {name} ({check.timeout}s)")
     def stop_monitoring(self) -> None:
         """Stop continuous monitoring."""
         if self.running:
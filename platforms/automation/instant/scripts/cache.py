@@ -0,0 +1,198 @@
+# 
+# @GL-governed
+# @GL-layer: data
+# @GL-semantic: cache
+# @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+# GL Unified Architecture Governance Framework Activated
+
+"""
+Multi-Layer Cache - INSTANT 模式
+L1：進程內 LRU + TTL
+L2：SQLite 持久化存儲（可跨進程重啟保留）
+延遲目標：<50ms (p99) 緩存讀取
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+class CacheLevel(Enum):
+    """緩存層級"""
+    LOCAL = "local"  # 只寫 L1
+    PERSISTENT = "persistent"  # 只寫 L2
+    ALL = "all"  # L1 + L2
+class MultiLayerCache:
+    """
+    Multi-Layer Cache
+    核心特性：
+    - L1：有界 LRU，逐條 TTL
+    - L2：SQLite（傳入 l2_path 即持久化，否則為進程內資料庫）
+    - 命中 / 未命中統計
+    - 防擊穿：同一 key 的並發未命中只執行一次 loader
+    """
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        default_ttl: float = 3600,
+        l2_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._l1: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._l2 = sqlite3.connect(l2_path or ":memory:", check_same_thread=False)
+        self._l2_lock = threading.Lock()
+        with self._l2_lock:
+            if l2_path:
+                self._l2.execute("PRAGMA journal_mode=WAL")
+            self._l2.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._l2.commit()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "local_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "loads": 0,
+            "coalesced_loads": 0,
+        }
+    async def get(self, key: str) -> Optional[Any]:
+        """讀取：L1 → L2（命中即回填 L1）"""
+        now = time.time()
+        item = self._l1.get(key)
+        if item is not None:
+            value, expires_at = item
+            if expires_at > now:
+                self._l1.move_to_end(key)
+                self.stats["local_hits"] += 1
+                return value
+            del self._l1[key]
+        with self._l2_lock:
+            row = self._l2.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None and row[1] > now:
+            value = json.loads(row[0])
+            self._set_l1(key, value, row[1])
+            self.stats["l2_hits"] += 1
+            return value
+        self.stats["misses"] += 1
+        return None
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        level: CacheLevel = CacheLevel.ALL,
+    ) -> bool:
+        """寫入指定層級"""
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        if level in (CacheLevel.LOCAL, CacheLevel.ALL):
+            self._set_l1(key, value, expires_at)
+        if level in (CacheLevel.PERSISTENT, CacheLevel.ALL):
+            payload = json.dumps(value, default=str)
+            with self._l2_lock:
+                self._l2.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, payload, expires_at),
+                )
+                self._l2.commit()
+        self.stats["sets"] += 1
+        return True
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[Any]]],
+        ttl: Optional[float] = None,
+    ) -> Optional[Any]:
+        """
+        讀取，未命中時調用 loader 回填
+        同一 key 的並發未命中共享同一次 loader 調用（防緩存擊穿）
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced_loads"] += 1
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self.stats["loads"] += 1
+            value = await loader()
+            if value is not None:
+                await self.set(key, value, ttl=ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # 避免無人等待時出現 "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    async def delete(self, key: str) -> bool:
+        """刪除兩層中的 key"""
+        existed = self._l1.pop(key, None) is not None
+        with self._l2_lock:
+            cursor = self._l2.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._l2.commit()
+        return existed or cursor.rowcount > 0
+    async def invalidate(self, prefix: str) -> int:
+        """批量失效所有以 prefix 開頭的 key，返回失效數量"""
+        keys = [key for key in self._l1 if key.startswith(prefix)]
+        for key in keys:
+            del self._l1[key]
+        with self._l2_lock:
+            # 範圍條件可走主鍵索引
+            bounds = (prefix, prefix + "\U0010ffff")
+            rows = self._l2.execute(
+                "SELECT key FROM cache_entries WHERE key >= ? AND key < ?", bounds
+            ).fetchall()
+            self._l2.execute(
+                "DELETE FROM cache_entries WHERE key >= ? AND key < ?", bounds
+            )
+            self._l2.commit()
+        return len(set(keys) | {row[0] for row in rows})
+    async def purge_expired(self) -> int:
+        """清除兩層中已過期的條目"""
+        now = time.time()
+        expired = [key for key, (_, expires_at) in self._l1.items() if expires_at <= now]
+        for key in expired:
+            del self._l1[key]
+        with self._l2_lock:
+            cursor = self._l2.execute(
+                "DELETE FROM cache_entries WHERE expires_at <= ?", (now,)
+            )
+            self._l2.commit()
+        return len(expired) + cursor.rowcount
+    def get_stats(self) -> Dict[str, Any]:
+        """獲取緩存統計"""
+        hits = self.stats["local_hits"] + self.stats["l2_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "l1_size": len(self._l1),
+            "l1_max_entries": self.max_entries,
+        }
+    def close(self):
+        """關閉 L2 連接"""
+        with self._l2_lock:
+            self._l2.close()
+    def _set_l1(self, key: str, value: Any, expires_at: float):
+        self._l1[key] = (value, expires_at)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+            self.stats["evictions"] += 1
@@ -17,8 +17,10 @@ Version: 2.0.0
 """
 # MNGA-002: Import organization needs review
 import asyncio
+import bisect
 import json
 import logging
+import threading
 import time
 import uuid
 from abc import ABC, abstractmethod
@@ -26,12 +28,31 @@ from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Tuple, Union
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 )
 logger = logging.getLogger("instant-engine")
+# Thread pools shared by every agent pool in the process, one per worker count
+_SHARED_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+_SHARED_EXECUTOR_LOCK = threading.Lock()
+def get_shared_executor(max_workers: int = 256) -> ThreadPoolExecutor:
+    """Return the process-wide thread pool of this size, creating it on first use"""
+    with _SHARED_EXECUTOR_LOCK:
+        executor = _SHARED_EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = _SHARED_EXECUTORS[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"instant-agent-{max_workers}"
+            )
+        return executor
+def shutdown_shared_executor(wait: bool = True):
+    """Shutdown every process-wide thread pool"""
+    with _SHARED_EXECUTOR_LOCK:
+        executors = list(_SHARED_EXECUTORS.values())
+        _SHARED_EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
 class ExecutionMode(Enum):
     """Execution mode enumeration"""
     INSTANT = "instant"  # < 100ms latency
@@ -92,6 +113,46 @@ class PipelineResult:
     started_at: datetime
     completed_at: Optional[datetime] = None
     error: Optional[str] = None
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with O(1) recording
+    Buckets grow geometrically from 0.1ms to ~10min, so percentiles are
+    accurate to within one bucket (~12%) without storing samples.
+    """
+    BOUNDS_MS: List[float] = [0.1 * (1.125 ** i) for i in range(150)]
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+    def record(self, latency_ms: float):
+        """Record one latency sample"""
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, latency_ms)] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+    def percentile(self, pct: float) -> float:
+        """Return the upper bound of the bucket holding the pct-th percentile"""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(round(self.total * pct / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index >= len(self.BOUNDS_MS):
+                    return self.max_ms
+                return min(self.BOUNDS_MS[index], self.max_ms)
+        return self.max_ms
+    def snapshot(self) -> Dict[str, float]:
+        """Return count, mean, p50, p99 and max in milliseconds"""
+        return {
+            "count": self.total,
+            "mean_ms": self.sum_ms / self.total if self.total else 0.0,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
 class InstantAgent(ABC):
     """Base class for instant execution agents"""
     def __init__(self, config: AgentConfig):
@@ -187,7 +248,7 @@ class ParallelAgentPool:
     """
     def __init__(self, max_workers: int = 256):
         self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.executor = get_shared_executor(max_workers)
         self.active_agents: Dict[str, InstantAgent] = {}
         self.logger = logging.getLogger("agent-pool")
     async def execute_parallel(
@@ -212,19 +273,19 @@ class ParallelAgentPool:
         self.logger.info(
             f"Executing {len(inputs)} tasks with parallelism={parallelism}"
         )
-        # Create agent instances
-        agents = [agent_class(config) for _ in range(parallelism)]
-        # Distribute work
-        results = []
-        semaphore = asyncio.Semaphore(parallelism)
-        async def process_one(agent: InstantAgent, input_data: Any) -> Any:
-            async with semaphore:
-                return await agent.execute_with_retry(input_data)
-        # Execute all tasks
-        tasks = [
-            process_one(agents[i % parallelism], inp) for i, inp in enumerate(inputs)
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if parallelism <= 0:
+            return []
+        # One long-lived worker per agent pulls the next input, so only
+        # `parallelism` coroutines exist regardless of len(inputs)
+        results: List[Any] = [None] * len(inputs)
+        next_index = iter(range(len(inputs)))
+        async def worker(agent: InstantAgent):
+            for i in next_index:
+                try:
+                    results[i] = await agent.execute_with_retry(inputs[i])
+                except Exception as e:
+                    results[i] = e
+        await asyncio.gather(*(worker(agent_class(config)) for _ in range(parallelism)))
         # Filter out exceptions and log them
         valid_results = []
         for i, result in enumerate(results):
@@ -234,8 +295,8 @@ class ParallelAgentPool:
                 valid_results.append(result)
         return valid_results
     def shutdown(self):
-        """Shutdown the executor"""
-        self.executor.shutdown(wait=True)
+        """Release this pool; the shared executor is owned by the process"""
+        self.active_agents.clear()
 class InstantPipeline:
     """
     Instant execution pipeline
@@ -246,13 +307,22 @@ class InstantPipeline:
         name: str,
         stages: List[Dict[str, Any]],
         thresholds: Optional[LatencyThreshold] = None,
+        queue_size: int = 128,
     ):
         self.name = name
         self.stages = stages
         self.thresholds = thresholds or LatencyThreshold()
+        self.queue_size = queue_size
         self.pipeline_id = str(uuid.uuid4())[:8]
         self.agent_pool = ParallelAgentPool()
+        self.stage_histograms: Dict[str, LatencyHistogram] = {}
         self.logger = logging.getLogger(f"pipeline-{name}")
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Live per-stage latency percentiles across all executions"""
+        return {
+            stage_id: histogram.snapshot()
+            for stage_id, histogram in self.stage_histograms.items()
+        }
     async def execute(self, input_data: Any) -> PipelineResult:
         """
         Execute the pipeline with instant delivery
@@ -333,12 +403,18 @@ class InstantPipeline:
                 agent = agent_class(config)
                 output = await agent.execute_with_retry(input_data)
             latency_ms = (time.perf_counter() - start_time) * 1000
+            histogram = self.stage_histograms.setdefault(stage_id, LatencyHistogram())
+            histogram.record(latency_ms)
+            if latency_ms > min(max_latency, self.thresholds.max_stage) * 1000:
+                self.logger.warning(
+                    f"Stage {stage_id} took {latency_ms:.1f}ms, over its {max_latency}s threshold"
+                )
             return StageResult(
                 stage_id=stage_id,
                 status=PipelineStatus.COMPLETED,
                 latency_ms=latency_ms,
                 output=output,
-                metadata={"parallelism": parallelism},
+                metadata={"parallelism": parallelism, "latency": histogram.snapshot()},
             )
         except Exception as e:
             latency_ms = (time.perf_counter() - start_time) * 1000
@@ -350,6 +426,177 @@ class InstantPipeline:
                 output=None,
                 error=str(e),
             )
+    async def execute_streaming(
+        self, inputs: Union[Iterable[Any], AsyncIterable[Any]]
+    ) -> PipelineResult:
+        """
+        Execute the pipeline item by item with stages running concurrently
+        Stages are connected by bounded queues (``queue_size``), so an item
+        enters stage N+1 as soon as stage N finishes it, and a slow stage
+        applies backpressure upstream instead of buffering everything.
+        Each stage runs ``parallelism`` workers; every item is bounded by the
+        stage ``latency`` (capped at ``thresholds.max_stage``) and the whole
+        run by ``thresholds.max_total``.
+        Args:
+            inputs: Items to stream through every stage, sync or async iterable
+        Returns:
+            PipelineResult whose last stage output holds the ordered results
+        """
+        started_at = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
+        self.logger.info(f"Starting streaming execution: {self.pipeline_id}")
+        stop = object()
+        specs = [self._stage_spec(stage_config) for stage_config in self.stages]
+        queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in range(len(specs) + 1)
+        ]
+        run_stats = [
+            {"histogram": LatencyHistogram(), "processed": 0, "failed": 0, "errors": [],
+             "breaches": 0, "first_start": None, "last_end": None}
+            for _ in specs
+        ]
+        async def feed():
+            count = 0
+            if hasattr(inputs, "__aiter__"):
+                async for item in inputs:
+                    await queues[0].put((count, item))
+                    count += 1
+            else:
+                for item in inputs:
+                    await queues[0].put((count, item))
+                    count += 1
+            for _ in range(specs[0]["parallelism"]):
+                await queues[0].put(stop)
+        async def stage_worker(index: int):
+            spec = specs[index]
+            stats = run_stats[index]
+            agent = spec["agent_class"](spec["config"])
+            inbox, outbox = queues[index], queues[index + 1]
+            while True:
+                item = await inbox.get()
+                if item is stop:
+                    return
+                sequence, payload = item
+                item_start = time.perf_counter()
+                if stats["first_start"] is None:
+                    stats["first_start"] = item_start
+                try:
+                    output = await asyncio.wait_for(
+                        agent.execute_with_retry(payload), timeout=spec["max_latency"]
+                    )
+                except Exception as e:
+                    stats["failed"] += 1
+                    if len(stats["errors"]) < 10:
+                        stats["errors"].append(f"item {sequence}: {e}")
+                    self.logger.error(f"Stage {spec['stage_id']} item {sequence} failed: {e}")
+                    continue
+                finally:
+                    stats["last_end"] = time.perf_counter()
+                    latency_ms = (stats["last_end"] - item_start) * 1000
+                    stats["histogram"].record(latency_ms)
+                    self.stage_histograms.setdefault(
+                        spec["stage_id"], LatencyHistogram()
+                    ).record(latency_ms)
+                    if latency_ms > spec["max_latency"] * 1000:
+                        stats["breaches"] += 1
+                stats["processed"] += 1
+                await outbox.put((sequence, output))
+        async def run_stage(index: int):
+            await asyncio.gather(
+                *(stage_worker(index) for _ in range(specs[index]["parallelism"]))
+            )
+            downstream = specs[index + 1]["parallelism"] if index + 1 < len(specs) else 1
+            for _ in range(downstream):
+                await queues[index + 1].put(stop)
+        async def collect() -> List[Tuple[int, Any]]:
+            collected = []
+            while True:
+                item = await queues[-1].get()
+                if item is stop:
+                    return collected
+                collected.append(item)
+        collector = asyncio.ensure_future(collect())
+        runners = [asyncio.ensure_future(feed())] + [
+            asyncio.ensure_future(run_stage(i)) for i in range(len(specs))
+        ]
+        error = None
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*runners, collector), timeout=self.thresholds.max_total
+            )
+        except asyncio.TimeoutError:
+            error = f"Pipeline exceeded max_total latency of {self.thresholds.max_total}s"
+        except Exception as e:
+            error = str(e)
+        finally:
+            for task in runners + [collector]:
+                task.cancel()
+        if error:
+            self.logger.error(f"Streaming pipeline failed: {error}")
+        results = [output for _, output in sorted(collector.result(), key=lambda item: item[0])] if not error else []
+        stage_results = []
+        for index, spec in enumerate(specs):
+            stats = run_stats[index]
+            latency = stats["histogram"].snapshot()
+            if latency["p99_ms"] > spec["max_latency"] * 1000:
+                self.logger.warning(
+                    f"Stage {spec['stage_id']} p99 {latency['p99_ms']:.1f}ms exceeds "
+                    f"{spec['max_latency'] * 1000:.0f}ms threshold"
+                )
+            is_last = index == len(specs) - 1
+            stage_results.append(
+                StageResult(
+                    stage_id=spec["stage_id"],
+                    status=PipelineStatus.FAILED if error else PipelineStatus.COMPLETED,
+                    latency_ms=(
+                        (stats["last_end"] - stats["first_start"]) * 1000
+                        if stats["first_start"] is not None
+                        else 0.0
+                    ),
+                    output=(
+                        {"batch_results": results, "count": len(results)}
+                        if is_last
+                        else {"count": stats["processed"]}
+                    ),
+                    error=error,
+                    metadata={
+                        "parallelism": spec["parallelism"],
+                        "failed": stats["failed"],
+                        "errors": stats["errors"],
+                        "threshold_breaches": stats["breaches"],
+                        "latency": latency,
+                    },
+                )
+            )
+        return PipelineResult(
+            pipeline_id=self.pipeline_id,
+            status=PipelineStatus.FAILED if error else PipelineStatus.COMPLETED,
+            total_latency_ms=(time.perf_counter() - start_time) * 1000,
+            stages=stage_results,
+            started_at=started_at,
+            completed_at=datetime.now(timezone.utc),
+            error=error,
+        )
+    def _stage_spec(self, stage_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve agent class, config and latency budget for a stage"""
+        agent_type = stage_config.get("agent", AgentType.ANALYZER)
+        parallelism = max(1, stage_config.get("parallelism", 1))
+        max_latency = min(stage_config.get("latency", 30.0), self.thresholds.max_stage)
+        return {
+            "stage_id": stage_config.get("name", str(uuid.uuid4())[:8]),
+            "agent_class": self._get_agent_class(agent_type),
+            "parallelism": parallelism,
+            "max_latency": max_latency,
+            "config": AgentConfig(
+                agent_type=(
+                    agent_type
+                    if isinstance(agent_type, AgentType)
+                    else AgentType.ANALYZER
+                ),
+                parallelism=parallelism,
+                max_latency=max_latency,
+            ),
+        }
     def _get_agent_class(self, agent_type: Any) -> type:
         """Get agent class by type"""
         agent_map = {
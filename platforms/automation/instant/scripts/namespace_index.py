@@ -0,0 +1,90 @@
+# 
+# @GL-governed
+# @GL-layer: data
+# @GL-semantic: namespace_index
+# @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+# GL Unified Architecture Governance Framework Activated
+
+"""
+Namespace Inverted Index - INSTANT 模式
+以 1~3 字元 n-gram 為 token 的倒排索引，保持原有「不分大小寫子字串」語義
+查詢成本與最小 posting 大小成正比，而非 registry 總大小
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set
+NAME_SCOPE = "__name__"
+class NamespaceIndex:
+    """
+    Namespace 倒排索引
+    - scope：namespace 名稱（NAME_SCOPE）或 data 的頂層欄位
+    - 查詢：取 query 的 n-gram posting 交集，再以子字串比對確認
+    """
+    GRAM_SIZE = 3
+    def __init__(self, searchable_fields: Optional[Iterable[str]] = None):
+        # None 表示索引所有頂層欄位
+        self.searchable_fields = (
+            set(searchable_fields) if searchable_fields is not None else None
+        )
+        self._postings: Dict[str, Dict[str, Set[str]]] = {}
+        self._texts: Dict[str, Dict[str, str]] = {}
+    def add(self, namespace: str, data: Dict[str, Any]):
+        """索引 namespace 名稱與可搜索欄位"""
+        self.remove(namespace)
+        self._add_text(NAME_SCOPE, namespace, namespace)
+        for field, value in data.items():
+            if self.searchable_fields is None or field in self.searchable_fields:
+                self._add_text(field, namespace, str(value))
+    def remove(self, namespace: str):
+        """移除 namespace 的所有 posting"""
+        for scope, texts in self._texts.items():
+            text = texts.pop(namespace, None)
+            if text is None:
+                continue
+            postings = self._postings[scope]
+            for gram in self._grams(text):
+                members = postings.get(gram)
+                if members is not None:
+                    members.discard(namespace)
+                    if not members:
+                        del postings[gram]
+    def search(self, query: str, scope: str = NAME_SCOPE) -> Set[str]:
+        """返回 scope 文本包含 query（不分大小寫）的 namespaces"""
+        texts = self._texts.get(scope)
+        if not texts:
+            return set()
+        needle = query.lower()
+        if not needle:
+            return set(texts)
+        postings = self._postings[scope]
+        grams = sorted(
+            self._query_grams(needle), key=lambda gram: len(postings.get(gram, ()))
+        )
+        candidates = set(postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= postings.get(gram, set())
+        return {ns for ns in candidates if needle in texts[ns]}
+    def is_indexed(self, scope: str) -> bool:
+        """該欄位是否有索引（未索引欄位需回退掃描）"""
+        return (
+            scope == NAME_SCOPE
+            or self.searchable_fields is None
+            or scope in self.searchable_fields
+        )
+    def _add_text(self, scope: str, namespace: str, text: str):
+        text = text.lower()
+        self._texts.setdefault(scope, {})[namespace] = text
+        postings = self._postings.setdefault(scope, {})
+        for gram in self._grams(text):
+            postings.setdefault(gram, set()).add(namespace)
+    def _grams(self, text: str) -> Set[str]:
+        grams: Set[str] = set()
+        for size in range(1, self.GRAM_SIZE + 1):
+            grams.update(text[i:i + size] for i in range(len(text) - size + 1))
+        return grams
+    def _query_grams(self, needle: str) -> List[str]:
+        if len(needle) <= self.GRAM_SIZE:
+            return [needle]
+        size = self.GRAM_SIZE
+        return list({needle[i:i + size] for i in range(len(needle) - size + 1)})
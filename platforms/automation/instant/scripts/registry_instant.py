@@ -12,11 +12,13 @@ Registry Manager - INSTANT 模式增強版
 延遲目標：<500ms (p99) 完整操作
 """
 import asyncio
+import itertools
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from .cache import MultiLayerCache
+from .namespace_index import NAME_SCOPE, NamespaceIndex
 from .schema_validator import SchemaValidator
 from .validator import RegistryValidator, ValidationStatus
 @dataclass
@@ -34,17 +36,27 @@ class RegistryManagerInstant:
     核心特性：
     - 延遲 <500ms (p99)
     - 多層緩存 (<50ms)
+    - 倒排索引搜索（成本與結果數量成正比）
     - 自動驗證
     - 事件驅動
     - 完全自治
     """
-    def __init__(self):
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        searchable_fields: Optional[Iterable[str]] = None,
+    ):
         # 核心組件
         self.validator = RegistryValidator()
-        self.cache = MultiLayerCache()
+        self.cache = MultiLayerCache(l2_path=cache_path)
         self.schema_validator = SchemaValidator()
         # Registry 數據
         self.namespaces: Dict[str, NamespaceEntry] = {}
+        # 索引：倒排索引、插入順序、to_dict 快照
+        self.index = NamespaceIndex(searchable_fields)
+        self._order: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
         # 統計
         self.stats = {
             "total_operations": 0,
@@ -94,10 +106,17 @@ class RegistryManagerInstant:
             created_at=datetime.now(),
             updated_at=datetime.now(),
         )
-        # 4. 存儲
+        # 4. 存儲 + 索引
+        if namespace in self.namespaces:
+            del self.namespaces[namespace]
         self.namespaces[namespace] = entry
+        self._order[namespace] = next(self._sequence)
+        self.index.add(namespace, data)
+        self._snapshots[namespace] = entry.to_dict()
         # 5. 緩存
-        await self.cache.set(f"namespace:{namespace}", entry.to_dict(), ttl=3600)
+        await self.cache.set(
+            f"namespace:{namespace}", self._snapshots[namespace], ttl=3600
+        )
         # 6. 觸發事件
         await self._trigger_event("on_create", namespace, entry)
         latency = (time.time() - start_time) * 1000
@@ -110,22 +129,25 @@ class RegistryManagerInstant:
         """
         start_time = time.time()
         self.stats["total_operations"] += 1
-        # 1. 嘗試從緩存獲取
-        cached = await self.cache.get(f"namespace:{namespace}")
-        if cached:
+        # 1. 從緩存獲取，未命中時由存儲回填（並發未命中只回填一次）
+        loaded = False
+        async def load_from_store() -> Optional[Dict[str, Any]]:
+            nonlocal loaded
+            loaded = True
+            return self._snapshots.get(namespace)
+        result = await self.cache.get_or_load(
+            f"namespace:{namespace}", load_from_store, ttl=3600
+        )
+        latency = (time.time() - start_time) * 1000
+        if not loaded:
             self.stats["cache_hits"] += 1
-            latency = (time.time() - start_time) * 1000
             print(f"✅ 從緩存獲取 {namespace}，延遲: {latency:.2f}ms")
-            return cached
+            return result
         # 2. 從存儲獲取
         self.stats["cache_misses"] += 1
-        if namespace in self.namespaces:
-            entry = self.namespaces[namespace]
-            # 回填緩存
-            await self.cache.set(f"namespace:{namespace}", entry.to_dict(), ttl=3600)
-            latency = (time.time() - start_time) * 1000
+        if result is not None:
             print(f"✅ 從存儲獲取 {namespace}，延遲: {latency:.2f}ms")
-            return entry.to_dict()
+            return result
         print(f"❌ Namespace 不存在: {namespace}")
         return None
     async def update_namespace(self, namespace: str, data: Dict[str, Any]) -> bool:
@@ -151,10 +173,14 @@ class RegistryManagerInstant:
         entry = self.namespaces[namespace]
         entry.data = data
         entry.updated_at = datetime.now()
+        self.index.add(namespace, data)
+        self._snapshots[namespace] = entry.to_dict()
         # 4. 失效緩存
         await self.cache.delete(f"namespace:{namespace}")
         # 5. 重新緩存
-        await self.cache.set(f"namespace:{namespace}", entry.to_dict(), ttl=3600)
+        await self.cache.set(
+            f"namespace:{namespace}", self._snapshots[namespace], ttl=3600
+        )
         # 6. 觸發事件
         await self._trigger_event("on_update", namespace, entry)
         latency = (time.time() - start_time) * 1000
@@ -172,8 +198,11 @@ class RegistryManagerInstant:
         if namespace not in self.namespaces:
             print(f"❌ Namespace 不存在: {namespace}")
             return False
-        # 2. 刪除條目
+        # 2. 刪除條目與索引
         del self.namespaces[namespace]
+        del self._order[namespace]
+        self._snapshots.pop(namespace, None)
+        self.index.remove(namespace)
         # 3. 失效緩存
         await self.cache.delete(f"namespace:{namespace}")
         # 4. 觸發事件
@@ -187,11 +216,15 @@ class RegistryManagerInstant:
         延遲目標：<100ms (p99)
         """
         start_time = time.time()
-        # 簡單的過濾邏輯
         if pattern == "*":
             namespaces = list(self.namespaces.keys())
         else:
-            namespaces = [ns for ns in self.namespaces.keys() if pattern in ns]
+            # 倒排索引不分大小寫，這裡再按原語義（區分大小寫）確認
+            namespaces = [
+                ns
+                for ns in self._in_registry_order(self.index.search(pattern))
+                if pattern in ns
+            ]
         latency = (time.time() - start_time) * 1000
         print(f"✅ 列出 {len(namespaces)} 個 namespaces，延遲: {latency:.2f}ms")
         return namespaces
@@ -203,19 +236,21 @@ class RegistryManagerInstant:
         延遲目標：<200ms (p99)
         """
         start_time = time.time()
-        results = []
-        for namespace, entry in self.namespaces.items():
-            # 搜索邏輯
-            if query.lower() in namespace.lower():
-                results.append(entry.to_dict())
+        matches = self.index.search(query, NAME_SCOPE)
+        for field in fields or []:
+            if self.index.is_indexed(field):
+                matches |= self.index.search(query, field)
             else:
-                # 搜索數據中的指定欄位
-                if fields:
-                    for field in fields:
-                        if field in entry.data:
-                            if query.lower() in str(entry.data[field]).lower():
-                                results.append(entry.to_dict())
-                                break
+                # 未索引欄位回退掃描
+                matches |= {
+                    namespace
+                    for namespace, entry in self.namespaces.items()
+                    if field in entry.data
+                    and query.lower() in str(entry.data[field]).lower()
+                }
+        results = [
+            self._snapshots[namespace] for namespace in self._in_registry_order(matches)
+        ]
         latency = (time.time() - start_time) * 1000
         print(f"✅ 搜索找到 {len(results)} 個結果，延遲: {latency:.2f}ms")
         return results
@@ -257,6 +292,9 @@ class RegistryManagerInstant:
             "cache": cache_stats,
             "total_namespaces": len(self.namespaces),
         }
+    def _in_registry_order(self, namespaces: Iterable[str]) -> List[str]:
+        """按插入順序排列（與遍歷 self.namespaces 的順序一致）"""
+        return sorted(namespaces, key=self._order.__getitem__)
     async def _trigger_event(
         self, event_type: str, namespace: str, entry: Optional[NamespaceEntry]
     ):
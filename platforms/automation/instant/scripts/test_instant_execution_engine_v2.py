@@ -0,0 +1,130 @@
+#
+# @GL-governed
+# @GL-layer: data
+# @GL-semantic: test_instant_execution_engine_v2
+# @GL-audit-trail: ../../engine/gov-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+# GL Unified Architecture Governance Framework Activated
+
+"""
+Tests for INSTANT Execution Engine v2.0.0
+驗證引擎可建構、預設管線已註冊、串流管線保序與背壓、延遲直方圖
+"""
+import asyncio
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from instant_execution_engine_v2 import (  # noqa: E402
+    InstantAgent,
+    InstantExecutionEngine,
+    InstantPipeline,
+    LatencyHistogram,
+    LatencyThreshold,
+    PipelineStatus,
+    get_shared_executor,
+    shutdown_shared_executor,
+)
+class EchoAgent(InstantAgent):
+    """Returns its input after a short random delay"""
+    async def execute(self, input_data):
+        await asyncio.sleep(random.random() * 0.002)
+        return input_data
+class SlowAgent(InstantAgent):
+    """Records how many items have left the last stage"""
+    finished = 0
+    async def execute(self, input_data):
+        await asyncio.sleep(0.002)
+        SlowAgent.finished += 1
+        return input_data
+class StubPipeline(InstantPipeline):
+    """Pipeline whose stage names map to test agents"""
+    AGENTS = {"echo": EchoAgent, "slow": SlowAgent}
+    def _get_agent_class(self, agent_type):
+        return self.AGENTS[agent_type]
+class TestLatencyHistogram:
+    """測試 Latency Histogram"""
+    def test_empty(self):
+        snapshot = LatencyHistogram().snapshot()
+        assert snapshot == {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    def test_percentiles_within_one_bucket(self):
+        histogram = LatencyHistogram()
+        samples = [float(value) for value in range(1, 1001)]
+        for value in samples:
+            histogram.record(value)
+        for pct, exact in ((50, 500.0), (90, 900.0), (99, 990.0)):
+            assert exact <= histogram.percentile(pct) <= exact * 1.125
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 1000
+        assert snapshot["max_ms"] == 1000.0
+        assert abs(snapshot["mean_ms"] - 500.5) < 1e-9
+    def test_percentile_bucket_bounds(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.05)
+        histogram.record(10 ** 7)
+        # Below the first bound reports that bound; past the last bound reports the max
+        assert histogram.percentile(50) == LatencyHistogram.BOUNDS_MS[0]
+        assert histogram.percentile(100) == 10 ** 7
+class TestStreamingPipeline:
+    """測試 Streaming Pipeline"""
+    def test_results_keep_input_order(self):
+        pipeline = StubPipeline(
+            "order",
+            [{"name": "a", "agent": "echo", "parallelism": 4}, {"name": "b", "agent": "echo", "parallelism": 3}],
+        )
+        result = asyncio.run(pipeline.execute_streaming(range(200)))
+        assert result.status == PipelineStatus.COMPLETED
+        assert result.stages[-1].output["batch_results"] == list(range(200))
+        assert pipeline.get_latency_stats()["a"]["count"] == 200
+    def test_slow_stage_applies_backpressure(self):
+        consumed = []
+        lead = []
+        def inputs():
+            for item in range(60):
+                consumed.append(item)
+                lead.append(len(consumed) - SlowAgent.finished)
+                yield item
+        SlowAgent.finished = 0
+        pipeline = StubPipeline(
+            "backpressure",
+            [{"name": "fast", "agent": "echo"}, {"name": "slow", "agent": "slow"}],
+            queue_size=2,
+        )
+        result = asyncio.run(pipeline.execute_streaming(inputs()))
+        assert result.stages[-1].output["batch_results"] == list(range(60))
+        # Three queues of two items plus one item in flight per stage and the feeder
+        assert max(lead) <= 3 * 2 + 3
+    def test_total_budget_fails_run(self):
+        pipeline = StubPipeline(
+            "budget", [{"name": "slow", "agent": "slow"}],
+            thresholds=LatencyThreshold(max_total=0.01),
+        )
+        result = asyncio.run(pipeline.execute_streaming(range(100)))
+        assert result.status == PipelineStatus.FAILED
+        assert "max_total" in result.error
+class TestInstantExecutionEngine:
+    """測試 Instant Execution Engine"""
+    def test_engine_registers_default_pipelines(self):
+        engine = InstantExecutionEngine()
+        assert set(engine.executor.pipelines) == {"feature", "fix", "optimization"}
+        assert engine.executor.event_handlers
+    def test_get_status(self):
+        status = InstantExecutionEngine().get_status()
+        assert status["version"] == InstantExecutionEngine.VERSION
+        assert status["status"] == "active"
+        assert status["pipelines"]
+        assert "error_detected" in status["event_handlers"]
+    def test_execute_fix(self):
+        engine = InstantExecutionEngine()
+        result = asyncio.run(engine.execute_fix({"error": "boom"}))
+        assert result.status == PipelineStatus.COMPLETED
+        assert result.stages
+    def test_shared_executor_lifecycle(self):
+        executor = get_shared_executor()
+        assert get_shared_executor() is executor
+        small = get_shared_executor(4)
+        assert small is not executor
+        assert small._max_workers == 4
+        shutdown_shared_executor()
+        assert get_shared_executor() is not executor
+        shutdown_shared_executor()
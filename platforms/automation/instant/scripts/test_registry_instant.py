@@ -11,9 +11,11 @@ Unit Tests for Registry - INSTANT 模式
 驗證所有功能符合 INSTANT 執行標準
 延遲目標：<500ms (p99)
 """
+import asyncio
 import time
 import pytest
 from namespace_registry.cache import CacheLevel, MultiLayerCache
+from namespace_registry.namespace_index import NamespaceIndex
 from namespace_registry.registry_instant import RegistryManagerInstant
 from namespace_registry.schema_validator import SchemaValidationStatus, SchemaValidator
 from namespace_registry.validator import RegistryValidator, ValidationStatus
@@ -133,6 +135,64 @@ class TestMultiLayerCache:
         latency = (time.time() - start) * 1000
         assert result is not None
         assert latency < 50  # <50ms (p99)
+    @pytest.mark.asyncio
+    async def test_cache_l2_persistence(self, tmp_path):
+        """測試 L2 持久化（新實例可讀取）"""
+        path = str(tmp_path / "cache.db")
+        writer = MultiLayerCache(l2_path=path)
+        await writer.set("test-key", {"data": "value"})
+        writer.close()
+        reader = MultiLayerCache(l2_path=path)
+        result = await reader.get("test-key")
+        assert result == {"data": "value"}
+        assert reader.get_stats()["l2_hits"] == 1
+    @pytest.mark.asyncio
+    async def test_cache_lru_eviction(self):
+        """測試 L1 容量上限"""
+        cache = MultiLayerCache(max_entries=2)
+        for i in range(3):
+            await cache.set(f"key{i}", {"i": i}, level=CacheLevel.LOCAL)
+        stats = cache.get_stats()
+        assert stats["l1_size"] == 2
+        assert stats["evictions"] == 1
+        assert await cache.get("key0") is None
+    @pytest.mark.asyncio
+    async def test_cache_ttl_expiry(self, cache):
+        """測試 TTL 過期"""
+        await cache.set("test-key", {"data": "value"}, ttl=0)
+        assert await cache.get("test-key") is None
+    @pytest.mark.asyncio
+    async def test_cache_stampede_protection(self, cache):
+        """測試並發未命中只回填一次"""
+        calls = 0
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"data": "value"}
+        results = await asyncio.gather(
+            *[cache.get_or_load("test-key", loader) for _ in range(20)]
+        )
+        assert calls == 1
+        assert all(r == {"data": "value"} for r in results)
+class TestNamespaceIndex:
+    """測試 Namespace 倒排索引"""
+    def test_search_matches_substring_semantics(self):
+        """測試與子字串掃描結果一致"""
+        index = NamespaceIndex()
+        names = ["platform-registry-service", "platform-agent-service", "Other-NS"]
+        for name in names:
+            index.add(name, {"metadata": {"owner": "platform-team"}})
+        for query in ["platform", "service", "ns", "o", "agent-s", "missing"]:
+            expected = {n for n in names if query.lower() in n.lower()}
+            assert index.search(query) == expected
+        assert index.search("team", "metadata") == set(names)
+    def test_remove(self):
+        """測試移除後不再命中"""
+        index = NamespaceIndex()
+        index.add("platform-registry-service", {})
+        index.remove("platform-registry-service")
+        assert index.search("registry") == set()
 class TestSchemaValidator:
     """測試 Schema Validator"""
     @pytest.fixture
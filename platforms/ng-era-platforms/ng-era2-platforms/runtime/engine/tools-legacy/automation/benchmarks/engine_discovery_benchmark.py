@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# @GL-governed
+# @GL-layer: gl-platform.governance
+# @GL-semantic: engine_discovery_benchmark
+# @GL-audit-trail: ../../engine/gl-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+"""
+Engine Discovery Benchmark - EngineRegistry 引擎發現基準測試
+比較舊版逐檔導入發現與 AST 靜態發現（冷啟動 / 熱快取）的耗時。
+預設在臨時目錄生成模擬工具樹；--path 可指定實際目錄。
+用法: python benchmarks/engine_discovery_benchmark.py [--modules N] [--path DIR]
+"""
+import argparse
+import importlib.util
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from engine_base import BaseEngine, EngineType  # noqa: E402
+from master_orchestrator import EngineRegistry  # noqa: E402
+ENGINE_MODULE = '''
+from engine_base import BaseEngine, EngineType
+_TABLE = [i * i for i in range({work})]
+class GeneratedEngine{index}(BaseEngine):
+    ENGINE_TYPE = EngineType.VALIDATION
+    async def _initialize(self):
+        return True
+    async def _execute(self, task):
+        return None
+    async def _shutdown(self):
+        return True
+    def _get_capabilities(self):
+        return {{}}
+'''
+PLAIN_MODULE = '''
+import json
+_TABLE = [i * i for i in range({work})]
+class Helper{index}:
+    def run(self):
+        return json.dumps(_TABLE[:3])
+'''
+def legacy_discover(search_paths: List[Path]) -> List[Dict[str, Any]]:
+    """改版前的發現方式：rglob 後逐檔 exec_module 再檢查 BaseEngine 子類"""
+    discovered = []
+    for search_path in search_paths:
+        for py_file in search_path.rglob("*.py"):
+            if py_file.name.startswith("_"):
+                continue
+            try:
+                spec = importlib.util.spec_from_file_location(py_file.stem, py_file)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                for name, obj in vars(module).items():
+                    if (
+                        isinstance(obj, type)
+                        and issubclass(obj, BaseEngine)
+                        and obj is not BaseEngine
+                        and not name.startswith("_")
+                    ):
+                        engine_type = getattr(obj, "ENGINE_TYPE", EngineType.EXECUTION)
+                        discovered.append(
+                            {
+                                "class_name": name,
+                                "module_path": str(py_file),
+                                "engine_type": engine_type.value,
+                                # 舊版也會列出從其他模組導入的引擎類
+                                "defined_here": obj.__module__ == module.__name__,
+                            }
+                        )
+            except Exception:
+                pass
+    return discovered
+def generate_tree(root: Path, modules: int, engine_ratio: float, work: int):
+    engines = max(1, int(modules * engine_ratio))
+    for i in range(modules):
+        package = root / f"pkg{i % 20}"
+        package.mkdir(exist_ok=True)
+        template = ENGINE_MODULE if i < engines else PLAIN_MODULE
+        (package / f"module_{i}.py").write_text(template.format(index=i, work=work))
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+def run(search_path: Path, cache_path: Path):
+    legacy, legacy_ms = timed(lambda: legacy_discover([search_path]))
+    print(f"legacy import discovery   {legacy_ms:9.1f}ms  engines={len(legacy)}")
+    registry = EngineRegistry(discovery_cache_path=cache_path)
+    cold, cold_ms = timed(lambda: registry.discover_engines([search_path]))
+    print(f"AST discovery (cold)      {cold_ms:9.1f}ms  engines={len(cold)}  {registry.discovery_stats}")
+    registry = EngineRegistry(discovery_cache_path=cache_path)
+    warm, warm_ms = timed(lambda: registry.discover_engines([search_path]))
+    print(f"AST discovery (warm)      {warm_ms:9.1f}ms  engines={len(warm)}  {registry.discovery_stats}")
+    legacy_keys = sorted(
+        (e["module_path"], e["class_name"], e["engine_type"])
+        for e in legacy
+        if e["defined_here"]
+    )
+    warm_keys = sorted((e["module_path"], e["class_name"], e["engine_type"]) for e in warm)
+    print(f"same engines as legacy (classes defined in each module): {legacy_keys == warm_keys}")
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--modules", type=int, default=1000)
+    parser.add_argument("--engine-ratio", type=float, default=0.05)
+    parser.add_argument("--work", type=int, default=5000, help="每個模組頂層計算量")
+    parser.add_argument("--path", type=Path, help="掃描實際目錄而非生成的模擬樹")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "engine_discovery_cache.json"
+        if args.path:
+            run(args.path.resolve(), cache_path)
+            return
+        root = Path(tmp) / "tools"
+        root.mkdir()
+        generate_tree(root, args.modules, args.engine_ratio, args.work)
+        run(root, cache_path)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# @GL-governed
+# @GL-layer: gl-platform.governance
+# @GL-semantic: engine_scheduling_benchmark
+# @GL-audit-trail: ../../engine/gl-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+"""
+Engine Scheduling Benchmark - BaseEngine 任務調度基準測試
+比較舊版輪詢主循環與 worker-pool 調度的吞吐量 (tasks/sec) 與排隊延遲。
+用法: python benchmarks/engine_scheduling_benchmark.py [--tasks N] [--concurrency N]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from engine_base import (  # noqa: E402
+    BaseEngine,
+    EngineConfig,
+    EngineState,
+    PersistenceConfig,
+    ResourceConfig,
+    TaskResult,
+)
+class BenchmarkEngine(BaseEngine):
+    """每個任務 await 一段固定時間的引擎"""
+    def __init__(self, config: EngineConfig, work_seconds: float):
+        super().__init__(config)
+        self.work_seconds = work_seconds
+        self.started: Dict[str, float] = {}
+    async def _initialize(self) -> bool:
+        return True
+    async def _execute(self, task: Dict[str, Any]) -> TaskResult:
+        self.started[task["task_id"]] = time.perf_counter()
+        if self.work_seconds:
+            await asyncio.sleep(self.work_seconds)
+        return TaskResult(task_id=task["task_id"], success=True)
+    async def _shutdown(self) -> bool:
+        return True
+    def _get_capabilities(self) -> Dict[str, Any]:
+        return {}
+class LegacyPollingEngine(BenchmarkEngine):
+    """重現改版前的主循環：wait_for(get, 1.0) + sleep(0.1) 輪詢並發上限"""
+    async def start(self) -> bool:
+        self._task_queue = asyncio.Queue(maxsize=self.config.resource.max_queue_size)
+        self._shutdown_event = asyncio.Event()
+        self._state = EngineState.RUNNING
+        self._running = True
+        self._background_tasks = [asyncio.create_task(self._main_loop())]
+        return True
+    async def submit_task(self, task: Dict[str, Any]) -> str:
+        await self._task_queue.put(task)
+        return task["task_id"]
+    async def _main_loop(self):
+        while self._running:
+            try:
+                task = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            while len(self._active_tasks) >= self.config.resource.max_concurrent_tasks:
+                await asyncio.sleep(0.1)
+            self._active_tasks.add(task["task_id"])
+            asyncio.create_task(self._run(task))
+    async def _run(self, task: Dict[str, Any]):
+        try:
+            await self._execute_with_retry(task)
+        finally:
+            self._active_tasks.discard(task["task_id"])
+    async def stop(self, force: bool = False) -> bool:
+        self._running = False
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        return True
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+async def run(engine_cls, tasks: int, concurrency: int, work_seconds: float):
+    config = EngineConfig(
+        engine_name=engine_cls.__name__,
+        resource=ResourceConfig(max_concurrent_tasks=concurrency, max_queue_size=0),
+        persistence=PersistenceConfig(enabled=False),
+    )
+    engine = engine_cls(config, work_seconds)
+    await engine.start()
+    submitted: Dict[str, float] = {}
+    start = time.perf_counter()
+    for i in range(tasks):
+        task_id = f"task-{i}"
+        submitted[task_id] = time.perf_counter()
+        await engine.submit_task({"task_id": task_id})
+    while len(engine.started) < tasks or engine._active_tasks:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    await engine.stop(force=True)
+    latencies = [(engine.started[t] - submitted[t]) * 1000 for t in submitted]
+    print(
+        f"{engine_cls.__name__:<22} {tasks / elapsed:>10.0f} tasks/s   "
+        f"queue p50={percentile(latencies, 50):8.1f}ms  p99={percentile(latencies, 99):8.1f}ms"
+    )
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--work-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    for engine_cls in (LegacyPollingEngine, BenchmarkEngine):
+        asyncio.run(run(engine_cls, args.tasks, args.concurrency, args.work_ms / 1000))
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# @GL-governed
+# @GL-layer: gl-platform.governance
+# @GL-semantic: event_bus_benchmark
+# @GL-audit-trail: ../../engine/gl-platform.governance/GL_SEMANTIC_ANCHOR.json
+#
+"""
+Event Bus Benchmark - EventBus 事件分發基準測試
+比較舊版中央隊列 + 串行分發與每訂閱者隊列的吞吐量 (events/sec)，
+並以一個慢訂閱者驗證其他訂閱者的延遲不受影響。
+用法: python benchmarks/event_bus_benchmark.py [--events N] [--subscribers N]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from engine_base import EngineEvent  # noqa: E402
+from master_orchestrator import EventBus, OverflowPolicy  # noqa: E402
+class LegacyEventBus:
+    """重現改版前的事件總線：中央隊列、逐個 await 處理器、每次分發 extend 全局訂閱"""
+    def __init__(self, max_size: int = 10000):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self._history: List[EngineEvent] = []
+        self._max_history = 1000
+        self._running = False
+        self._task = None
+    async def start(self):
+        self._running = True
+        self._task = asyncio.create_task(self._dispatch_loop())
+    async def stop(self):
+        self._running = False
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+    async def publish(self, event: EngineEvent):
+        self._history.append(event)
+        if len(self._history) > self._max_history:
+            self._history = self._history[-self._max_history:]
+        await self._queue.put(event)
+    def subscribe(self, event_type: str, handler: Callable):
+        self._subscribers.setdefault(event_type, []).append(handler)
+    async def join(self):
+        await self._queue.join()
+    async def _dispatch_loop(self):
+        while self._running:
+            event = await self._queue.get()
+            handlers = self._subscribers.get(event.event_type, [])
+            handlers.extend(self._subscribers.get("*", []))
+            for handler in handlers:
+                try:
+                    result = handler(event)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception:
+                    pass
+            self._queue.task_done()
+def make_events(count: int) -> List[EngineEvent]:
+    return [
+        EngineEvent(
+            event_id=str(i),
+            event_type=f"type.{i % 8}",
+            engine_id="bench",
+            timestamp="",
+        )
+        for i in range(count)
+    ]
+async def run_throughput(bus, events: List[EngineEvent], subscribers: int) -> float:
+    received = [0]
+    def handler(event):
+        received[0] += 1
+    for i in range(subscribers):
+        bus.subscribe(f"type.{i % 8}", handler)
+    await bus.start()
+    start = time.perf_counter()
+    for event in events:
+        await bus.publish(event)
+    await bus.join()
+    elapsed = time.perf_counter() - start
+    await bus.stop()
+    return len(events) / elapsed
+async def run_isolation(events: List[EngineEvent], slow_seconds: float) -> Dict:
+    bus = EventBus(max_size=1000)
+    async def slow(event):
+        await asyncio.sleep(slow_seconds)
+    def fast(event):
+        pass
+    bus.subscribe("*", slow, max_queue=100, overflow=OverflowPolicy.DROP, name="slow")
+    bus.subscribe("*", fast, name="fast")
+    await bus.start()
+    for i, event in enumerate(events):
+        await bus.publish(event)
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+    await bus.join()
+    metrics = bus.get_metrics()["subscribers"]
+    await bus.stop()
+    return metrics
+async def main_async(args):
+    events = make_events(args.events)
+    legacy = await run_throughput(
+        LegacyEventBus(max_size=args.queue_size), events, args.subscribers
+    )
+    print(f"legacy central queue      {legacy:12,.0f} events/sec")
+    current = await run_throughput(
+        EventBus(max_size=args.queue_size), events, args.subscribers
+    )
+    print(f"per-subscriber queues     {current:12,.0f} events/sec")
+    metrics = await run_isolation(make_events(args.isolation_events), args.slow_seconds)
+    for name in ("fast", "slow"):
+        m = metrics[name]
+        print(
+            f"isolation {name:<5} delivered={m['delivered']:<7} dropped={m['dropped']:<7} "
+            f"avg_lag={m['avg_lag_ms']:.2f}ms max_lag={m['max_lag_ms']:.2f}ms"
+        )
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--subscribers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--isolation-events", type=int, default=20000)
+    parser.add_argument("--slow-seconds", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+if __name__ == "__main__":
+    main()
@@ -22,14 +22,23 @@ Engine Base - 引擎基礎架構
 - 生命週期管理 (Lifecycle Management)
 - 事件驅動 (Event-Driven)
 - 可觀測性 (Observability)
+任務調度：
+- N 個常駐 worker 協程，由 asyncio.Semaphore 限制並發
+- 按優先級出隊（同優先級 FIFO），入隊即喚醒，無輪詢
+- 檢查點按髒標記增量序列化，原子寫入
 Version: 1.0.0
 """
 # MNGA-002: Import organization needs review
 import asyncio
+import itertools
 import json
 import logging
+import os
+import tempfile
+import time
 import uuid
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum, auto
@@ -193,6 +202,48 @@ class HealthStatus:
     error_rate: float = 0.0
     details: Dict[str, Any] = field(default_factory=dict)
 # ============================================================================
+# 檢查點輔助
+# ============================================================================
+class TrackedDict(dict):
+    """頂層寫入時標記為髒的字典（巢狀結構修改需呼叫 mark_dirty）"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty = False
+    def mark_dirty(self):
+        self.dirty = True
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dirty = True
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dirty = True
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.dirty = True
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.dirty = True
+        return super().setdefault(key, default)
+    def pop(self, *args):
+        self.dirty = True
+        return super().pop(*args)
+    def popitem(self):
+        self.dirty = True
+        return super().popitem()
+    def clear(self):
+        super().clear()
+        self.dirty = True
+def _task_priority(task: Dict[str, Any], default: Priority) -> int:
+    """任務優先級數值（越小越先執行），接受 Priority、名稱或整數"""
+    priority = task.get("priority", default)
+    if isinstance(priority, Priority):
+        return priority.value
+    if isinstance(priority, str) and priority.upper() in Priority.__members__:
+        return Priority[priority.upper()].value
+    if isinstance(priority, int):
+        return priority
+    return default.value
+# ============================================================================
 # 引擎基礎類
 # ============================================================================
 class BaseEngine(ABC):
@@ -212,18 +263,29 @@ class BaseEngine(ABC):
         self._total_execution_time = 0.0
         # 事件處理
         self._event_handlers: Dict[str, List[Callable]] = {}
-        # 任務隊列
-        self._task_queue: asyncio.Queue = None
+        # 任務隊列: (優先級, 序號, 入隊時間, 任務)
+        self._task_queue: asyncio.PriorityQueue = None
+        self._task_sequence = itertools.count()
         self._active_tasks: Set[str] = set()
+        self._direct_tasks = 0  # execute_now 進行中的任務數
+        self._concurrency: asyncio.Semaphore = None
+        self._workers: List[asyncio.Task] = []
+        self._background_tasks: List[asyncio.Task] = []
+        self._queue_latencies_ms: deque = deque(maxlen=4096)
         # 控制標誌
         self._running = False
         self._shutdown_event: asyncio.Event = None
+        self._resumed: asyncio.Event = None
+        self._idle: asyncio.Event = None
         # 日誌
         self._logger = logging.getLogger(
             f"engine.{self.config.engine_name or self.config.engine_id}"
         )
         # 檢查點
-        self._checkpoint_data: Dict[str, Any] = {}
+        self._checkpoint_data: TrackedDict = TrackedDict()
+        self._stats_dirty = False
+        self._checkpoint_sections: Dict[str, str] = {}
+        self._checkpointed_state: Optional[str] = None
     # ========================================================================
     # 屬性
     # ========================================================================
@@ -244,6 +306,11 @@ class BaseEngine(ABC):
         if self._start_time:
             return datetime.now() - self._start_time
         return timedelta(0)
+    @property
+    def outstanding_tasks(self) -> int:
+        """未完成的任務數（排隊 + 執行中 + execute_now），供負載均衡使用"""
+        queued = self._task_queue.qsize() if self._task_queue else 0
+        return queued + len(self._active_tasks) + self._direct_tasks
     # ========================================================================
     # 抽象方法 (子類必須實現)
     # ========================================================================
@@ -293,10 +360,17 @@ class BaseEngine(ABC):
         self._state = EngineState.INITIALIZING
         try:
             # 初始化組件
-            self._task_queue = asyncio.Queue(
+            self._task_queue = asyncio.PriorityQueue(
                 maxsize=self.config.resource.max_queue_size
             )
+            self._concurrency = asyncio.Semaphore(
+                self.config.resource.max_concurrent_tasks
+            )
             self._shutdown_event = asyncio.Event()
+            self._resumed = asyncio.Event()
+            self._resumed.set()
+            self._idle = asyncio.Event()
+            self._idle.set()
             # 載入檢查點
             if self.config.persistence.enabled:
                 await self._load_checkpoint()
@@ -313,10 +387,15 @@ class BaseEngine(ABC):
             # 發送啟動事件
             await self._emit_event("engine.started", {"config": asdict(self.config)})
             # 啟動背景任務
-            asyncio.create_task(self._main_loop())
-            asyncio.create_task(self._heartbeat_loop())
+            self._workers = [
+                asyncio.create_task(self._worker_loop(index))
+                for index in range(self.config.resource.max_concurrent_tasks)
+            ]
+            self._background_tasks = [asyncio.create_task(self._heartbeat_loop())]
             if self.config.persistence.enabled:
-                asyncio.create_task(self._checkpoint_loop())
+                self._background_tasks.append(
+                    asyncio.create_task(self._checkpoint_loop())
+                )
             self._logger.info(f"引擎啟動成功: {self.engine_name}")
             return True
         except asyncio.TimeoutError:
@@ -338,10 +417,23 @@ class BaseEngine(ABC):
             # 設置關閉信號
             if self._shutdown_event:
                 self._shutdown_event.set()
-            # 等待活動任務完成
+            if self._resumed:
+                self._resumed.set()
+            # 等待活動任務完成（最多 2 秒）
             if not force and self._active_tasks:
                 self._logger.info(f"等待 {len(self._active_tasks)} 個任務完成...")
-                await asyncio.sleep(2)
+                try:
+                    await asyncio.wait_for(self._idle.wait(), timeout=2)
+                except asyncio.TimeoutError:
+                    pass
+            # 停止 worker 與背景任務
+            for task in self._workers + self._background_tasks:
+                task.cancel()
+            await asyncio.gather(
+                *self._workers, *self._background_tasks, return_exceptions=True
+            )
+            self._workers = []
+            self._background_tasks = []
             # 保存檢查點
             if self.config.persistence.enabled:
                 await self._save_checkpoint()
@@ -371,6 +463,7 @@ class BaseEngine(ABC):
         if self._state != EngineState.RUNNING:
             return False
         self._state = EngineState.PAUSED
+        self._resumed.clear()
         await self._emit_event("engine.paused", {})
         return True
     async def resume(self) -> bool:
@@ -378,51 +471,70 @@ class BaseEngine(ABC):
         if self._state != EngineState.PAUSED:
             return False
         self._state = EngineState.RUNNING
+        self._resumed.set()
         await self._emit_event("engine.resumed", {})
         return True
     # ========================================================================
     # 任務處理
     # ========================================================================
     async def submit_task(self, task: Dict[str, Any]) -> str:
-        """提交任務"""
+        """提交任務（task["priority"] 可為 Priority、名稱或整數，預設取引擎優先級）"""
         task_id = task.get("task_id") or str(uuid.uuid4())
         task["task_id"] = task_id
         task["submitted_at"] = datetime.now().isoformat()
-        await self._task_queue.put(task)
+        await self._task_queue.put(
+            (
+                _task_priority(task, self.config.priority),
+                next(self._task_sequence),
+                time.perf_counter(),
+                task,
+            )
+        )
         self._logger.debug(f"任務已提交: {task_id}")
         return task_id
     async def execute_now(self, task: Dict[str, Any]) -> TaskResult:
-        """立即執行任務 (繞過隊列)"""
+        """立即執行任務 (繞過隊列，仍受並發限制)"""
         task_id = task.get("task_id") or str(uuid.uuid4())
         task["task_id"] = task_id
-        return await self._execute_with_retry(task)
-    async def _main_loop(self):
-        """主執行循環"""
+        self._direct_tasks += 1
+        try:
+            if self._concurrency is None:
+                return await self._execute_with_retry(task)
+            async with self._concurrency:
+                return await self._execute_with_retry(task)
+        finally:
+            self._direct_tasks -= 1
+    async def _worker_loop(self, index: int):
+        """常駐 worker：阻塞等待任務，入隊即喚醒"""
         while self._running:
             try:
-                # 檢查狀態
-                if self._state == EngineState.PAUSED:
-                    await asyncio.sleep(0.5)
-                    continue
-                # 獲取任務
+                # 暫停時等待恢復
+                await self._resumed.wait()
+                if not self._running:
+                    break
+                _, _, enqueued_at, task = await self._task_queue.get()
                 try:
-                    task = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    continue
-                # 檢查並發限制
-                while (
-                    len(self._active_tasks) >= self.config.resource.max_concurrent_tasks
-                ):
-                    await asyncio.sleep(0.1)
-                # 執行任務
-                asyncio.create_task(self._process_task(task))
+                    # 等待期間被暫停時，持有任務直到恢復
+                    await self._resumed.wait()
+                    async with self._concurrency:
+                        self._queue_latencies_ms.append(
+                            (time.perf_counter() - enqueued_at) * 1000
+                        )
+                        await self._process_task(task)
+                finally:
+                    self._task_queue.task_done()
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                self._logger.error(f"主循環錯誤: {e}")
-                await asyncio.sleep(1)
+                self._logger.error(f"Worker {index} 錯誤: {e}")
+    async def join(self):
+        """等待隊列中所有已提交任務處理完成"""
+        await self._task_queue.join()
     async def _process_task(self, task: Dict[str, Any]):
         """處理單一任務"""
         task_id = task["task_id"]
         self._active_tasks.add(task_id)
+        self._idle.clear()
         try:
             result = await self._execute_with_retry(task)
             if result.success:
@@ -431,6 +543,7 @@ class BaseEngine(ABC):
                 self._tasks_failed += 1
             self._total_execution_time += result.duration_ms
             self._last_activity = datetime.now()
+            self._stats_dirty = True
             await self._emit_event(
                 "task.completed",
                 {
@@ -441,6 +554,7 @@ class BaseEngine(ABC):
             )
         except Exception as e:
             self._tasks_failed += 1
+            self._stats_dirty = True
             self._logger.error(f"任務處理失敗 {task_id}: {e}")
             await self._emit_event(
                 "task.failed",
@@ -451,6 +565,8 @@ class BaseEngine(ABC):
             )
         finally:
             self._active_tasks.discard(task_id)
+            if not self._active_tasks:
+                self._idle.set()
     async def _execute_with_retry(self, task: Dict[str, Any]) -> TaskResult:
         """帶重試的執行"""
         task_id = task["task_id"]
@@ -501,8 +617,10 @@ class BaseEngine(ABC):
     async def _emit_event(self, event_type: str, payload: Dict[str, Any]):
         """發送事件"""
         event = EngineEvent.create(event_type, self.engine_id, payload)
-        handlers = self._event_handlers.get(event_type, [])
-        handlers.extend(self._event_handlers.get("*", []))  # 全局處理器
+        # 複製後再合併全局處理器，避免在註冊列表上累積
+        handlers = self._event_handlers.get(event_type, []) + self._event_handlers.get(
+            "*", []
+        )
         for handler in handlers:
             try:
                 if asyncio.iscoroutinefunction(handler):
@@ -528,7 +646,10 @@ class BaseEngine(ABC):
                         ),
                     },
                 )
-                await asyncio.sleep(self.config.timeout.heartbeat)
+                if await self._wait_shutdown(self.config.timeout.heartbeat):
+                    break
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self._logger.error(f"心跳錯誤: {e}")
     def get_health(self) -> HealthStatus:
@@ -553,41 +674,111 @@ class BaseEngine(ABC):
                     if self._tasks_completed > 0
                     else 0
                 ),
+                **self.get_queue_latency(),
             },
         )
+    def get_queue_latency(self) -> Dict[str, float]:
+        """最近任務的排隊延遲（提交到開始執行）"""
+        samples = sorted(self._queue_latencies_ms)
+        if not samples:
+            return {"queue_latency_p50_ms": 0.0, "queue_latency_p99_ms": 0.0}
+        return {
+            "queue_latency_p50_ms": samples[len(samples) // 2],
+            "queue_latency_p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        }
+    async def _wait_shutdown(self, timeout: float) -> bool:
+        """等待關閉信號或超時，返回是否已關閉"""
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     # ========================================================================
     # 檢查點 (持久化)
     # ========================================================================
     async def _checkpoint_loop(self):
-        """檢查點循環"""
+        """檢查點循環（無變更時不寫入）"""
         while self._running:
             try:
-                await asyncio.sleep(self.config.persistence.checkpoint_interval)
+                if await self._wait_shutdown(self.config.persistence.checkpoint_interval):
+                    break
                 await self._save_checkpoint()
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self._logger.error(f"檢查點錯誤: {e}")
-    async def _save_checkpoint(self):
-        """保存檢查點"""
-        state_dir = Path(self.config.persistence.state_dir)
-        state_dir.mkdir(parents=True, exist_ok=True)
-        checkpoint = {
-            "engine_id": self.engine_id,
-            "timestamp": datetime.now().isoformat(),
-            "state": self._state.name,
-            "statistics": {
-                "tasks_completed": self._tasks_completed,
-                "tasks_failed": self._tasks_failed,
-                "total_execution_time": self._total_execution_time,
-            },
-            "custom_data": self._checkpoint_data,
-        }
-        checkpoint_file = state_dir / f"{self.engine_id}_checkpoint.json"
-        with open(checkpoint_file, "w", encoding="utf-8") as f:
-            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+    def mark_checkpoint_dirty(self):
+        """標記自定義檢查點數據已變更（巢狀結構修改後呼叫）"""
+        self._checkpoint_data.mark_dirty()
+    def _checkpoint_path(self) -> Path:
+        return (
+            Path(self.config.persistence.state_dir)
+            / f"{self.engine_id}_checkpoint.json"
+        )
+    async def _save_checkpoint(self, force: bool = False) -> bool:
+        """保存檢查點
+        只重新序列化有變更的區段；狀態、統計與自定義數據都未變更時不寫入。
+        寫入臨時文件後 os.replace，讀者不會看到半寫的檢查點。
+        Returns:
+            bool: 是否寫入
+        """
+        if not isinstance(self._checkpoint_data, TrackedDict):
+            # 子類直接替換為普通 dict 時無法追蹤變更
+            self._checkpoint_data = TrackedDict(self._checkpoint_data)
+            self._checkpoint_data.mark_dirty()
+        sections = self._checkpoint_sections
+        state_changed = self._checkpointed_state != self._state.name
+        if not (
+            force
+            or state_changed
+            or self._stats_dirty
+            or self._checkpoint_data.dirty
+            or not sections
+        ):
+            return False
+        if self._stats_dirty or "statistics" not in sections:
+            sections["statistics"] = json.dumps(
+                {
+                    "tasks_completed": self._tasks_completed,
+                    "tasks_failed": self._tasks_failed,
+                    "total_execution_time": self._total_execution_time,
+                }
+            )
+            self._stats_dirty = False
+        if self._checkpoint_data.dirty or "custom_data" not in sections:
+            sections["custom_data"] = json.dumps(
+                self._checkpoint_data, ensure_ascii=False
+            )
+            self._checkpoint_data.dirty = False
+        self._checkpointed_state = self._state.name
+        payload = (
+            "{"
+            f'"engine_id": {json.dumps(self.engine_id)}, '
+            f'"timestamp": {json.dumps(datetime.now().isoformat())}, '
+            f'"state": {json.dumps(self._state.name)}, '
+            f'"statistics": {sections["statistics"]}, '
+            f'"custom_data": {sections["custom_data"]}'
+            "}"
+        )
+        await asyncio.to_thread(self._write_atomic, self._checkpoint_path(), payload)
+        return True
+    @staticmethod
+    def _write_atomic(path: Path, payload: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
     async def _load_checkpoint(self):
         """載入檢查點"""
-        state_dir = Path(self.config.persistence.state_dir)
-        checkpoint_file = state_dir / f"{self.engine_id}_checkpoint.json"
+        checkpoint_file = self._checkpoint_path()
         if checkpoint_file.exists():
             try:
                 with open(checkpoint_file, "r", encoding="utf-8") as f:
@@ -598,7 +789,7 @@ class BaseEngine(ABC):
                 self._tasks_failed = checkpoint.get("statistics", {}).get(
                     "tasks_failed", 0
                 )
-                self._checkpoint_data = checkpoint.get("custom_data", {})
+                self._checkpoint_data = TrackedDict(checkpoint.get("custom_data", {}))
                 self._logger.info(f"已載入檢查點: {checkpoint_file}")
             except Exception as e:
                 self._logger.warning(f"載入檢查點失敗: {e}")
@@ -620,6 +811,7 @@ class BaseEngine(ABC):
             while not self._task_queue.empty():
                 try:
                     self._task_queue.get_nowait()
+                    self._task_queue.task_done()
                 except BaseException:
                     break
             # 重新初始化
@@ -73,16 +73,25 @@ Version: 1.0.0
 """
 # MNGA-002: Import organization needs review
 import argparse
+import ast
 import asyncio
+import hashlib
 import importlib
 import importlib.util
+import inspect
+import itertools
 import json
 import logging
+import os
+import random
 import signal
+import time
+from collections import deque
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
+from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
 import yaml
 from engine_base import (
     BaseEngine,
@@ -102,6 +111,9 @@ BASE_PATH = Path(__file__).parent.parent.parent
 CONFIG_PATH = BASE_PATH / "config" / "automation"
 ENGINES_PATH = BASE_PATH / "tools" / "automation" / "engines"
 STATE_PATH = BASE_PATH / ".automation_state"
+DISCOVERY_CACHE_FILE = "engine_discovery_cache.json"
+# 發現快取格式版本，結構變更時遞增
+DISCOVERY_CACHE_VERSION = 1
 # ============================================================================
 # 配置資料結構
 # ============================================================================
@@ -140,6 +152,7 @@ class PipelineConfig:
     stages: List[Dict[str, Any]] = field(default_factory=list)
     triggers: List[Dict[str, Any]] = field(default_factory=list)
     enabled: bool = True
+    max_parallel: int = 4  # 同時執行的階段上限
 @dataclass
 class EngineRegistration:
     """引擎註冊資訊"""
@@ -156,71 +169,251 @@ class EngineRegistration:
 # ============================================================================
 # 事件總線
 # ============================================================================
+class OverflowPolicy(Enum):
+    """訂閱者隊列已滿時的處理方式"""
+    DROP = "drop"  # 丟棄新事件並計數
+    BLOCK = "block"  # 發布者等待空位（背壓）
+    SPILL = "spill"  # 暫存到訂閱者的溢出緩衝，隊列有空位時依序回填
+class Subscription:
+    """
+    單一訂閱者 - 擁有獨立的有界隊列與 worker
+    """
+    def __init__(
+        self,
+        name: str,
+        event_type: str,
+        handler: Callable,
+        max_queue: int,
+        concurrency: int,
+        overflow: OverflowPolicy,
+    ):
+        self.name = name
+        self.event_type = event_type
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.overflow = overflow
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.spill: Deque[Tuple[EngineEvent, float]] = deque()
+        self.workers: List[asyncio.Task] = []
+        # 指標
+        self.received = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._total_lag_ms = 0.0
+    def offer(self, item: Tuple[EngineEvent, float]) -> bool:
+        """非阻塞投遞；BLOCK 策略且隊列已滿時返回 False"""
+        self.received += 1
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.overflow is OverflowPolicy.DROP:
+                self.dropped += 1
+            elif self.overflow is OverflowPolicy.SPILL:
+                self.spill.append(item)
+                self.spilled += 1
+            else:
+                return False
+        return True
+    def get_metrics(self) -> Dict[str, Any]:
+        """訂閱者指標（lag = 發布到處理開始的延遲）"""
+        handled = self.delivered + self.failed
+        return {
+            "event_type": self.event_type,
+            "overflow": self.overflow.value,
+            "concurrency": self.concurrency,
+            "received": self.received,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "pending": self.queue.qsize() + len(self.spill),
+            "lag_events": self.received - self.dropped - handled,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+            "avg_lag_ms": self._total_lag_ms / handled if handled else 0.0,
+        }
 class EventBus:
     """
     事件總線 - 引擎間通信中心
+    每個訂閱者有自己的有界隊列、並發上限與溢出策略，
+    慢訂閱者只會拖慢自己。歷史記錄為按事件類型索引的環形緩衝。
     """
-    def __init__(self, max_size: int = 10000):
-        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
-        self._subscribers: Dict[str, List[Callable]] = {}
-        self._history: List[EngineEvent] = []
-        self._max_history = 1000
+    def __init__(
+        self,
+        max_size: int = 10000,
+        max_history: int = 1000,
+        default_concurrency: int = 1,
+        default_overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    ):
+        self._max_size = max_size
+        self._default_concurrency = default_concurrency
+        self._default_overflow = default_overflow
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._routes: Dict[str, Tuple[Subscription, ...]] = {}
+        self._subscription_ids = itertools.count(1)
+        # 歷史：全局環形緩衝 + 按類型索引（以序號判斷是否仍在全局窗口內）
+        self._max_history = max_history
+        self._history: Deque[EngineEvent] = deque(maxlen=max_history)
+        self._history_by_type: Dict[str, Deque[Tuple[int, EngineEvent]]] = {}
+        self._sequence = 0
         self._running = False
         self._logger = logging.getLogger("event_bus")
     async def start(self):
         """啟動事件總線"""
         self._running = True
-        asyncio.create_task(self._dispatch_loop())
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                self._start_workers(subscription)
         self._logger.info("事件總線已啟動")
     async def stop(self):
         """停止事件總線"""
         self._running = False
+        workers = [
+            worker
+            for subscriptions in self._subscribers.values()
+            for subscription in subscriptions
+            for worker in subscription.workers
+        ]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.workers = []
     async def publish(self, event: EngineEvent):
         """發布事件"""
-        await self._queue.put(event)
         # 記錄歷史
+        self._sequence += 1
         self._history.append(event)
-        if len(self._history) > self._max_history:
-            self._history = self._history[-self._max_history:]
-    def subscribe(self, event_type: str, handler: Callable):
-        """訂閱事件"""
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-        self._subscribers[event_type].append(handler)
+        by_type = self._history_by_type.get(event.event_type)
+        if by_type is None:
+            by_type = self._history_by_type[event.event_type] = deque(
+                maxlen=self._max_history
+            )
+        by_type.append((self._sequence, event))
+        # 扇出到各訂閱者隊列
+        item = (event, time.perf_counter())
+        for subscription in self._route(event.event_type):
+            if not subscription.offer(item):
+                await subscription.queue.put(item)
+    def subscribe(
+        self,
+        event_type: str,
+        handler: Callable,
+        max_queue: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+        name: Optional[str] = None,
+    ) -> str:
+        """訂閱事件
+        Args:
+            event_type: 事件類型，"*" 為全局訂閱
+            handler: 同步或非同步處理器
+            max_queue: 隊列上限，預設為總線 max_size
+            concurrency: 同時處理的事件數
+            overflow: 隊列已滿時的策略
+            name: 指標中的訂閱者名稱
+        Returns:
+            訂閱者名稱
+        """
+        subscription = Subscription(
+            name=name or f"{getattr(handler, '__qualname__', 'handler')}#{next(self._subscription_ids)}",
+            event_type=event_type,
+            handler=handler,
+            max_queue=self._max_size if max_queue is None else max_queue,
+            concurrency=concurrency or self._default_concurrency,
+            overflow=overflow or self._default_overflow,
+        )
+        self._subscribers.setdefault(event_type, []).append(subscription)
+        self._routes.clear()
+        if self._running:
+            self._start_workers(subscription)
+        return subscription.name
     def unsubscribe(self, event_type: str, handler: Callable):
         """取消訂閱"""
-        if event_type in self._subscribers:
-            self._subscribers[event_type].remove(handler)
-    async def _dispatch_loop(self):
-        """事件分發循環"""
-        while self._running:
-            try:
-                event = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                await self._dispatch(event)
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                self._logger.error(f"事件分發錯誤: {e}")
-    async def _dispatch(self, event: EngineEvent):
-        """分發單一事件"""
-        handlers = self._subscribers.get(event.event_type, [])
-        handlers.extend(self._subscribers.get("*", []))  # 全局訂閱者
-        for handler in handlers:
+        subscriptions = self._subscribers.get(event_type, [])
+        for subscription in subscriptions:
+            if subscription.handler == handler:
+                subscriptions.remove(subscription)
+                for worker in subscription.workers:
+                    worker.cancel()
+                self._routes.clear()
+                return
+    async def join(self):
+        """等待所有訂閱者處理完已發布的事件"""
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                await subscription.queue.join()
+    def _route(self, event_type: str) -> Tuple[Subscription, ...]:
+        """事件類型對應的訂閱者（含全局訂閱者），訂閱變更時重建"""
+        route = self._routes.get(event_type)
+        if route is None:
+            route = tuple(self._subscribers.get(event_type, ()))
+            if event_type != "*":
+                route += tuple(self._subscribers.get("*", ()))
+            self._routes[event_type] = route
+        return route
+    def _start_workers(self, subscription: Subscription):
+        subscription.workers = [
+            asyncio.create_task(self._subscriber_loop(subscription))
+            for _ in range(subscription.concurrency)
+        ]
+    async def _subscriber_loop(self, subscription: Subscription):
+        """訂閱者 worker：依序處理自己的隊列"""
+        queue = subscription.queue
+        handler = subscription.handler
+        while True:
+            event, published_at = await queue.get()
+            if subscription.spill:
+                queue.put_nowait(subscription.spill.popleft())
+            lag_ms = (time.perf_counter() - published_at) * 1000
+            subscription.last_lag_ms = lag_ms
+            subscription._total_lag_ms += lag_ms
+            if lag_ms > subscription.max_lag_ms:
+                subscription.max_lag_ms = lag_ms
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(event)
-                else:
-                    handler(event)
+                result = handler(event)
+                if result is not None and inspect.isawaitable(result):
+                    await result
+                subscription.delivered += 1
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                self._logger.error(f"事件處理錯誤: {e}")
+                subscription.failed += 1
+                self._logger.error(f"事件處理錯誤 ({subscription.name}): {e}")
+            finally:
+                queue.task_done()
+    def get_metrics(self) -> Dict[str, Any]:
+        """總線與各訂閱者指標"""
+        return {
+            "published": self._sequence,
+            "history_size": len(self._history),
+            "subscribers": {
+                subscription.name: subscription.get_metrics()
+                for subscriptions in self._subscribers.values()
+                for subscription in subscriptions
+            },
+        }
     def get_history(
         self, event_type: str = None, limit: int = 100
     ) -> List[EngineEvent]:
         """獲取事件歷史"""
-        events = self._history
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
-        return events[-limit:]
+        if limit <= 0:
+            return []
+        if not event_type:
+            events = itertools.islice(reversed(self._history), limit)
+            return list(events)[::-1]
+        oldest = self._sequence - len(self._history)
+        events = []
+        for sequence, event in reversed(self._history_by_type.get(event_type, ())):
+            if sequence <= oldest or len(events) >= limit:
+                break
+            events.append(event)
+        return events[::-1]
 # ============================================================================
 # 引擎註冊中心
 # ============================================================================
@@ -300,10 +493,17 @@ class EngineRegistry:
     - `engine_base.py` - BaseEngine interface definition
     - `config/system-manifest.yaml` - Module registration schema
     """
-    def __init__(self):
+    def __init__(self, discovery_cache_path: Optional[Path] = None):
         self._engines: Dict[str, EngineRegistration] = {}
         self._engine_classes: Dict[str, Type[BaseEngine]] = {}
+        self._modules: Dict[str, Any] = {}
+        self._random = random.Random()
         self._logger = logging.getLogger("engine_registry")
+        # 發現快取：模組路徑 -> 靜態分析結果
+        self.discovery_cache_path = discovery_cache_path
+        self._discovery_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._discovery_cache_dirty = False
+        self.discovery_stats = {"files": 0, "parsed": 0, "cache_hits": 0, "rehashed": 0}
     def register_class(self, name: str, engine_class: Type[BaseEngine]):
         """註冊引擎類"""
         self._engine_classes[name] = engine_class
@@ -332,9 +532,65 @@ class EngineRegistry:
     def get_healthy_engines(self) -> List[EngineRegistration]:
         """獲取健康的引擎"""
         return [e for e in self._engines.values() if e.healthy]
+    def select_engine(
+        self, engine_type: EngineType, healthy_only: bool = True
+    ) -> Optional[EngineRegistration]:
+        """
+        按負載選擇引擎實例（power-of-two-choices）
+        隨機取兩個候選，選未完成任務較少者；只有兩個以下時直接取最少者。
+        """
+        candidates = [
+            e
+            for e in self._engines.values()
+            if e.engine_type == engine_type
+            and (e.healthy or not healthy_only)
+            and self.ensure_instance(e)
+        ]
+        if not candidates:
+            return None
+        if len(candidates) > 2:
+            candidates = self._random.sample(candidates, 2)
+        return min(candidates, key=lambda e: e.instance.outstanding_tasks)
     def get_engine_class(self, name: str) -> Optional[Type[BaseEngine]]:
         """獲取引擎類"""
         return self._engine_classes.get(name)
+    def load_engine_class(self, module_path: str, class_name: str) -> Type[BaseEngine]:
+        """
+        載入引擎類（延遲到首次實例化才導入模組）
+        同一模組只執行一次；載入後以 class_name 註冊到引擎類表。
+        """
+        key = f"{module_path}:{class_name}"
+        engine_class = self._engine_classes.get(key)
+        if engine_class is not None:
+            return engine_class
+        module = self._modules.get(module_path)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(
+                Path(module_path).stem, module_path
+            )
+            if spec is None or spec.loader is None:
+                raise ImportError(f"無法載入模組: {module_path}")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._modules[module_path] = module
+        engine_class = getattr(module, class_name)
+        if not (isinstance(engine_class, type) and issubclass(engine_class, BaseEngine)):
+            raise TypeError(f"{class_name} 不是 BaseEngine 子類")
+        self._engine_classes[key] = engine_class
+        self._engine_classes.setdefault(class_name, engine_class)
+        return engine_class
+    def ensure_instance(self, registration: EngineRegistration) -> Optional[BaseEngine]:
+        """取得引擎實例，未實例化時載入引擎類並建立"""
+        if registration.instance is None:
+            try:
+                engine_class = self.load_engine_class(
+                    registration.module_path, registration.engine_class
+                )
+                registration.instance = engine_class(registration.config)
+            except Exception as e:
+                self._logger.error(f"載入引擎 {registration.engine_class} 失敗: {e}")
+                return None
+        return registration.instance
     def discover_engines(self, search_paths: List[Path]) -> List[Dict[str, Any]]:
         """
         Automatically discover and collect engine metadata from specified directories.
@@ -343,10 +599,12 @@ class EngineRegistry:
         and YAML configuration files defining engine specifications.
         Discovery Strategies:
         ---------------------
-        1. **Python Module Introspection**:
+        1. **Static Python Module Analysis**:
            - Recursively scans for all `*.py` files in search paths
            - Excludes files starting with underscore (private modules)
-           - Dynamically loads modules and inspects for BaseEngine subclasses
+           - Parses modules with `ast` (no import, no top-level code executed)
+           - A class is an engine if its base chain reaches `BaseEngine`,
+             including bases defined in other scanned modules
            - Extracts engine metadata (class name, module path, engine type)
         2. **YAML Configuration Discovery**:
            - Recursively searches for `engine.yaml` configuration files
@@ -376,8 +634,11 @@ class EngineRegistry:
         - **Non-blocking**: Discovery failures are logged at DEBUG level and
           do not halt the overall discovery process.
           Note: Because failures are logged at DEBUG level, they may not be visible in production environments unless debug logging is enabled. This can make troubleshooting discovery issues more difficult.
-        - **Recursive**: Searches entire directory trees using rglob patterns
-        - **Safe**: Catches and handles module loading exceptions gracefully
+        - **Recursive**: Searches entire directory trees in a single walk
+          (`__pycache__` directories are skipped)
+        - **Safe**: Modules are never imported during discovery
+        - **Cached**: Per-file results are stored in the discovery cache,
+          keyed by mtime/size with a SHA-256 fallback, see `_scan_module()`
         - **Deduplication**: Caller is responsible for handling duplicate
           discoveries (same engine found via both strategies)
         File Exclusions:
@@ -386,14 +647,15 @@ class EngineRegistry:
         - Directories without read permissions (silently skipped)
         Module Loading:
         ---------------
-        - Uses `importlib.util.spec_from_file_location` for dynamic loading
-        - Modules are loaded in isolated namespace to prevent conflicts
+        - Discovery only reads source; `load_engine_class()` imports the
+          module when the engine is first instantiated (`ensure_instance()`)
         - Only inspects module-level class definitions
-        - Does not instantiate engines during discovery phase
+        - `ENGINE_TYPE` must be a literal (`EngineType.X` or a string);
+          engines created dynamically at import time are not discovered
         Error Handling:
         ---------------
         - Invalid Python syntax: Logged and skipped
-        - Import errors: Logged and skipped
+        - Import errors: Surface at first instantiation, not during discovery
         - YAML parse errors: Logged and skipped
         - File permission errors: Silently skipped
         Example Usage:
@@ -412,156 +674,219 @@ class EngineRegistry:
           - GenerationEngine from /app/tools/automation/engines/generation.py
         Performance Considerations:
         ---------------------------
-        - Discovery time scales with number of files in search paths
-        - Module loading incurs one-time import cost per Python file
-        - Recommended to cache results and re-discover only on file changes
-        - Consider using file system watchers for production deployments
+        - Warm discovery costs one `stat()` per file; only changed files are
+          read and parsed, and the cache is written back only when it changed
+        - Import cost is paid per engine module on first instantiation
+        - `benchmarks/engine_discovery_benchmark.py` measures cold/warm startup
         Thread Safety:
         --------------
         This method is NOT thread-safe. Callers must ensure external
         synchronization if called from multiple threads concurrently.
         See Also:
         ---------
-        - `_inspect_module()`: Internal method for Python module introspection
+        - `_scan_module()`: Internal method for static module analysis
         - `register_engine()`: Register discovered engines for use
         - `EngineConfig`: Expected configuration structure for engines
         """
-        discovered = []
+        self._load_discovery_cache()
+        module_files: List[Path] = []
+        config_files: List[Path] = []
         for search_path in search_paths:
             if not search_path.exists():
                 continue
-            # 搜尋 Python 模組
-            for py_file in search_path.rglob("*.py"):
-                if py_file.name.startswith("_"):
-                    continue
-                try:
-                    engine_info = self._inspect_module(py_file)
-                    if engine_info:
-                        discovered.extend(engine_info)
-                except Exception as e:
-                    self._logger.debug(f"檢查模組失敗 {py_file}: {e}")
-            # 搜尋配置檔
-            for config_file in search_path.rglob("engine.yaml"):
-                try:
-                    with open(config_file, "r", encoding="utf-8") as f:
-                        config = yaml.safe_load(f)
-                    if config:
-                        config["config_path"] = str(config_file)
-                        discovered.append(config)
-                except Exception as e:
-                    self._logger.debug(f"讀取配置失敗 {config_file}: {e}")
+            for root, dirs, files in os.walk(search_path):
+                dirs[:] = [d for d in dirs if d != "__pycache__"]
+                for filename in files:
+                    if filename.endswith(".py") and not filename.startswith("_"):
+                        module_files.append(Path(root) / filename)
+                    elif filename == "engine.yaml":
+                        config_files.append(Path(root) / filename)
+        # 靜態分析 Python 模組
+        scanned: List[Tuple[Path, List[Dict[str, Any]]]] = []
+        for py_file in module_files:
+            try:
+                scanned.append((py_file, self._scan_module(py_file)))
+            except Exception as e:
+                self._logger.debug(f"檢查模組失敗 {py_file}: {e}")
+        discovered = self._resolve_engines(scanned)
+        self.save_discovery_cache()
+        # 搜尋配置檔
+        for config_file in config_files:
+            try:
+                with open(config_file, "r", encoding="utf-8") as f:
+                    config = yaml.safe_load(f)
+                if config:
+                    config["config_path"] = str(config_file)
+                    discovered.append(config)
+            except Exception as e:
+                self._logger.debug(f"讀取配置失敗 {config_file}: {e}")
         return discovered
-    def _inspect_module(self, module_path: Path) -> List[Dict[str, Any]]:
+    def save_discovery_cache(self) -> bool:
+        """把有變更的發現快取寫回磁碟（原子替換）"""
+        if (
+            self.discovery_cache_path is None
+            or self._discovery_cache is None
+            or not self._discovery_cache_dirty
+        ):
+            return False
+        path = Path(self.discovery_cache_path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": DISCOVERY_CACHE_VERSION, "modules": self._discovery_cache},
+                    f,
+                )
+            os.replace(tmp_path, path)
+            self._discovery_cache_dirty = False
+            return True
+        except OSError as e:
+            self._logger.warning(f"寫入發現快取失敗: {e}")
+            return False
+    def _load_discovery_cache(self):
+        if self._discovery_cache is not None:
+            return
+        self._discovery_cache = {}
+        if self.discovery_cache_path is None or not Path(self.discovery_cache_path).exists():
+            return
+        try:
+            with open(self.discovery_cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == DISCOVERY_CACHE_VERSION:
+                self._discovery_cache = cached.get("modules", {})
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"讀取發現快取失敗，將重新分析: {e}")
+    def _scan_module(self, module_path: Path) -> List[Dict[str, Any]]:
         """
-        INTERNAL: Inspect a Python module file to discover BaseEngine subclasses.
-        This is a private/internal method. It dynamically loads a Python module and uses
-        runtime introspection to identify all classes that inherit from BaseEngine, extracting
-        metadata for registration.
-        Do NOT call this method directly. Use the public `discover_engines()` method instead,
-        which handles engine discovery and registration in a safe and supported manner.
-        Parameters
-        ----------
-        module_path : Path
-            Path to the Python module file (.py) to inspect.
-        Returns
-        -------
-        List[Dict[str, Any]]
-            List of metadata dictionaries for each discovered engine class, or an empty list.
-        Engine Class Criteria:
-        ----------------------
-        A class is considered a valid engine if ALL of these conditions are met:
-        - Is a Python class (type instance)
-        - Is a subclass of BaseEngine
-        - Is NOT the BaseEngine class itself (no self-inheritance)
-        - Class name does not start with underscore (public classes only)
-        Metadata Extraction:
-        --------------------
-        - **class_name**: Directly from the class `__name__` attribute
-        - **module_path**: Converted to string for JSON serialization
-        - **engine_type**: String value extracted from the ENGINE_TYPE class
-                           attribute if present, otherwise defaults to the
-                           string value of EngineType.EXECUTION
-        Error Handling:
-        ---------------
-        All exceptions during module loading and introspection are silently
-        caught and ignored. **No exceptions are logged at all.**
-        .. warning::
-           This may make debugging difficult, as any errors (e.g., syntax errors,
-           missing dependencies, or other failures) will be completely silent.
-           Unlike ``discover_engines``, which logs exceptions at DEBUG level,
-           this method does not log any errors during discovery.
-        This ensures that:
-        - Syntax errors in modules don't crash discovery
-        - Missing dependencies don't halt the process
-        - Malformed modules are gracefully skipped
-        Common failure scenarios:
-        - ImportError: Module has missing dependencies
-        - SyntaxError: Module contains invalid Python syntax
-        - AttributeError: Module has unexpected structure
-        - FileNotFoundError: Module path is invalid (should not occur with proper caller)
-        Security Considerations:
-        ------------------------
-        - **Code Execution**: This method executes arbitrary Python code from files
-        - **Trust Boundary**: Only use with trusted module paths from controlled
-          search directories
-        - **Isolation**: Each module is loaded in a fresh namespace to prevent
-          cross-contamination
-        - **No Sandbox**: This method does NOT provide security sandboxing
-        Performance Notes:
-        ------------------
-        - Module loading has O(n) complexity where n = file size
-        - Class introspection is O(m) where m = number of module attributes
-        - Each module is loaded only once per discovery cycle
-        - Consider caching results for frequently inspected modules
-        Example Discovered Metadata:
-        ----------------------------
-        >>> engines = registry._inspect_module(Path("engines/validator.py"))
-        >>> print(engines)
-        [
-            {
-                'class_name': 'ValidationEngine',
-                'module_path': '/app/tools/automation/engines/validator.py',
-                'engine_type': 'validation'
-            },
-            {
-                'class_name': 'SyntaxValidationEngine',
-                'module_path': '/app/tools/automation/engines/validator.py',
-                'engine_type': 'validation'
-            }
-        ]
-        See Also:
-        ---------
-        - `discover_engines()`: Public method that calls this for module discovery
-        - `BaseEngine`: The base class that all engines must inherit from
-        - `EngineType`: Enum defining valid engine type values
+        INTERNAL: Statically list the module-level classes of a Python file.
+        Returns one dict per class with `name`, `bases` (last dotted
+        component of each base expression) and `engine_type` (the literal
+        `ENGINE_TYPE` value assigned in the class body, or None). Whether a
+        class is an engine is decided later by `_resolve_engines()`, since
+        the base chain may cross modules.
+        Cache lookup: unchanged (mtime_ns, size) is a hit without reading
+        the file; otherwise the SHA-256 of the content is compared so that
+        touched-but-identical files are not re-parsed.
+        Raises SyntaxError / OSError / UnicodeDecodeError for unreadable
+        modules; `discover_engines()` logs and skips them.
         """
+        self.discovery_stats["files"] += 1
+        key = str(module_path.resolve())
+        stat = module_path.stat()
+        entry = self._discovery_cache.get(key)
+        if (
+            entry is not None
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            self.discovery_stats["cache_hits"] += 1
+            return entry["classes"]
+        source = module_path.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+        if entry is not None and entry["sha256"] == digest:
+            self.discovery_stats["rehashed"] += 1
+            classes = entry["classes"]
+        else:
+            self.discovery_stats["parsed"] += 1
+            classes = self._parse_classes(source, module_path) if b"class" in source else []
+        self._discovery_cache[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "classes": classes,
+        }
+        self._discovery_cache_dirty = True
+        return classes
+    @staticmethod
+    def _parse_classes(source: bytes, module_path: Path) -> List[Dict[str, Any]]:
+        classes = []
+        for node in ast.parse(source, filename=str(module_path)).body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = []
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    bases.append(base.id)
+                elif isinstance(base, ast.Attribute):
+                    bases.append(base.attr)
+            engine_type = None
+            for stmt in node.body:
+                if isinstance(stmt, ast.Assign):
+                    targets = stmt.targets
+                elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+                    targets = [stmt.target]
+                else:
+                    continue
+                if not any(isinstance(t, ast.Name) and t.id == "ENGINE_TYPE" for t in targets):
+                    continue
+                value = stmt.value
+                if isinstance(value, ast.Attribute) and value.attr in EngineType.__members__:
+                    engine_type = EngineType[value.attr].value
+                elif isinstance(value, ast.Constant) and isinstance(value.value, str):
+                    engine_type = value.value
+            classes.append({"name": node.name, "bases": bases, "engine_type": engine_type})
+        return classes
+    @staticmethod
+    def _resolve_engines(
+        scanned: List[Tuple[Path, List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """依類名沿繼承鏈判斷 BaseEngine 子類，ENGINE_TYPE 可繼承自父引擎"""
+        classes_by_name: Dict[str, List[Dict[str, Any]]] = {}
+        for _, classes in scanned:
+            for cls in classes:
+                classes_by_name.setdefault(cls["name"], []).append(cls)
+        # 已導入的引擎基類（如 engine_base 中的 ValidationEngineBase）直接視為引擎
+        resolved: Dict[str, Optional[str]] = {"BaseEngine": None}
+        pending = list(BaseEngine.__subclasses__())
+        while pending:
+            engine_class = pending.pop()
+            engine_type = getattr(engine_class, "ENGINE_TYPE", None)
+            resolved.setdefault(
+                engine_class.__name__,
+                engine_type.value if isinstance(engine_type, EngineType) else None,
+            )
+            pending.extend(engine_class.__subclasses__())
+        visiting = set()
+        def resolve(name: str) -> Tuple[bool, Optional[str]]:
+            """返回 (是否為引擎, 繼承鏈上最近的 ENGINE_TYPE)"""
+            if name in resolved:
+                return True, resolved[name]
+            if name in visiting or name not in classes_by_name:
+                return False, None
+            visiting.add(name)
+            try:
+                for cls in classes_by_name[name]:
+                    for base in cls["bases"]:
+                        is_engine, engine_type = resolve(base)
+                        if is_engine:
+                            resolved[name] = cls["engine_type"] or engine_type
+                            return True, resolved[name]
+                return False, None
+            finally:
+                visiting.discard(name)
         engines = []
-        try:
-            spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
-            if spec is None or spec.loader is None:
-                return engines
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            # 尋找 BaseEngine 子類
-            for name, obj in vars(module).items():
-                if (
-                    isinstance(obj, type)
-                    and issubclass(obj, BaseEngine)
-                    and obj is not BaseEngine
-                    and not name.startswith("_")
-                ):
-                    # 獲取引擎資訊
+        for module_path, classes in scanned:
+            for cls in classes:
+                name = cls["name"]
+                if name == "BaseEngine" or name.startswith("_"):
+                    continue
+                is_engine = False
+                engine_type = cls["engine_type"]
+                for base in cls["bases"]:
+                    base_engine, base_type = resolve(base)
+                    if base_engine:
+                        is_engine = True
+                        engine_type = engine_type or base_type
+                        break
+                if is_engine:
                     engines.append(
                         {
                             "class_name": name,
                             "module_path": str(module_path),
-                            "engine_type": getattr(
-                                obj, "ENGINE_TYPE", EngineType.EXECUTION
-                            ).value,
+                            "engine_type": engine_type or EngineType.EXECUTION.value,
                         }
                     )
-        except Exception:
-            pass
         return engines
 # ============================================================================
 # 引擎調度器
@@ -574,6 +899,7 @@ class EngineScheduler:
         self._registry = registry
         self._event_bus = event_bus
         self._task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._task_sequence = itertools.count()
         self._running = False
         self._logger = logging.getLogger("engine_scheduler")
     async def start(self):
@@ -588,12 +914,13 @@ class EngineScheduler:
         self, task: Dict[str, Any], priority: Priority = Priority.NORMAL
     ):
         """調度任務"""
-        await self._task_queue.put((priority.value, task))
+        # 序號保證同優先級按提交順序，且不比較任務字典
+        await self._task_queue.put((priority.value, next(self._task_sequence), task))
     async def _schedule_loop(self):
         """調度循環"""
         while self._running:
             try:
-                _, task = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
+                _, _, task = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
                 await self._dispatch_task(task)
             except asyncio.TimeoutError:
                 continue
@@ -606,15 +933,13 @@ class EngineScheduler:
         # 找到合適的引擎
         if target_engine_id:
             reg = self._registry.get_engine(target_engine_id)
-            if reg and reg.instance and reg.healthy:
+            if reg and reg.healthy and self._registry.ensure_instance(reg):
                 await reg.instance.submit_task(task)
                 return
         elif target_engine_type:
-            engines = self._registry.get_engines_by_type(EngineType(target_engine_type))
-            healthy_engines = [e for e in engines if e.healthy and e.instance]
-            if healthy_engines:
-                # 負載均衡 (簡單輪詢)
-                engine = healthy_engines[0]
+            # 負載均衡 (power-of-two-choices)
+            engine = self._registry.select_engine(EngineType(target_engine_type))
+            if engine:
                 await engine.instance.submit_task(task)
                 return
         self._logger.warning(f"找不到合適的引擎執行任務: {task.get('task_id')}")
@@ -638,48 +963,204 @@ class PipelineExecutor:
     async def execute_pipeline(
         self, pipeline_id: str, input_data: Dict = None
     ) -> Dict[str, Any]:
-        """執行管道"""
+        """
+        執行管道
+        階段按 DAG 執行：`depends_on` 未指定時依賴前一階段（與舊版串行語義相同），
+        `depends_on: []` 表示可立即執行。同時執行的階段數受 max_parallel 限制。
+        多個依賴的階段以 `merge` 合併輸入："keyed"（預設，{階段 id: 輸出}）
+        或 "merge"（按 depends_on 順序淺合併字典輸出）。
+        """
         pipeline = self._pipelines.get(pipeline_id)
         if not pipeline:
             return {"success": False, "error": f"管道不存在: {pipeline_id}"}
         if not pipeline.enabled:
             return {"success": False, "error": "管道已停用"}
+        try:
+            stage_ids, dependencies = self._build_graph(pipeline.stages)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
         execution_id = f"{pipeline_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        self._running_pipelines[execution_id] = {
+        execution = self._running_pipelines[execution_id] = {
             "pipeline_id": pipeline_id,
             "started_at": datetime.now().isoformat(),
             "current_stage": 0,
+            "running_stages": [],
             "status": "running",
+            "timings": {},
         }
-        results = []
-        current_data = input_data or {}
+        index_of = {stage_id: i for i, stage_id in enumerate(stage_ids)}
+        dependents: Dict[str, List[str]] = {stage_id: [] for stage_id in stage_ids}
+        remaining = {}
+        for stage_id in stage_ids:
+            remaining[stage_id] = len(dependencies[stage_id])
+            for dep in dependencies[stage_id]:
+                dependents[dep].append(stage_id)
+        outputs: Dict[str, Any] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        timings: Dict[str, Dict[str, float]] = execution["timings"]
+        origin = time.perf_counter()
+        ready = deque(s for s in stage_ids if remaining[s] == 0)
+        ready_at = {s: 0.0 for s in ready}
+        running: Dict[asyncio.Task, str] = {}
+        failed_stage: Optional[str] = None
+        max_parallel = max(1, pipeline.max_parallel)
+        def ordered_results() -> List[Dict[str, Any]]:
+            return [results[s] for s in stage_ids if s in results]
         try:
-            for i, stage in enumerate(pipeline.stages):
-                self._running_pipelines[execution_id]["current_stage"] = i
-                stage_result = await self._execute_stage(stage, current_data)
-                results.append(stage_result)
-                if not stage_result.get("success"):
-                    self._running_pipelines[execution_id]["status"] = "failed"
-                    return {
-                        "success": False,
-                        "error": f"階段 {i} 失敗",
-                        "results": results,
-                    }
-                # 傳遞數據到下一階段
-                current_data = stage_result.get("output", current_data)
-            self._running_pipelines[execution_id]["status"] = "completed"
+            while ready or running:
+                while ready and len(running) < max_parallel and failed_stage is None:
+                    stage_id = ready.popleft()
+                    stage = pipeline.stages[index_of[stage_id]]
+                    stage_input = self._stage_input(
+                        stage, dependencies[stage_id], outputs, input_data or {}
+                    )
+                    now = (time.perf_counter() - origin) * 1000
+                    timings[stage_id] = {"ready_ms": ready_at[stage_id], "start_ms": now}
+                    execution["current_stage"] = index_of[stage_id]
+                    execution["running_stages"].append(stage_id)
+                    task = asyncio.create_task(self._execute_stage(stage, stage_input))
+                    running[task] = stage_id
+                if not running:
+                    break
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                now = (time.perf_counter() - origin) * 1000
+                for task in done:
+                    stage_id = running.pop(task)
+                    execution["running_stages"].remove(stage_id)
+                    stage_result = task.result()
+                    stage_result["stage_id"] = stage_id
+                    timing = timings[stage_id]
+                    timing["end_ms"] = now
+                    timing["wall_ms"] = now - timing["start_ms"]
+                    results[stage_id] = stage_result
+                    if not stage_result.get("success"):
+                        if failed_stage is None or index_of[stage_id] < index_of[failed_stage]:
+                            failed_stage = stage_id
+                        continue
+                    outputs[stage_id] = stage_result.get("output")
+                    for dependent in dependents[stage_id]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            ready.append(dependent)
+                            ready_at[dependent] = now
+            if failed_stage is not None:
+                execution["status"] = "failed"
+                return {
+                    "success": False,
+                    "error": f"階段 {index_of[failed_stage]} 失敗",
+                    "results": ordered_results(),
+                    **self._timing_report(execution, dependencies),
+                }
+            execution["status"] = "completed"
             return {
                 "success": True,
                 "execution_id": execution_id,
-                "results": results,
+                "results": ordered_results(),
+                **self._timing_report(execution, dependencies),
             }
         except Exception as e:
-            self._running_pipelines[execution_id]["status"] = "error"
+            for task in running:
+                task.cancel()
+            execution["status"] = "error"
             return {
                 "success": False,
                 "error": str(e),
-                "results": results,
+                "results": ordered_results(),
             }
+    def get_execution_report(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """獲取管道執行的階段耗時與關鍵路徑"""
+        execution = self._running_pipelines.get(execution_id)
+        if execution is None:
+            return None
+        return {
+            "execution_id": execution_id,
+            "status": execution["status"],
+            "timings": execution["timings"],
+            "critical_path": execution.get("critical_path", []),
+            "critical_path_ms": execution.get("critical_path_ms", 0.0),
+        }
+    @staticmethod
+    def _build_graph(
+        stages: List[Dict[str, Any]]
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """解析階段 id 與依賴，檢查未知依賴與環"""
+        stage_ids = [str(stage.get("id", f"stage_{i}")) for i, stage in enumerate(stages)]
+        if len(set(stage_ids)) != len(stage_ids):
+            raise ValueError("階段 id 重複")
+        dependencies: Dict[str, List[str]] = {}
+        for i, stage in enumerate(stages):
+            depends_on = stage.get("depends_on")
+            if depends_on is None:
+                depends_on = [stage_ids[i - 1]] if i > 0 else []
+            elif isinstance(depends_on, str):
+                depends_on = [depends_on]
+            for dep in depends_on:
+                if dep not in stage_ids:
+                    raise ValueError(f"階段 {stage_ids[i]} 依賴未知階段: {dep}")
+            dependencies[stage_ids[i]] = list(depends_on)
+        # Kahn 拓撲排序檢查環
+        indegree = {s: len(deps) for s, deps in dependencies.items()}
+        dependents: Dict[str, List[str]] = {s: [] for s in stage_ids}
+        for stage_id, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(stage_id)
+        queue = deque(s for s in stage_ids if indegree[s] == 0)
+        visited = 0
+        while queue:
+            stage_id = queue.popleft()
+            visited += 1
+            for dependent in dependents[stage_id]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    queue.append(dependent)
+        if visited != len(stage_ids):
+            raise ValueError("階段依賴存在環")
+        return stage_ids, dependencies
+    @staticmethod
+    def _stage_input(
+        stage: Dict[str, Any],
+        depends_on: List[str],
+        outputs: Dict[str, Any],
+        input_data: Dict,
+    ) -> Any:
+        """依賴輸出作為階段輸入；多個依賴時合併（fan-in）"""
+        if not depends_on:
+            return input_data
+        if len(depends_on) == 1:
+            return outputs[depends_on[0]]
+        if stage.get("merge", "keyed") == "merge":
+            merged: Dict[str, Any] = {}
+            for dep in depends_on:
+                if isinstance(outputs[dep], dict):
+                    merged.update(outputs[dep])
+            return merged
+        return {dep: outputs[dep] for dep in depends_on}
+    @staticmethod
+    def _timing_report(
+        execution: Dict[str, Any], dependencies: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """
+        計算關鍵路徑：從最晚結束的階段出發，沿最晚完成的依賴回溯
+        """
+        timings = execution["timings"]
+        finished = [s for s in timings if "end_ms" in timings[s]]
+        path: List[str] = []
+        if finished:
+            stage_id = max(finished, key=lambda s: timings[s]["end_ms"])
+            while stage_id is not None:
+                path.append(stage_id)
+                deps = [d for d in dependencies[stage_id] if "end_ms" in timings.get(d, {})]
+                stage_id = max(deps, key=lambda d: timings[d]["end_ms"]) if deps else None
+            path.reverse()
+        execution["critical_path"] = path
+        execution["critical_path_ms"] = timings[path[-1]]["end_ms"] if path else 0.0
+        return {
+            "timings": timings,
+            "critical_path": path,
+            "critical_path_ms": execution["critical_path_ms"],
+        }
     async def _execute_stage(
         self, stage: Dict[str, Any], input_data: Dict
     ) -> Dict[str, Any]:
@@ -691,13 +1172,12 @@ class PipelineExecutor:
         engine = None
         if engine_id:
             reg = self._registry.get_engine(engine_id)
-            if reg and reg.instance:
-                engine = reg.instance
+            if reg:
+                engine = self._registry.ensure_instance(reg)
         elif engine_type:
-            engines = self._registry.get_engines_by_type(EngineType(engine_type))
-            healthy = [e for e in engines if e.healthy and e.instance]
-            if healthy:
-                engine = healthy[0].instance
+            reg = self._registry.select_engine(EngineType(engine_type))
+            if reg:
+                engine = reg.instance
         if not engine:
             return {"success": False, "error": "找不到引擎"}
         # 執行任務
@@ -811,7 +1291,9 @@ class MasterOrchestrator:
         self.config = config or OrchestratorConfig()
         # 核心組件
         self.event_bus = EventBus(max_size=self.config.event_queue_size)
-        self.registry = EngineRegistry()
+        self.registry = EngineRegistry(
+            discovery_cache_path=BASE_PATH / self.config.state_path / DISCOVERY_CACHE_FILE
+        )
         self.scheduler = EngineScheduler(self.registry, self.event_bus)
         self.pipeline_executor = PipelineExecutor(self.registry, self.scheduler)
         self.health_monitor = HealthMonitor(self.registry, self.event_bus)
@@ -903,29 +1385,19 @@ class MasterOrchestrator:
             except Exception as e:
                 self._logger.error(f"註冊引擎失敗: {e}")
     async def _register_engine_from_info(self, info: Dict[str, Any]):
-        """從資訊註冊引擎"""
+        """從資訊註冊引擎（模組延遲到首次實例化才導入）"""
         module_path = info.get("module_path")
         class_name = info.get("class_name")
         if not module_path or not class_name:
             return
         try:
-            # 動態載入模組
-            spec = importlib.util.spec_from_file_location(
-                Path(module_path).stem, module_path
-            )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            # 獲取引擎類
-            engine_class = getattr(module, class_name)
             # 建立配置
             config = EngineConfig(
                 engine_name=class_name,
                 engine_type=EngineType(info.get("engine_type", "execution")),
                 execution_mode=ExecutionMode.AUTONOMOUS,
             )
-            # 建立實例
-            instance = engine_class(config)
-            # 註冊
+            # 註冊（實例由 registry.ensure_instance 建立）
             registration = EngineRegistration(
                 engine_id=config.engine_id,
                 engine_name=class_name,
@@ -933,7 +1405,6 @@ class MasterOrchestrator:
                 engine_type=config.engine_type,
                 module_path=module_path,
                 config=config,
-                instance=instance,
             )
             self.registry.register_engine(registration)
         except Exception as e:
@@ -942,7 +1413,7 @@ class MasterOrchestrator:
         """啟動所有引擎"""
         self._logger.info("啟動所有引擎...")
         for reg in self.registry.get_all_engines():
-            if reg.instance:
+            if self.registry.ensure_instance(reg):
                 try:
                     success = await reg.instance.start()
                     if success:
@@ -965,13 +1436,13 @@ class MasterOrchestrator:
     async def start_engine(self, engine_id: str) -> bool:
         """啟動指定引擎"""
         reg = self.registry.get_engine(engine_id)
-        if not reg or not reg.instance:
+        if not reg or not self.registry.ensure_instance(reg):
             return False
         return await reg.instance.start()
     async def stop_engine(self, engine_id: str) -> bool:
         """停止指定引擎"""
         reg = self.registry.get_engine(engine_id)
-        if not reg or not reg.instance:
+        if not reg or not self.registry.ensure_instance(reg):
             return False
         return await reg.instance.stop()
     # ========================================================================
@@ -993,6 +1464,7 @@ class MasterOrchestrator:
                     stages=data.get("stages", []),
                     triggers=data.get("triggers", []),
                     enabled=data.get("enabled", True),
+                    max_parallel=data.get("max_parallel", 4),
                 )
                 self.pipeline_executor.register_pipeline(pipeline)
             except Exception as e:
@@ -1011,7 +1483,7 @@ class MasterOrchestrator:
     async def execute_task(self, engine_id: str, task: Dict[str, Any]) -> TaskResult:
         """直接執行任務"""
         reg = self.registry.get_engine(engine_id)
-        if not reg or not reg.instance:
+        if not reg or not self.registry.ensure_instance(reg):
             return TaskResult(
                 task_id=task.get("task_id", ""),
                 success=False,
@@ -92,6 +92,8 @@ class QuantumSettings(BaseSettings):
     ibm_token: str = ""
     ibm_instance: str = ""
     max_circuits_per_batch: int = Field(default=100, ge=1)
+    transpile_cache_size: int = Field(default=128, ge=0)
+    simulator_cache_size: int = Field(default=8, ge=1)
     resilience_level: int = Field(default=1, ge=0, le=2)
 
 
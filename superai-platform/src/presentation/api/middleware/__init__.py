@@ -1,6 +1,7 @@
 """API middleware — authentication, rate limiting, request logging."""
 from __future__ import annotations
 
+import math
 import time
 import uuid
 from typing import Any, Callable
@@ -9,6 +10,13 @@ import structlog
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from src.presentation.api.middleware.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimitRule,
+    RateLimitStore,
+    RedisRateLimitStore,
+)
+
 logger = structlog.get_logger(__name__)
 
 
@@ -49,40 +57,70 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiter per client IP."""
-
-    def __init__(self, app: Any, requests_per_minute: int = 100) -> None:
+    """Token-bucket rate limiter per client IP, with optional per-route limits.
+
+    ``route_limits`` maps path prefixes to ``RateLimitRule`` (or a
+    ``(requests, window_seconds)`` tuple); the longest matching prefix wins and
+    each prefix gets its own buckets. Pass ``store=RedisRateLimitStore()`` to
+    share limits across workers; the default store is per-process and bounded
+    to ``max_clients`` buckets.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        requests_per_minute: int = 100,
+        route_limits: dict[str, RateLimitRule | tuple[int, float]] | None = None,
+        store: RateLimitStore | None = None,
+        max_clients: int = 100_000,
+    ) -> None:
         super().__init__(app)
-        self._limit = requests_per_minute
-        self._window = 60
-        self._store: dict[str, list[float]] = {}
+        self._default = RateLimitRule(requests=requests_per_minute, window=60)
+        routes = {
+            prefix: rule if isinstance(rule, RateLimitRule) else RateLimitRule(*rule)
+            for prefix, rule in (route_limits or {}).items()
+        }
+        self._routes = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+        self._store = store or InMemoryRateLimitStore(max_clients=max_clients)
+
+    def _resolve(self, path: str) -> tuple[str, RateLimitRule]:
+        for prefix, rule in self._routes:
+            if path.startswith(prefix):
+                return prefix, rule
+        return "*", self._default
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         client_ip = request.client.host if request.client else "unknown"
-        now = time.time()
+        scope, rule = self._resolve(request.url.path)
+        decision = await self._store.hit(f"{scope}|{client_ip}", rule)
 
-        # Clean old entries
-        if client_ip in self._store:
-            self._store[client_ip] = [t for t in self._store[client_ip] if now - t < self._window]
-        else:
-            self._store[client_ip] = []
-
-        if len(self._store[client_ip]) >= self._limit:
+        if not decision.allowed:
             from fastapi.responses import JSONResponse
-            retry_after = int(self._window - (now - self._store[client_ip][0]))
             return JSONResponse(
                 status_code=429,
                 content={
                     "error": {
                         "code": "RATE_LIMITED",
-                        "message": f"Rate limit exceeded: {self._limit} requests per {self._window}s",
+                        "message": f"Rate limit exceeded: {rule.requests} requests per {rule.window:g}s",
                     }
                 },
-                headers={"Retry-After": str(max(1, retry_after))},
+                headers={
+                    "Retry-After": str(max(1, math.ceil(decision.retry_after))),
+                    "X-RateLimit-Limit": str(decision.limit),
+                    "X-RateLimit-Remaining": "0",
+                },
             )
 
-        self._store[client_ip].append(now)
-        return await call_next(request)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(decision.limit)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+        return response
 
 
-__all__ = ["RequestLoggingMiddleware", "RateLimitMiddleware"]
\ No newline at end of file
+__all__ = [
+    "RequestLoggingMiddleware",
+    "RateLimitMiddleware",
+    "RateLimitRule",
+    "InMemoryRateLimitStore",
+    "RedisRateLimitStore",
+]
\ No newline at end of file
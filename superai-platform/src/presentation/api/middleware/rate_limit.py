@@ -0,0 +1,202 @@
+"""Token-bucket rate limiting — rules, in-memory store, shared Redis store."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """``requests`` per ``window`` seconds, with bursts up to ``burst`` (defaults to ``requests``)."""
+
+    requests: int
+    window: float = 60.0
+    burst: int | None = None
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.window
+
+    @property
+    def capacity(self) -> int:
+        return self.burst or self.requests
+
+    @property
+    def refill_seconds(self) -> float:
+        """Time for an empty bucket to refill; an idle bucket older than this is indistinguishable from a new one."""
+        return self.capacity / self.rate
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+
+
+class RateLimitStore(Protocol):
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitDecision: ...
+
+
+class InMemoryRateLimitStore:
+    """Per-process token buckets in a bounded, TTL-evicted LRU table.
+
+    Each bucket is ``[tokens, updated_at, expires_at]``. A hit refills the bucket
+    from elapsed time and spends one token, so the cost per request is O(1)
+    regardless of request rate. Buckets expire once they would be full again
+    (``rule.refill_seconds``), so evicting them never changes a decision; the
+    ``max_clients`` bound only forgets partially drained buckets under pressure.
+    """
+
+    def __init__(self, max_clients: int = 100_000, sweep_batch: int = 16) -> None:
+        self.max_clients = max_clients
+        self.sweep_batch = sweep_batch
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self.evicted_expired = 0
+        self.evicted_capacity = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        return self.hit_sync(key, rule)
+
+    def hit_sync(self, key: str, rule: RateLimitRule, now: float | None = None) -> RateLimitDecision:
+        now = time.monotonic() if now is None else now
+        capacity = rule.capacity
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket[2] <= now:
+            tokens = float(capacity)
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rule.rate)
+
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        expires_at = now + (capacity - tokens) / rule.rate
+
+        if bucket is None:
+            self._buckets[key] = [tokens, now, expires_at]
+            self._evict(now)
+        else:
+            bucket[0], bucket[1], bucket[2] = tokens, now, expires_at
+            self._buckets.move_to_end(key)
+
+        retry_after = 0.0 if allowed else (1.0 - tokens) / rule.rate
+        return RateLimitDecision(allowed, capacity, int(tokens), retry_after)
+
+    def _evict(self, now: float) -> None:
+        # Least recently used buckets sit at the head; drop a few expired ones per insert
+        buckets = self._buckets
+        for _ in range(self.sweep_batch):
+            if not buckets:
+                return
+            key, bucket = next(iter(buckets.items()))
+            if bucket[2] > now:
+                break
+            del buckets[key]
+            self.evicted_expired += 1
+        while len(buckets) > self.max_clients:
+            buckets.popitem(last=False)
+            self.evicted_capacity += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "clients": len(self._buckets),
+            "max_clients": self.max_clients,
+            "evicted_expired": self.evicted_expired,
+            "evicted_capacity": self.evicted_capacity,
+        }
+
+
+# Atomic refill-and-spend; uses the Redis clock so workers on different hosts agree.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+  tokens = capacity
+else
+  tokens = math.min(capacity, tokens + (now - ts) * rate)
+end
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitStore:
+    """Token buckets shared by all workers through Redis.
+
+    Keys expire when the bucket would be full, so Redis memory is bounded by the
+    number of recently active clients. If Redis is unreachable, decisions fall
+    back to a per-process ``InMemoryRateLimitStore`` instead of failing requests.
+    """
+
+    def __init__(self, prefix: str = "superai:ratelimit", fallback: InMemoryRateLimitStore | None = None) -> None:
+        self._prefix = prefix
+        self._script: Any = None
+        self._fallback = fallback or InMemoryRateLimitStore()
+
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        try:
+            if self._script is None:
+                from src.infrastructure.cache.redis_client import get_redis
+                self._script = (await get_redis()).register_script(_TOKEN_BUCKET_LUA)
+            allowed, tokens = await self._script(keys=[f"{self._prefix}:{key}"], args=[rule.rate, rule.capacity])
+        except Exception as e:
+            logger.warning("rate_limit_store_unavailable", error=str(e))
+            return await self._fallback.hit(key, rule)
+
+        tokens = float(tokens)
+        retry_after = 0.0 if allowed else (1.0 - tokens) / rule.rate
+        return RateLimitDecision(bool(allowed), rule.capacity, int(tokens), retry_after)
+
+
+def load_test(clients: int = 1_000_000, max_clients: int = 10_000) -> dict[str, Any]:
+    """Hit the in-memory store with ``clients`` unique keys and report memory use.
+
+    Run with ``python -m src.presentation.api.middleware.rate_limit``.
+    """
+    import tracemalloc
+
+    store = InMemoryRateLimitStore(max_clients=max_clients)
+    rule = RateLimitRule(requests=100, window=60)
+    tracemalloc.start()
+    checkpoints = []
+    start = time.perf_counter()
+    for i in range(clients):
+        store.hit_sync(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:{i}", rule)
+        if (i + 1) % (clients // 10 or 1) == 0:
+            checkpoints.append((i + 1, tracemalloc.get_traced_memory()[0]))
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return {
+        **store.stats(),
+        "unique_clients": clients,
+        "requests_per_second": round(clients / elapsed),
+        "memory_bytes": checkpoints,
+    }
+
+
+if __name__ == "__main__":
+    report = load_test()
+    for seen, current in report.pop("memory_bytes"):
+        print(f"{seen:>9} clients  {current / 1024 / 1024:8.2f} MiB")
+    print(report)
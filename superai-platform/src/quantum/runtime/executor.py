@@ -1,41 +1,115 @@
 """Quantum Circuit Executor - Qiskit Runtime integration."""
 from __future__ import annotations
 
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from typing import Any
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# AerSimulator options clients may set. Everything else (noise models, custom
+# executors, target overrides) is server-side configuration only.
+ALLOWED_BACKEND_OPTIONS = frozenset({
+    "method",
+    "device",
+    "precision",
+    "seed_simulator",
+    "max_parallel_threads",
+    "max_parallel_experiments",
+    "max_parallel_shots",
+    "fusion_enable",
+    "fusion_threshold",
+    "statevector_parallel_threshold",
+})
+
+
+class TranspileCache:
+    """Bounded LRU of transpiled circuit templates, shared across executor instances.
+
+    Templates keep custom gate angles as unbound ``Parameter`` objects, so circuits
+    that differ only in their parameter values compile once and are bound late.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[Any, ...]) -> Any | None:
+        with self._lock:
+            template = self._entries.get(key)
+            if template is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return template
+
+    def put(self, key: tuple[Any, ...], template: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
 
 class QuantumExecutor:
-    """Execute quantum circuits on local simulator or IBM Quantum backends."""
+    """Execute quantum circuits on local simulator or IBM Quantum backends.
+
+    Simulators are reused per backend configuration (bounded LRU) and transpiled
+    templates are cached process-wide, since routes create a new executor for
+    every request.
+    """
+
+    _simulators: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+    _simulators_lock = threading.Lock()
+    _transpile_cache: TranspileCache | None = None
 
     def __init__(self) -> None:
         from src.infrastructure.config import get_settings
         self._settings = get_settings().quantum
+        if QuantumExecutor._transpile_cache is None:
+            QuantumExecutor._transpile_cache = TranspileCache(self._settings.transpile_cache_size)
 
     async def run_circuit(self, num_qubits: int, circuit_type: str, shots: int, parameters: dict[str, Any]) -> dict[str, Any]:
         start = time.perf_counter()
         job_id = str(uuid.uuid4())
 
         try:
-            from qiskit import QuantumCircuit
-            from qiskit_aer import AerSimulator
-
-            qc = self._build_circuit(num_qubits, circuit_type, parameters)
-            qc.measure_all()
-
-            simulator = AerSimulator()
-            from qiskit import transpile
-            transpiled = transpile(qc, simulator, optimization_level=self._settings.optimization_level)
-            result = simulator.run(transpiled, shots=shots).result()
+            backend_key = self._backend_key(parameters.get("backend_options"))
+            simulator = self._get_simulator(backend_key)
+            template, values, cache_hit = self._get_template(num_qubits, circuit_type, parameters, simulator, backend_key)
+            bound = self._bind(template, values)
+            result = simulator.run(bound, shots=shots).result()
             counts = result.get_counts()
 
             elapsed = (time.perf_counter() - start) * 1000
-            logger.info("quantum_circuit_executed", job_id=job_id, circuit_type=circuit_type, qubits=num_qubits, shots=shots, elapsed_ms=elapsed)
+            logger.info("quantum_circuit_executed", job_id=job_id, circuit_type=circuit_type, qubits=num_qubits, shots=shots, transpile_cache_hit=cache_hit, elapsed_ms=elapsed)
 
             return {
                 "job_id": job_id,
@@ -43,11 +117,11 @@ class QuantumExecutor:
                 "result": {
                     "counts": counts,
                     "num_qubits": num_qubits,
-                    "depth": transpiled.depth(),
-                    "gate_count": transpiled.size(),
+                    "depth": template.depth(),
+                    "gate_count": template.size(),
                     "shots": shots,
                 },
-                "metadata": {"circuit_type": circuit_type, "backend": "aer_simulator", "optimization_level": self._settings.optimization_level},
+                "metadata": {"circuit_type": circuit_type, "backend": "aer_simulator", "optimization_level": self._settings.optimization_level, "transpile_cache_hit": cache_hit},
                 "execution_time_ms": round(elapsed, 2),
             }
         except ImportError:
@@ -56,7 +130,155 @@ class QuantumExecutor:
             logger.error("quantum_circuit_error", error=str(e))
             return {"job_id": job_id, "status": "error", "result": {"error": str(e)}, "metadata": {}, "execution_time_ms": 0}
 
-    def _build_circuit(self, num_qubits: int, circuit_type: str, parameters: dict[str, Any]) -> Any:
+    async def run_batch(self, num_qubits: int, circuit_type: str, shots: int, parameter_sets: list[dict[str, Any]], backend_options: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Run one circuit shape for many parameter sets.
+
+        The shape is transpiled once; each parameter set is bound to the template and
+        all bound circuits are submitted together, in chunks of ``max_circuits_per_batch``.
+        Every parameter set must describe the same shape (same gates and qubits).
+        """
+        start = time.perf_counter()
+        job_id = str(uuid.uuid4())
+
+        try:
+            if not parameter_sets:
+                raise ValueError("parameter_sets must not be empty")
+            backend_key = self._backend_key(backend_options)
+            simulator = self._get_simulator(backend_key)
+            template, _, cache_hit = self._get_template(num_qubits, circuit_type, parameter_sets[0], simulator, backend_key)
+            signature = self._shape_signature(circuit_type, parameter_sets[0])
+
+            bound_circuits = []
+            for parameters in parameter_sets:
+                if self._shape_signature(circuit_type, parameters) != signature:
+                    raise ValueError("All parameter sets in a batch must share one circuit shape")
+                bound_circuits.append(self._bind(template, self._parameter_values(circuit_type, parameters)))
+
+            experiments = []
+            chunk_size = self._settings.max_circuits_per_batch
+            for offset in range(0, len(bound_circuits), chunk_size):
+                chunk = bound_circuits[offset:offset + chunk_size]
+                result = simulator.run(chunk, shots=shots).result()
+                experiments.extend({"index": offset + i, "counts": result.get_counts(i)} for i in range(len(chunk)))
+
+            elapsed = (time.perf_counter() - start) * 1000
+            logger.info("quantum_batch_executed", job_id=job_id, circuit_type=circuit_type, qubits=num_qubits, shots=shots, circuits=len(bound_circuits), transpile_cache_hit=cache_hit, elapsed_ms=elapsed)
+
+            return {
+                "job_id": job_id,
+                "status": "completed",
+                "result": {
+                    "experiments": experiments,
+                    "num_circuits": len(bound_circuits),
+                    "num_qubits": num_qubits,
+                    "depth": template.depth(),
+                    "gate_count": template.size(),
+                    "shots": shots,
+                },
+                "metadata": {"circuit_type": circuit_type, "backend": "aer_simulator", "optimization_level": self._settings.optimization_level, "transpile_cache_hit": cache_hit},
+                "execution_time_ms": round(elapsed, 2),
+            }
+        except ImportError:
+            return {"job_id": job_id, "status": "error", "result": {"error": "Qiskit not installed. Install with: pip install qiskit qiskit-aer"}, "metadata": {}, "execution_time_ms": 0}
+        except Exception as e:
+            logger.error("quantum_batch_error", error=str(e))
+            return {"job_id": job_id, "status": "error", "result": {"error": str(e)}, "metadata": {}, "execution_time_ms": 0}
+
+    @classmethod
+    def cache_info(cls) -> dict[str, Any]:
+        return {
+            "transpile_cache": cls._transpile_cache.info() if cls._transpile_cache else {},
+            "simulators": len(cls._simulators),
+        }
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        with cls._simulators_lock:
+            cls._simulators.clear()
+        if cls._transpile_cache is not None:
+            cls._transpile_cache.clear()
+
+    @staticmethod
+    def _backend_key(backend_options: dict[str, Any] | None) -> tuple[tuple[str, Any], ...]:
+        """Validate client backend options and return them as a hashable cache key."""
+        options = backend_options or {}
+        unknown = sorted(set(options) - ALLOWED_BACKEND_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unsupported backend options: {', '.join(map(str, unknown))}")
+        for name, value in options.items():
+            if not isinstance(value, (str, int, float, bool)):
+                raise ValueError(f"Backend option {name} must be a scalar value")
+        return tuple(sorted(options.items()))
+
+    def _get_simulator(self, backend_key: tuple[tuple[str, Any], ...]) -> Any:
+        from qiskit_aer import AerSimulator
+
+        with self._simulators_lock:
+            simulator = self._simulators.get(backend_key)
+            if simulator is not None:
+                self._simulators.move_to_end(backend_key)
+                return simulator
+            simulator = AerSimulator(**dict(backend_key))
+            self._simulators[backend_key] = simulator
+            while len(self._simulators) > self._settings.simulator_cache_size:
+                self._simulators.popitem(last=False)
+            return simulator
+
+    def _get_template(self, num_qubits: int, circuit_type: str, parameters: dict[str, Any], simulator: Any, backend_key: tuple[tuple[str, Any], ...]) -> tuple[Any, list[float], bool]:
+        """Return (transpiled template, parameter values, cache hit)."""
+        from qiskit import transpile
+
+        values = self._parameter_values(circuit_type, parameters)
+        key = (
+            num_qubits,
+            circuit_type,
+            self._shape_signature(circuit_type, parameters),
+            backend_key,
+            self._settings.optimization_level,
+        )
+        template = self._transpile_cache.get(key)
+        if template is not None:
+            return template, values, True
+
+        qc = self._build_circuit(num_qubits, circuit_type, parameters, parameterized=True)
+        qc.measure_all()
+        template = transpile(qc, simulator, optimization_level=self._settings.optimization_level)
+        self._transpile_cache.put(key, template)
+        return template, values, False
+
+    @staticmethod
+    def _bind(template: Any, values: list[float]) -> Any:
+        if not template.parameters:
+            return template
+        # Template parameters are θ[i]; bind by vector index, not by name order ("θ[10]" < "θ[2]")
+        return template.assign_parameters({p: values[p.index] for p in template.parameters})
+
+    @staticmethod
+    def _shape_signature(circuit_type: str, parameters: dict[str, Any]) -> tuple[Any, ...]:
+        """Structure of a custom circuit without its numeric parameter values."""
+        if circuit_type in ("bell", "ghz", "qft", "grover"):
+            return ()
+        return tuple(
+            (
+                gate.get("name", "h"),
+                tuple(gate.get("qubits", [0])),
+                tuple(p if not isinstance(p, (int, float)) else None for p in gate.get("params", [])),
+            )
+            for gate in parameters.get("gates", [])
+        )
+
+    @staticmethod
+    def _parameter_values(circuit_type: str, parameters: dict[str, Any]) -> list[float]:
+        if circuit_type in ("bell", "ghz", "qft", "grover"):
+            return []
+        return [
+            float(p)
+            for gate in parameters.get("gates", [])
+            for p in gate.get("params", [])
+            if isinstance(p, (int, float))
+        ]
+
+    def _build_circuit(self, num_qubits: int, circuit_type: str, parameters: dict[str, Any], parameterized: bool = False) -> Any:
         from qiskit import QuantumCircuit
         import math
 
@@ -106,10 +328,17 @@ class QuantumExecutor:
         else:  # custom
             qc = QuantumCircuit(num_qubits)
             gates = parameters.get("gates", [])
+            if parameterized:
+                # Numeric angles become θ[i] slots, bound later in _bind
+                from qiskit.circuit import ParameterVector
+                theta = ParameterVector("θ", len(self._parameter_values(circuit_type, parameters)))
+                slots = iter(theta)
             for gate in gates:
                 gate_name = gate.get("name", "h")
                 qubits = gate.get("qubits", [0])
                 params = gate.get("params", [])
+                if parameterized:
+                    params = [next(slots) if isinstance(p, (int, float)) else p for p in params]
                 getattr(qc, gate_name)(*params, *qubits) if params else getattr(qc, gate_name)(*qubits)
             return qc
 
@@ -120,4 +349,4 @@ class QuantumExecutor:
         ]
         if self._settings.ibm_token:
             backends.append({"name": "ibm_quantum", "type": "hardware", "status": "configured", "local": False})
-        return backends
\ No newline at end of file
+        return backends
@@ -0,0 +1,57 @@
+"""Unit tests for the token-bucket rate limiter."""
+from __future__ import annotations
+
+from src.presentation.api.middleware.rate_limit import (
+    InMemoryRateLimitStore,
+    RateLimitRule,
+)
+
+
+class TestInMemoryRateLimitStore:
+    def test_allows_burst_then_limits(self):
+        store = InMemoryRateLimitStore()
+        rule = RateLimitRule(requests=3, window=60)
+        decisions = [store.hit_sync("1.2.3.4", rule, now=0.0) for _ in range(4)]
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert decisions[2].remaining == 0
+        assert decisions[3].retry_after == 20.0
+
+    def test_tokens_refill_over_time(self):
+        store = InMemoryRateLimitStore()
+        rule = RateLimitRule(requests=60, window=60)
+        for _ in range(60):
+            store.hit_sync("client", rule, now=0.0)
+        assert not store.hit_sync("client", rule, now=0.5).allowed
+        assert store.hit_sync("client", rule, now=1.0).allowed
+
+    def test_clients_are_independent(self):
+        store = InMemoryRateLimitStore()
+        rule = RateLimitRule(requests=1, window=60)
+        assert store.hit_sync("a", rule, now=0.0).allowed
+        assert not store.hit_sync("a", rule, now=0.0).allowed
+        assert store.hit_sync("b", rule, now=0.0).allowed
+
+    def test_idle_buckets_expire(self):
+        store = InMemoryRateLimitStore()
+        rule = RateLimitRule(requests=10, window=10)
+        for i in range(100):
+            store.hit_sync(f"client-{i}", rule, now=0.0)
+        # A single token refills in 1s, so every bucket is full (expired) at t=2
+        for i in range(10):
+            store.hit_sync(f"late-{i}", rule, now=2.0)
+        assert len(store) < 100
+        assert store.evicted_expired > 0
+
+    def test_table_is_bounded(self):
+        store = InMemoryRateLimitStore(max_clients=1000)
+        rule = RateLimitRule(requests=100, window=60)
+        for i in range(50_000):
+            store.hit_sync(f"client-{i}", rule, now=0.0)
+        assert len(store) == 1000
+        assert store.stats()["evicted_capacity"] == 49_000
+
+    def test_burst_overrides_capacity(self):
+        rule = RateLimitRule(requests=60, window=60, burst=5)
+        assert rule.capacity == 5
+        assert rule.rate == 1.0
+        assert rule.refill_seconds == 5.0
@@ -51,6 +51,108 @@ class TestQuantumExecutor:
         except ImportError:
             pytest.skip("Qiskit not installed")
 
+    @pytest.mark.asyncio
+    async def test_transpile_cache_reused_across_executors(self):
+        try:
+            from src.quantum.runtime.executor import QuantumExecutor
+            QuantumExecutor.clear_caches()
+            first = await QuantumExecutor().run_circuit(
+                num_qubits=3, circuit_type="ghz", shots=50, parameters={}
+            )
+            second = await QuantumExecutor().run_circuit(
+                num_qubits=3, circuit_type="ghz", shots=50, parameters={}
+            )
+            if first["status"] == "completed":
+                assert first["metadata"]["transpile_cache_hit"] is False
+                assert second["metadata"]["transpile_cache_hit"] is True
+                assert QuantumExecutor.cache_info()["transpile_cache"]["hits"] == 1
+        except ImportError:
+            pytest.skip("Qiskit not installed")
+
+    @pytest.mark.asyncio
+    async def test_custom_circuit_binds_parameters_late(self):
+        try:
+            from src.quantum.runtime.executor import QuantumExecutor
+            QuantumExecutor.clear_caches()
+            executor = QuantumExecutor()
+            # rx(0) leaves |0>, rx(pi) flips to |1>; both share one cached template
+            zero = await executor.run_circuit(
+                num_qubits=1, circuit_type="custom", shots=50,
+                parameters={"gates": [{"name": "rx", "qubits": [0], "params": [0.0]}]},
+            )
+            one = await executor.run_circuit(
+                num_qubits=1, circuit_type="custom", shots=50,
+                parameters={"gates": [{"name": "rx", "qubits": [0], "params": [3.141592653589793]}]},
+            )
+            if zero["status"] == "completed":
+                assert zero["result"]["counts"] == {"0": 50}
+                assert one["result"]["counts"] == {"1": 50}
+                assert one["metadata"]["transpile_cache_hit"] is True
+        except ImportError:
+            pytest.skip("Qiskit not installed")
+
+    @pytest.mark.asyncio
+    async def test_run_batch(self):
+        try:
+            from src.quantum.runtime.executor import QuantumExecutor
+            executor = QuantumExecutor()
+            parameter_sets = [
+                {"gates": [{"name": "ry", "qubits": [0], "params": [angle]}, {"name": "cx", "qubits": [0, 1]}]}
+                for angle in (0.0, 0.5, 1.0, 1.5)
+            ]
+            result = await executor.run_batch(
+                num_qubits=2, circuit_type="custom", shots=50, parameter_sets=parameter_sets
+            )
+            assert result["status"] in ("completed", "error")
+            if result["status"] == "completed":
+                assert result["result"]["num_circuits"] == 4
+                assert [e["index"] for e in result["result"]["experiments"]] == [0, 1, 2, 3]
+                assert result["result"]["experiments"][0]["counts"] == {"00": 50}
+        except ImportError:
+            pytest.skip("Qiskit not installed")
+
+    @pytest.mark.asyncio
+    async def test_run_batch_rejects_mixed_shapes(self):
+        try:
+            from src.quantum.runtime.executor import QuantumExecutor
+            result = await QuantumExecutor().run_batch(
+                num_qubits=1, circuit_type="custom", shots=10,
+                parameter_sets=[
+                    {"gates": [{"name": "rx", "qubits": [0], "params": [0.1]}]},
+                    {"gates": [{"name": "ry", "qubits": [0], "params": [0.1]}]},
+                ],
+            )
+            assert result["status"] == "error"
+        except ImportError:
+            pytest.skip("Qiskit not installed")
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_backend_options(self):
+        try:
+            from src.quantum.runtime.executor import QuantumExecutor
+            result = await QuantumExecutor().run_circuit(
+                num_qubits=2, circuit_type="bell", shots=10,
+                parameters={"backend_options": {"executor": "thread-pool"}},
+            )
+            assert result["status"] == "error"
+            assert "executor" in result["result"]["error"]
+        except ImportError:
+            pytest.skip("Qiskit not installed")
+
+    def test_simulator_cache_is_bounded(self):
+        try:
+            from src.quantum.runtime.executor import QuantumExecutor
+            QuantumExecutor.clear_caches()
+            executor = QuantumExecutor()
+            size = executor._settings.simulator_cache_size
+            first = executor._get_simulator(QuantumExecutor._backend_key({"seed_simulator": 0}))
+            for seed in range(1, size + 1):
+                executor._get_simulator(QuantumExecutor._backend_key({"seed_simulator": seed}))
+            assert QuantumExecutor.cache_info()["simulators"] == size
+            assert executor._get_simulator(QuantumExecutor._backend_key({"seed_simulator": 0})) is not first
+        except ImportError:
+            pytest.skip("Qiskit not installed")
+
     def test_list_backends(self):
         try:
             from src.quantum.runtime.executor import QuantumExecutor